@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark of the InvCompare hot paths on synthetic solutions
+(see invariants/synthetic.py), without the MCC corpus.
+
+  benchInvCompare.py run [--sizes 100,200,400,800] [--repeat 3] [--csv bench_invcompare.csv] [--plot scaling.png]
+  benchInvCompare.py generate OUTDIR --size 500 [--semiflow] [--redundancy 0.05]
+
+run times, for each size n (number of invariants, over --var-ratio * n variables):
+  parse        parseSolFile of a .sol.gz with n invariants
+  dedup        deduplicateInvariants of an equivalent pair
+  xor_equiv    checkXor of an equivalent pair (UNSAT)
+  xor_nearmiss checkXor of a near-miss pair (SAT)
+  minimality   checkMinimality of a set with --redundancy redundant invariants
+and prints the best time of --repeat runs and the log-log slope of each curve
+(1: linear, 2: quadratic). The z3 benchmarks are skipped if z3 is missing.
+
+generate writes base.sol.gz, equiv.sol.gz, nearmiss.sol.gz and redundant.sol.gz
+to OUTDIR, to try main.py by hand on sets of a known relationship.
+"""
+
+import argparse
+import csv
+import gzip
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from invariants.deduplicate import deduplicateInvariants
+from invariants.invariant import Invariant
+from invariants.synthetic import equivalentSet, nearMissSet, randomInvariantSet, randomMarking
+from invariants.varindex import VarIndex
+from parsing.parser_solution import parseSolFile
+from solution.writer import SolWriter
+
+try:
+    from solver.satcheck import checkMinimality, checkXor
+except ImportError:
+    checkXor = checkMinimality = None
+
+
+def write_sol_gz(path: str, invariants: List[Invariant]) -> None:
+    """Write a .sol.gz (and its sidecar) as collectSolution.py does."""
+    sol = path[:-len(".gz")]
+    with SolWriter(sol) as writer:
+        for inv in invariants:
+            writer.write(inv)
+    with open(sol, "rb") as src, gzip.open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(sol)
+
+
+def index_of(*sets: List[Invariant]) -> VarIndex:
+    return VarIndex(sorted(set().union(*(inv.getUsedVarNames() for s in sets for inv in s))))
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def slope(points: List[Tuple[int, float]]) -> float:
+    """Least squares slope of log(time) against log(size)."""
+    pts = [(math.log(n), math.log(t)) for n, t in points if t > 0]
+    if len(pts) < 2:
+        return float("nan")
+    mx = sum(x for x, _ in pts) / len(pts)
+    my = sum(y for _, y in pts) / len(pts)
+    var = sum((x - mx) ** 2 for x, _ in pts)
+    return sum((x - mx) * (y - my) for x, y in pts) / var if var else float("nan")
+
+
+def run(args: argparse.Namespace) -> None:
+    sizes = [int(s) for s in args.sizes.split(",")]
+    if checkXor is None:
+        print("Warning: z3 not installed, skipping the checkXor and checkMinimality benchmarks.", file=sys.stderr)
+    results: Dict[str, List[Tuple[int, float]]] = {}
+    rows = []
+    tmp = tempfile.mkdtemp(prefix="benchInvCompare")
+    try:
+        for n in sizes:
+            rng = random.Random(args.seed + n)
+            nbVars = max(n + 1, int(args.var_ratio * n))
+            marking = randomMarking(nbVars, rng)
+            base = randomInvariantSet(nbVars, n, args.support, args.max_coeff, args.semiflow,
+                                      marking=marking, rng=rng)
+            equiv = equivalentSet(base, rng, semiflow=args.semiflow)
+            near = nearMissSet(base, marking, rng)
+            redundant = randomInvariantSet(nbVars, n, args.support, args.max_coeff, args.semiflow,
+                                           args.redundancy, marking, rng)
+            path = os.path.join(tmp, f"base{n}.sol.gz")
+            write_sol_gz(path, base)
+
+            benches: Dict[str, Callable[[], object]] = {
+                "parse": lambda: parseSolFile(path),
+                "dedup": lambda: deduplicateInvariants(base, equiv, index_of(base, equiv)),
+            }
+            if checkXor is not None:
+                benches["xor_equiv"] = lambda: checkXor(base, equiv, index_of(base, equiv))
+                benches["xor_nearmiss"] = lambda: checkXor(base, near, index_of(base, near))
+                if n <= args.max_minimality:
+                    benches["minimality"] = lambda: checkMinimality(redundant, index_of(redundant))
+            for name, fn in benches.items():
+                seconds = best_time(fn, args.repeat)
+                results.setdefault(name, []).append((n, seconds))
+                rows.append([name, n, nbVars, f"{seconds:.6f}"])
+                print(f"{name:14s} n={n:6d} vars={nbVars:6d} {seconds * 1000:10.1f} ms")
+                sys.stdout.flush()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("\nScaling (log-log slope of time against size):")
+    for name, points in results.items():
+        print(f"  {name:14s} {slope(points):5.2f}")
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["Function", "Size", "Vars", "Seconds"])
+            writer.writerows(rows)
+        print(f"Wrote {args.csv}")
+    if args.plot:
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+        except ImportError:
+            print("Warning: matplotlib not installed, skipping the plot.", file=sys.stderr)
+            return
+        plt.figure(figsize=(10, 7))
+        for name, points in results.items():
+            plt.plot([n for n, _ in points], [t for _, t in points], marker="o", label=name)
+        plt.xscale("log")
+        plt.yscale("log")
+        plt.xlabel("Invariants")
+        plt.ylabel("Time (s)")
+        plt.title("InvCompare scaling on synthetic solutions")
+        plt.legend()
+        plt.savefig(args.plot, bbox_inches="tight")
+        print(f"Wrote {args.plot}")
+
+
+def generate(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    n = args.size
+    nbVars = max(n + 1, int(args.var_ratio * n))
+    marking = randomMarking(nbVars, rng)
+    base = randomInvariantSet(nbVars, n, args.support, args.max_coeff, args.semiflow, marking=marking, rng=rng)
+    sets = {
+        "base": base,
+        "equiv": equivalentSet(base, rng, semiflow=args.semiflow),
+        "nearmiss": nearMissSet(base, marking, rng),
+        "redundant": randomInvariantSet(nbVars, n, args.support, args.max_coeff, args.semiflow,
+                                        args.redundancy, marking, rng),
+    }
+    os.makedirs(args.outdir, exist_ok=True)
+    for name, invariants in sets.items():
+        write_sol_gz(os.path.join(args.outdir, f"{name}.sol.gz"), invariants)
+    print(f"Wrote {', '.join(sets)} ({n} invariants over {nbVars} variables) to {args.outdir}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scaling benchmark of InvCompare on synthetic solutions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--var-ratio", type=float, default=2.0, help="Number of variables per invariant of the set.")
+        p.add_argument("--support", type=int, default=8, help="Variables per invariant (sparsity).")
+        p.add_argument("--max-coeff", type=int, default=3, help="Largest coefficient magnitude.")
+        p.add_argument("--semiflow", action="store_true", help="Non-negative coefficients only.")
+        p.add_argument("--redundancy", type=float, default=0.05, help="Fraction of redundant invariants.")
+        p.add_argument("--seed", type=int, default=0)
+
+    p = sub.add_parser("run", help="Time the hot paths over a size sweep.")
+    common(p)
+    p.add_argument("--sizes", default="100,200,400,800", help="Comma separated numbers of invariants.")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per measure (the best is kept).")
+    p.add_argument("--max-minimality", type=int, default=400,
+                   help="Largest size for checkMinimality (one solver call per invariant).")
+    p.add_argument("--csv", default="bench_invcompare.csv", help="Output CSV ('' for none).")
+    p.add_argument("--plot", default="", help="Output scaling plot (PNG/PDF, needs matplotlib).")
+
+    p = sub.add_parser("generate", help="Write synthetic solution files.")
+    common(p)
+    p.add_argument("outdir", help="Output folder.")
+    p.add_argument("--size", type=int, default=500, help="Number of invariants.")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Low-noise measurement mode (see campaign/repeat.py).
+
+Runs each selected job R times instead of once, each run pinned to its own CPU
+(by default one run at a time; with --exclusive, one hardware thread per
+physical core), in a random order and from the same page cache state. The
+logs of repetition k go to logs_<mode>/bench/r<k>/ with the usual names;
+existing ones are kept, so an interrupted benchmark can be resumed. At the end
+the min, median and median absolute deviation (MAD) of the wall, user and sys
+times and of the max RSS of each job are written to bench.csv; collectCSV.py
+also writes them (as <type>_bench.csv and invar_bench.csv) for every log
+folder with repeated runs.
+
+Jobs are described with the same arguments as runCampaign.py; must be run from
+the folder containing config.sh. Select a few jobs (--model-filter, --tools,
+--matrix), as every job costs R runs.
+
+Example:
+  python3 InvCompare/benchmark.py PFLOWS --tools=petri --matrix "petri=-32 | -64" \\
+      --model-filter=A-B -R 7 --cpus 2-9 --exclusive --parallel 4 -t 120 --mem=16G
+"""
+
+import argparse
+import csv
+import os
+import sys
+from typing import List
+
+from campaign.jobs import MODE_LOGDIRS, RUNNER_TOOLS, Job, expand_jobs, parse_matrices
+from campaign.repeat import (CACHE_MODES, available_cpus, exclusive_cpus, parse_cpus,
+                             run_pinned, shuffled_runs)
+from parsing.parser_repeats import BENCH_DIR, REPEAT_COLUMNS, parseRepeats
+
+MODES = ["PFLOWS", "TFLOWS", "PSEMIFLOWS", "TSEMIFLOWS"]
+
+
+def rep_dir(k: int) -> str:
+    return os.path.join(BENCH_DIR, f"r{k}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run jobs several times on pinned CPUs for low-noise timings.")
+    parser.add_argument("modes", nargs="+", choices=MODES, help="Examination modes.")
+    parser.add_argument("--tools", default="tina,petri,itstools,gspn", help="Comma separated runners.")
+    parser.add_argument("--matrix", action="append", default=[], metavar="TOOL=GROUP",
+                        help="Flag group of a tool, as in runCampaign.py. Repeatable.")
+    parser.add_argument("--model-filter", default=None, help="First letter range of the models, e.g. A-D.")
+    parser.add_argument("--models", default=os.environ.get("MODELDIR"), help="Models folder (default $MODELDIR).")
+    parser.add_argument("-t", "--timeout", type=int, default=120, help="Timeout per run (s).")
+    parser.add_argument("--mem", "-mem", default="16G", help="Memory limit per run, or ANY.")
+    parser.add_argument("-R", "--repeats", type=int, default=5, help="Runs per job.")
+    parser.add_argument("--cpus", default=None, help="CPUs to use, e.g. 2-9 (default: all available).")
+    parser.add_argument("--exclusive", action="store_true",
+                        help="Use one hardware thread per physical core (no SMT sibling sharing).")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="Concurrent runs, each on its own CPU (default 1: no contention).")
+    parser.add_argument("--cache", choices=CACHE_MODES, default="warm",
+                        help="Page cache before each run: warm (read the model files), "
+                             "cold (drop caches, needs root; use with --parallel 1) or asis.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the random run order.")
+    parser.add_argument("--summary", default="bench.csv", help="Output CSV of the per-job statistics.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the runs and CPUs only.")
+    args = parser.parse_args()
+
+    tools = [t for t in args.tools.split(",") if t]
+    if any(t not in RUNNER_TOOLS for t in tools):
+        parser.error(f"unknown tool in {args.tools}")
+    if not args.models or not os.path.isdir(args.models):
+        parser.error("models folder not found, use --models or set MODELDIR")
+    if args.repeats < 1 or args.parallel < 1:
+        parser.error("--repeats and --parallel must be positive")
+    try:
+        matrices = parse_matrices(tools, args.matrix)
+        cpus = parse_cpus(args.cpus) if args.cpus else available_cpus()
+    except ValueError as e:
+        parser.error(str(e))
+    if args.exclusive:
+        cpus = exclusive_cpus(cpus)
+    cpus = cpus[:args.parallel]
+
+    jobs = expand_jobs(args.models, args.modes, matrices, args.model_filter)
+    runs = [(job, k) for job, k in shuffled_runs(jobs, args.repeats, args.seed)
+            if not os.path.exists(os.path.join(MODE_LOGDIRS[job.mode], rep_dir(k), job.log_name()))]
+    print(f"{len(jobs)} jobs x {args.repeats} runs: {len(runs)} runs to do on CPUs {','.join(map(str, cpus))}")
+    if args.dry_run:
+        for job, k in runs:
+            print(f"  r{k} {job.describe()}")
+        return
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = os.path.join(root, "runners", "run_job.sh")
+
+    def command(job: Job, k: int) -> List[str]:
+        return [script, job.mode, job.tool, job.model_dir.rstrip("/") + "/", job.flags,
+                args.mem, str(args.timeout), "false", rep_dir(k)]
+
+    counts = run_pinned(runs, cpus, command, args.cache)
+    print(f"Runs: {counts['done']} done, {counts['failed']} failed.")
+
+    rows = []
+    for mode in args.modes:
+        rows.extend(parseRepeats(MODE_LOGDIRS[mode]))
+    with open(args.summary, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=REPEAT_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote {len(rows)} rows to {args.summary}")
+    sys.exit(0 if counts["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
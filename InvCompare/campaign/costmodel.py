@@ -0,0 +1,155 @@
+# campaign/costmodel.py
+"""
+Predict the wall time and memory of a campaign job from past campaigns
+(invar.csv rows, as written by collectCSV.py or logs2csvpar.pl).
+
+Prediction, from the most to the least specific source:
+  - history : a row for the same Model, Tool and Examination (Examination is
+              ignored for older CSVs without that column); a TO row costs the
+              full timeout, a memory overflow the full memory limit.
+  - size    : a least-squares fit of log(Time) and log(Mem) against
+              log(CardP + CardT + CardA) over the rows of the same Tool
+              (and Examination), applied to the size of the model as known
+              from any row of that model.
+  - default : unknown jobs are assumed to run into the timeout and limit,
+              so they are started early rather than discovered late.
+"""
+
+import csv
+import math
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from parsing.parser_logstats import logModelTool
+from .jobs import Job
+
+
+class Prediction(NamedTuple):
+    seconds: float
+    mem_kb: float
+    source: str      # history, size or default
+
+
+def _number(text: Optional[str]) -> Optional[float]:
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+def _fit(points: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """Least squares y = a + b*x; None with fewer than 3 points or no spread."""
+    n = len(points)
+    if n < 3:
+        return None
+    mx = sum(x for x, _ in points) / n
+    my = sum(y for _, y in points) / n
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    if sxx == 0:
+        return None
+    b = sum((x - mx) * (y - my) for x, y in points) / sxx
+    return (my - b * mx, b)
+
+
+class CostModel:
+    """Job cost predictor built from one or more invar.csv files."""
+
+    def __init__(self, timeout_sec: int, mem_limit_kb: Optional[float]) -> None:
+        self.timeout_sec = timeout_sec
+        self.mem_limit_kb = mem_limit_kb
+        # (Model, Tool, Examination) -> (seconds, mem_kb); later files override earlier ones
+        self.history: Dict[Tuple[str, str, str], Tuple[float, Optional[float]]] = {}
+        self.model_size: Dict[str, float] = {}
+        self._points: Dict[Tuple[str, str], List[Tuple[float, float, Optional[float]]]] = {}
+        self._fits: Dict[Tuple[str, str], Tuple[Optional[Tuple[float, float]], Optional[Tuple[float, float]]]] = {}
+
+    def load_csv(self, path: str) -> int:
+        """Add the rows of a CSV file. Returns the number of usable rows."""
+        count = 0
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                # tool names are matched case-insensitively (itstools / ItsTools)
+                model, tool = row.get("Model", ""), row.get("Tool", "").lower()
+                exam = row.get("Examination", "")
+                status = row.get("Status", "")
+                time_ms, mem = _number(row.get("Time")), _number(row.get("Mem"))
+                if status.startswith("TO"):
+                    seconds = float(self.timeout_sec)
+                elif time_ms is not None:
+                    seconds = time_ms / 1000.0
+                else:
+                    continue
+                if status.startswith("MOVF") and self.mem_limit_kb:
+                    mem = self.mem_limit_kb
+                self.history[(model, tool, exam)] = (seconds, mem)
+                self.history[(model, tool, "")] = (seconds, mem)
+
+                sizes = [_number(row.get(c)) for c in ("CardP", "CardT", "CardA")]
+                if all(s is not None for s in sizes):
+                    size = sum(sizes)
+                    self.model_size[model] = size
+                    for key in ((tool, exam), (tool, "")):
+                        self._points.setdefault(key, []).append((size, seconds, mem))
+                count += 1
+        self._fits.clear()
+        return count
+
+    def _fit_for(self, key: Tuple[str, str]):
+        if key not in self._fits:
+            points = self._points.get(key, [])
+            time_fit = _fit([(math.log1p(s), math.log(max(t, 0.001))) for s, t, _ in points])
+            mem_fit = _fit([(math.log1p(s), math.log(m)) for s, _, m in points if m])
+            self._fits[key] = (time_fit, mem_fit)
+        return self._fits[key]
+
+    def predict(self, job: Job) -> Prediction:
+        model, tool = logModelTool(job.log_name())
+        tool = tool.lower()
+        default_mem = self.mem_limit_kb or 0.0
+
+        for exam in (job.mode, ""):
+            hit = self.history.get((model, tool, exam))
+            if hit is not None:
+                seconds, mem = hit
+                return Prediction(min(seconds, self.timeout_sec), mem or default_mem, "history")
+
+        size = self.model_size.get(job.model)
+        if size is not None:
+            for key in ((tool, job.mode), (tool, "")):
+                time_fit, mem_fit = self._fit_for(key)
+                if time_fit is None:
+                    continue
+                seconds = math.exp(time_fit[0] + time_fit[1] * math.log1p(size))
+                mem = math.exp(mem_fit[0] + mem_fit[1] * math.log1p(size)) if mem_fit else default_mem
+                if self.mem_limit_kb:
+                    mem = min(mem, self.mem_limit_kb)
+                return Prediction(min(seconds, self.timeout_sec), mem, "size")
+
+        return Prediction(float(self.timeout_sec), default_mem, "default")
+
+
+def parse_mem(value: str) -> Optional[float]:
+    """A systemd MemoryMax value (e.g. 16G, 512M, 1048576) in kB; None for ANY."""
+    if value.upper() == "ANY":
+        return None
+    units = {"K": 1, "M": 1024, "G": 1024 ** 2, "T": 1024 ** 3}
+    suffix = value[-1:].upper()
+    if suffix in units:
+        return float(value[:-1]) * units[suffix]
+    return float(value) / 1024
+
+
+def physical_mem_kb() -> Optional[float]:
+    """MemTotal of /proc/meminfo in kB, None if unavailable."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024
+    except (ValueError, OSError, AttributeError):
+        return None
@@ -0,0 +1,89 @@
+# campaign/events.py
+"""
+Append-only campaign event log, for timelines of whole campaigns (see traceEvents.py).
+
+When EVENT_LOG names a folder (shared by all nodes), tool runs
+(runners/run_common.sh), solution collection (collectSolution.py) and
+comparisons (main.py) append begin/end events to <EVENT_LOG>/<host>.jsonl,
+one JSON object per line:
+
+    {"ts": 1718000000.123, "ev": "B", "host": "node-3", "pid": 4242, "slot": "",
+     "phase": "run", "model": "Angiogenesis-PT-01", "tool": "petri64", "mode": "PFLOWS"}
+    {"ts": 1718000012.456, "ev": "E", ..., "rc": 0}
+
+Each host has its own file, so nodes never append to the same file over NFS;
+each event is a single short write in append mode, so the processes of a
+node do not interleave lines. slot is the worker slot when the launcher knows
+it (EVENT_SLOT), else empty: the exporter then assigns lanes itself.
+"""
+
+import json
+import os
+import socket
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+EVENT_LOG_ENV = "EVENT_LOG"
+EVENT_SLOT_ENV = "EVENT_SLOT"
+
+
+def event_log() -> Optional[str]:
+    return os.environ.get(EVENT_LOG_ENV) or None
+
+
+def emit(ev: str, phase: str, model: str = "", tool: str = "", mode: str = "", **extra) -> None:
+    """Append one event if EVENT_LOG is set; never raises."""
+    folder = event_log()
+    if folder is None:
+        return
+    host = socket.gethostname()
+    event = {
+        "ts": round(time.time(), 3), "ev": ev, "host": host, "pid": os.getpid(),
+        "slot": os.environ.get(EVENT_SLOT_ENV, ""), "phase": phase,
+        "model": model, "tool": tool, "mode": mode,
+    }
+    event.update(extra)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        fd = os.open(os.path.join(folder, f"{host}.jsonl"), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(event) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+@contextmanager
+def span(phase: str, model: str = "", tool: str = "", mode: str = "") -> Iterator[Dict[str, object]]:
+    """
+    Begin and end events around a block. Items set in the yielded dict (e.g.
+    rc, status) are added to the end event; an exception gives rc=1.
+    """
+    extra: Dict[str, object] = {}
+    emit("B", phase, model, tool, mode)
+    try:
+        yield extra
+    except BaseException:
+        extra.setdefault("rc", 1)
+        raise
+    finally:
+        extra.setdefault("rc", 0)
+        emit("E", phase, model, tool, mode, **extra)
+
+
+def read_events(folder: str) -> List[dict]:
+    """All events of an event log folder, in time order (corrupted lines are skipped)."""
+    events = []
+    for name in sorted(os.listdir(folder)):
+        if not name.endswith(".jsonl"):
+            continue
+        with open(os.path.join(folder, name), "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+    events.sort(key=lambda e: e.get("ts", 0))
+    return events
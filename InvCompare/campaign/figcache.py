@@ -0,0 +1,90 @@
+# campaign/figcache.py
+"""
+Cache of the rendered figures of makeReport.py, keyed by a hash of the data
+they are drawn from: a figure is only redrawn when its input slice (the rows
+and columns it plots) changed, otherwise the pickled matplotlib figure of the
+previous report is reused as is.
+
+The key also covers the figure name, the version of the drawing code (bump
+it when a figure's code changes) and the matplotlib version, since pickled
+figures are only readable by the version that wrote them.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Callable, Optional, Set
+
+import matplotlib
+import matplotlib.pyplot as plt
+import pandas as pd
+
+
+def frame_digest(df: pd.DataFrame) -> bytes:
+    """Digest of the columns and values of a DataFrame (row order included, index ignored)."""
+    h = hashlib.sha256()
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.digest()
+
+
+class FigureCache:
+
+    def __init__(self, folder: str, version: str = "1") -> None:
+        self.folder = folder
+        self.version = version
+        self.used: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+
+    def key(self, name: str, *frames: pd.DataFrame) -> str:
+        h = hashlib.sha256()
+        h.update(f"{name}\0{self.version}\0{matplotlib.__version__}".encode())
+        for df in frames:
+            h.update(frame_digest(df))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.pickle")
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def put(self, key: str, fig) -> None:
+        path = self._path(key)
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            pickle.dump(fig, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def figure(self, name: str, frames, draw: Callable[[], None]):
+        """
+        The figure drawn by draw() (which draws on a new current figure) from
+        frames, from the cache when these frames were already drawn.
+        """
+        key = self.key(name, *frames)
+        self.used.add(key)
+        fig = self.get(key)
+        if fig is not None:
+            self.hits += 1
+            return fig
+        self.misses += 1
+        fig = plt.figure(figsize=(12, 8))
+        draw()
+        self.put(key, fig)
+        return fig
+
+    def prune(self, keep: Optional[Set[str]] = None) -> int:
+        """Remove the cached figures not used by this report (or not in keep)."""
+        keep = self.used if keep is None else keep
+        removed = 0
+        for entry in os.listdir(self.folder):
+            if entry.endswith(".pickle") and entry[:-len(".pickle")] not in keep:
+                os.remove(os.path.join(self.folder, entry))
+                removed += 1
+        return removed
@@ -0,0 +1,176 @@
+# campaign/history.py
+"""
+Campaign history store. Each campaign CSV (invar.csv, as written by
+collectCSV.py or logs2csvpar.pl) is kept rather than overwritten by the next
+one, as Parquet files partitioned by campaign, mode and tool:
+
+    <store>/campaign=<name>/Examination=<mode>/Tool=<tool>/data_0.parquet
+
+Rows are sorted by Model inside each file, so the min/max statistics of the
+Parquet row groups let DuckDB skip the data of other models on lookups, while
+the partitions skip other campaigns, modes and tools without opening them.
+Queries run in DuckDB over the whole store and return pandas DataFrames; the
+status counts of summary.py are computed by a single GROUP BY.
+
+CSVs without an Examination column (single mode campaigns) get Examination
+ALL unless a mode is given when they are added.
+"""
+
+import os
+import re
+import shutil
+from typing import Iterable, List, Optional
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+ALL_MODES = "ALL"
+CAMPAIGN_PREFIX = "campaign="
+
+# summary.py status classes, as SQL over the Status column
+STATUS_COUNTS_SQL = """
+    count(*) AS tot,
+    count(*) FILTER (WHERE Status = 'OK') AS succ,
+    count(*) FILTER (WHERE Status = 'TO') AS "time",
+    count(*) FILTER (WHERE Status = 'OF') AS ovf,
+    count(*) FILTER (WHERE Status LIKE '%MO%' AND Status NOT LIKE '%OF%') AS mem,
+    count(*) FILTER (WHERE Status = 'UNK') AS unk,
+    count(*) FILTER (WHERE Status <> 'OK') AS fail
+"""
+
+
+def connect():
+    if duckdb is None:
+        raise ImportError("the history store needs duckdb (pip install duckdb)")
+    return duckdb.connect()
+
+
+def _literal(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _check_name(name: str, what: str) -> None:
+    if not re.fullmatch(r"[A-Za-z0-9._+-]+", name):
+        raise ValueError(f"{what} name '{name}' must only contain letters, digits and ._+-")
+
+
+def campaigns(store: str) -> List[str]:
+    """Names of the campaigns in the store, in name order."""
+    if not os.path.isdir(store):
+        return []
+    return sorted(d[len(CAMPAIGN_PREFIX):] for d in os.listdir(store)
+                  if d.startswith(CAMPAIGN_PREFIX) and os.path.isdir(os.path.join(store, d)))
+
+
+def check_campaigns(store: str, campaign_names: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """
+    campaign_names as a list (None: no restriction).
+    Raises ValueError if one of them is not in the store.
+    """
+    if campaign_names is None:
+        return None
+    campaign_names = list(campaign_names)
+    known = set(campaigns(store))
+    missing = [name for name in campaign_names if name not in known]
+    if missing:
+        raise ValueError(f"No campaign {', '.join(missing)} in {store}"
+                         f" (known: {', '.join(sorted(known)) or 'none'})")
+    return campaign_names
+
+
+def add_campaign(store: str, csv_path: str, campaign: str, mode: Optional[str] = None,
+                 replace: bool = False) -> int:
+    """Add the rows of a campaign CSV to the store. Returns the number of rows."""
+    _check_name(campaign, "campaign")
+    if mode:
+        _check_name(mode, "mode")
+    con = connect()
+    try:
+        source = f"read_csv_auto({_literal(csv_path)}, header=true)"
+        columns = [row[0] for row in con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()]
+        if "Model" not in columns or "Tool" not in columns or "Status" not in columns:
+            raise ValueError(f"{csv_path} has no Model, Tool and Status columns")
+        if mode:
+            mode_sql = _literal(mode)
+        elif "Examination" in columns:
+            mode_sql = f"coalesce(nullif(CAST(Examination AS VARCHAR), ''), {_literal(ALL_MODES)})"
+        else:
+            mode_sql = _literal(ALL_MODES)
+        others = "* EXCLUDE (Examination)" if "Examination" in columns else "*"
+
+        folder = os.path.join(store, CAMPAIGN_PREFIX + campaign)
+        if os.path.exists(folder):
+            if not replace:
+                raise ValueError(f"campaign {campaign} already in {store}")
+            shutil.rmtree(folder)
+        os.makedirs(store, exist_ok=True)
+        count = con.execute(f"SELECT count(*) FROM {source}").fetchone()[0]
+        # the partition columns are stored in the paths only, and read back from them
+        con.execute(f"""
+            COPY (SELECT {others}, {mode_sql} AS Examination, {_literal(campaign)} AS campaign
+                  FROM {source} ORDER BY Model)
+            TO {_literal(store)} (FORMAT PARQUET, PARTITION_BY (campaign, Examination, Tool), OVERWRITE_OR_IGNORE true)
+        """)
+        return count
+    finally:
+        con.close()
+
+
+def remove_campaign(store: str, campaign: str) -> None:
+    _check_name(campaign, "campaign")
+    check_campaigns(store, [campaign])
+    shutil.rmtree(os.path.join(store, CAMPAIGN_PREFIX + campaign))
+
+
+def scan_sql(store: str) -> str:
+    """The whole store as a DuckDB table expression."""
+    pattern = os.path.join(store, "**", "*.parquet")
+    return (f"read_parquet({_literal(pattern)}, hive_partitioning=true, "
+            f"hive_types_autocast=false, union_by_name=true)")
+
+
+def _where(filters: Iterable[tuple]) -> tuple:
+    """WHERE clause and parameters for (column, values) filters; None values are skipped."""
+    clauses, params = [], []
+    for column, values in filters:
+        if values:
+            values = list(values)
+            clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+    return (" WHERE " + " AND ".join(clauses) if clauses else "", params)
+
+
+def select(store: str, campaign_names: Optional[Iterable[str]] = None, modes: Optional[Iterable[str]] = None,
+           tools: Optional[Iterable[str]] = None, models: Optional[Iterable[str]] = None,
+           columns: str = "*"):
+    """
+    Rows of the store as a DataFrame, restricted to the given campaigns, modes, tools and models.
+    An unknown campaign name raises ValueError rather than selecting no rows.
+    """
+    campaign_names = check_campaigns(store, campaign_names)
+    where, params = _where([("campaign", campaign_names), ("Examination", modes), ("Tool", tools),
+                            ("Model", models)])
+    con = connect()
+    try:
+        return con.execute(f"SELECT {columns} FROM {scan_sql(store)}{where}", params).df()
+    finally:
+        con.close()
+
+
+def status_summary(store: str, campaign_names: Optional[Iterable[str]] = None,
+                   by_campaign: bool = False):
+    """
+    Status counts per tool (and campaign) as a DataFrame: tot, succ, time, ovf, mem, unk, fail.
+    An unknown campaign name raises ValueError rather than counting no rows.
+    """
+    campaign_names = check_campaigns(store, campaign_names)
+    where, params = _where([("campaign", campaign_names)])
+    keys = "campaign, Tool" if by_campaign else "Tool"
+    con = connect()
+    try:
+        return con.execute(f"SELECT {keys}, {STATUS_COUNTS_SQL} FROM {scan_sql(store)}{where} "
+                           f"GROUP BY {keys} ORDER BY {keys}", params).df()
+    finally:
+        con.close()
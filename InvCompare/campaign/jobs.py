@@ -0,0 +1,141 @@
+# campaign/jobs.py
+"""
+Campaign jobs: one (mode, tool, model, flag set) run of a runners/run_<tool>.sh
+script. Log names are computed exactly as the runners do, so that a job knows
+its log (to skip finished jobs and to find its history in invar.csv).
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from parsing.log_info import LOGDIR_MODES
+
+# mode -> log folder (inverse of LOGDIR_MODES, as in run_atool.sh)
+MODE_LOGDIRS: Dict[str, str] = {mode: folder for folder, mode in LOGDIR_MODES.items()}
+
+# runners/run_<tool>.sh names
+RUNNER_TOOLS = ("tina", "petri", "itstools", "gspn", "petrisage")
+
+_FLAG_PATTERN = re.compile(r'^--?([a-zA-Z0-9]+)(=[^ ]+)?$')
+
+
+def compress_flags(flags: str) -> str:
+    """Port of compress_flags of runners/run_common.sh (log name segment of a flag set)."""
+    parts: List[str] = []
+    for flag in flags.split():
+        m = _FLAG_PATTERN.match(flag)
+        if not m:
+            continue
+        name, value = m.group(1), m.group(2) or ""
+        value = value.replace("=", "").replace("-1", "inf")
+        abbr = re.sub(r'([A-Z])[a-z]*', r'\1', name).replace("-", "")
+        abbr = abbr[:1].lower() + abbr[1:]
+        parts.append(abbr + value)
+    return "_".join(parts)
+
+
+def expand_groups(groups: Iterable[str]) -> List[str]:
+    """
+    Port of generate_combinations of run_oar2.sh: each group lists alternatives
+    separated by '|' ('' or empty meaning no flag); the result is the cartesian
+    product of the groups, as flag strings. No group gives one empty flag set.
+    """
+    result = [""]
+    for group in groups:
+        if not group.strip():
+            continue
+        options = [opt.strip() for opt in group.split("|")]
+        result = [
+            f"{prev} {opt}".strip() if opt not in ("", "''") else prev
+            for prev in result for opt in options
+        ]
+    return result
+
+
+def parse_matrices(tools: List[str], matrix_args: List[str]) -> Dict[str, List[str]]:
+    """--matrix TOOL=GROUP arguments -> tool -> list of groups (one flag set if none)."""
+    matrices: Dict[str, List[str]] = {tool: [] for tool in tools}
+    for arg in matrix_args:
+        tool, sep, group = arg.partition("=")
+        if not sep or tool not in matrices:
+            raise ValueError(f"bad --matrix {arg!r}: expected TOOL=GROUP with TOOL among {', '.join(tools)}")
+        matrices[tool].append(group)
+    return matrices
+
+
+class Job(NamedTuple):
+    mode: str
+    tool: str        # runner name: tina, petri, itstools, gspn, petrisage
+    model_dir: str
+    flags: str
+
+    @property
+    def model(self) -> str:
+        return os.path.basename(os.path.normpath(self.model_dir))
+
+    def log_name(self) -> str:
+        """File name of the log the runner will write (see runners/run_<tool>.sh)."""
+        flags = self.flags
+        if self.tool == "petri":
+            bitness = "64"
+            if "-32" in flags:
+                bitness, flags = "32", flags.replace("-32", "")
+            if "-128" in flags:
+                bitness, flags = "128", flags.replace("-128", "")
+            flags = flags.replace("-64", "")
+            ext = f"petri{bitness}"
+        elif self.tool == "petrisage":
+            m = re.search(r'--backend=(\S*)', flags)
+            return f"{self.model}{'.' + m.group(1) if m else ''}.petrisage"
+        else:
+            ext = {"tina": "tina", "itstools": "its", "gspn": "gspn"}[self.tool]
+        segment = compress_flags(flags)
+        return f"{self.model}{'.' + segment if segment else ''}.{ext}"
+
+    def log_path(self, root: str = ".") -> str:
+        return os.path.join(root, MODE_LOGDIRS[self.mode], self.log_name())
+
+    def supported(self) -> bool:
+        return self.tool != "petrisage" or self.mode in ("PFLOWS", "TFLOWS")
+
+    def describe(self) -> str:
+        return f"{self.mode} {self.tool} {self.model}{' [' + self.flags + ']' if self.flags else ''}"
+
+
+def in_model_filter(model: str, model_filter: Optional[str]) -> bool:
+    """--model-filter=X-Y of run.sh: first letter of the model in [X, Y], case-insensitive."""
+    if not model_filter:
+        return True
+    start, end = model_filter.upper().split("-")
+    return start <= model[:1].upper() <= end
+
+
+def read_model_list(path: str) -> Set[str]:
+    """--model-list of run.sh: model names, one per line, '#' comments (see selectModels.py)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.split()[0] for line in f if line.strip() and not line.lstrip().startswith("#")}
+
+
+def expand_jobs(
+    models_dir: str,
+    modes: List[str],
+    tool_matrices: Dict[str, List[str]],
+    model_filter: Optional[str] = None,
+    model_list: Optional[Set[str]] = None
+) -> List[Job]:
+    """Jobs of the cartesian product models x tools x modes x flag sets."""
+    model_dirs = sorted(
+        os.path.join(models_dir, d) for d in os.listdir(models_dir)
+        if os.path.isdir(os.path.join(models_dir, d)) and in_model_filter(d, model_filter)
+        and (model_list is None or d in model_list)
+    )
+    jobs: List[Job] = []
+    for mode in modes:
+        for tool, groups in tool_matrices.items():
+            for flags in expand_groups(groups):
+                for model_dir in model_dirs:
+                    job = Job(mode, tool, model_dir, flags)
+                    if job.supported():
+                        jobs.append(job)
+    return jobs
@@ -0,0 +1,115 @@
+# campaign/ladder.py
+"""
+Adaptive limit ladder: re-run only the jobs that hit a limit, with larger ones.
+
+The first rung is the campaign's own log (logs_<mode>/<log>) run with the base
+limits. A job that timed out (TO) is re-run with its timeout multiplied by a
+factor, one that ran out of memory (MOVF) with its memory limit multiplied by
+a factor, until it succeeds or the maximum limits are reached. Each attempt
+writes its log under a limit-tagged folder, logs_<mode>/ladder/t<sec>_m<mem>/,
+with the usual log name, so the attempts stay parseable by collectCSV.py.
+"""
+
+import os
+from typing import List, NamedTuple, Optional
+
+from parsing.parser_logstats import parseLogStats
+from .jobs import MODE_LOGDIRS, Job
+
+LADDER_DIR = "ladder"
+
+
+class Limits(NamedTuple):
+    timeout_sec: int
+    mem_kb: Optional[float]     # None: no memory limit
+
+    def mem_arg(self) -> str:
+        """The limit as accepted by run_job.sh --mem (systemd MemoryMax)."""
+        if self.mem_kb is None:
+            return "ANY"
+        mb = int(self.mem_kb // 1024)
+        return f"{mb // 1024}G" if mb % 1024 == 0 else f"{mb}M"
+
+    def time_limit_ms(self) -> int:
+        return self.timeout_sec * 1000
+
+    def tag(self) -> str:
+        return f"t{self.timeout_sec}_m{self.mem_arg()}"
+
+
+class Attempt(NamedTuple):
+    limits: Limits
+    log_path: str
+    status: Optional[str]       # None if not run yet
+
+
+def log_status(log_path: str, limits: Optional[Limits] = None) -> Optional[str]:
+    """Status column of a log (OK, TO, MOVF, ...) run with limits, None if absent or unreadable."""
+    if not os.path.exists(log_path):
+        return None
+    try:
+        row = parseLogStats(log_path, limits.time_limit_ms()) if limits else parseLogStats(log_path)
+    except (OSError, ValueError):
+        return None
+    return str(row["Status"]) if row else None
+
+
+def is_timeout(status: Optional[str]) -> bool:
+    return status is not None and status.startswith("TO")
+
+
+def is_memory_overflow(status: Optional[str]) -> bool:
+    return status is not None and status.startswith("MOVF")
+
+
+def is_solved(status: Optional[str]) -> bool:
+    return status is not None and status.startswith("OK")
+
+
+def attempt_log(job: Job, limits: Limits, root: str = ".") -> str:
+    return os.path.join(root, MODE_LOGDIRS[job.mode], LADDER_DIR, limits.tag(), job.log_name())
+
+
+class Ladder:
+    """Limits escalation policy."""
+
+    def __init__(self, base: Limits, time_factor: float, max_timeout: int,
+                 mem_factor: float, max_mem_kb: Optional[float]) -> None:
+        self.base = base
+        self.time_factor = time_factor
+        self.max_timeout = max_timeout
+        self.mem_factor = mem_factor
+        self.max_mem_kb = max_mem_kb
+
+    def next_limits(self, limits: Limits, status: Optional[str]) -> Optional[Limits]:
+        """Limits of the next attempt after a failure with status, None if exhausted or not escalated."""
+        if is_timeout(status):
+            timeout = min(int(round(limits.timeout_sec * self.time_factor)), self.max_timeout)
+            return limits._replace(timeout_sec=timeout) if timeout > limits.timeout_sec else None
+        if is_memory_overflow(status) and limits.mem_kb is not None and self.max_mem_kb:
+            mem = min(limits.mem_kb * self.mem_factor, self.max_mem_kb)
+            return limits._replace(mem_kb=mem) if mem > limits.mem_kb else None
+        return None
+
+    def attempts(self, job: Job, root: str = ".") -> List[Attempt]:
+        """The attempts of a job so far, the base run first, ending with the first not run yet (if any)."""
+        limits: Optional[Limits] = self.base
+        log = job.log_path(root)
+        result: List[Attempt] = []
+        while limits is not None:
+            status = log_status(log, limits)
+            result.append(Attempt(limits, log, status))
+            if status is None:
+                break
+            limits = self.next_limits(limits, status)
+            if limits is not None:
+                log = attempt_log(job, limits, root)
+        return result
+
+    def next_attempt(self, job: Job, root: str = ".") -> Optional[Attempt]:
+        """The attempt to run now for a job: the first one without a log, beyond the base run."""
+        attempts = self.attempts(job, root)
+        last = attempts[-1]
+        if last.status is None and len(attempts) > 1:
+            return last
+        return None
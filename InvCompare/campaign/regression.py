@@ -0,0 +1,148 @@
+# campaign/regression.py
+"""
+Paired statistics between two campaigns joined on (Model, Tool, Examination),
+for compareCampaigns.py.
+
+Times are compared on the pairs solved (OK) in both campaigns, as the ratio
+base / new (speedup > 1: the new campaign is faster), with both times raised
+to a floor so that millisecond noise on trivial models does not dominate.
+  - geometric mean speedup, with a percentile bootstrap confidence interval;
+  - Wilcoxon signed-rank test of the log ratios (normal approximation with tie
+    and continuity corrections, zero differences dropped), two-sided;
+  - status transitions (OK, TO, MEM, OF, ERR) between the campaigns;
+  - memory: geometric mean of the new / base max RSS ratios.
+"""
+
+import csv
+import math
+import random
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .subset import status_class
+
+
+class Measure(NamedTuple):
+    ms: int
+    mem_kb: int
+    status: str     # status class
+
+
+Key = Tuple[str, str, str]      # Model, tool (lower case), Examination
+
+
+def _int(text: Optional[str]) -> int:
+    try:
+        return int(float(text))
+    except (TypeError, ValueError):
+        return -1
+
+
+def load_campaign(path: str) -> Tuple[Dict[Key, Measure], Dict[str, str]]:
+    """Rows of a campaign CSV by key, and the tool names as written in the CSV."""
+    rows: Dict[Key, Measure] = {}
+    names: Dict[str, str] = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            model, tool = row.get("Model", ""), row.get("Tool", "")
+            if not model or not tool:
+                continue
+            names.setdefault(tool.lower(), tool)
+            key = (model, tool.lower(), row.get("Examination", ""))
+            rows[key] = Measure(_int(row.get("Time")), _int(row.get("Mem")), status_class(row.get("Status", "")))
+    return rows, names
+
+
+def geomean(values: List[float]) -> float:
+    return math.exp(sum(math.log(v) for v in values) / len(values)) if values else float("nan")
+
+
+def bootstrap_ci(log_ratios: List[float], resamples: int = 2000, level: float = 0.95,
+                 rng: Optional[random.Random] = None) -> Tuple[float, float]:
+    """Percentile bootstrap interval of the geometric mean of exp(log_ratios)."""
+    if not log_ratios:
+        return (float("nan"), float("nan"))
+    rng = rng or random.Random(0)
+    n = len(log_ratios)
+    means = sorted(sum(rng.choices(log_ratios, k=n)) / n for _ in range(resamples))
+    low = means[int((1 - level) / 2 * (resamples - 1))]
+    high = means[int((1 + level) / 2 * (resamples - 1))]
+    return (math.exp(low), math.exp(high))
+
+
+class Wilcoxon(NamedTuple):
+    n: int              # non-zero differences
+    w_plus: float       # sum of the ranks of the positive differences
+    z: float
+    p: float            # two-sided
+
+
+def wilcoxon(differences: List[float], eps: float = 1e-12) -> Wilcoxon:
+    """Wilcoxon signed-rank test that the differences are centered on zero."""
+    diffs = [d for d in differences if abs(d) > eps]
+    n = len(diffs)
+    if n == 0:
+        return Wilcoxon(0, 0.0, 0.0, 1.0)
+    ordered = sorted(range(n), key=lambda i: abs(diffs[i]))
+    ranks = [0.0] * n
+    tie_term = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and abs(abs(diffs[ordered[j + 1]]) - abs(diffs[ordered[i]])) <= eps:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[ordered[k]] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    w_plus = sum(r for r, d in zip(ranks, diffs) if d > 0)
+    mean = n * (n + 1) / 4
+    var = n * (n + 1) * (2 * n + 1) / 24 - tie_term / 48
+    if var <= 0:
+        return Wilcoxon(n, w_plus, 0.0, 1.0)
+    delta = w_plus - mean
+    z = (delta - math.copysign(0.5, delta)) / math.sqrt(var) if delta else 0.0
+    return Wilcoxon(n, w_plus, z, math.erfc(abs(z) / math.sqrt(2)))
+
+
+class ToolComparison(NamedTuple):
+    tool: str
+    pairs: int                          # rows in both campaigns
+    timed: int                          # OK in both, used for the times
+    speedup: float                      # geometric mean of base / new times
+    ci: Tuple[float, float]
+    test: Wilcoxon
+    transitions: Dict[Tuple[str, str], int]     # (base class, new class) -> count, changes only
+    mem_ratio: float                    # geometric mean of new / base max RSS
+    ratios: List[Tuple[float, Key, Measure, Measure]]    # (speedup, key, base, new), slowest first
+
+    def new_failures(self) -> int:
+        return sum(n for (b, a), n in self.transitions.items() if b == "OK" and a != "OK")
+
+    def fixed(self) -> int:
+        return sum(n for (b, a), n in self.transitions.items() if b != "OK" and a == "OK")
+
+
+def compare_tool(tool: str, base: Dict[Key, Measure], new: Dict[Key, Measure], floor_ms: int = 50,
+                 resamples: int = 2000, rng: Optional[random.Random] = None) -> ToolComparison:
+    keys = sorted(k for k in base if k[1] == tool and k in new)
+    log_ratios: List[float] = []
+    mem_logs: List[float] = []
+    transitions: Dict[Tuple[str, str], int] = {}
+    ratios: List[Tuple[float, Key, Measure, Measure]] = []
+    for key in keys:
+        b, a = base[key], new[key]
+        if b.status != a.status:
+            transitions[(b.status, a.status)] = transitions.get((b.status, a.status), 0) + 1
+        if b.status != "OK" or a.status != "OK" or b.ms < 0 or a.ms < 0:
+            continue
+        ratio = max(b.ms, floor_ms) / max(a.ms, floor_ms)
+        log_ratios.append(math.log(ratio))
+        ratios.append((ratio, key, b, a))
+        if b.mem_kb > 0 and a.mem_kb > 0:
+            mem_logs.append(math.log(a.mem_kb / b.mem_kb))
+    ratios.sort(key=lambda r: (r[0], r[1]))
+    speedup = geomean([r[0] for r in ratios])
+    mem_ratio = math.exp(sum(mem_logs) / len(mem_logs)) if mem_logs else float("nan")
+    return ToolComparison(tool, len(keys), len(log_ratios), speedup, bootstrap_ci(log_ratios, resamples, rng=rng),
+                          wilcoxon(log_ratios), transitions, mem_ratio, ratios)
@@ -0,0 +1,153 @@
+# campaign/repeat.py
+"""
+Repeated, pinned runs of campaign jobs, for low-noise timings (see benchmark.py).
+
+Every (job, repetition) run is pinned to one CPU with sched_setaffinity (as
+taskset does; the affinity is inherited by the runner, `time` and the tool),
+and at most one run uses a given CPU at a time. With an exclusive layout only
+one hardware thread per physical core is used, so runs do not share a core
+with their SMT sibling. Runs are started in a random order (reproducible with
+a seed), so that drifts of the machine during the campaign do not bias one
+tool or one repetition. Before each run the page cache is either warmed with
+the model files or dropped (root only), so that all repetitions of all tools
+start in the same cache state.
+"""
+
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .jobs import Job
+
+CACHE_MODES = ("warm", "cold", "asis")
+
+Run = Tuple[Job, int]   # (job, repetition number, from 1)
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _siblings(cpu: int) -> Optional[Set[int]]:
+    path = f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
+    try:
+        with open(path) as f:
+            text = f.read().strip()
+    except OSError:
+        return None
+    cpus: Set[int] = set()
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def exclusive_cpus(cpus: List[int]) -> List[int]:
+    """One CPU (the first hardware thread) per physical core among cpus."""
+    result: List[int] = []
+    taken: Set[int] = set()
+    for cpu in cpus:
+        if cpu in taken:
+            continue
+        result.append(cpu)
+        taken.update(_siblings(cpu) or {cpu})
+    return result
+
+
+def parse_cpus(text: str) -> List[int]:
+    """CPU list in taskset -c syntax, e.g. 0-3,8,10-11."""
+    cpus: List[int] = []
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return sorted(set(cpus))
+
+
+def warm_cache(model_dir: str) -> None:
+    """Read the model files, so that every run finds them in the page cache."""
+    for name in sorted(os.listdir(model_dir)):
+        path = os.path.join(model_dir, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                while f.read(1 << 20):
+                    pass
+
+
+def drop_caches() -> bool:
+    """Drop the page cache (needs root). Returns False if not permitted."""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def shuffled_runs(jobs: List[Job], repeats: int, seed: Optional[int]) -> List[Run]:
+    """All (job, repetition) runs in a random order."""
+    runs = [(job, k) for k in range(1, repeats + 1) for job in jobs]
+    random.Random(seed).shuffle(runs)
+    return runs
+
+
+def _pin(cpu: int) -> Callable[[], None]:
+    def preexec() -> None:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+    return preexec
+
+
+def run_pinned(
+    runs: List[Run],
+    cpus: List[int],
+    command: Callable[[Job, int], List[str]],
+    cache: str = "warm",
+    poll_sec: float = 0.2
+) -> Dict[str, int]:
+    """
+    Run the runs in order, each pinned to a free CPU of cpus (so at most
+    len(cpus) at a time). Returns a count of runs per outcome (done, failed).
+    """
+    pending = list(runs)
+    free = list(cpus)
+    running: Dict[subprocess.Popen, Tuple[Run, int, float]] = {}
+    counts = {"done": 0, "failed": 0}
+    total = len(pending)
+    warned = False
+
+    while pending or running:
+        while pending and free:
+            job, k = pending.pop(0)
+            cpu = free.pop(0)
+            if cache == "warm":
+                warm_cache(job.model_dir)
+            elif cache == "cold" and not drop_caches() and not warned:
+                print("Warning: cannot drop the page cache (not root), runs start with a warm cache.",
+                      file=sys.stderr)
+                warned = True
+            proc = subprocess.Popen(command(job, k), stdout=subprocess.DEVNULL, preexec_fn=_pin(cpu))
+            running[proc] = ((job, k), cpu, time.time())
+            print(f"[{total - len(pending)}/{total}] cpu {cpu} r{k} {job.describe()}")
+            sys.stdout.flush()
+
+        finished = [p for p in running if p.poll() is not None]
+        if not finished:
+            time.sleep(poll_sec)
+            continue
+        for proc in finished:
+            (job, k), cpu, start = running.pop(proc)
+            free.append(cpu)
+            outcome = "done" if proc.returncode == 0 else "failed"
+            counts[outcome] += 1
+            if outcome == "failed":
+                print(f"  failed r{k} {job.describe()} (exit {proc.returncode})")
+    return counts
@@ -0,0 +1,126 @@
+# campaign/scheduler.py
+"""
+Longest-first packing of campaign jobs on the local cores under a memory budget.
+
+A job holds one core and reserves its predicted memory (with a margin, capped
+by the per-job limit) until it ends. Whenever a core is free, the longest
+pending job whose reservation fits in the remaining budget is started; a job
+whose reservation exceeds the whole budget runs alone. Starting the long jobs
+(typically the timeouts) first keeps them off the end of the campaign.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .costmodel import Prediction
+from .jobs import Job
+
+# reserved memory = predicted memory * MEM_MARGIN
+MEM_MARGIN = 1.25
+
+Planned = Tuple[Job, Prediction]
+
+
+def reservation(pred: Prediction, mem_limit_kb: Optional[float]) -> float:
+    mem = pred.mem_kb * MEM_MARGIN
+    return min(mem, mem_limit_kb) if mem_limit_kb else mem
+
+
+def longest_first(planned: List[Planned]) -> List[Planned]:
+    """Pending order: decreasing predicted time, then decreasing memory."""
+    return sorted(planned, key=lambda jp: (-jp[1].seconds, -jp[1].mem_kb, jp[0].describe()))
+
+
+def _pick(pending: List[Planned], free_mem: float, running: int,
+          mem_limit_kb: Optional[float], budget_kb: float) -> Optional[int]:
+    """Index of the first pending job that fits, or None."""
+    for i, (_, pred) in enumerate(pending):
+        need = reservation(pred, mem_limit_kb)
+        if need <= free_mem or (running == 0 and need > budget_kb):
+            return i
+    return None
+
+
+def simulate(planned: List[Planned], cores: int, budget_kb: float,
+             mem_limit_kb: Optional[float]) -> float:
+    """Predicted makespan (seconds) of running planned in the given order."""
+    if cores < 1:
+        raise ValueError(f"at least one core is needed, got {cores}")
+    pending = list(planned)
+    running: List[Tuple[float, float]] = []  # (end time, reserved mem)
+    now = 0.0
+    free_mem = budget_kb
+    while pending or running:
+        while pending and len(running) < cores:
+            i = _pick(pending, free_mem, len(running), mem_limit_kb, budget_kb)
+            if i is None:
+                break
+            _, pred = pending.pop(i)
+            need = reservation(pred, mem_limit_kb)
+            running.append((now + pred.seconds, need))
+            free_mem -= need
+        running.sort()
+        end, need = running.pop(0)
+        now = end
+        free_mem += need
+    return now
+
+
+def run_jobs(
+    planned: List[Planned],
+    cores: int,
+    budget_kb: float,
+    mem_limit_kb: Optional[float],
+    command: Callable[[Job], List[str]],
+    poll_sec: float = 0.5
+) -> Dict[str, int]:
+    """
+    Run the jobs in the planned order, at most cores at a time and within the
+    memory budget. Returns a count of jobs per outcome (done, failed).
+    """
+    if cores < 1:
+        raise ValueError(f"at least one core is needed, got {cores}")
+    pending = list(planned)
+    running: Dict[subprocess.Popen, Tuple[Job, Prediction, float, float]] = {}
+    free_mem = budget_kb
+    counts = {"done": 0, "failed": 0}
+    total = len(pending)
+
+    while pending or running:
+        while pending and len(running) < cores:
+            i = _pick(pending, free_mem, len(running), mem_limit_kb, budget_kb)
+            if i is None:
+                break
+            job, pred = pending.pop(i)
+            need = reservation(pred, mem_limit_kb)
+            proc = subprocess.Popen(command(job), stdout=subprocess.DEVNULL)
+            running[proc] = (job, pred, need, time.time())
+            free_mem -= need
+            print(f"[{total - len(pending)}/{total}] start {job.describe()} "
+                  f"(predicted {pred.seconds:.0f}s, {pred.mem_kb / 1024:.0f}MB, {pred.source})")
+            sys.stdout.flush()
+
+        finished = [p for p in running if p.poll() is not None]
+        if not finished:
+            time.sleep(poll_sec)
+            continue
+        for proc in finished:
+            job, pred, need, start = running.pop(proc)
+            free_mem += need
+            outcome = "done" if proc.returncode == 0 else "failed"
+            counts[outcome] += 1
+            print(f"  {outcome} {job.describe()} in {time.time() - start:.0f}s")
+    return counts
+
+
+def runner_command(root: str, mem: str, timeout_sec: int, solution: bool) -> Callable[[Job], List[str]]:
+    """Command line of a job: runners/run_job.sh, which wraps runners/run_<tool>.sh."""
+    script = os.path.join(root, "runners", "run_job.sh")
+
+    def command(job: Job) -> List[str]:
+        return [script, job.mode, job.tool, job.model_dir.rstrip("/") + "/", job.flags,
+                mem, str(timeout_sec), "true" if solution else "false"]
+    return command
@@ -0,0 +1,258 @@
+# campaign/subset.py
+"""
+Representative subsets of the models, for short regression campaigns.
+
+Models are described by the rows of a past campaign (invar.csv): their size
+(CardP + CardT + CardA), the number of invariants found (NbPInv + NbTInv, or
+NBP + NBT in older CSVs; reported with the selection, not stratified on), and
+for each run (tool and Examination) the time spent and the status. They are
+grouped into strata by
+  - cost : quantile bin of the summed time of all tools on the model, i.e.
+           of what the model costs a campaign;
+  - failures : the classes of failure seen on the model (TO, MEM, OF, ERR),
+           or OK when every run solved it; with per_tool, which run failed how.
+Every stratum gets at least one model (largest strata first) while K allows,
+half of the rest in proportion to the stratum sizes, which keeps the failure
+rates, and half in proportion to the stratum size times the standard
+deviation of the cost in the stratum (Neyman allocation), which covers the
+few costly models that make most of the campaign time. Inside a stratum,
+models sorted by cost and size are taken at evenly spaced ranks, so the
+sample keeps the spread of times and sizes of its stratum.
+
+Each selected model stands for weight = stratum size / models taken in the
+stratum; weighted sums and means over the subset estimate those of the full
+campaign (see aggregates).
+"""
+
+import csv
+import math
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+FAILURE_CLASSES = ("TO", "MEM", "OF", "ERR")
+
+# Status of logs2csvpar.pl / collectCSV.py (logs2csv.pl appends _OF on an
+# arithmetic overflow) -> class
+STATUS_CLASSES = {
+    "OK": "OK",
+    "TO": "TO",             # killed by the timeout
+    "MOVF": "MEM",          # killed by signal 9: out of memory
+    "OF": "OF",             # arithmetic overflow in the tool
+    "OK_OF": "OF",          # finished, but the result overflowed
+    "TO_OF": "TO",
+    "MOVF_OF": "MEM",
+}
+
+
+def status_class(status: str) -> str:
+    """OK, TO, MEM (out of memory), OF (overflow) or ERR (anything else, including UNK)."""
+    return STATUS_CLASSES.get(status.strip(), "ERR")
+
+
+def _int(text: Optional[str]) -> int:
+    try:
+        return int(float(text))
+    except (TypeError, ValueError):
+        return -1
+
+
+class Run(NamedTuple):
+    ms: int             # time spent (TotalTime for timeouts)
+    mem_kb: int
+    status: str         # status class
+    invariants: int     # NbPInv + NbTInv (NBP + NBT), -1 if unknown
+
+
+class ModelFeatures(NamedTuple):
+    model: str
+    size: int
+    runs: Dict[str, Run]    # run key (see run_key) -> run
+
+    def cost_ms(self) -> int:
+        return sum(max(r.ms, 0) for r in self.runs.values())
+
+    def invariants(self) -> int:
+        return max((r.invariants for r in self.runs.values()), default=-1)
+
+    def failures(self, per_tool: bool = False) -> str:
+        if per_tool:
+            failed = [f"{tool}:{r.status}" for tool, r in sorted(self.runs.items()) if r.status != "OK"]
+        else:
+            classes = {r.status for r in self.runs.values()}
+            failed = [c for c in FAILURE_CLASSES if c in classes]
+        return "+".join(failed) or "OK"
+
+
+def run_key(tool: str, examination: str) -> str:
+    """'tool/EXAMINATION', or the tool alone for CSVs without an Examination."""
+    return f"{tool}/{examination}" if examination else tool
+
+
+def _invariant_count(row: Dict[str, str]) -> int:
+    """NbPInv + NbTInv (NBP + NBT in older CSVs), -1 if neither is known."""
+    for p_col, t_col in (("NbPInv", "NbTInv"), ("NBP", "NBT")):
+        if p_col in row or t_col in row:
+            nbp, nbt = _int(row.get(p_col)), _int(row.get(t_col))
+            return max(nbp, 0) + max(nbt, 0) if nbp >= 0 or nbt >= 0 else -1
+    return -1
+
+
+def load_runs(path: str, examination: Optional[str] = None) -> Dict[str, ModelFeatures]:
+    """
+    Per model features of a campaign CSV (collectCSV.py or logs2csvpar.pl format).
+    Runs are keyed by tool and Examination, by tool alone when examination
+    selects the rows of one Examination.
+    """
+    models: Dict[str, ModelFeatures] = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if examination and row.get("Examination", examination) != examination:
+                continue
+            model, tool = row.get("Model", ""), row.get("Tool", "")
+            if not model or not tool:
+                continue
+            status = status_class(row.get("Status", ""))
+            ms = _int(row.get("Time"))
+            if ms < 0 or status == "TO":
+                ms = max(ms, _int(row.get("TotalTime")))
+            invariants = _invariant_count(row)
+            size = sum(max(_int(row.get(c)), 0) for c in ("CardP", "CardT", "CardA"))
+            features = models.setdefault(model, ModelFeatures(model, 0, {}))
+            if size > features.size:
+                features = models[model] = features._replace(size=size)
+            key = tool if examination else run_key(tool, row.get("Examination", ""))
+            features.runs[key] = Run(ms, _int(row.get("Mem")), status, invariants)
+    return models
+
+
+def _cost_bins(models: List[ModelFeatures], nb_bins: int) -> Dict[str, int]:
+    """Model -> quantile bin (0 .. nb_bins-1) of its cost."""
+    ordered = sorted(models, key=lambda m: m.cost_ms())
+    return {m.model: min(nb_bins - 1, rank * nb_bins // len(ordered)) for rank, m in enumerate(ordered)}
+
+
+def strata(models: Dict[str, ModelFeatures], time_bins: int = 4, per_tool: bool = False) -> Dict[str, List[str]]:
+    """Stratum name ('t<bin>/<failures>') -> models, sorted by cost and size."""
+    bins = _cost_bins(list(models.values()), max(1, time_bins)) if models else {}
+    groups: Dict[str, List[str]] = {}
+    for name, features in models.items():
+        groups.setdefault(f"t{bins[name]}/{features.failures(per_tool)}", []).append(name)
+    for names in groups.values():
+        names.sort(key=lambda n: (models[n].cost_ms(), models[n].size, n))
+    return groups
+
+
+def allocate(sizes: Dict[str, int], k: int, spreads: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+    """
+    Models per stratum: one each for the largest strata, then the rest in
+    proportion to size * spread (Neyman allocation; size only without spreads),
+    rounded by largest remainder.
+    """
+    alloc = {name: 0 for name in sizes}
+    for name in sorted(sizes, key=lambda n: (-sizes[n], n))[:k]:
+        alloc[name] = 1
+    left = k - sum(alloc.values())
+    while left > 0:
+        shares = {n: (sizes[n] - alloc[n]) * (spreads[n] if spreads else 1.0) for n in sizes if alloc[n] < sizes[n]}
+        total = sum(shares.values())
+        if not shares:
+            break
+        if total == 0:
+            shares = {n: float(sizes[n] - alloc[n]) for n in shares}
+            total = sum(shares.values())
+        quotas = {n: left * share / total for n, share in shares.items()}
+        given = 0
+        for n, q in quotas.items():
+            extra = min(int(q), sizes[n] - alloc[n])
+            alloc[n] += extra
+            given += extra
+        for n in sorted(quotas, key=lambda n: (-(quotas[n] - int(quotas[n])), n)):
+            if given >= left:
+                break
+            if alloc[n] < sizes[n]:
+                alloc[n] += 1
+                given += 1
+        left -= given
+    return alloc
+
+
+def spread(values: List[float]) -> float:
+    """Standard deviation of values."""
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
+def evenly_spaced(items: List[str], count: int) -> List[str]:
+    """count items at the middle of count equal slices of items."""
+    n = len(items)
+    return [items[min(n - 1, int((i + 0.5) * n / count))] for i in range(count)]
+
+
+class Selection(NamedTuple):
+    weights: Dict[str, float]       # selected model -> number of models it stands for
+    stratum: Dict[str, str]         # selected model -> its stratum
+
+
+def select(models: Dict[str, ModelFeatures], k: int, time_bins: int = 4, per_tool: bool = False) -> Selection:
+    groups = strata(models, time_bins, per_tool)
+    sizes = {name: len(names) for name, names in groups.items()}
+    spreads = {name: spread([models[n].cost_ms() for n in names]) for name, names in groups.items()}
+    # half proportional (failure rates), half Neyman (campaign time)
+    mean_spread = sum(sizes[n] * spreads[n] for n in groups) / len(models)
+    relative = {n: 1.0 + (spreads[n] / mean_spread if mean_spread else 0.0) for n in groups}
+    alloc = allocate(sizes, min(k, len(models)), relative)
+    weights: Dict[str, float] = {}
+    stratum: Dict[str, str] = {}
+    for name, names in sorted(groups.items()):
+        if alloc[name] == 0:
+            continue
+        for model in evenly_spaced(names, alloc[name]):
+            weights[model] = len(names) / alloc[name]
+            stratum[model] = name
+    return Selection(weights, stratum)
+
+
+class Aggregate(NamedTuple):
+    models: float       # number of models (weighted)
+    solved: float       # models with an OK status
+    hours: float        # time spent, timeouts included
+    par2_sec: float     # mean time of a model, failures counted as twice the largest time
+
+
+def aggregates(models: Dict[str, ModelFeatures], weights: Dict[str, float]) -> Dict[str, Aggregate]:
+    """
+    Per tool aggregates of the weighted models (weight 1 each for the full
+    campaign). The PAR2 penalty is taken over all models, so that subset and
+    full campaign use the same one.
+    """
+    penalties: Dict[str, int] = {}
+    for features in models.values():
+        for tool, run in features.runs.items():
+            penalties[tool] = max(penalties.get(tool, 0), 2 * run.ms)
+    per_tool: Dict[str, List[Tuple[float, Run]]] = {}
+    for model, weight in weights.items():
+        features = models.get(model)
+        if features is None:
+            continue
+        for tool, run in features.runs.items():
+            per_tool.setdefault(tool, []).append((weight, run))
+    result: Dict[str, Aggregate] = {}
+    for tool, runs in per_tool.items():
+        penalty = penalties[tool]
+        count = sum(w for w, _ in runs)
+        solved = sum(w for w, r in runs if r.status == "OK")
+        ms = sum(w * max(r.ms, 0) for w, r in runs)
+        par2 = sum(w * (max(r.ms, 0) if r.status == "OK" else penalty) for w, r in runs)
+        result[tool] = Aggregate(count, solved, ms / 3.6e6, par2 / count / 1000 if count else 0.0)
+    return result
+
+
+def full_weights(models: Iterable[str]) -> Dict[str, float]:
+    return {m: 1.0 for m in models}
+
+
+def relative_error(estimate: float, actual: float) -> float:
+    if actual == 0:
+        return 0.0 if estimate == 0 else math.inf
+    return (estimate - actual) / actual
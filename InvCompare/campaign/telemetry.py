@@ -0,0 +1,197 @@
+# campaign/telemetry.py
+"""
+Resource time series of a tool run (see monitor.py).
+
+A run is sampled at a fixed interval: memory (kB) and cumulated CPU time (ms)
+of the tool. When the tool runs in its own cgroup v2 (the systemd-run --scope
+of the memory limit), the cgroup's memory.current and cpu.stat are read, and
+its memory.peak gives the exact peak; otherwise the RSS and CPU times of the
+process tree are summed from /proc.
+
+A series is a small text file next to the log (<log>.mon):
+
+    # monitor 1 interval_ms=500 source=cgroup
+    # t_ms mem_kb cpu_ms
+    0 2048 0
+    500 180312 490
+    ...
+    # end wall_ms=61250 cpu_ms=118730 peak_kb=1843212
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+SERIES_SUFFIX = ".mon"
+SERIES_VERSION = 1
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_KB = (os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096) // 1024
+
+Sample = Tuple[int, int, int]   # (t_ms, mem_kb, cpu_ms)
+
+
+def series_path(log_path: str) -> str:
+    return log_path + SERIES_SUFFIX
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _cgroup_of(pid: int) -> Optional[str]:
+    """cgroup v2 folder of a process, None if not on cgroup v2."""
+    text = _read(f"/proc/{pid}/cgroup")
+    if text is None:
+        return None
+    for line in text.splitlines():
+        if line.startswith("0::"):
+            folder = os.path.join(CGROUP_ROOT, line[3:].lstrip("/"))
+            return folder if os.path.exists(os.path.join(folder, "memory.current")) else None
+    return None
+
+
+def _children() -> Dict[int, List[int]]:
+    """ppid -> pids, for all processes."""
+    tree: Dict[int, List[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        stat = _read(f"/proc/{name}/stat")
+        if stat is None:
+            continue
+        fields = stat[stat.rfind(")") + 2:].split()
+        tree.setdefault(int(fields[1]), []).append(int(name))
+    return tree
+
+
+def descendants(pid: int) -> List[int]:
+    """pid and all its live descendants."""
+    tree = _children()
+    result, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        result.append(p)
+        todo.extend(tree.get(p, []))
+    return result
+
+
+class Sampler:
+    """Samples a process tree, switching to the tool's cgroup once it appears."""
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.own_cgroup = _cgroup_of(os.getpid())
+        self.cgroup: Optional[str] = None
+        self.peak_kb = 0
+        self._last: Tuple[int, int] = (0, 0)
+
+    @property
+    def source(self) -> str:
+        return "cgroup" if self.cgroup else "proc"
+
+    def _find_cgroup(self, pids: List[int]) -> None:
+        # the systemd-run --scope moves the tool out of our own cgroup
+        for p in pids:
+            cg = _cgroup_of(p)
+            if cg and cg != self.own_cgroup:
+                self.cgroup = cg
+                return
+
+    def _sample_cgroup(self) -> Optional[Tuple[int, int]]:
+        current = _read(os.path.join(self.cgroup, "memory.current"))
+        stat = _read(os.path.join(self.cgroup, "cpu.stat"))
+        if current is None or stat is None:
+            return None  # scope gone: the tool has ended
+        cpu_us = 0
+        for line in stat.splitlines():
+            if line.startswith("usage_usec "):
+                cpu_us = int(line.split()[1])
+        peak = _read(os.path.join(self.cgroup, "memory.peak"))
+        if peak and peak.strip().isdigit():
+            self.peak_kb = max(self.peak_kb, int(peak) // 1024)
+        return (int(current) // 1024, cpu_us // 1000)
+
+    @staticmethod
+    def _sample_proc(pids: List[int]) -> Tuple[int, int]:
+        mem_kb = cpu_ticks = 0
+        for p in pids:
+            statm = _read(f"/proc/{p}/statm")
+            stat = _read(f"/proc/{p}/stat")
+            if statm is None or stat is None:
+                continue
+            mem_kb += int(statm.split()[1]) * _PAGE_KB
+            fields = stat[stat.rfind(")") + 2:].split()
+            # utime, stime, and cutime, cstime of the reaped children
+            cpu_ticks += sum(int(x) for x in fields[11:15])
+        return (mem_kb, cpu_ticks * 1000 // _CLK_TCK)
+
+    def sample(self) -> Tuple[int, int]:
+        """(mem_kb, cpu_ms) now."""
+        pids = descendants(self.pid)
+        if self.cgroup is None:
+            self._find_cgroup(pids)
+        value = self._sample_cgroup() if self.cgroup else None
+        if value is None:
+            value = self._sample_proc(pids)
+            # processes may have exited since the last sample: CPU time never decreases
+            value = (value[0], max(value[1], self._last[1]))
+        self._last = value
+        self.peak_kb = max(self.peak_kb, value[0])
+        return value
+
+
+def write_series(path: str, samples: List[Sample], interval_ms: int, source: str,
+                 wall_ms: int, cpu_ms: int, peak_kb: int) -> None:
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        f.write(f"# monitor {SERIES_VERSION} interval_ms={interval_ms} source={source}\n")
+        f.write("# t_ms mem_kb cpu_ms\n")
+        for t, mem, cpu in samples:
+            f.write(f"{t} {mem} {cpu}\n")
+        f.write(f"# end wall_ms={wall_ms} cpu_ms={cpu_ms} peak_kb={peak_kb}\n")
+    os.replace(tmp, path)
+
+
+def read_series(path: str) -> Tuple[List[Sample], Dict[str, str]]:
+    """Samples and header/trailer attributes of a series file."""
+    samples: List[Sample] = []
+    attrs: Dict[str, str] = {}
+    with open(path) as f:
+        for line in f:
+            if line.startswith("#"):
+                for word in line[1:].split():
+                    key, sep, value = word.partition("=")
+                    if sep:
+                        attrs[key] = value
+                continue
+            parts = line.split()
+            if len(parts) == 3:
+                samples.append((int(parts[0]), int(parts[1]), int(parts[2])))
+    return (samples, attrs)
+
+
+def series_summary(path: str) -> Optional[Dict[str, float]]:
+    """
+    Monitor columns of a run: MonPeakMem (kB), MonParallelism (CPU time over
+    wall time) and MonTimeToPeak (ms from the start to the largest sample).
+    None if the series is missing or empty.
+    """
+    try:
+        samples, attrs = read_series(path)
+    except (OSError, ValueError):
+        return None
+    if not samples:
+        return None
+    top = max(samples, key=lambda s: s[1])
+    wall_ms = int(attrs.get("wall_ms", samples[-1][0]))
+    cpu_ms = int(attrs.get("cpu_ms", samples[-1][2]))
+    return {
+        "MonPeakMem": max(int(attrs.get("peak_kb", 0)), top[1]),
+        "MonParallelism": round(cpu_ms / wall_ms, 2) if wall_ms > 0 else -1,
+        "MonTimeToPeak": top[0],
+    }
@@ -0,0 +1,123 @@
+# campaign/timeline.py
+"""
+Intervals of a campaign event log (see events.py): Chrome/Perfetto trace
+export and per-node utilization.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class Interval(NamedTuple):
+    host: str
+    pid: int
+    slot: str
+    phase: str
+    model: str
+    tool: str
+    mode: str
+    start: float
+    end: float
+    rc: Optional[int]     # None: no end event (killed, or still running)
+
+
+def intervals(events: List[dict]) -> List[Interval]:
+    """
+    Pair begin and end events of the same process and task. Unmatched begins
+    end at the last event of their host.
+    """
+    open_: Dict[Tuple, List[dict]] = defaultdict(list)
+    last_ts: Dict[str, float] = {}
+    result: List[Interval] = []
+    for e in events:
+        key = (e.get("host", ""), e.get("pid", 0), e.get("phase", ""), e.get("model", ""),
+               e.get("tool", ""), e.get("mode", ""))
+        last_ts[key[0]] = max(last_ts.get(key[0], 0.0), e.get("ts", 0.0))
+        if e.get("ev") == "B":
+            open_[key].append(e)
+        elif e.get("ev") == "E" and open_[key]:
+            b = open_[key].pop()
+            result.append(Interval(key[0], key[1], str(b.get("slot", "")), key[2], key[3], key[4], key[5],
+                                   b["ts"], e["ts"], e.get("rc")))
+    for key, begins in open_.items():
+        for b in begins:
+            result.append(Interval(key[0], key[1], str(b.get("slot", "")), key[2], key[3], key[4], key[5],
+                                   b["ts"], last_ts[key[0]], None))
+    result.sort(key=lambda i: (i.start, i.end))
+    return result
+
+
+def assign_lanes(items: List[Interval]) -> Dict[Interval, int]:
+    """
+    Lane of each interval within its host: its slot when known, else the
+    smallest lane free at its start (a run and the collection it starts may
+    overlap: nested intervals of the same process share its lane).
+    """
+    lanes: Dict[Interval, int] = {}
+    by_host: Dict[str, List[Interval]] = defaultdict(list)
+    for item in items:
+        by_host[item.host].append(item)
+    for host_items in by_host.values():
+        busy: List[Tuple[float, int]] = []   # (end, lane) of the running intervals
+        pid_lane: Dict[int, Tuple[float, int]] = {}
+        for item in sorted(host_items, key=lambda i: (i.start, -i.end)):
+            if item.slot.isdigit():
+                lanes[item] = int(item.slot)
+                continue
+            busy = [(end, lane) for end, lane in busy if end > item.start]
+            outer = pid_lane.get(item.pid)
+            if outer and outer[0] >= item.end:
+                lanes[item] = outer[1]
+                continue
+            taken = {lane for _, lane in busy}
+            lane = next(n for n in range(len(taken) + 1) if n not in taken)
+            busy.append((item.end, lane))
+            pid_lane[item.pid] = (item.end, lane)
+            lanes[item] = lane
+    return lanes
+
+
+def chrome_trace(items: List[Interval]) -> dict:
+    """Trace-event JSON (chrome://tracing, ui.perfetto.dev): one process per host, one thread per lane."""
+    lanes = assign_lanes(items)
+    hosts = sorted({i.host for i in items})
+    host_pid = {h: n + 1 for n, h in enumerate(hosts)}
+    t0 = min((i.start for i in items), default=0.0)
+    trace: List[dict] = [
+        {"name": "process_name", "ph": "M", "pid": host_pid[h], "args": {"name": h}} for h in hosts
+    ]
+    for item in items:
+        name = f"{item.phase} {item.tool} {item.model}".strip()
+        trace.append({
+            "name": name, "cat": item.phase, "ph": "X",
+            "ts": round((item.start - t0) * 1e6), "dur": max(1, round((item.end - item.start) * 1e6)),
+            "pid": host_pid[item.host], "tid": lanes[item],
+            "args": {"model": item.model, "tool": item.tool, "mode": item.mode, "pid": item.pid,
+                     "rc": item.rc if item.rc is not None else "unfinished"},
+        })
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def utilization(items: List[Interval], bin_sec: float, phases: Optional[List[str]] = None
+                ) -> Dict[str, List[float]]:
+    """
+    Per host, the average number of busy lanes in each time bin since the
+    first event of the campaign. Only top-level work is counted: intervals of
+    the given phases (default: all).
+    """
+    selected = [i for i in items if phases is None or i.phase in phases]
+    if not selected:
+        return {}
+    t0 = min(i.start for i in selected)
+    t1 = max(i.end for i in selected)
+    nbins = max(1, int((t1 - t0) // bin_sec) + 1)
+    busy: Dict[str, List[float]] = defaultdict(lambda: [0.0] * nbins)
+    for item in selected:
+        b = int((item.start - t0) // bin_sec)
+        t = item.start
+        while t < item.end and b < nbins:
+            bin_end = t0 + (b + 1) * bin_sec
+            busy[item.host][b] += min(item.end, bin_end) - t
+            t = bin_end
+            b += 1
+    return {host: [v / bin_sec for v in values] for host, values in busy.items()}
@@ -0,0 +1,270 @@
+# campaign/workqueue.py
+"""
+Work queue on a shared filesystem, for workers on any number of nodes.
+
+Each task is a small JSON file that moves between state folders by atomic
+rename (reliable on NFS, unlike the file locks SQLite would need):
+
+    pending/<id>.json  --claim-->  claimed/<id>.json  --finish-->  done/<id>.json
+                                          |                    \\-> failed/<id>.json
+                                          \\--lease expired / retry--> pending/<id>.json
+
+Only one worker can win the rename of a pending task, so a successful rename
+is the claim. A claimed task is leased: the claim touches the file before the
+rename (a rename keeps the mtime, so the task never sits in claimed/ with the
+age it had in pending/) and writes a lease token of its own in it, the worker
+refreshes the file's mtime while the task runs, and any worker may put back a
+task whose mtime is older than the lease duration (the worker or its node
+died). A worker only moves a claimed task on when the file still holds its
+token, so a task whose lease was taken over is left to its new owner. Times are compared with
+the mtime of a freshly touched probe file, i.e. the file server clock, so
+clock skews between nodes do not expire leases early.
+
+A task file that cannot be read as a task is moved to failed/ as is, with a
+warning, so that it is neither lost nor claimed again.
+
+Task ids start with a zero-padded priority: workers take the smallest ids first.
+"""
+
+import hashlib
+import json
+import os
+import random
+import secrets
+import socket
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+STATES = ("pending", "claimed", "done", "failed")
+
+DEFAULT_PRIORITY = 50000000
+MAX_PRIORITY = 99999999
+
+
+def task_id(argv: List[str], priority: int = DEFAULT_PRIORITY) -> str:
+    """Deterministic id of a command: priority prefix + hash of the command line."""
+    digest = hashlib.blake2b("\0".join(argv).encode("utf-8"), digest_size=8).hexdigest()
+    return f"{max(0, min(priority, MAX_PRIORITY)):08d}-{digest}"
+
+
+def _write_json(path: str, data: dict) -> None:
+    """Write a JSON file atomically (unique temp name, then rename)."""
+    tmp = f"{path}.tmp.{socket.gethostname()}.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_task(task: Optional[dict]) -> bool:
+    return isinstance(task, dict) and all(k in task for k in ("id", "attempts", "max_attempts", "history"))
+
+
+class WorkQueue:
+    """A queue folder; see the module documentation for its layout."""
+
+    def __init__(self, root: str, lease_sec: float = 600.0) -> None:
+        self.root = root
+        self.lease_sec = lease_sec
+        self.host = socket.gethostname()
+        self._known: Optional[set] = None  # command digests in the queue, loaded on first add
+
+    def _path(self, state: str, tid: str = "") -> str:
+        return os.path.join(self.root, state, f"{tid}.json" if tid else "")
+
+    def init(self) -> None:
+        for state in STATES + ("output",):
+            os.makedirs(os.path.join(self.root, state), exist_ok=True)
+
+    def ids(self, state: str) -> List[str]:
+        try:
+            names = os.listdir(self._path(state))
+        except FileNotFoundError:
+            return []
+        return sorted(n[:-len(".json")] for n in names if n.endswith(".json"))
+
+    def counts(self) -> Dict[str, int]:
+        return {state: len(self.ids(state)) for state in STATES}
+
+    def exists(self, tid: str) -> bool:
+        """True if the command of tid is in the queue, in any state and with any priority."""
+        if self._known is None:
+            self._known = {t.split("-", 1)[1] for state in STATES for t in self.ids(state)}
+        return tid.split("-", 1)[1] in self._known
+
+    # --- producers ---
+
+    def add(self, kind: str, argv: List[str], cwd: str, priority: int = DEFAULT_PRIORITY,
+            output: Optional[str] = None, max_attempts: int = 3) -> Optional[str]:
+        """
+        Add a task running argv in cwd (stdout/stderr to output, default
+        output/<id>.out in the queue). Returns its id, or None if the same
+        command is already in the queue, in any state.
+        """
+        tid = task_id(argv, priority)
+        if self.exists(tid):
+            return None
+        task = {
+            "id": tid, "kind": kind, "argv": argv, "cwd": cwd,
+            "output": output or os.path.join(self.root, "output", f"{tid}.out"),
+            "attempts": 0, "max_attempts": max_attempts, "history": [],
+        }
+        _write_json(self._path("pending", tid), task)
+        self._known.add(tid.split("-", 1)[1])
+        return tid
+
+    # --- workers ---
+
+    def server_now(self) -> float:
+        """Current time of the file server: mtime of a freshly written probe file."""
+        probe = os.path.join(self.root, f".clock.{self.host}.{os.getpid()}")
+        with open(probe, "w") as f:
+            f.write("")
+        now = os.stat(probe).st_mtime
+        os.remove(probe)
+        return now
+
+    def claim(self, candidates: int = 16) -> Optional[dict]:
+        """
+        Claim one pending task, by renaming it to claimed/. Tries the highest
+        priority ones first, in random order among the first candidates to
+        limit collisions between workers. None if nothing is pending.
+        """
+        while True:
+            pending = self.ids("pending")
+            if not pending:
+                return None
+            head = pending[:candidates]
+            random.shuffle(head)
+            for tid in head:
+                try:
+                    # Fresh mtime first: the rename keeps it, so the lease starts with the claim
+                    os.utime(self._path("pending", tid))
+                    os.rename(self._path("pending", tid), self._path("claimed", tid))
+                except FileNotFoundError:
+                    continue  # claimed by another worker
+                task = _read_json(self._path("claimed", tid))
+                if not _is_task(task):
+                    self._set_aside(self._path("claimed", tid), tid)
+                    continue
+                task["attempts"] += 1
+                task["lease"] = f"{self.host}.{os.getpid()}.{secrets.token_hex(8)}"
+                task["history"].append({"host": self.host, "pid": os.getpid(), "start": time.time()})
+                _write_json(self._path("claimed", tid), task)
+                return task
+
+    def _set_aside(self, path: str, tid: str) -> None:
+        """Move an unreadable task file to failed/, as is, rather than lose it."""
+        try:
+            os.replace(path, self._path("failed", tid))
+        except FileNotFoundError:
+            return
+        print(f"Warning: unreadable task {tid}, moved to {self._path('failed', tid)}", file=sys.stderr)
+
+    def owns(self, task: dict, path: Optional[str] = None) -> bool:
+        """True if the claimed file of task (or path) still holds the lease of task."""
+        current = _read_json(path or self._path("claimed", task["id"]))
+        return current is not None and current.get("lease") == task.get("lease")
+
+    def heartbeat(self, task: dict) -> bool:
+        """Renew the lease of a claimed task. False if the lease was lost."""
+        if not self.owns(task):
+            return False
+        try:
+            os.utime(self._path("claimed", task["id"]))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _release(self, task: dict) -> bool:
+        """
+        Take a claimed task out of claimed/ if its lease is still ours.
+        The file is renamed aside first, so that no requeue can move it meanwhile.
+        """
+        tid = task["id"]
+        claimed = self._path("claimed", tid)
+        if not self.owns(task, claimed):
+            return False
+        limbo = os.path.join(self.root, "claimed", f"{tid}.finish.{self.host}.{os.getpid()}")
+        try:
+            os.rename(claimed, limbo)
+        except FileNotFoundError:
+            return False
+        if not self.owns(task, limbo):
+            # expired and claimed again between the check and the rename: give it back
+            os.rename(limbo, claimed)
+            return False
+        os.remove(limbo)
+        return True
+
+    def finish(self, task: dict, returncode: int) -> str:
+        """
+        Record the outcome of a claimed task: done, or back to pending for
+        another attempt, or failed after max_attempts. Returns the new state,
+        or "lost" if the lease was taken over and the task is left as it is.
+        """
+        tid = task["id"]
+        task["history"][-1].update({"end": time.time(), "returncode": returncode})
+        if returncode == 0:
+            state = "done"
+        elif task["attempts"] < task["max_attempts"]:
+            state = "pending"
+        else:
+            state = "failed"
+        if self._release(task):
+            _write_json(self._path(state, tid), task)
+            return state
+        # Lease lost: the task was put back, and may be running elsewhere. Only
+        # a success is kept, and the pending copy dropped so it does not run again
+        if state != "done":
+            return "lost"
+        task["history"][-1]["lease_lost"] = True
+        _write_json(self._path(state, tid), task)
+        try:
+            os.remove(self._path("pending", tid))
+        except FileNotFoundError:
+            pass
+        return state
+
+    def expired(self) -> Iterator[Tuple[str, float]]:
+        """(id, age) of the claimed tasks whose lease has expired."""
+        now = self.server_now()
+        for tid in self.ids("claimed"):
+            try:
+                age = now - os.stat(self._path("claimed", tid)).st_mtime
+            except FileNotFoundError:
+                continue
+            if age > self.lease_sec:
+                yield (tid, age)
+
+    def requeue_expired(self) -> List[str]:
+        """Put back the tasks of dead workers (or fail them after max_attempts)."""
+        moved = []
+        for tid, _ in self.expired():
+            # rename first, so that only one worker requeues a given task
+            limbo = os.path.join(self.root, "claimed", f"{tid}.expired.{self.host}.{os.getpid()}")
+            try:
+                os.rename(self._path("claimed", tid), limbo)
+            except FileNotFoundError:
+                continue
+            if self.server_now() - os.stat(limbo).st_mtime <= self.lease_sec:
+                os.rename(limbo, self._path("claimed", tid))  # renewed meanwhile
+                continue
+            task = _read_json(limbo)
+            if not _is_task(task):
+                self._set_aside(limbo, tid)
+                continue
+            task["history"][-1]["expired"] = True
+            exhausted = task["attempts"] >= task["max_attempts"]
+            _write_json(self._path("failed" if exhausted else "pending", tid), task)
+            os.remove(limbo)
+            moved.append(tid)
+        return moved
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Keep every campaign in a columnar history store (see campaign/history.py)
+instead of overwriting invar.csv, and query it.
+
+  campaignHistory.py add invar.csv --campaign 2025-06-petri-nSSR [--store history] [--mode PFLOWS] [--replace]
+  campaignHistory.py list [--store history]
+  campaignHistory.py lookup --model Angiogenesis-PT-01 [--tool tina] [--campaign NAME ...]
+  campaignHistory.py summary [--campaign NAME ...] [--by-campaign]
+  campaignHistory.py remove --campaign NAME
+
+makeReport.py --history history and summary.py --history history read the
+store instead of a CSV. Needs duckdb (and pandas for the query results).
+"""
+
+import argparse
+import sys
+
+from campaign import history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Campaign history store.")
+    store = argparse.ArgumentParser(add_help=False)
+    store.add_argument("--store", default="history", help="Store folder (default: history).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("add", parents=[store], help="Add a campaign CSV to the store.")
+    p.add_argument("csv", help="Campaign CSV (collectCSV.py or logs2csvpar.pl format).")
+    p.add_argument("--campaign", required=True, help="Campaign name (letters, digits, ._+-).")
+    p.add_argument("--mode", default=None, help="Examination of CSVs without an Examination column.")
+    p.add_argument("--replace", action="store_true", help="Replace a campaign of the same name.")
+    sub.add_parser("list", parents=[store], help="List the campaigns and their number of rows.")
+    p = sub.add_parser("lookup", parents=[store], help="Rows of a model, across campaigns.")
+    p.add_argument("--model", action="append", required=True, help="Model name. Repeatable.")
+    p.add_argument("--tool", action="append", default=None, help="Tool name. Repeatable.")
+    p.add_argument("--campaign", action="append", default=None, help="Campaign name. Repeatable.")
+    p = sub.add_parser("summary", parents=[store], help="Status counts per tool.")
+    p.add_argument("--campaign", action="append", default=None, help="Campaign name. Repeatable.")
+    p.add_argument("--by-campaign", action="store_true", help="One line per campaign and tool.")
+    p = sub.add_parser("remove", parents=[store], help="Remove a campaign from the store.")
+    p.add_argument("--campaign", required=True, help="Campaign name.")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "add":
+            count = history.add_campaign(args.store, args.csv, args.campaign, args.mode, args.replace)
+            print(f"Added {count} rows of {args.csv} as campaign {args.campaign} to {args.store}")
+        elif args.command == "list":
+            names = history.campaigns(args.store)
+            if not names:
+                print(f"No campaign in {args.store}")
+                return
+            counts = history.status_summary(args.store, by_campaign=True).groupby("campaign")["tot"].sum()
+            for name in names:
+                print(f"{name:40s} {int(counts.get(name, 0)):8d} rows")
+        elif args.command == "lookup":
+            if not history.campaigns(args.store):
+                print(f"No campaign in {args.store}")
+                return
+            rows = history.select(args.store, args.campaign, tools=args.tool, models=args.model)
+            print(rows.sort_values(["Model", "Tool", "campaign"]).to_string(index=False))
+        elif args.command == "summary":
+            if not history.campaigns(args.store):
+                print(f"No campaign in {args.store}")
+                return
+            print(history.status_summary(args.store, args.campaign, args.by_campaign).to_string(index=False))
+        else:
+            history.remove_campaign(args.store, args.campaign)
+            print(f"Removed campaign {args.campaign} from {args.store}")
+    except (ValueError, OSError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
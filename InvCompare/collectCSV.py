@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel replacement for logs2csvpar.pl + collectCSV.sh.
+- Parses every tool log of the given logs_* folders with a process pool.
+- Keeps a manifest (size, mtime, hash and extracted row per log) in each folder,
+  so only new or changed logs (or solutions) are parsed again.
+- Reads solution metrics from the .sol.json sidecar written at collection time;
+  solutions collected before sidecars existed are read in memory (no temporary .sol)
+  and their sidecar is created on the way.
+- Writes one <type>.csv per folder, the merged invar.csv and, if pyarrow is
+  available, a Parquet copy.
+- Reads the monitor columns from the <log>.mon series written by monitor.py.
+- For folders with repeated runs (bench/r<k>/, see benchmark.py), also writes
+  <type>_bench.csv and the merged invar_bench.csv (min/median/MAD per job).
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import sys
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from parsing.parser_logstats import CSV_COLUMNS, parseLogStats, Value
+from parsing.parser_repeats import REPEAT_COLUMNS, parseRepeats
+from parsing.parser_solution import solutionMetrics
+from invariants.metrics import readSidecar, sidecarPath, writeSidecar
+from campaign.telemetry import series_path, series_summary
+
+MANIFEST_NAME = ".invar_manifest.json"
+MANIFEST_VERSION = 1
+
+# Parquet column types; other columns are strings.
+INT_COLUMNS = {"CardP", "CardT", "CardA", "NbPInv", "NbTInv", "NbDecomp", "SolSize",
+               "SolPosSize", "SolNbCoeff", "Mem", "SolOverflow", "MonPeakMem", "MonTimeToPeak"}
+FLOAT_COLUMNS = {"SolSizeKB", "SolMaxCoeff", "SolSumCoeff", "Time", "MonParallelism"}
+
+# CSV column -> sidecar key
+SOL_COLUMNS = {c: c for c in ["SolSizeKB", "SolSize", "SolPosSize", "SolMaxCoeff", "SolSumCoeff",
+                              "SolNbCoeff", "SolOverflow"]}
+SOL_COLUMNS["SolFingerprint"] = "Fingerprint"
+
+
+def file_state(path: str) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) of a file, or None if absent."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def content_hash(paths: List[str]) -> str:
+    """Hash of the concatenated content of the existing files among paths."""
+    h = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        if not os.path.exists(path):
+            h.update(b"\0absent\0")
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        h.update(b"\0eof\0")
+    return h.hexdigest()
+
+
+def extract_row(log_path: str) -> Optional[Dict[str, Value]]:
+    """Full CSV row of a log: log statistics plus solution metrics."""
+    row = parseLogStats(log_path)
+    if row is None:
+        return None
+    sol_path = f"{log_path}.sol.gz"
+    if not os.path.exists(sol_path):
+        sol_path = f"{log_path}.sol"
+    if os.path.exists(sol_path):
+        metrics = readSidecar(sol_path)
+        if metrics is None:
+            try:
+                computed = solutionMetrics(sol_path)
+                writeSidecar(sol_path, computed)
+                metrics = computed.toDict()
+            except (OSError, EOFError, ValueError) as e:
+                print(f"Warning: cannot read {sol_path}: {e}", file=sys.stderr)
+        if metrics is not None:
+            row.update({c: metrics[k] for c, k in SOL_COLUMNS.items()})
+    monitor = series_summary(series_path(log_path))
+    if monitor is not None:
+        row.update(monitor)
+    return row
+
+
+def solution_witness(log_path: str) -> str:
+    """
+    The file standing for the solution of a log in the manifest: its metrics
+    sidecar if present (small, derived from the immutable .sol.gz), else the .sol.gz.
+    """
+    sidecar = sidecarPath(f"{log_path}.sol.gz")
+    return sidecar if os.path.exists(sidecar) else f"{log_path}.sol.gz"
+
+
+def process_log(task: Tuple[str, Optional[dict]]) -> Tuple[str, dict]:
+    """
+    Worker: (log_path, previous manifest entry) -> (log_path, new entry).
+    The row is reused if the content hash did not change.
+    """
+    log_path, previous = task
+    paths = [log_path, solution_witness(log_path)]
+    digest = content_hash(paths)
+    if previous is not None and previous.get("hash") == digest:
+        row = previous["row"]
+    else:
+        try:
+            extracted = extract_row(log_path)
+        except Exception as e:
+            print(f"Warning: failed to parse {log_path}: {e}", file=sys.stderr)
+            extracted = None
+        row = [extracted[c] for c in CSV_COLUMNS] if extracted else None
+        if solution_witness(log_path) != paths[1]:  # sidecar created by extract_row
+            paths[1] = solution_witness(log_path)
+            digest = content_hash(paths)
+    entry = {
+        "log": file_state(paths[0]),
+        "sol": file_state(paths[1]),
+        "hash": digest,
+        "row": row,
+    }
+    return (log_path, entry)
+
+
+def load_manifest(folder: str) -> Dict[str, dict]:
+    path = os.path.join(folder, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION or data.get("columns") != CSV_COLUMNS:
+        return {}
+    return data.get("entries", {})
+
+
+def save_manifest(folder: str, entries: Dict[str, dict]) -> None:
+    path = os.path.join(folder, MANIFEST_NAME)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "columns": CSV_COLUMNS, "entries": entries}, f)
+    os.replace(tmp, path)
+
+
+def is_log_name(name: str) -> bool:
+    return name.endswith((".petri32", ".petri64", ".petri128", ".its", ".struct",
+                          ".tina", ".gspn", ".petrisage"))
+
+
+def extract_folder(folder: str, pool: Optional[Pool]) -> Tuple[List[list], int]:
+    """
+    Extract the rows of all logs in folder, re-parsing only what changed.
+    Returns (rows, number of logs parsed or re-hashed).
+    """
+    old = load_manifest(folder)
+    entries: Dict[str, dict] = {}
+    tasks: List[Tuple[str, Optional[dict]]] = []
+
+    for name in sorted(os.listdir(folder)):
+        if not is_log_name(name):
+            continue
+        log_path = os.path.join(folder, name)
+        previous = old.get(name)
+        if previous is not None:
+            unchanged = (tuple(previous["log"] or ()) == (file_state(log_path) or ()) and
+                         tuple(previous["sol"] or ()) == (file_state(solution_witness(log_path)) or ()))
+            if unchanged:
+                entries[name] = previous
+                continue
+        tasks.append((log_path, previous))
+
+    results = pool.imap_unordered(process_log, tasks, chunksize=8) if pool else map(process_log, tasks)
+    for log_path, entry in results:
+        entries[os.path.basename(log_path)] = entry
+
+    save_manifest(folder, entries)
+    rows = [e["row"] for e in entries.values() if e["row"] is not None]
+    return (rows, len(tasks))
+
+
+def format_value(column: str, value: Value) -> str:
+    """Format a value the way logs2csvpar.pl prints it."""
+    if column == "SolSizeKB" and isinstance(value, float):
+        return f"{value:.3f}"
+    if column in ("SolMaxCoeff", "SolSumCoeff") and isinstance(value, (int, float)) and value >= 10000:
+        return f"{float(value):.3e}"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def write_csv(path: str, rows: List[list], columns: List[str] = CSV_COLUMNS) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([format_value(c, v) for c, v in zip(columns, row)])
+
+
+def write_parquet(path: str, rows: List[list]) -> bool:
+    """Write rows as Parquet with typed columns. Returns False if pyarrow is missing."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("Warning: pyarrow not installed, skipping Parquet output.", file=sys.stderr)
+        return False
+
+    def convert(column: str, value: Value):
+        if column in INT_COLUMNS:
+            return value if isinstance(value, int) else None
+        if column in FLOAT_COLUMNS:
+            return float(value) if isinstance(value, (int, float)) else None
+        return str(value)
+
+    columns = {}
+    for i, c in enumerate(CSV_COLUMNS):
+        pa_type = pa.int64() if c in INT_COLUMNS else (pa.float64() if c in FLOAT_COLUMNS else pa.string())
+        values = [convert(c, row[i]) for row in rows]
+        if pa_type == pa.int64():
+            values = [v if v is None or -2**63 <= v < 2**63 else None for v in values]
+        columns[c] = pa.array(values, type=pa_type)
+    pq.write_table(pa.table(columns), path)
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build invar.csv from tool logs, incrementally and in parallel.")
+    parser.add_argument("folders", nargs="*", help="Log folders (default: all logs_* in the current directory).")
+    parser.add_argument("--output", default="invar.csv", help="Merged CSV output (default: invar.csv).")
+    parser.add_argument("--parquet", default=None,
+                        help="Parquet output (default: the --output name with a .parquet extension).")
+    parser.add_argument("--no-parquet", action="store_true", help="Do not write Parquet output.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    folders = args.folders or sorted(d for d in glob.glob("logs_*") if os.path.isdir(d))
+    if not folders:
+        print("Error: no log folders found.")
+        sys.exit(1)
+
+    all_rows: List[list] = []
+    bench_rows: List[list] = []
+    pool = Pool(processes=args.jobs) if args.jobs > 1 else None
+    try:
+        for folder in folders:
+            rows, parsed = extract_folder(folder, pool)
+            rows.sort(key=lambda r: (str(r[0]), str(r[1]), str(r[2])))
+            out_type = os.path.basename(os.path.normpath(folder))
+            if out_type.startswith("logs_"):
+                write_csv(f"{out_type[len('logs_'):]}.csv", rows)
+            print(f"{folder}: {len(rows)} rows, {parsed} logs (re)examined.")
+            all_rows.extend(rows)
+            repeats = [[r[c] for c in REPEAT_COLUMNS] for r in parseRepeats(folder)]
+            if repeats:
+                if out_type.startswith("logs_"):
+                    write_csv(f"{out_type[len('logs_'):]}_bench.csv", repeats, REPEAT_COLUMNS)
+                print(f"{folder}: {len(repeats)} jobs with repeated runs.")
+                bench_rows.extend(repeats)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    write_csv(args.output, all_rows)
+    print(f"Wrote {len(all_rows)} rows to {args.output}")
+    if bench_rows:
+        bench_path = os.path.splitext(args.output)[0] + "_bench.csv"
+        write_csv(bench_path, bench_rows, REPEAT_COLUMNS)
+        print(f"Wrote {len(bench_rows)} rows to {bench_path}")
+    if not args.no_parquet:
+        parquet_path = args.parquet or os.path.splitext(args.output)[0] + ".parquet"
+        if write_parquet(parquet_path, all_rows):
+            print(f"Wrote {parquet_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Build phases.csv, the long table of per-phase timings of every tool log
+(see parsing/parser_phases.py):
+
+  Model,Tool,Examination,Phase,Ms
+
+makeReport.py draws per-phase cactus plots and phase share breakdowns from it.
+
+Example:
+  python3 InvCompare/collectPhases.py logs_pflows logs_tflows --jobs 16
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+from multiprocessing import Pool
+from typing import Dict, List
+
+from parsing.parser_logstats import Value
+from parsing.parser_phases import PHASE_COLUMNS, parsePhases
+
+
+def phases_of(log_path: str) -> List[Dict[str, Value]]:
+    try:
+        return parsePhases(log_path)
+    except Exception as e:
+        print(f"Warning: failed to parse {log_path}: {e}", file=sys.stderr)
+        return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract per-phase timings of tool logs to a long CSV table.")
+    parser.add_argument("folders", nargs="*", help="Log folders (default: all logs_* in the current directory).")
+    parser.add_argument("--output", default="phases.csv", help="Output CSV (default: phases.csv).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    folders = args.folders or sorted(d for d in glob.glob("logs_*") if os.path.isdir(d))
+    if not folders:
+        print("Error: no log folders found.")
+        sys.exit(1)
+
+    logs = [os.path.join(folder, name) for folder in folders for name in sorted(os.listdir(folder))
+            if os.path.isfile(os.path.join(folder, name))]
+    if args.jobs > 1:
+        with Pool(processes=args.jobs) as pool:
+            results = pool.map(phases_of, logs, chunksize=16)
+    else:
+        results = [phases_of(log) for log in logs]
+
+    rows = [row for result in results for row in result]
+    rows.sort(key=lambda r: (str(r["Model"]), str(r["Tool"]), str(r["Examination"]), str(r["Phase"])))
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=PHASE_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote {len(rows)} phase rows from {len(logs)} files to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Build comparisons.csv and minimality.csv from the JSON-lines results that
+compare_sol.sh (<model>.comp.json) and test_minimality.sh (<file>.sol.min.json)
+write next to their text reports (see results.py), and print the models
+with a disagreement, the discrepancies per tool pair and the minimality
+cost per tool.
+
+  comparisons.csv: Model,A,B,Verdict,Method,UniqueA,UniqueB,Vars,ViolatedA,ViolatedB,Witnesses,Ms
+  minimality.csv:  Model,Solution,Tool,Verdict,Invariants,Redundant,CheckSatCalls,Ms
+
+Example:
+  python3 InvCompare/collectResults.py logs_pflows logs_tflows --jobs 16
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Tuple
+
+COMPARE_COLUMNS = ["Model", "A", "B", "Verdict", "Method", "UniqueA", "UniqueB", "Vars",
+                   "ViolatedA", "ViolatedB", "Witnesses", "Ms"]
+MINIMALITY_COLUMNS = ["Model", "Solution", "Tool", "Verdict", "Invariants", "Redundant", "CheckSatCalls", "Ms"]
+
+Row = Dict[str, object]
+
+
+def result_files(folder: str) -> Iterator[str]:
+    """The .comp.json and .sol.min.json files of a folder, in one directory scan."""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith((".comp.json", ".sol.min.json")) and entry.is_file():
+                yield entry.path
+
+
+def tool_of(model: str, name: str) -> str:
+    """Tool part of a solution name <model>.<tool>."""
+    return name[len(model) + 1:] if name.startswith(model + ".") else name
+
+
+def rows_of(path: str) -> Tuple[List[Row], List[Row]]:
+    """Comparison and minimality rows of one results file."""
+    compares: List[Row] = []
+    minimality: List[Row] = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                sizes = record.get("sizes", {})
+                if record["kind"] == "compare":
+                    nameA, nameB = record["names"]
+                    compares.append({
+                        "Model": record["model"], "A": tool_of(record["model"], nameA),
+                        "B": tool_of(record["model"], nameB), "Verdict": record["verdict"],
+                        "Method": record.get("method", ""), "UniqueA": sizes.get("uniqueA", 0),
+                        "UniqueB": sizes.get("uniqueB", 0), "Vars": sizes.get("vars", 0),
+                        "ViolatedA": len(record.get("violatedA", [])),
+                        "ViolatedB": len(record.get("violatedB", [])),
+                        "Witnesses": record.get("witnesses", 1 if record["verdict"] != "consistent" else 0),
+                        "Ms": record["ms"]})
+                elif record["kind"] == "minimality":
+                    # The tested file is a temporary copy: name the solution after the results file
+                    solution = os.path.basename(path)[:-len(".sol.min.json")]
+                    model = solution.split(".", 1)[0]
+                    minimality.append({
+                        "Model": model, "Solution": solution, "Tool": tool_of(model, solution),
+                        "Verdict": record["verdict"], "Invariants": sizes.get("invariants", 0),
+                        "Redundant": len(record.get("redundant", [])),
+                        "CheckSatCalls": record.get("check_sat_calls", 0), "Ms": record["ms"]})
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: failed to read {path}: {e}", file=sys.stderr)
+    return compares, minimality
+
+
+def write_csv(path: str, columns: List[str], rows: List[Row]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_report(compares: List[Row], minimality: List[Row], top: int) -> None:
+    disagreeing = sorted({str(r["Model"]) for r in compares if r["Verdict"] != "consistent"})
+    models = {r["Model"] for r in compares}
+    print(f"{len(disagreeing)} of {len(models)} compared models with a disagreement")
+    for model in disagreeing[:top]:
+        print(f"  {model}")
+    if len(disagreeing) > top:
+        print(f"  ... {len(disagreeing) - top} more")
+
+    pairs: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+    for r in compares:
+        counts = pairs[tuple(sorted((str(r["A"]), str(r["B"]))))]
+        counts[0] += 1
+        counts[1] += r["Verdict"] != "consistent"
+    if pairs:
+        print("\nDiscrepancies per tool pair:")
+        for (a, b), (total, bad) in sorted(pairs.items(), key=lambda item: (-item[1][1], item[0])):
+            print(f"  {a:>20s} / {b:<20s} {bad:6d} of {total:6d}")
+
+    tools: Dict[str, List[float]] = defaultdict(lambda: [0, 0, 0.0, 0])
+    for r in minimality:
+        stats = tools[str(r["Tool"])]
+        stats[0] += 1
+        stats[1] += r["Verdict"] == "redundant"
+        stats[2] += float(r["Ms"])
+        stats[3] += int(r["CheckSatCalls"])
+    if tools:
+        print("\nMinimality per tool:")
+        print(f"  {'Tool':20s} {'Files':>6s} {'Redundant':>9s} {'Mean ms':>10s} {'Check-sat':>10s}")
+        for tool, (files, redundant, ms, calls) in sorted(tools.items()):
+            print(f"  {tool:20s} {files:6d} {redundant:9d} {ms / files:10.1f} {calls:10d}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aggregate the JSON results of compare_sol.sh and test_minimality.sh.")
+    parser.add_argument("folders", nargs="*", help="Log folders (default: all logs_* in the current directory).")
+    parser.add_argument("--comparisons", default="comparisons.csv", help="Output CSV of compared pairs.")
+    parser.add_argument("--minimality", default="minimality.csv", help="Output CSV of minimality tests.")
+    parser.add_argument("--top", type=int, default=20, help="Number of disagreeing models listed (default: 20).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    folders = args.folders or sorted(d for d in glob.glob("logs_*") if os.path.isdir(d))
+    if not folders:
+        print("Error: no log folders found.")
+        sys.exit(1)
+
+    paths = [path for folder in folders for path in result_files(folder)]
+    compares: List[Row] = []
+    minimality: List[Row] = []
+    if args.jobs > 1 and len(paths) > 1:
+        with Pool(processes=args.jobs) as pool:
+            for c, m in pool.imap_unordered(rows_of, paths, chunksize=64):
+                compares.extend(c)
+                minimality.extend(m)
+    else:
+        for path in paths:
+            c, m = rows_of(path)
+            compares.extend(c)
+            minimality.extend(m)
+
+    compares.sort(key=lambda r: (str(r["Model"]), str(r["A"]), str(r["B"])))
+    minimality.sort(key=lambda r: (str(r["Model"]), str(r["Solution"])))
+    write_csv(args.comparisons, COMPARE_COLUMNS, compares)
+    write_csv(args.minimality, MINIMALITY_COLUMNS, minimality)
+    print(f"Wrote {len(compares)} comparisons to {args.comparisons} and {len(minimality)} minimality tests "
+          f"to {args.minimality} from {len(paths)} files\n")
+    print_report(compares, minimality, args.top)
+
+
+if __name__ == "__main__":
+    main()
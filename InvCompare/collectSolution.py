@@ -1,20 +1,42 @@
 #!/usr/bin/env python3
 import argparse
+import os
 import sys
 
 from solution.generic import create_solution
+from solution.batch import collect_batch
+from campaign.events import span
+from parsing.log_info import model_name
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Collect solutions from tool logs into .sol files.")
-    parser.add_argument("--tool", required=True, choices=["tina", "itstools", "petrispot", "greatspn", "petrisage"],
+    parser.add_argument("--tool", choices=["tina", "itstools", "petrispot", "greatspn", "petrisage"],
                         help="Tool name to process.")
-    parser.add_argument("--log", required=True, help="Path to the tool's log file.")
-    parser.add_argument("--model", required=True, help="Path to the model folder.")
-    parser.add_argument("--mode", required=True, choices=["PFLOWS", "PSEMIFLOWS", "TFLOWS", "TSEMIFLOWS"],
-                        help="Mode of invariant calculation.")
-    
+    parser.add_argument("--log", help="Path to the tool's log file.")
+    parser.add_argument("--model", help="Path to the model folder.")
+    parser.add_argument("--mode", choices=["PFLOWS", "PSEMIFLOWS", "TFLOWS", "TSEMIFLOWS"],
+                        help="Mode of invariant calculation (inferred from the log in --batch mode).")
+    parser.add_argument("--batch", nargs="+", metavar="SRC",
+                        help="Collect many logs in one process: log folders, log files, "
+                             "'-' (paths on stdin) or '@list' (paths in a file). "
+                             "Tool and mode are inferred; already collected logs are skipped.")
+    parser.add_argument("--models", default=os.environ.get("MODELDIR"),
+                        help="Folder containing one subfolder per model (--batch only, default $MODELDIR).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (--batch only).")
+    parser.add_argument("--binary", action="store_true",
+                        help="Also write the solution in compact binary format (.solb).")
+
     args = parser.parse_args()
-    create_solution(args.tool, args.log, args.model, args.mode)
+    if args.batch:
+        ok, skipped, errors = collect_batch(args.batch, args.mode, args.models, args.jobs, args.binary)
+        print(f"Collected {ok} solutions, skipped {skipped}, {errors} errors.")
+        sys.exit(1 if errors else 0)
+
+    if not (args.tool and args.log and args.model and args.mode):
+        parser.error("--tool, --log, --model and --mode are required unless --batch is used")
+    with span("collect", model_name(args.log), args.tool, args.mode):
+        create_solution(args.tool, args.log, args.model, args.mode, args.binary)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
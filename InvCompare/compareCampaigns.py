@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Regression gate between two campaigns: a baseline CSV (e.g. the committed
+invar.csv) and a new one (collectCSV.py or logs2csvpar.pl format), joined on
+(Model, Tool, Examination). See campaign/regression.py for the statistics.
+
+  compareCampaigns.py invar.csv invar_new.csv [--tools petrispot64,tina]
+      [--max-slowdown 1.05] [--alpha 0.05] [--max-new-failures 0] [--max-mem-ratio 1.10]
+      [--top 10] [--csv regression.csv]
+
+For each tool, prints the geometric mean speedup (base time / new time, > 1
+when the new campaign is faster) with its bootstrap confidence interval and
+the Wilcoxon signed-rank p-value, the status transitions, the memory ratio and
+the models with the worst slowdowns.
+
+Exits with status 1 if, for some tool:
+  - the new campaign is significantly slower (Wilcoxon p < --alpha) by more
+    than --max-slowdown (geometric mean of new / base times);
+  - more than --max-new-failures models solved by the baseline are not solved;
+  - the geometric mean of new / base memory exceeds --max-mem-ratio.
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+from typing import List
+
+from campaign.regression import ToolComparison, compare_tool, load_campaign
+
+
+def print_tool(name: str, c: ToolComparison, top: int, min_delta_ms: int) -> None:
+    print(f"\n== {name}: {c.pairs} pairs, {c.timed} solved by both")
+    if c.timed:
+        print(f"   speedup x{c.speedup:.3f} (95% CI x{c.ci[0]:.3f} .. x{c.ci[1]:.3f}), "
+              f"Wilcoxon n={c.test.n} z={c.test.z:+.2f} p={c.test.p:.3g}, memory x{c.mem_ratio:.3f}")
+    if c.transitions:
+        print("   transitions: " + ", ".join(f"{b}->{a} {n}" for (b, a), n in sorted(c.transitions.items())))
+    slow = [r for r in c.ratios if r[0] < 1 and r[3].ms - r[2].ms >= min_delta_ms][:top]
+    for ratio, key, b, a in slow:
+        print(f"   x{ratio:.3f} {b.ms:9d} ms -> {a.ms:9d} ms  {key[0]}{' ' + key[2] if key[2] else ''}")
+
+
+def failures(c: ToolComparison, args: argparse.Namespace) -> List[str]:
+    reasons = []
+    if c.timed and 1 / c.speedup > args.max_slowdown and c.test.p < args.alpha:
+        reasons.append(f"slower x{1 / c.speedup:.3f} (p={c.test.p:.3g})")
+    if c.new_failures() > args.max_new_failures:
+        reasons.append(f"{c.new_failures()} new failures")
+    if not math.isnan(c.mem_ratio) and c.mem_ratio > args.max_mem_ratio:
+        reasons.append(f"memory x{c.mem_ratio:.3f}")
+    return reasons
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Statistical performance regression gate between two campaigns.")
+    parser.add_argument("base", help="Baseline campaign CSV.")
+    parser.add_argument("new", help="New campaign CSV.")
+    parser.add_argument("--tools", default="", help="Comma separated tools to compare (default: all common tools).")
+    parser.add_argument("--floor-ms", type=int, default=50, help="Times below this are raised to it.")
+    parser.add_argument("--max-slowdown", type=float, default=1.05,
+                        help="Fail on a significant geometric mean slowdown above this factor.")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level of the Wilcoxon test.")
+    parser.add_argument("--max-new-failures", type=int, default=0,
+                        help="Fail if more models solved by the baseline are not solved (TO, MEM, OF, ERR).")
+    parser.add_argument("--max-mem-ratio", type=float, default=1.10,
+                        help="Fail if the geometric mean of new / base memory is above this.")
+    parser.add_argument("--resamples", type=int, default=2000, help="Bootstrap resamples.")
+    parser.add_argument("--seed", type=int, default=0, help="Bootstrap seed.")
+    parser.add_argument("--top", type=int, default=10, help="Worst slowdowns listed per tool.")
+    parser.add_argument("--min-delta-ms", type=int, default=1000,
+                        help="Only list slowdowns of at least this many ms.")
+    parser.add_argument("--csv", default="", help="Write the per tool statistics to this CSV.")
+    args = parser.parse_args()
+
+    for path in (args.base, args.new):
+        if not os.path.isfile(path):
+            parser.error(f"{path} not found")
+    base, base_names = load_campaign(args.base)
+    new, new_names = load_campaign(args.new)
+    tools = sorted(set(base_names) & set(new_names))
+    if args.tools:
+        wanted = [t.lower() for t in args.tools.split(",") if t]
+        missing = [t for t in wanted if t not in tools]
+        if missing:
+            parser.error(f"tool(s) not in both campaigns: {', '.join(missing)}")
+        tools = wanted
+    if not tools:
+        parser.error("no tool in common")
+
+    rng = random.Random(args.seed)
+    rejected = []
+    rows = []
+    for tool in tools:
+        c = compare_tool(tool, base, new, args.floor_ms, args.resamples, rng)
+        print_tool(base_names[tool], c, args.top, args.min_delta_ms)
+        reasons = failures(c, args)
+        if reasons:
+            rejected.append(f"{base_names[tool]}: {', '.join(reasons)}")
+        rows.append([base_names[tool], c.pairs, c.timed, f"{c.speedup:.4f}", f"{c.ci[0]:.4f}", f"{c.ci[1]:.4f}",
+                     f"{c.test.p:.4g}", c.new_failures(), c.fixed(), f"{c.mem_ratio:.4f}",
+                     "FAIL" if reasons else "PASS"])
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["Tool", "Pairs", "Timed", "Speedup", "CILow", "CIHigh", "WilcoxonP",
+                             "NewFailures", "Fixed", "MemRatio", "Gate"])
+            writer.writerows(rows)
+        print(f"\nWrote {args.csv}")
+
+    if rejected:
+        print("\nREGRESSION:")
+        for line in rejected:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regression.")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
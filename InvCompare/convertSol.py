@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Convert collected solutions (.sol / .sol.gz) to the compact binary format (.solb).
+Arguments are solution files or folders (all *.sol.gz and *.sol inside).
+Existing .solb files newer than their source are left untouched.
+"""
+
+import argparse
+import glob
+import os
+import sys
+from multiprocessing import Pool
+from typing import List, Tuple
+
+from parsing.parser_solution import parseSolFile
+from parsing.solbin import writeSolBin
+
+
+def solb_path(sol_path: str) -> str:
+    """X.sol.gz / X.sol -> X.solb"""
+    if sol_path.endswith(".gz"):
+        sol_path = sol_path[:-len(".gz")]
+    if sol_path.endswith(".sol"):
+        sol_path = sol_path[:-len(".sol")]
+    return f"{sol_path}.solb"
+
+
+def convert_one(task: Tuple[str, bool]) -> Tuple[str, str]:
+    """Worker: (sol_path, verify) -> (sol_path, status message)."""
+    sol_path, verify = task
+    out = solb_path(sol_path)
+    if os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(sol_path):
+        return (sol_path, "up to date")
+    try:
+        invariants = parseSolFile(sol_path, allowUnknown=True)
+        tmp = f"{out}.tmp{os.getpid()}"
+        digest = writeSolBin(tmp, invariants)
+        if verify and parseSolFile(tmp, allowUnknown=True) != invariants:
+            os.remove(tmp)
+            return (sol_path, "ERROR: round trip mismatch")
+        os.replace(tmp, out)
+    except Exception as e:
+        return (sol_path, f"ERROR: {e}")
+    return (sol_path, f"{len(invariants)} invariants, hash {digest}")
+
+
+def collect_sources(sources: List[str]) -> List[str]:
+    paths: List[str] = []
+    for src in sources:
+        if os.path.isdir(src):
+            paths.extend(sorted(glob.glob(os.path.join(src, "*.sol.gz"))))
+            paths.extend(sorted(p for p in glob.glob(os.path.join(src, "*.sol"))
+                                if not os.path.exists(f"{p}.gz")))
+        else:
+            paths.append(src)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert .sol / .sol.gz solutions to binary .solb files.")
+    parser.add_argument("sources", nargs="+", help="Solution files or folders.")
+    parser.add_argument("--verify", action="store_true", help="Reload each .solb and compare with the source.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    tasks = [(p, args.verify) for p in collect_sources(args.sources)]
+    errors = 0
+    with Pool(processes=max(1, args.jobs)) as pool:
+        for sol_path, msg in pool.imap_unordered(convert_one, tasks, chunksize=4):
+            if msg.startswith("ERROR"):
+                errors += 1
+            print(f"{sol_path}: {msg}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Common core of the invariant sets of a model.
+
+When most tools agree, comparing each pair of sets carries the invariants they
+all share into every formula. The core is the set of invariants present in
+every set, found in one hash pass; since
+    Xor(core and rA, core and rB) == core and Xor(rA, rB),
+the core is asserted once per model and each pair only compares the residuals,
+the invariants of each set outside the core.
+
+The core's equations also eliminate variables: a core equation with a unit
+coefficient defines that variable from the others, and substituting it in a
+residual gives an equivalent residual (given the core) that no longer uses it.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+from .invariant import Invariant
+from .varindex import VarIndex
+
+# A substitution larger than this many terms is not worth its pivot
+MAX_PIVOT_TERMS = 64
+
+
+def _substitute(row: Dict[str, int], const: int, pivots: List[Tuple[str, Dict[str, int], int]]) -> Tuple[Dict[str, int], int]:
+    """Eliminate the pivot variables from an equation row = const."""
+    for var, prow, pconst in pivots:
+        c = row.get(var)
+        if not c:
+            continue
+        row = dict(row)
+        del row[var]
+        for v, pc in prow.items():
+            nv = row.get(v, 0) - c * pc
+            if nv:
+                row[v] = nv
+            else:
+                row.pop(v, None)
+        const -= c * pconst
+    return row, const
+
+
+class CommonCore:
+    """
+    The invariants common to all sets of a model, the residual of each set,
+    and the eliminations defined by the core.
+    """
+
+    def __init__(self, invSets: Sequence[List[Invariant]]) -> None:
+        common = set(invSets[0]) if invSets else set()
+        for invs in invSets[1:]:
+            common.intersection_update(invs)
+        # core in the order of the first set, without duplicates
+        seen = set()
+        self.core: List[Invariant] = []
+        for inv in invSets[0] if invSets else []:
+            if inv in common and inv not in seen:
+                seen.add(inv)
+                self.core.append(inv)
+        self.residuals: List[List[Invariant]] = [[inv for inv in invs if inv not in common] for invs in invSets]
+        self.varIndex = VarIndex(sorted(set().union(*(inv.getUsedVarNames() for invs in invSets for inv in invs))))
+
+        # pivot rows, each reduced by the previous pivots, with a unit coefficient
+        # normalized to 1: var = pconst - sum(others), stored as var + others = pconst
+        self.pivots: List[Tuple[str, Dict[str, int], int]] = []
+        for inv in self.core:
+            row, const = _substitute(inv.varCoeffs, inv.const, self.pivots)
+            if len(row) > MAX_PIVOT_TERMS:
+                continue
+            var = next((v for v, c in sorted(row.items()) if c in (1, -1)), None)
+            if var is None:
+                continue
+            sign = row[var]
+            self.pivots.append((var, {v: c * sign for v, c in row.items() if v != var}, const * sign))
+
+    def eliminated(self) -> List[str]:
+        """The variables defined by the core."""
+        return [var for var, _, _ in self.pivots]
+
+    def reduce(self, invs: List[Invariant]) -> List[Invariant]:
+        """Residual invariants without the eliminated variables, equivalent given the core."""
+        reduced = []
+        for inv in invs:
+            row, const = _substitute(inv.varCoeffs, inv.const, self.pivots)
+            reduced.append(Invariant(row, const))
+        return reduced
@@ -0,0 +1,151 @@
+# fingerprint.py
+
+import hashlib
+from fractions import Fraction
+from typing import Dict, Iterable, List, Tuple
+from .invariant import Invariant
+
+# Two Mersenne primes: a false match needs both reductions to collide.
+FINGERPRINT_PRIMES: Tuple[int, ...] = (2**61 - 1, 2**31 - 1)
+
+# Column key of the constant, sorted after every variable name.
+CONST_COLUMN = "\uffff="
+
+
+class RowSpace:
+    """
+    Reduced row-echelon form, modulo a prime, of the equations [coeffs | const]
+    of an invariant set, maintained incrementally.
+
+    Columns are ordered by variable name, the constant last, so the form only
+    depends on the row space (the set of linear consequences of the equations),
+    not on the order, scaling or redundancy of the input invariants.
+    Rows are sparse dicts column -> value in [1, p-1]; each pivot row has a 1
+    on its pivot, its smallest column, and no other pivot column.
+    """
+
+    def __init__(self, prime: int) -> None:
+        self.prime = prime
+        self.pivots: Dict[str, Dict[str, int]] = {}
+
+    def add(self, row: Dict[str, int]) -> bool:
+        """Add one equation. Returns True if it increased the rank."""
+        p = self.prime
+        vec = {col: v % p for col, v in row.items() if v % p}
+        pivots = self.pivots
+        for col in [c for c in vec if c in pivots]:
+            factor = vec.get(col)
+            if not factor:
+                continue
+            for c, v in pivots[col].items():
+                nv = (vec.get(c, 0) - factor * v) % p
+                if nv:
+                    vec[c] = nv
+                else:
+                    vec.pop(c, None)
+        if not vec:
+            return False
+
+        lead = min(vec)
+        inv_lead = pow(vec[lead], p - 2, p)
+        if inv_lead != 1:
+            vec = {c: (v * inv_lead) % p for c, v in vec.items()}
+        # keep the form reduced: clear the new pivot column from the other rows
+        for other in pivots.values():
+            factor = other.get(lead)
+            if factor:
+                for c, v in vec.items():
+                    nv = (other.get(c, 0) - factor * v) % p
+                    if nv:
+                        other[c] = nv
+                    else:
+                        other.pop(c, None)
+        pivots[lead] = vec
+        return True
+
+    def rank(self) -> int:
+        return len(self.pivots)
+
+    def canonicalRows(self) -> List[List[Tuple[str, int]]]:
+        """The pivot rows sorted by pivot column, each as sorted (column, value) pairs."""
+        return [sorted(self.pivots[lead].items()) for lead in sorted(self.pivots)]
+
+
+class Fingerprinter:
+    """
+    Canonical fingerprint of the row space of an invariant set: a hash of its
+    reduced row-echelon forms modulo FINGERPRINT_PRIMES, over the sorted variable
+    names with the constant as an extra column.
+
+    Equal fingerprints mean equivalent invariant sets (the same equations up to
+    linear combination) with overwhelming probability; different fingerprints
+    leave the question to the exact checker. Invariants with an unknown constant
+    ('?') are ignored, as parseSolFile drops them.
+    """
+
+    def __init__(self, primes: Tuple[int, ...] = FINGERPRINT_PRIMES) -> None:
+        self.spaces = [RowSpace(p) for p in primes]
+
+    def add(self, inv: Invariant) -> None:
+        if not isinstance(inv.const, int):
+            return
+        row = dict(inv.varCoeffs)
+        if inv.const:
+            row[CONST_COLUMN] = inv.const
+        for space in self.spaces:
+            space.add(row)
+
+    def rank(self) -> int:
+        return self.spaces[0].rank() if self.spaces else 0
+
+    def hexdigest(self) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for space in self.spaces:
+            h.update(f"p{space.prime}\n".encode())
+            for row in space.canonicalRows():
+                h.update(" ".join(f"{col}:{v}" for col, v in row).encode("utf-8"))
+                h.update(b"\n")
+        return h.hexdigest()
+
+
+def fingerprintInvariants(invariants: Iterable[Invariant]) -> str:
+    """Row-space fingerprint of an invariant set."""
+    fp = Fingerprinter()
+    for inv in invariants:
+        fp.add(inv)
+    return fp.hexdigest()
+
+
+def _equationRows(invariants: Iterable[Invariant]) -> List[Dict[str, int]]:
+    return [dict(inv.varCoeffs, **{CONST_COLUMN: inv.const})
+            for inv in invariants if isinstance(inv.const, int)]
+
+
+def _rationalRank(rows: List[Dict[str, int]]) -> int:
+    """Rank of the rows over the rationals (exact, row echelon form with Fractions)."""
+    pivots: Dict[str, Dict[str, Fraction]] = {}
+    for row in rows:
+        vec = {c: Fraction(v) for c, v in row.items() if v}
+        while vec:
+            lead = min(vec)
+            if lead not in pivots:
+                pivots[lead] = {c: v / vec[lead] for c, v in vec.items()}
+                break
+            factor = vec[lead]
+            for c, v in pivots[lead].items():
+                nv = vec.get(c, 0) - factor * v
+                if nv:
+                    vec[c] = nv
+                else:
+                    vec.pop(c, None)
+    return len(pivots)
+
+
+def sameRowSpace(invSetA: List[Invariant], invSetB: List[Invariant]) -> bool:
+    """
+    Exact confirmation of a fingerprint match, over the rationals: both sets
+    have the same rank and stacking them does not increase it.
+    """
+    rowsA, rowsB = _equationRows(invSetA), _equationRows(invSetB)
+    rankA = _rationalRank(rowsA)
+    return rankA == _rationalRank(rowsB) == _rationalRank(rowsA + rowsB)
@@ -0,0 +1,128 @@
+# metrics.py
+
+import json
+import os
+from typing import Dict, Optional, Union
+from .invariant import Invariant
+from .fingerprint import Fingerprinter
+
+INT32_MAX = 2**31 - 1
+INT64_MAX = 2**63 - 1
+
+METRICS_VERSION = 2
+
+# Above this many nonzero terms, the fingerprint is not computed while collecting
+# (its row reduction would dominate the collection time); main.py then compares
+# the solution without the fingerprint shortcut.
+FINGERPRINT_MAX_TERMS = 50000
+
+
+class SolutionMetrics:
+    """
+    Accumulates the statistics of a solution set while it is written,
+    with exact (big int) arithmetic:
+      - SolSize: number of invariants, SolPosSize: those without negative coefficient
+      - SolNbCoeff: number of nonzero terms
+      - SolMaxCoeff / SolSumCoeff: max and sum of absolute coefficient values
+      - SolSizeKB: size of the textual .sol in KB
+      - SupportHist: support size (number of terms) -> number of invariants
+      - SolOverflow: 0, or 32 / 64 if some coefficient does not fit a signed int of that width
+      - Fingerprint / Rank: canonical row-space fingerprint (see fingerprint.py) and rank,
+        None for solutions of more than fingerprintMaxTerms terms (None: no bound)
+    """
+
+    def __init__(self, fingerprintMaxTerms: Optional[int] = FINGERPRINT_MAX_TERMS) -> None:
+        self.size = 0
+        self.pos_size = 0
+        self.nb_coeff = 0
+        self.max_coeff = 0
+        self.sum_coeff = 0
+        self.max_const = 0
+        self.text_bytes = 0
+        self.support_hist: Dict[int, int] = {}
+        self.fingerprintMaxTerms = fingerprintMaxTerms
+        self.fingerprint: Optional[Fingerprinter] = Fingerprinter()
+
+    def add(self, inv: Invariant, line: Optional[str] = None) -> None:
+        """Account for one invariant, and for its text line if given."""
+        self.size += 1
+        support = len(inv.varCoeffs)
+        self.support_hist[support] = self.support_hist.get(support, 0) + 1
+        self.nb_coeff += support
+        negative = False
+        for coeff in inv.varCoeffs.values():
+            if coeff < 0:
+                negative = True
+            a = abs(coeff)
+            self.sum_coeff += a
+            if a > self.max_coeff:
+                self.max_coeff = a
+        if not negative:
+            self.pos_size += 1
+        if isinstance(inv.const, int) and abs(inv.const) > self.max_const:
+            self.max_const = abs(inv.const)
+        if line is not None:
+            self.text_bytes += len(line.encode("utf-8")) + 1  # with newline
+        if self.fingerprint is None:
+            return
+        if self.fingerprintMaxTerms is not None and self.nb_coeff > self.fingerprintMaxTerms:
+            self.fingerprint = None  # too large to fingerprint
+            return
+        # lines with an unknown constant ('= ?') may carry a placeholder int const
+        if line is None or not line.rstrip().endswith("= ?"):
+            self.fingerprint.add(inv)
+
+    def overflow(self) -> int:
+        """Smallest machine width (32 or 64) the coefficients overflow, 0 if none."""
+        if self.max_coeff > INT32_MAX:
+            return 64 if self.max_coeff > INT64_MAX else 32
+        return 0
+
+    def toDict(self) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        return {
+            "version": METRICS_VERSION,
+            "SolSizeKB": self.text_bytes / 1024,
+            "SolSize": self.size,
+            "SolPosSize": self.pos_size,
+            "SolMaxCoeff": self.max_coeff,
+            "SolSumCoeff": self.sum_coeff,
+            "SolNbCoeff": self.nb_coeff,
+            "SolMaxConst": self.max_const,
+            "SolOverflow": self.overflow(),
+            "Fingerprint": self.fingerprint.hexdigest() if self.fingerprint is not None else None,
+            "Rank": self.fingerprint.rank() if self.fingerprint is not None else None,
+            # JSON object keys must be strings
+            "SupportHist": {str(k): v for k, v in sorted(self.support_hist.items())},
+        }
+
+
+def sidecarPath(solPath: str) -> str:
+    """Metrics sidecar of a solution: X.sol, X.sol.gz, X.solb -> X.sol.json"""
+    if solPath.endswith(".gz"):
+        solPath = solPath[:-3]
+    elif solPath.endswith(".solb"):
+        solPath = solPath[:-1]
+    return f"{solPath}.json"
+
+
+def writeSidecar(solPath: str, metrics: SolutionMetrics) -> str:
+    """Write the metrics next to the solution (atomically) and return the sidecar path."""
+    path = sidecarPath(solPath)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(metrics.toDict(), f)
+    os.replace(tmp, path)
+    return path
+
+
+def readSidecar(solPath: str) -> Optional[Dict]:
+    """Load the metrics sidecar of a solution, or None if absent/unreadable/outdated."""
+    path = sidecarPath(solPath)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != METRICS_VERSION:
+        return None
+    return data
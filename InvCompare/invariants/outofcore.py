@@ -0,0 +1,180 @@
+"""
+Out-of-core deduplication of two invariant sets, for generating sets too large
+to hold as Python objects (millions of semiflows).
+
+Both solution files are streamed once and each invariant is written, as its
+normalized signature (the sorted sparse coefficients and the constant, which
+is what the dense vector of deduplicateInvariants encodes), to one of N bucket
+files chosen by a hash of the signature. Equal invariants land in the same
+bucket, so the set difference is computed bucket by bucket with only one
+bucket of A in memory. A bucket that is still too large (skewed hash, bad size
+estimate) is split again with another hash salt.
+
+The residual invariants are written to spool files in their original order,
+with the semantics of deduplicateInvariants: duplicates within A are merged,
+an invariant of A matched by any invariant of B is dropped, and invariants of B
+matched in A are dropped. The invariants found on both sides are spooled as
+well, so that the caller can assert them once instead of dropping them (the
+comparison of the whole sets, as with --keepDup). iterResidual streams the
+spool files to the next stage.
+"""
+
+import heapq
+import math
+import os
+import zlib
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from parsing.parser_generic import iterInvariants
+from .invariant import Invariant
+
+DEFAULT_BUCKET_BYTES = 64 * 1024 * 1024
+MAX_BUCKETS = 512
+# Uncompressed signature bytes per byte of solution file, to size the buckets
+EXPANSION = {".gz": 8, ".solb": 6}
+
+
+class StreamDedup(NamedTuple):
+    uniqueA: str  # spool files of the residual invariants
+    uniqueB: str
+    invariantsA: int
+    invariantsB: int
+    countA: int  # residual sizes
+    countB: int
+    buckets: int
+    shared: str = ""  # spool file of the invariants found on both sides
+    countShared: int = 0
+
+
+def signature(inv: Invariant) -> str:
+    """Normalized text signature of an invariant: 'const;var:coeff var:coeff ...'."""
+    return f"{inv.const};" + " ".join(f"{v}:{c}" for v, c in sorted(inv.varCoeffs.items()))
+
+
+def fromSignature(sig: str) -> Invariant:
+    const, _, terms = sig.partition(";")
+    inv = Invariant.__new__(Invariant)
+    inv.varCoeffs = {v: int(c) for v, c in (t.split(":") for t in terms.split())}
+    inv.const = int(const)
+    return inv
+
+
+def iterResidual(path: str) -> Iterator[Invariant]:
+    """Stream the invariants of a residual spool file."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield fromSignature(line.rstrip("\n").split("\t", 1)[1])
+
+
+def bucketCount(paths: List[str], bucketBytes: int) -> int:
+    """Number of buckets so that a bucket of signatures is about bucketBytes."""
+    estimate = 0
+    for path in paths:
+        ext = ".gz" if path.endswith(".gz") else os.path.splitext(path)[1]
+        estimate += os.path.getsize(path) * EXPANSION.get(ext, 1)
+    return max(1, min(MAX_BUCKETS, math.ceil(estimate / bucketBytes)))
+
+
+def _bucketOf(sig: str, salt: int, n: int) -> int:
+    return zlib.crc32(sig.encode("utf-8"), salt) % n
+
+
+def _partition(lines: Iterator[Tuple[int, str]], prefix: str, n: int, salt: int) -> int:
+    """Write (seq, signature) lines to prefix.<k> bucket files; returns the line count."""
+    files: List[IO[str]] = [open(f"{prefix}.{k}", "w", encoding="utf-8") for k in range(n)]
+    count = 0
+    try:
+        for seq, sig in lines:
+            files[_bucketOf(sig, salt, n)].write(f"{seq}\t{sig}\n")
+            count += 1
+    finally:
+        for f in files:
+            f.close()
+    return count
+
+
+def _readBucket(path: str) -> Iterator[Tuple[int, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            seq, sig = line.rstrip("\n").split("\t", 1)
+            yield int(seq), sig
+
+
+def _mergeBySeq(parts: List[str], out: str) -> None:
+    """Merge residual files, each sorted by sequence number, into out."""
+    with open(out, "w", encoding="utf-8") as f:
+        for seq, sig in heapq.merge(*(_readBucket(p) for p in parts)):
+            f.write(f"{seq}\t{sig}\n")
+
+
+def _dedupBucket(pathA: str, pathB: str, outA: str, outB: str, outShared: str, bucketBytes: int,
+                 salt: int) -> None:
+    """Set difference of one pair of buckets, split again if A's bucket is too large."""
+    if os.path.getsize(pathA) > 4 * bucketBytes and salt < 4:
+        n = min(MAX_BUCKETS, math.ceil(os.path.getsize(pathA) / bucketBytes))
+        _partition(_readBucket(pathA), pathA, n, salt + 1)
+        _partition(_readBucket(pathB), pathB, n, salt + 1)
+        os.remove(pathA)
+        os.remove(pathB)
+        parts = [(f"{pathA}.{k}", f"{pathB}.{k}", f"{outA}.{k}", f"{outB}.{k}", f"{outShared}.{k}")
+                 for k in range(n)]
+        for subA, subB, subOutA, subOutB, subShared in parts:
+            _dedupBucket(subA, subB, subOutA, subOutB, subShared, bucketBytes, salt + 1)
+        _mergeParts(parts, outA, outB, outShared)
+        return
+
+    # first occurrence of each signature of A
+    first: Dict[str, int] = {}
+    for seq, sig in _readBucket(pathA):
+        first.setdefault(sig, seq)
+    matched = set()
+    with open(outB, "w", encoding="utf-8") as f:
+        for seq, sig in _readBucket(pathB):
+            if sig in first:
+                matched.add(sig)
+            else:
+                f.write(f"{seq}\t{sig}\n")
+    with open(outA, "w", encoding="utf-8") as f, open(outShared, "w", encoding="utf-8") as shared:
+        for sig, seq in sorted(first.items(), key=lambda item: item[1]):
+            (shared if sig in matched else f).write(f"{seq}\t{sig}\n")
+    os.remove(pathA)
+    os.remove(pathB)
+
+
+def _mergeParts(parts: List[Tuple[str, str, str, str, str]], outA: str, outB: str, outShared: str) -> None:
+    """Merge the residual and shared files of the buckets, and remove them."""
+    for k, out in ((2, outA), (3, outB), (4, outShared)):
+        _mergeBySeq([p[k] for p in parts], out)
+        for p in parts:
+            os.remove(p[k])
+
+
+def _countLines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def deduplicateSolFiles(solA: str, solB: str, workDir: str,
+                        bucketBytes: int = DEFAULT_BUCKET_BYTES, mode: Optional[str] = None) -> StreamDedup:
+    """
+    Deduplicate the invariants of two solution files (or raw tool logs, read
+    in the given mode) through hash buckets in workDir, with about bucketBytes
+    of signatures in memory at a time.
+    """
+    n = bucketCount([solA, solB], bucketBytes)
+    prefixA = os.path.join(workDir, "A")
+    prefixB = os.path.join(workDir, "B")
+    invariantsA = _partition(((i, signature(inv)) for i, inv in enumerate(iterInvariants(solA, mode))), prefixA, n, 0)
+    invariantsB = _partition(((i, signature(inv)) for i, inv in enumerate(iterInvariants(solB, mode))), prefixB, n, 0)
+
+    parts = [(f"{prefixA}.{k}", f"{prefixB}.{k}", f"{prefixA}.{k}.out", f"{prefixB}.{k}.out",
+              f"{prefixA}.{k}.shared") for k in range(n)]
+    for pathA, pathB, outA, outB, outShared in parts:
+        _dedupBucket(pathA, pathB, outA, outB, outShared, bucketBytes, 0)
+
+    uniqueA = os.path.join(workDir, "uniqueA")
+    uniqueB = os.path.join(workDir, "uniqueB")
+    shared = os.path.join(workDir, "shared")
+    _mergeParts(parts, uniqueA, uniqueB, shared)
+    return StreamDedup(uniqueA, uniqueB, invariantsA, invariantsB,
+                       _countLines(uniqueA), _countLines(uniqueB), n, shared, _countLines(shared))
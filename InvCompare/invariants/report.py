@@ -3,6 +3,14 @@
 from typing import List, Dict
 from invariants.invariant import Invariant
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Products below this bound are computed in int64 by numpy
+_INT64_SAFE = 2**62
+
 
 def evaluateInvariant(inv: Invariant, assignment: Dict[str,int]) -> int:
     """
@@ -30,6 +38,72 @@ def findViolations(
     return violated
 
 
+def evaluateWitnesses(
+    invs: List[Invariant],
+    witnesses: List[Dict[str,int]]
+) -> List[List[int]]:
+    """
+    Evaluate every invariant on every witness at once: returns the differences
+    (lhs - const), one row per invariant and one column per witness.
+    The invariants form a sparse (CSR) matrix and the witnesses a dense
+    variables x witnesses matrix; with numpy their product is vectorized,
+    otherwise each invariant is evaluated on all witnesses in one pass.
+    """
+    k = len(witnesses)
+    names = sorted(set().union(*(inv.varCoeffs.keys() for inv in invs)))
+    col = {name: i for i, name in enumerate(names)}
+    values = [[w.get(name, 0) for w in witnesses] for name in names]
+
+    if np is not None and invs and k:
+        max_coeff = max((abs(c) for inv in invs for c in inv.varCoeffs.values()), default=0)
+        max_value = max((abs(v) for row in values for v in row), default=0)
+        max_len = max(len(inv.varCoeffs) for inv in invs)
+        max_const = max(abs(inv.const) for inv in invs)
+        # each factor must fit int64 on its own: a zero witness makes the product 0
+        if (max(max_coeff, max_value, max_const) < _INT64_SAFE
+                and max_coeff * max_value * max_len + max_const < _INT64_SAFE):
+            nterms = sum(len(inv.varCoeffs) for inv in invs)
+            lengths = np.fromiter((len(inv.varCoeffs) for inv in invs), dtype=np.int64, count=len(invs))
+            cols = np.fromiter((col[v] for inv in invs for v in inv.varCoeffs), dtype=np.int64, count=nterms)
+            coeffs = np.fromiter((c for inv in invs for c in inv.varCoeffs.values()), dtype=np.int64, count=nterms)
+            dense = np.array(values, dtype=np.int64).reshape(len(names), k)
+            diffs = np.zeros((len(invs), k), dtype=np.int64)
+            np.add.at(diffs, np.repeat(np.arange(len(invs)), lengths), coeffs[:, None] * dense[cols])
+            diffs -= np.array([inv.const for inv in invs], dtype=np.int64)[:, None]
+            return diffs.tolist()
+
+    diffs: List[List[int]] = []
+    for inv in invs:
+        row = [-inv.const] * k
+        for varName, coeff in inv.varCoeffs.items():
+            row = [r + coeff * v for r, v in zip(row, values[col[varName]])]
+        diffs.append(row)
+    return diffs
+
+
+def violationCounts(diffs: List[List[int]]) -> List[int]:
+    """Number of witnesses violating each invariant, from evaluateWitnesses."""
+    return [sum(1 for d in row if d != 0) for row in diffs]
+
+
+def reportViolationCounts(
+    label: str,
+    invariants: List[Invariant],
+    counts: List[int],
+    nwitnesses: int
+) -> None:
+    """
+    Print the invariants violated by at least one witness, most violated first.
+    """
+    violated = sorted((i for i, c in enumerate(counts) if c), key=lambda i: (-counts[i], i))
+    if not violated:
+        print(f"{label}: No violations over {nwitnesses} witnesses.")
+        return
+    print(f"{label}: Invariants violated over {nwitnesses} witnesses:")
+    for idx in violated:
+        print(f"  - {counts[idx]}/{nwitnesses} : \"{formatInvariantAsEquation(invariants[idx])}\"")
+
+
 def reportSparseAssignment(assignment: Dict[str,int]) -> None:
     """
     Print the assignment in sparse form (hiding zero values).
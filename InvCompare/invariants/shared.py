@@ -0,0 +1,164 @@
+"""
+Invariant sets in shared memory, for worker processes.
+
+Pickling a List[Invariant] to each worker costs more than the work for big
+sets and multiplies the memory by the number of workers. Instead, the owner
+packs the set once into a multiprocessing.shared_memory block as CSR arrays
+with the variable name table, and sends the workers only its handle; they
+attach read-only and decode the rows they need.
+
+Block layout (native byte order, 8-byte aligned sections):
+    header  : b"SHIV" | 4 pad bytes | nrows, nterms, names_len (3 x int64)
+    offsets : int64[nrows + 1]   row i is terms offsets[i] .. offsets[i+1]
+    coeffs  : int64[nterms]
+    consts  : int64[nrows]
+    cols    : int32[nterms]      index in the name table
+    known   : uint8[nrows]       0 for an unknown constant ('?')
+    names   : UTF-8, '\n'-separated sorted name table
+
+The owner unlinks the block when it is done (SharedInvariants is a context
+manager), also when a worker crashed; workers only close their mapping. If the
+owner itself dies, the multiprocessing resource tracker unlinks the block.
+"""
+
+import struct
+from array import array
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, NamedTuple
+
+from .invariant import Invariant
+
+MAGIC = b"SHIV"
+_HEADER = struct.Struct("=4s4xqqq")
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+
+
+class SharedHandle(NamedTuple):
+    """What a worker needs to attach a shared invariant set."""
+    name: str
+    size: int
+
+
+def _layout(nrows: int, nterms: int, names_len: int) -> Dict[str, int]:
+    """Start offset of each section in the block, and the total size."""
+    offsets = _HEADER.size
+    coeffs = offsets + 8 * (nrows + 1)
+    consts = coeffs + 8 * nterms
+    cols = consts + 8 * nrows
+    known = cols + 4 * nterms
+    names = known + nrows
+    return {"offsets": offsets, "coeffs": coeffs, "consts": consts, "cols": cols,
+            "known": known, "names": names, "size": max(1, names + names_len)}
+
+
+class SharedInvariants:
+    """
+    Owner of an invariant set packed in shared memory.
+    Raises OverflowError if a coefficient or constant does not fit in 64 bits.
+    """
+
+    def __init__(self, invariants: List[Invariant]) -> None:
+        names = sorted(set().union(*(inv.varCoeffs.keys() for inv in invariants)))
+        col_of = {name: i for i, name in enumerate(names)}
+        offsets = array("q", [0])
+        coeffs = array("q")
+        cols = array("i")
+        consts = array("q")
+        known = bytearray()
+        for inv in invariants:
+            for var, coeff in inv.varCoeffs.items():
+                cols.append(col_of[var])
+                coeffs.append(coeff)
+            offsets.append(len(cols))
+            is_known = isinstance(inv.const, int)
+            if is_known and not _INT64_MIN <= inv.const <= _INT64_MAX:
+                raise OverflowError(f"Constant {inv.const} does not fit in 64 bits")
+            consts.append(inv.const if is_known else 0)
+            known.append(1 if is_known else 0)
+        name_bytes = "\n".join(names).encode("utf-8")
+        nrows, nterms = len(invariants), len(cols)
+        layout = _layout(nrows, nterms, len(name_bytes))
+
+        self.shm = shared_memory.SharedMemory(create=True, size=layout["size"])
+        try:
+            buf = self.shm.buf
+            _HEADER.pack_into(buf, 0, MAGIC, nrows, nterms, len(name_bytes))
+            for section, data in (("offsets", offsets), ("coeffs", coeffs), ("consts", consts), ("cols", cols)):
+                raw = data.tobytes()
+                buf[layout[section]:layout[section] + len(raw)] = raw
+            buf[layout["known"]:layout["known"] + nrows] = bytes(known)
+            buf[layout["names"]:layout["names"] + len(name_bytes)] = name_bytes
+        except BaseException:
+            self.close()
+            raise
+        self.handle = SharedHandle(self.shm.name, layout["size"])
+
+    def close(self) -> None:
+        """Release and unlink the block. Idempotent."""
+        if self.shm is None:
+            return
+        shm, self.shm = self.shm, None
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "SharedInvariants":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class SharedView:
+    """
+    Read-only view of a shared invariant set, in a worker process. It is a
+    sequence of invariants decoded on access, so a consumer that goes through
+    it once (e.g. to build a solver) never holds the set as Python objects.
+    """
+
+    def __init__(self, handle: SharedHandle) -> None:
+        self.shm = shared_memory.SharedMemory(name=handle.name)
+        buf = self.shm.buf.toreadonly()
+        magic, nrows, nterms, names_len = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            self.shm.close()
+            raise ValueError(f"{handle.name} is not a shared invariant set")
+        layout = _layout(nrows, nterms, names_len)
+        self.nrows = nrows
+        self.offsets = buf[layout["offsets"]:layout["coeffs"]].cast("q")
+        self.coeffs = buf[layout["coeffs"]:layout["consts"]].cast("q")
+        self.consts = buf[layout["consts"]:layout["cols"]].cast("q")
+        self.cols = buf[layout["cols"]:layout["known"]].cast("i")
+        self.known = buf[layout["known"]:layout["names"]]
+        names = bytes(buf[layout["names"]:layout["names"] + names_len]).decode("utf-8")
+        self.names = names.split("\n") if names else []
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    def invariant(self, i: int) -> Invariant:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        inv = Invariant.__new__(Invariant)
+        inv.varCoeffs = {self.names[c]: k for c, k in zip(self.cols[start:end], self.coeffs[start:end])}
+        inv.const = self.consts[i] if self.known[i] else "?"
+        return inv
+
+    def __getitem__(self, i: int) -> Invariant:
+        if not 0 <= i < self.nrows:
+            raise IndexError(i)
+        return self.invariant(i)
+
+    def __iter__(self) -> Iterator[Invariant]:
+        for i in range(self.nrows):
+            yield self.invariant(i)
+
+    def invariants(self) -> List[Invariant]:
+        return list(self)
+
+    def close(self) -> None:
+        """Release the mapping; the block itself belongs to the owner."""
+        for view in (self.offsets, self.coeffs, self.consts, self.cols, self.known):
+            view.release()
+        self.shm.close()
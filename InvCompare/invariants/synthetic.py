@@ -0,0 +1,106 @@
+"""
+Synthetic invariant sets with controlled size, sparsity, coefficient magnitude
+and redundancy, for benchmarks of the comparison code (see benchInvCompare.py).
+
+All invariants of a set hold on a random reference marking m0 (their constant
+is their value on m0), like the P-flows of a real net with its initial marking,
+so that sets are consistent and comparisons must actually reason about them.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from .invariant import Invariant
+
+
+def varName(i: int) -> str:
+    return f"p{i}"
+
+
+def randomMarking(nbVars: int, rng: random.Random, maxTokens: int = 3) -> Dict[str, int]:
+    return {varName(i): rng.randint(0, maxTokens) for i in range(nbVars)}
+
+
+def _withConstant(coeffs: Dict[str, int], marking: Dict[str, int]) -> Invariant:
+    return Invariant(coeffs, sum(c * marking[v] for v, c in coeffs.items()))
+
+
+def randomInvariantSet(
+    nbVars: int,
+    nbInvariants: int,
+    support: int = 8,
+    maxCoeff: int = 3,
+    semiflow: bool = False,
+    redundancy: float = 0.0,
+    marking: Optional[Dict[str, int]] = None,
+    rng: Optional[random.Random] = None
+) -> List[Invariant]:
+    """
+    nbInvariants invariants over nbVars variables p0..p<nbVars-1>, each with
+    about support variables and coefficients in [-maxCoeff, maxCoeff] (only
+    positive ones if semiflow). Each invariant has a variable of its own
+    (p<i> for the i-th), so the set is linearly independent. A fraction
+    redundancy of extra invariants are sums of two others (redundant).
+    """
+    rng = rng or random.Random(0)
+    if nbInvariants > nbVars:
+        raise ValueError("nbInvariants must not exceed nbVars")
+    marking = marking or randomMarking(nbVars, rng)
+    invariants: List[Invariant] = []
+    for i in range(nbInvariants):
+        coeffs = {varName(i): rng.randint(1, maxCoeff)}
+        for _ in range(max(0, support - 1)):
+            # other variables are taken after the pivots, so pivots stay private
+            j = rng.randrange(nbInvariants, nbVars) if nbVars > nbInvariants else rng.randrange(nbVars)
+            if varName(j) in coeffs:
+                continue
+            c = rng.randint(1, maxCoeff)
+            coeffs[varName(j)] = c if semiflow or rng.random() < 0.5 else -c
+        invariants.append(_withConstant(coeffs, marking))
+    for _ in range(int(round(redundancy * nbInvariants))):
+        a, b = rng.sample(range(nbInvariants), 2) if nbInvariants > 1 else (0, 0)
+        invariants.append(combine(invariants[a], invariants[b], 1))
+    rng.shuffle(invariants)
+    return invariants
+
+
+def combine(a: Invariant, b: Invariant, k: int) -> Invariant:
+    """The invariant a + k*b."""
+    coeffs = dict(a.varCoeffs)
+    for v, c in b.varCoeffs.items():
+        coeffs[v] = coeffs.get(v, 0) + k * c
+    return Invariant(coeffs, a.const + k * b.const)
+
+
+def equivalentSet(invariants: List[Invariant], rng: Optional[random.Random] = None,
+                  steps: Optional[int] = None, semiflow: bool = False) -> List[Invariant]:
+    """
+    A set with the same solutions: random unimodular row operations (add or,
+    unless semiflow, subtract another invariant), then a shuffle.
+    """
+    rng = rng or random.Random(1)
+    result = list(invariants)
+    n = len(result)
+    for _ in range(n if steps is None else steps):
+        if n < 2:
+            break
+        i, j = rng.sample(range(n), 2)
+        result[i] = combine(result[i], result[j], 1 if semiflow or rng.random() < 0.5 else -1)
+    rng.shuffle(result)
+    return result
+
+
+def nearMissSet(invariants: List[Invariant], marking: Dict[str, int],
+                rng: Optional[random.Random] = None) -> List[Invariant]:
+    """
+    The same set with one invariant perturbed: one coefficient changed by one,
+    the constant updated so that the reference marking still satisfies it.
+    """
+    rng = rng or random.Random(2)
+    result = list(invariants)
+    i = rng.randrange(len(result))
+    coeffs = dict(result[i].varCoeffs)
+    v = rng.choice(sorted(coeffs))
+    coeffs[v] += 1 if coeffs[v] != -1 else 2
+    result[i] = _withConstant(coeffs, marking)
+    return result
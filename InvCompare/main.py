@@ -5,73 +5,317 @@ Entry point of the Petri net invariant comparison tool.
 - With --compareSolutions (default): Compares invariants from multiple .sol files pairwise for consistency.
 - With --testMinimality: Tests each .sol file for minimality and reports redundant invariants.
 Use --keepDup to disable deduplication (applies only to --compareSolutions).
+Runs linked to the same blob of the solution store (solStore.py) are consistent without
+being read. Pairs whose row-space fingerprints, read from the .sol.json sidecars, are equal
+are reported consistent without a solver call (never under --outOfCore, and never computed:
+raw logs and solutions too large to fingerprint at collection time have none);
+--confirmFingerprint confirms such matches exactly, --noFingerprint always runs the solver.
+Solutions may be given as .sol, .sol.gz or binary .solb files, or as raw tool outputs
+(.tina, .struct, .its, .petri*, GreatSPN .pba/.tba/.pin/.tin next to the model's .net,
+PetriSage <log>.petrisage.tba), parsed on the fly (see parsing/parser_generic.py);
+--mode=MODE gives their examination mode when the log does not tell.
+--outOfCore deduplicates through on-disk hash buckets instead of in memory, for
+generating sets too large to load (see invariants/outofcore.py); with --keepDup, the
+invariants found in both files are asserted once instead of dropped.
+Otherwise the invariants common to all the files are factored out once (see invariants/core.py):
+the core is asserted once in a solver shared by all pairs, each residual once behind a guard
+literal, and each pair is a check-sat-assuming of its Xor; --noCore compares whole sets.
+--stats-json=FILE appends one JSON line per comparison or minimality test with the
+wall time of each phase, peak RSS, problem sizes and Z3 statistics (see profiling.py);
+--tracemalloc adds the Python heap peak of each phase, --profile=FILE dumps cProfile stats.
+--results-json=FILE appends one JSON line per compared pair, consistency summary or
+minimality test with the verdict, violated or redundant invariants, sizes and time (see results.py).
+--jobs=N splits each minimality test over N worker processes sharing the set in shared
+memory (see solver/parallel.py).
+--witnesses=K enumerates up to K discrepancy witnesses with different violation patterns
+and reports, per invariant, how many of them violate it.
 """
 
 import sys
 import os
-from typing import List, Dict, Tuple
-from parsing.parser_solution import parseSolFile
+import time
+import cProfile
+import tempfile
+import tracemalloc
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+from functools import lru_cache
+from parsing.parser_solution import solutionFingerprint
+from parsing.parser_generic import isRawLog, parseInvariants, rawLogMode
 from invariants.varindex import VarIndex
 from invariants.invariant import Invariant
 from invariants.deduplicate import deduplicateInvariants
-from solver.satcheck import checkXor, checkMinimality
+from invariants.outofcore import deduplicateSolFiles, iterResidual
+from invariants.core import CommonCore
+from invariants.fingerprint import sameRowSpace
+from solver.satcheck import CoreSolver, checkXor, checkMinimality, enumerateXor
+from solver.parallel import checkMinimalityParallel
+from campaign.events import span
+from parsing.log_info import model_name
+from profiling import PhaseProfile, StatsWriter, phase
+from results import ResultWriter
 from invariants.report import (
     reportSparseAssignment,
-    findViolations,
+    evaluateWitnesses,
+    violationCounts,
+    reportViolationCounts,
     reportViolations,
     formatInvariantAsEquation
 )
 
 def get_base_name(file_path: str) -> str:
-    """Extract the filename without folder or .sol extension."""
-    return os.path.splitext(os.path.basename(file_path))[0]
+    """
+    Extract the filename without folder or .sol / .sol.gz / .solb extension.
+    Raw logs keep their tool extension, as their collected solutions do
+    (GreatSPN model.pba becomes <model folder>.pba).
+    """
+    name = os.path.basename(file_path)
+    if isRawLog(file_path):
+        if name.endswith(".petrisage.tba"):
+            return name[:-len(".tba")]
+        if name.startswith("model."):
+            return os.path.basename(os.path.dirname(os.path.abspath(file_path))) + name[len("model"):]
+        return name
+    for ext in (".sol.gz", ".sol", ".solb"):
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return os.path.splitext(name)[0]
+
+@lru_cache(maxsize=None)
+def cached_fingerprint(sol_file: str) -> Optional[str]:
+    """
+    Fingerprint of a solution from its sidecar, None if it has none (raw logs,
+    solutions above FINGERPRINT_MAX_TERMS): it is never computed here.
+    """
+    if isRawLog(sol_file):
+        return None
+    return solutionFingerprint(sol_file)
+
+class ModelCore:
+    """
+    The solution files of a model, their common core and its solver, built on
+    the first pair that needs the solver: each file is parsed once, the core is
+    asserted once and each residual is encoded once for all pairs.
+    """
+
+    def __init__(self, sol_files: List[str], mode: Optional[str] = None) -> None:
+        self.sol_files = sol_files
+        self.mode = mode
+        self.sets: Dict[str, List[Invariant]] = {}
+        self.residuals: Dict[str, List[Invariant]] = {}
+        self.index: Dict[str, int] = {}
+        self.core: Optional[CommonCore] = None
+        self.solver: Optional[CoreSolver] = None
 
-def compare_invariants(solA: str, solB: str, keep_duplicates: bool = False) -> bool:
+    def build(self) -> None:
+        if self.core is not None:
+            return
+        self.sets = {sol_file: parseInvariants(sol_file, self.mode) for sol_file in self.sol_files}
+        invSets = [self.sets[sol_file] for sol_file in self.sol_files]
+        self.core = CommonCore(invSets)
+        self.residuals = dict(zip(self.sol_files, self.core.residuals))
+        self.index = {sol_file: i for i, sol_file in enumerate(self.sol_files)}
+        self.solver = CoreSolver(self.core)
+        print(f"Common core of {len(self.sol_files)} files: {len(self.core.core)} invariants, "
+              f"{len(self.core.eliminated())} variables eliminated\n")
+
+def compare_invariants(solA: str, solB: str, keep_duplicates: bool = False,
+                       use_fingerprint: bool = True, confirm_fingerprint: bool = False,
+                       profile: Optional[PhaseProfile] = None,
+                       record: Optional[Dict[str, object]] = None,
+                       out_of_core: bool = False, core: Optional[ModelCore] = None,
+                       witnesses: int = 1, mode: Optional[str] = None) -> bool:
     """
     Compare invariants from two .sol files for consistency.
     Returns True if consistent (UNSAT), False if discrepant (SAT).
+    Two links to the same solution store blob (solStore.py) are consistent
+    without reading it.
+    With use_fingerprint, sets with equal row-space fingerprints in their
+    sidecars are consistent without a solver call (confirmed exactly if
+    confirm_fingerprint); fingerprints are only read, never computed.
+    With a profile, records the time of each phase and the problem sizes.
+    With a record dict, fills in the method, sizes, violated invariant indices
+    and witness of the comparison (see results.py).
+    With out_of_core, neither set is loaded: both files are deduplicated through
+    on-disk buckets and only the unique invariants reach the solver (fingerprints
+    are not used); with keep_duplicates, the invariants of both files are
+    streamed into the solver as well.
+    With a core, the sets come from it and only their residuals are compared,
+    with its solver. With witnesses > 1, up to that many discrepancy witnesses
+    are enumerated and each invariant's violations are counted over them.
+    mode is the examination mode of raw tool logs that do not tell it.
     """
+    if record is None:
+        record = {}
+    sizes: Dict[str, int] = {}
+    record["sizes"] = sizes
     nameA = get_base_name(solA)
     nameB = get_base_name(solB)
     print(f"=== Comparing {nameA} vs {nameB} ===")
 
-    invSetA: List[Invariant] = parseSolFile(solA)
-    invSetB: List[Invariant] = parseSolFile(solB)
+    if os.path.realpath(solA) == os.path.realpath(solB):
+        print(f"Same stored solution. {nameA} and {nameB} are consistent.\n")
+        record["method"] = "same-blob"
+        return True
+
+    same_fingerprint = False
+    if use_fingerprint and not out_of_core:
+        with phase(profile, "fingerprint"):
+            fingerprintA = cached_fingerprint(solA)
+            same_fingerprint = fingerprintA is not None and fingerprintA == cached_fingerprint(solB)
+    if same_fingerprint and not confirm_fingerprint:
+        print(f"Equal row-space fingerprints. {nameA} and {nameB} are consistent.\n")
+        record["method"] = "fingerprint"
+        return True
+
+    if out_of_core:
+        with tempfile.TemporaryDirectory(prefix="invcompare_") as work:
+            with phase(profile, "dedup"):
+                streamed = deduplicateSolFiles(solA, solB, work, mode=mode)
+                uniqueA = list(iterResidual(streamed.uniqueA))
+                uniqueB = list(iterResidual(streamed.uniqueB))
+            print(f"Streamed {streamed.invariantsA} invariants from {nameA} and {streamed.invariantsB} from {nameB} "
+                  f"through {streamed.buckets} buckets")
+            sizes.update(invariantsA=streamed.invariantsA, invariantsB=streamed.invariantsB)
+            if profile is not None:
+                profile.size(invariantsA=streamed.invariantsA, invariantsB=streamed.invariantsB,
+                             buckets=streamed.buckets)
+            print_unique(nameA, uniqueA, nameB, uniqueB)
+            # the shared invariants stay on disk: read once for their variables,
+            # then streamed into the solver
+            shared = sharedVars = None
+            if keep_duplicates:
+                print(f"Asserting the {streamed.countShared} invariants found in both files (--keepDup).")
+                sizes.update(shared=streamed.countShared)
+                sharedVars = set()
+                for inv in iterResidual(streamed.shared):
+                    sharedVars.update(inv.varCoeffs)
+                shared = iterResidual(streamed.shared)
+            used = set().union(sharedVars or set(), *(inv.getUsedVarNames() for inv in uniqueA + uniqueB))
+            fusedIndex = VarIndex(sorted(used))
+            return solve_unique(nameA, uniqueA, nameB, uniqueB, fusedIndex, sizes, record, profile,
+                                witnesses=witnesses, assumed=shared, assumed_vars=sharedVars)
+
+    if core is not None:
+        with phase(profile, "core"):
+            core.build()
+        invSetA: List[Invariant] = core.sets[solA]
+        invSetB: List[Invariant] = core.sets[solB]
+    else:
+        with phase(profile, "parse"):
+            invSetA = parseInvariants(solA, mode)
+            invSetB = parseInvariants(solB, mode)
     print(f"Parsed {len(invSetA)} invariants from {nameA}")
     print(f"Parsed {len(invSetB)} invariants from {nameB}")
+    sizes.update(invariantsA=len(invSetA), invariantsB=len(invSetB))
+    if profile is not None:
+        profile.size(invariantsA=len(invSetA), invariantsB=len(invSetB))
+
+    if same_fingerprint:
+        with phase(profile, "confirm"):
+            same = sameRowSpace(invSetA, invSetB)
+        if same:
+            print(f"Equal row-space fingerprints, confirmed exactly. {nameA} and {nameB} are consistent.\n")
+            record["method"] = "confirmed"
+            return True
+        print("Warning: fingerprint collision, falling back to the solver.")
+
+    if core is not None:
+        # the core solver compares the whole residuals, no pairwise deduplication
+        residualA, residualB = core.residuals[solA], core.residuals[solB]
+        sizes.update(core=len(core.core.core), eliminated=len(core.core.eliminated()))
+        print_unique(nameA, residualA, nameB, residualB, "Outside the common core")
+        return solve_unique(nameA, residualA, nameB, residualB, core.core.varIndex, sizes, record, profile,
+                            core.solver, (core.index[solA], core.index[solB]), witnesses)
 
-    allVarsA = set().union(*(inv.getUsedVarNames() for inv in invSetA))
-    allVarsB = set().union(*(inv.getUsedVarNames() for inv in invSetB))
-    idxA = VarIndex(sorted(allVarsA))
-    idxB = VarIndex(sorted(allVarsB))
-    fusedIndex = idxA.fuse(idxB)
+    with phase(profile, "index"):
+        allVarsA = set().union(*(inv.getUsedVarNames() for inv in invSetA))
+        allVarsB = set().union(*(inv.getUsedVarNames() for inv in invSetB))
+        idxA = VarIndex(sorted(allVarsA))
+        idxB = VarIndex(sorted(allVarsB))
+        fusedIndex = idxA.fuse(idxB)
 
     if keep_duplicates:
         uniqueA, uniqueB = invSetA, invSetB
         print("Deduplication skipped due to --keepDup flag.")
     else:
-        uniqueA, uniqueB = deduplicateInvariants(invSetA, invSetB, fusedIndex)
-        print(f"After deduplication, {nameA} has {len(uniqueA)} unique invariants, {nameB} has {len(uniqueB)} unique invariants.")
-        print(f"Unique invariants in {nameA}:")
-        for idx, inv in enumerate(uniqueA):
-            print(f"  {idx}: {formatInvariantAsEquation(inv)}")
-        print(f"\nUnique invariants in {nameB}:")
-        for idx, inv in enumerate(uniqueB):
-            print(f"  {idx}: {formatInvariantAsEquation(inv)}")
-
-    usedVarsAll = set().union(*(inv.getUsedVarNames() for inv in uniqueA + uniqueB))
+        with phase(profile, "dedup"):
+            uniqueA, uniqueB = deduplicateInvariants(invSetA, invSetB, fusedIndex)
+        print_unique(nameA, uniqueA, nameB, uniqueB)
+    return solve_unique(nameA, uniqueA, nameB, uniqueB, fusedIndex, sizes, record, profile,
+                        witnesses=witnesses)
+
+def positive_option(args: List[str], flag: str, default: int = 1) -> int:
+    """Value of a --flag=N option, a positive integer; exits with an error otherwise."""
+    value = next((f.split("=", 1)[1] for f in args if f.startswith(flag + "=")), None)
+    if value is None:
+        return default
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        print(f"Error: {flag} expects a positive integer, got '{value}'")
+        sys.exit(1)
+    return n
+
+def print_unique(nameA: str, uniqueA: List[Invariant], nameB: str, uniqueB: List[Invariant],
+                 label: str = "After deduplication") -> None:
+    print(f"{label}, {nameA} has {len(uniqueA)} unique invariants, {nameB} has {len(uniqueB)} unique invariants.")
+    print(f"Unique invariants in {nameA}:")
+    for idx, inv in enumerate(uniqueA):
+        print(f"  {idx}: {formatInvariantAsEquation(inv)}")
+    print(f"\nUnique invariants in {nameB}:")
+    for idx, inv in enumerate(uniqueB):
+        print(f"  {idx}: {formatInvariantAsEquation(inv)}")
+
+def solve_unique(nameA: str, uniqueA: List[Invariant], nameB: str, uniqueB: List[Invariant],
+                 fusedIndex: VarIndex, sizes: Dict[str, int], record: Dict[str, object],
+                 profile: Optional[PhaseProfile], core_solver: Optional[CoreSolver] = None,
+                 pair: Optional[Tuple[int, int]] = None, witnesses: int = 1,
+                 assumed: Optional[Iterable[Invariant]] = None,
+                 assumed_vars: Optional[Set[str]] = None) -> bool:
+    """
+    Check the unique invariants of both sides with the solver, or the pair of
+    sets of the model with core_solver (uniqueA and uniqueB are then the
+    residuals of the pair outside the core), and report the discrepancy, if
+    any, over up to witnesses assignments. The assumed invariants, shared by
+    both sides, are streamed into the solver as well (read once, assumed_vars
+    holds their variables). Returns True if consistent.
+    """
+    usedVarsAll = set().union(assumed_vars or set(), *(inv.getUsedVarNames() for inv in uniqueA + uniqueB))
     finalIndex = fusedIndex.restrict(usedVarsAll)
+    sizes.update(uniqueA=len(uniqueA), uniqueB=len(uniqueB), vars=finalIndex.size())
+    record["method"] = "solver"
+    if profile is not None:
+        profile.size(uniqueA=len(uniqueA), uniqueB=len(uniqueB), vars=finalIndex.size(),
+                     terms=sum(len(inv.varCoeffs) for inv in uniqueA + uniqueB))
 
-    sat, assignment = checkXor(uniqueA, uniqueB, finalIndex)
-    if not sat:
+    if witnesses > 1:
+        if core_solver is not None:
+            found = core_solver.enumeratePair(pair[0], pair[1], uniqueA, uniqueB, witnesses, profile)
+        else:
+            found = enumerateXor(uniqueA, uniqueB, finalIndex, witnesses, profile, assumed)
+    elif core_solver is not None:
+        sat, assignment = core_solver.checkPair(pair[0], pair[1], profile)
+        found = [assignment] if sat else []
+    else:
+        sat, assignment = checkXor(uniqueA, uniqueB, finalIndex, profile, assumed)
+        found = [assignment] if sat else []
+    if not found:
         print(f"No discrepancy found (UNSAT). {nameA} and {nameB} are consistent.\n")
         return True
 
     print("DISCREPANCY FOUND: XOR is satisfiable.")
+    assignment = found[0]
     reportSparseAssignment(assignment)
 
-    violatedA = findViolations(uniqueA, assignment)
-    violatedB = findViolations(uniqueB, assignment)
+    # all invariants against all witnesses at once; the first witness is reported in full
+    diffsA = evaluateWitnesses(uniqueA, found)
+    diffsB = evaluateWitnesses(uniqueB, found)
+    violatedA = [i for i, row in enumerate(diffsA) if row[0] != 0]
+    violatedB = [i for i, row in enumerate(diffsB) if row[0] != 0]
+    record.update(violatedA=violatedA, violatedB=violatedB,
+                  witness={k: v for k, v in assignment.items() if v != 0})
     satisfiesA = (len(violatedA) == 0)
     satisfiesB = (len(violatedB) == 0)
 
@@ -86,24 +330,71 @@ def compare_invariants(solA: str, solB: str, keep_duplicates: bool = False) -> b
         reportViolations(nameA, uniqueA, violatedA, assignment)
         reportViolations(nameB, uniqueB, violatedB, assignment)
 
+    if witnesses > 1:
+        countsA, countsB = violationCounts(diffsA), violationCounts(diffsB)
+        print(f"\n{len(found)} witnesses with different violation patterns:")
+        reportViolationCounts(nameA, uniqueA, countsA, len(found))
+        reportViolationCounts(nameB, uniqueB, countsB, len(found))
+        record.update(witnesses=len(found),
+                      violationCountsA={i: c for i, c in enumerate(countsA) if c},
+                      violationCountsB={i: c for i, c in enumerate(countsB) if c})
+
     print()
     return False
 
-def test_minimality(sol_files: List[str]) -> None:
+def test_minimality(sol_files: List[str], stats: Optional[StatsWriter] = None,
+                    results: Optional[ResultWriter] = None, jobs: int = 1,
+                    mode: Optional[str] = None) -> None:
     """
     Test each .sol file for minimality and report redundant invariants.
+    With stats, writes a profile record per file; with results, a result record.
+    With jobs > 1, the invariants of a file are tested in parallel shards.
     """
     print("=== Testing Minimality of Invariant Sets ===")
     for sol_file in sol_files:
         name = get_base_name(sol_file)
-        invs = parseSolFile(sol_file)
+        profile = PhaseProfile("minimality", [sol_file]) if stats else None
+        start = time.perf_counter()
+        with phase(profile, "parse"):
+            invs = parseInvariants(sol_file, mode)
         if not invs:
             print(f"{name}: No invariants found.")
+            if results:
+                results.write("minimality", [name], verdict="empty", ms=0.0, sizes={"invariants": 0},
+                              redundant=[], check_sat_calls=0)
             continue
         
         print(f"Parsed {len(invs)} invariants from {name}")
-        vIndex = VarIndex(sorted(set().union(*(inv.getUsedVarNames() for inv in invs))))
-        redundant, total_time, check_sat_calls = checkMinimality(invs, vIndex)
+        with phase(profile, "index"):
+            vIndex = VarIndex(sorted(set().union(*(inv.getUsedVarNames() for inv in invs))))
+        if profile is not None:
+            profile.size(invariants=len(invs), vars=vIndex.size(),
+                         terms=sum(len(inv.varCoeffs) for inv in invs))
+        with span("minimality", model_name(sol_file), name):
+            try:
+                if jobs > 1 and len(invs) >= 2 * jobs:
+                    redundant, total_time, check_sat_calls = checkMinimalityParallel(invs, jobs, profile)
+                else:
+                    redundant, total_time, check_sat_calls = checkMinimality(invs, vIndex, profile)
+            except OverflowError:
+                # coefficients beyond 64 bits cannot be shared, test in this process
+                redundant, total_time, check_sat_calls = checkMinimality(invs, vIndex, profile)
+            except RuntimeError as e:
+                print(f"{name}: Error: {e}")
+                if results:
+                    results.write("minimality", [name], verdict="error",
+                                  ms=round((time.perf_counter() - start) * 1000, 3),
+                                  sizes={"invariants": len(invs), "vars": vIndex.size()},
+                                  redundant=[], check_sat_calls=0)
+                continue
+        if stats:
+            stats.write(profile, result="minimal" if not redundant else "redundant",
+                        redundant=len(redundant), check_sat_calls=check_sat_calls)
+        if results:
+            results.write("minimality", [name], verdict="minimal" if not redundant else "redundant",
+                          ms=round((time.perf_counter() - start) * 1000, 3),
+                          sizes={"invariants": len(invs), "vars": vIndex.size()},
+                          redundant=redundant, check_sat_calls=check_sat_calls)
         
         print(f"Minimality test took {total_time:.3f} seconds with {check_sat_calls} check-sat calls")
         if redundant:
@@ -115,9 +406,10 @@ def test_minimality(sol_files: List[str]) -> None:
         print()
         
 
-def generate_summary(results: Dict[Tuple[str, str], bool], file_names: List[str]) -> None:
+def generate_summary(results: Dict[Tuple[str, str], bool], file_names: List[str]) -> List[List[str]]:
     """
     Generate a synthetic report of which files agree with which.
+    Returns the consistency groups (sorted names).
     """
     print("=== Consistency Summary ===")
     consistent_pairs = [(a, b) for (a, b), consistent in results.items() if consistent]
@@ -125,7 +417,7 @@ def generate_summary(results: Dict[Tuple[str, str], bool], file_names: List[str]
 
     if not discrepant_pairs:
         print("All invariant sets are consistent with each other.")
-        return
+        return [sorted(file_names)]
 
     agreement_groups: Dict[frozenset, List[str]] = {}
     for name in file_names:
@@ -144,6 +436,7 @@ def generate_summary(results: Dict[Tuple[str, str], bool], file_names: List[str]
         for idx, group in enumerate(agreement_groups.values(), 1):
             print(f"Group {idx}: {', '.join(sorted(group))}")
         print("\nFiles within each group are consistent with each other but discrepant with files in other groups.")
+    return [sorted(group) for group in agreement_groups.values()]
 
 def main() -> None:
     # Parse arguments
@@ -152,6 +445,18 @@ def main() -> None:
         print("  --compareSolutions: Pairwise compare solutions (default if no mode specified)")
         print("  --testMinimality: Test each solution for minimality")
         print("  --keepDup: Skip deduplication (only with --compareSolutions)")
+        print("  --outOfCore: Deduplicate through on-disk hash buckets, for sets too large for memory")
+        print("               (with --keepDup, the invariants of both files are asserted once)")
+        print("  --noCore: Compare whole sets instead of factoring out the invariants common to all files")
+        print("  --noFingerprint: Run the solver even for pairs with equal row-space fingerprints")
+        print("  --confirmFingerprint: Confirm equal fingerprints with an exact rank computation")
+        print("  --stats-json=FILE: Append per-phase times, sizes and Z3 statistics as JSON lines ('-': stderr)")
+        print("  --tracemalloc: Also record the Python heap peak of each phase (slower)")
+        print("  --profile=FILE: Run under cProfile and dump the statistics to FILE")
+        print("  --results-json=FILE: Append the verdicts, violated/redundant invariants, sizes and times as JSON lines")
+        print("  --jobs=N: Split each minimality test over N worker processes")
+        print("  --witnesses=K: Enumerate up to K discrepancy witnesses and count the violations of each invariant")
+        print("  --mode=MODE: Examination mode (PFLOWS, TSEMIFLOWS, ...) of raw tool logs that do not tell it")
         sys.exit(1)
 
     keep_duplicates = False
@@ -166,9 +471,26 @@ def main() -> None:
     if "--compareSolutions" in sys.argv:
         compare_mode = True
         sol_files = [f for f in sol_files if f != "--compareSolutions"]
+    use_fingerprint = "--noFingerprint" not in sys.argv
+    confirm_fingerprint = "--confirmFingerprint" in sys.argv
+    out_of_core = "--outOfCore" in sys.argv
+    use_core = "--noCore" not in sys.argv and not out_of_core
+    sol_files = [f for f in sol_files
+                 if f not in ("--noFingerprint", "--confirmFingerprint", "--outOfCore", "--noCore")]
     if "--testMinimality" in sys.argv:
         minimality_mode = True
         sol_files = [f for f in sol_files if f != "--testMinimality"]
+    stats_path = next((f.split("=", 1)[1] for f in sol_files if f.startswith("--stats-json=")), None)
+    profile_path = next((f.split("=", 1)[1] for f in sol_files if f.startswith("--profile=")), None)
+    results_path = next((f.split("=", 1)[1] for f in sol_files if f.startswith("--results-json=")), None)
+    jobs = positive_option(sol_files, "--jobs")
+    witnesses = positive_option(sol_files, "--witnesses")
+    mode = next((f.split("=", 1)[1].upper() for f in sol_files if f.startswith("--mode=")), None)
+    if "--tracemalloc" in sol_files:
+        tracemalloc.start()
+    sol_files = [f for f in sol_files
+                 if not f.startswith(("--stats-json=", "--profile=", "--results-json=", "--jobs=", "--witnesses=", "--mode="))
+                 and f != "--tracemalloc"]
 
     # Validate mode selection
     if compare_mode and minimality_mode:
@@ -182,20 +504,55 @@ def main() -> None:
     if len(sol_files) < 1:
         print("Error: At least 1 solution file required")
         sys.exit(1)
+    for f in sol_files:
+        if isRawLog(f):
+            try:
+                rawLogMode(f, mode)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
 
     file_names = [get_base_name(f) for f in sol_files]
+    stats = StatsWriter(stats_path) if stats_path else None
+    results_writer = ResultWriter(results_path) if results_path else None
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler:
+        profiler.enable()
 
     # Execute selected mode
     if compare_mode:
         results: Dict[Tuple[str, str], bool] = {}
+        core = ModelCore(sol_files, mode) if use_core else None
         for i in range(len(sol_files)):
             for j in range(i + 1, len(sol_files)):
                 nameA, nameB = file_names[i], file_names[j]
-                consistent = compare_invariants(sol_files[i], sol_files[j], keep_duplicates)
+                profile = PhaseProfile("compare", [sol_files[i], sol_files[j]]) if stats else None
+                record: Dict[str, object] = {}
+                start = time.perf_counter()
+                with span("compare", model_name(sol_files[i]), f"{nameA} {nameB}"):
+                    consistent = compare_invariants(sol_files[i], sol_files[j], keep_duplicates,
+                                                    use_fingerprint, confirm_fingerprint, profile, record,
+                                                    out_of_core, core, witnesses, mode)
                 results[(nameA, nameB)] = consistent
-        generate_summary(results, file_names)
+                if stats:
+                    stats.write(profile, result="consistent" if consistent else "discrepancy")
+                if results_writer:
+                    results_writer.write("compare", [nameA, nameB],
+                                         verdict="consistent" if consistent else "discrepancy",
+                                         ms=round((time.perf_counter() - start) * 1000, 3), **record)
+        groups = generate_summary(results, file_names)
+        if results_writer:
+            results_writer.write("summary", file_names, pairs=len(results),
+                                 discrepancies=sum(1 for c in results.values() if not c), groups=groups)
     elif minimality_mode:
-        test_minimality(sol_files)
+        test_minimality(sol_files, stats, results_writer, jobs, mode)
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(profile_path)
+        print(f"cProfile statistics written to {profile_path} (read with python3 -m pstats)")
+    if stats:
+        stats.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
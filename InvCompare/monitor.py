@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Run a command and record its memory and CPU time series (see campaign/telemetry.py).
+
+  monitor.py --output LOG.mon [--interval 0.5] -- COMMAND...
+
+The command inherits stdin/stdout/stderr and the exit status is passed on.
+runners/run_common.sh wraps every tool invocation with it when MONITOR_INTERVAL
+is set (e.g. export MONITOR_INTERVAL=0.5 before run_atool.sh), and writes the
+series next to the log; collectCSV.py then fills the MonPeakMem,
+MonParallelism and MonTimeToPeak columns.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from campaign.telemetry import Sampler, write_series
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a command and sample its memory and CPU usage.")
+    parser.add_argument("--output", required=True, help="Series file to write.")
+    parser.add_argument("--interval", type=float, default=0.5, help="Sampling interval (s).")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Command to run, after --.")
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no command given")
+
+    start = time.monotonic()
+    try:
+        proc = subprocess.Popen(command)
+    except OSError as e:
+        print(f"monitor.py: cannot run {command[0]}: {e}", file=sys.stderr)
+        sys.exit(127)
+    sampler = Sampler(proc.pid)
+    samples = []
+    while True:
+        t_ms = int((time.monotonic() - start) * 1000)
+        mem_kb, cpu_ms = sampler.sample()
+        samples.append((t_ms, mem_kb, cpu_ms))
+        pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+        if pid:
+            break
+        time.sleep(args.interval)
+    proc.returncode = 0  # reaped by wait4
+
+    wall_ms = int((time.monotonic() - start) * 1000)
+    if sampler.cgroup is None:
+        # all descendants are reaped now: exact total
+        cpu_ms = int((usage.ru_utime + usage.ru_stime) * 1000)
+    else:
+        cpu_ms = samples[-1][2]
+    try:
+        write_series(args.output, samples, int(args.interval * 1000), sampler.source,
+                     wall_ms, max(cpu_ms, samples[-1][2]), sampler.peak_kb)
+    except OSError as e:
+        print(f"monitor.py: cannot write {args.output}: {e}", file=sys.stderr)
+
+    if os.WIFSIGNALED(status):
+        sys.exit(128 + os.WTERMSIG(status))
+    sys.exit(os.WEXITSTATUS(status))
+
+
+if __name__ == "__main__":
+    main()
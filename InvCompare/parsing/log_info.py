@@ -0,0 +1,119 @@
+# parsing/log_info.py
+"""
+Infer tool, mode and model of a tool log from its file name and first line,
+mirroring the conventions of logs2csvpar.pl.
+"""
+
+import os
+import re
+from typing import Optional
+
+# Log extension -> tool name as understood by collectSolution.py
+LOG_EXTENSIONS = {
+    "tina": "tina",
+    "struct": "tina",
+    "its": "itstools",
+    "petri32": "petrispot",
+    "petri64": "petrispot",
+    "petri128": "petrispot",
+    "gspn": "greatspn",
+    "petrisage": "petrisage",
+}
+
+# Log directory created by run.sh / run_atool.sh -> mode
+LOGDIR_MODES = {
+    "logs_pflows": "PFLOWS",
+    "logs_tflows": "TFLOWS",
+    "logs_psemiflows": "PSEMIFLOWS",
+    "logs_tsemiflows": "TSEMIFLOWS",
+}
+
+
+def log_extension(log_path: str) -> str:
+    """Return the last extension of a log file, without the dot."""
+    return os.path.splitext(log_path)[1].lstrip(".")
+
+
+def infer_tool(log_path: str) -> Optional[str]:
+    """Return the collectSolution tool name for a log, or None if not a tool log."""
+    return LOG_EXTENSIONS.get(log_extension(log_path))
+
+
+def model_name(log_path: str) -> str:
+    """
+    Extract the model name from a log path.
+    MCC model names contain no dots, so everything after the first dot is
+    the flag suffix and tool extension (e.g. Model.nSSR_lL500.petri64).
+    """
+    return os.path.basename(log_path).split(".", 1)[0]
+
+
+def flag_suffix(log_path: str) -> str:
+    """Return the compressed flag segment of a log name, '' if absent."""
+    parts = os.path.basename(log_path).split(".")
+    return ".".join(parts[1:-1])
+
+
+def _mode_from_flags(p: bool, t: bool, flows: bool, semi: bool) -> Optional[str]:
+    if flows and semi:
+        return None
+    if flows:
+        if p and t:
+            return "FLOWS"
+        return "PFLOWS" if p else ("TFLOWS" if t else None)
+    if semi:
+        if p and t:
+            return "SEMIFLOWS"
+        return "PSEMIFLOWS" if p else ("TSEMIFLOWS" if t else None)
+    return None
+
+
+def infer_mode_from_line(tool: str, first_line: str) -> Optional[str]:
+    """
+    Infer the examination mode from the first line of a log (the tool's command
+    echo), using the same flag tests as logs2csvpar.pl.
+    """
+    if tool in ("petrispot", "itstools"):
+        pf, tf = "--Pflows" in first_line, "--Tflows" in first_line
+        ps, ts = "--Psemiflows" in first_line, "--Tsemiflows" in first_line
+        if pf or tf:
+            return _mode_from_flags(pf, tf, True, False)
+        return _mode_from_flags(ps, ts, False, ps or ts)
+    if tool == "tina":
+        def has(flag: str) -> bool:
+            return re.search(rf"\s+{flag}\s", first_line) is not None
+        if has("-F") and has("-S"):
+            return None
+        return _mode_from_flags(has("-P"), has("-T"), has("-F"), has("-S"))
+    if tool == "greatspn":
+        pb, tb = "-pbasis" in first_line, "-tbasis" in first_line
+        pi, ti = "-pinv" in first_line, "-tinv" in first_line
+        if pb or tb:
+            return _mode_from_flags(pb, tb, True, False)
+        return _mode_from_flags(pi, ti, False, pi or ti)
+    if tool == "petrisage":
+        if "TFLOWS" in first_line:
+            return "TFLOWS"
+        if "PFLOWS" in first_line:
+            return "PFLOWS"
+    return None
+
+
+def infer_mode(log_path: str, tool: Optional[str] = None) -> Optional[str]:
+    """
+    Infer the examination mode of a log: first from its first line, then from
+    the name of its logs_<mode> folder. Returns None if undecidable.
+    """
+    tool = tool or infer_tool(log_path)
+    if tool is None:
+        return None
+    try:
+        with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+            first_line = f.readline()
+    except OSError:
+        first_line = ""
+    mode = infer_mode_from_line(tool, first_line)
+    if mode is None:
+        folder = os.path.basename(os.path.dirname(os.path.abspath(log_path)))
+        mode = LOGDIR_MODES.get(folder)
+    return mode
@@ -1,19 +1,114 @@
 # parser_generic.py
+"""
+Read the invariants of a run straight from the tool's raw output, without
+collecting a .sol first: Tina logs (.tina, .struct), PetriSpot and ITS-Tools
+logs (.petri32/64/128, .its), GreatSPN invariant files (.pba, .tba, .pin, .tin,
+with the model's .net for the names) and PetriSage .tba files (<log>.petrisage.tba).
+The invariants are streamed as they are parsed.
+"""
 
-from typing import List
+import os
+from typing import Iterator, List, Optional
 from invariants.invariant import Invariant
-from .parser_tina import parseLogTina
-from .parser_petrispot import parseLogPetriSpot
+from .log_info import infer_mode
+from .parser_greatspn import parse_greatspn_invariants, parse_greatspn_net
+from .parser_petrisage import iterTbaPetriSage
+from .parser_petrispot import iterLogPetriSpot
+from .parser_solution import iterSolFile, parseSolFile
+from .parser_tina import iterLogTina
 
-def parseLogGeneric(logPath: str, isPlaceFlow: bool = True) -> List[Invariant]:
+TINA_EXTENSIONS = (".tina", ".struct")
+PETRISPOT_EXTENSIONS = (".petri32", ".petri64", ".petri128", ".its")
+# GreatSPN invariant file -> mode
+GREATSPN_MODES = {".pba": "PFLOWS", ".tba": "TFLOWS", ".pin": "PSEMIFLOWS", ".tin": "TSEMIFLOWS"}
+PETRISAGE_SUFFIX = ".petrisage.tba"
+PLACE_MODES = ("PFLOWS", "PSEMIFLOWS", "FLOWS", "SEMIFLOWS")
+
+_warnedUnknown = set()  # raw logs already reported by iterInvariants
+
+
+def isRawLog(path: str) -> bool:
+    """True for a raw tool output that parseLogGeneric reads, False for solution files."""
+    return path.endswith(TINA_EXTENSIONS + PETRISPOT_EXTENSIONS + tuple(GREATSPN_MODES))
+
+
+def rawLogMode(path: str, mode: Optional[str] = None) -> str:
     """
-    Dispatcher that looks at file extension (or eventually content).
+    Examination mode of a raw tool output: fixed by the extension of GreatSPN
+    files, else the given mode, else inferred from the log's first line or
+    logs_<mode> folder (for PetriSage, from its .petrisage log).
+    """
+    if not path.endswith(PETRISAGE_SUFFIX):
+        greatspn = GREATSPN_MODES.get(os.path.splitext(path)[1])
+        if greatspn is not None:
+            return greatspn
+    if mode is None:
+        log = path[:-len(".tba")] if path.endswith(PETRISAGE_SUFFIX) else path
+        mode = infer_mode(log) if os.path.exists(log) else infer_mode(path, "petrisage")
+    if mode is None:
+        raise ValueError(f"Cannot infer the examination mode of '{path}', give it with --mode")
+    return mode
+
+
+def greatspnNet(invPath: str) -> str:
+    """The .net file of a GreatSPN invariant file: <stem>.net, else model.net next to it."""
+    for net in (os.path.splitext(invPath)[0] + ".net", os.path.join(os.path.dirname(invPath), "model.net")):
+        if os.path.exists(net):
+            return net
+    raise FileNotFoundError(f"No .net model found for '{invPath}'")
+
+
+def iterLogGeneric(logPath: str, isPlaceFlow: bool = True) -> Iterator[Invariant]:
+    """
+    Dispatcher that looks at the file extension and streams the invariants.
     isPlaceFlow: if True, parse P-flows or P-semi-flows from the log;
                  if False, parse T-flows or T-semi-flows.
     """
-    if logPath.endswith(".tina"):
-        return parseLogTina(logPath, isPlaceFlow)
-    elif logPath.endswith(".petri32"):
-        return parseLogPetriSpot(logPath, isPlaceFlow)
+    if logPath.endswith(PETRISAGE_SUFFIX):
+        yield from iterTbaPetriSage(logPath, isPlaceFlow)
+    elif logPath.endswith(TINA_EXTENSIONS):
+        yield from iterLogTina(logPath, isPlaceFlow)
+    elif logPath.endswith(PETRISPOT_EXTENSIONS):
+        yield from iterLogPetriSpot(logPath, isPlaceFlow)
+    elif os.path.splitext(logPath)[1] in GREATSPN_MODES:
+        place_names, transition_names = parse_greatspn_net(greatspnNet(logPath))
+        yield from parse_greatspn_invariants(logPath, place_names if isPlaceFlow else transition_names,
+                                             isPlaceFlow)
     else:
         raise ValueError(f"Unknown or unsupported format for file '{logPath}'")
+
+
+def parseLogGeneric(logPath: str, isPlaceFlow: bool = True) -> List[Invariant]:
+    """Same as iterLogGeneric, as a list."""
+    return list(iterLogGeneric(logPath, isPlaceFlow))
+
+
+def iterInvariants(path: str, mode: Optional[str] = None, allowUnknown: bool = False) -> Iterator[Invariant]:
+    """
+    Stream the invariants of a solution file (.sol, .sol.gz, .solb) or of a raw
+    tool output, as parseSolFile would return them once collected: invariants
+    with an unknown constant ('?') are dropped unless allowUnknown.
+    """
+    if not isRawLog(path):
+        yield from iterSolFile(path, allowUnknown)
+        return
+    isPlaceFlow = rawLogMode(path, mode) in PLACE_MODES
+    kept = dropped = 0
+    for inv in iterLogGeneric(path, isPlaceFlow):
+        if allowUnknown or inv.const != "?":
+            kept += 1
+            yield inv
+        else:
+            dropped += 1
+    if dropped and path not in _warnedUnknown:
+        # GreatSPN .pba/.pin and PetriSage P-flows never give the constants
+        _warnedUnknown.add(path)
+        what = "all its" if not kept else f"{dropped} of its"
+        print(f"Warning: {path}: {what} invariants have an unknown constant ('?') and are ignored")
+
+
+def parseInvariants(path: str, mode: Optional[str] = None, allowUnknown: bool = False) -> List[Invariant]:
+    """Same as iterInvariants, as a list (solution files use parseSolFile)."""
+    if not isRawLog(path):
+        return parseSolFile(path, allowUnknown)
+    return list(iterInvariants(path, mode, allowUnknown))
@@ -0,0 +1,455 @@
+# parsing/parser_logstats.py
+"""
+Extract the per-run statistics of a tool log (sizes, invariant counts, times,
+memory, status), as one CSV row. This is a port of the parse_*_file
+functions of logs2csvpar.pl; the regular expressions and their order are
+kept identical so that both extractors produce the same rows; the trailing
+SolOverflow and SolFingerprint columns (from the solution metrics sidecar)
+and Mon* columns (from the monitor series, see monitor.py) are specific to
+this port.
+"""
+
+import os
+import re
+from typing import Dict, Optional, Tuple, Union
+
+Value = Union[int, float, str]
+
+CSV_COLUMNS = [
+    "Model", "Tool", "Examination", "CardP", "CardT", "CardA", "NbPInv", "NbTInv",
+    "NbDecomp", "TimeInternal", "SolSizeKB", "SolSize", "SolPosSize", "SolMaxCoeff",
+    "SolSumCoeff", "SolNbCoeff", "Time", "Mem", "Status", "SolOverflow",
+    "SolFingerprint", "MonPeakMem", "MonParallelism", "MonTimeToPeak"
+]
+
+TIME_LINE_PATTERN = re.compile(
+    r'.*user .*system (.*)elapsed .*CPU \(.*avgtext+.*avgdata (.*)maxresident\)k')
+ELAPSED_PATTERN = re.compile(r'(\d+):(\d+)\.(\d+)')
+TIMEOUT_PATTERN = re.compile(r'TIME LIMIT: Killed by timeout after (\d+) seconds')
+# Time (ms) of a "TIME LIMIT" line that does not give it: the campaign timeout, as in logs2csvpar.pl
+DEFAULT_TIME_LIMIT_MS = 120000
+PARSED_PT_PATTERN = re.compile(
+    r'Parsed PT model containing (\d+) places and (\d+) transitions and (\d+) arcs in (\d+) ms')
+
+
+def _parse_time_line(line: str, row: Dict[str, Value]) -> bool:
+    """
+    Parse the `time` summary line into row['Time'] (ms) and row['Mem'] (kB).
+    Returns True if the line matched.
+    """
+    m = TIME_LINE_PATTERN.search(line)
+    if not m:
+        return False
+    elapsed, mem = m.group(1), m.group(2)
+    em = ELAPSED_PATTERN.search(elapsed)
+    if em:
+        frac = em.group(3)
+        frac_ms = int(frac) * (10 ** (3 - len(frac)))
+        row["Time"] = 60000 * int(em.group(1)) + 1000 * int(em.group(2)) + frac_ms
+    else:
+        row["Time"] = elapsed
+    row["Mem"] = int(mem) if mem.isdigit() else mem
+    return True
+
+
+def _new_row(model: str, tool: str) -> Dict[str, Value]:
+    row: Dict[str, Value] = {col: -1 for col in CSV_COLUMNS}
+    row["Model"] = model
+    row["Tool"] = tool
+    row["Examination"] = "UNK"
+    row["Status"] = "UNK"
+    return row
+
+
+def _examination_from_dashed(first_line: str) -> str:
+    """Mode detection shared by PetriSpot and ITS-Tools logs."""
+    if "--Pflows" in first_line and "--Tflows" in first_line:
+        return "FLOWS"
+    if "--Psemiflows" in first_line and "--Tsemiflows" in first_line:
+        return "SEMIFLOWS"
+    for flag, mode in (("--Pflows", "PFLOWS"), ("--Psemiflows", "PSEMIFLOWS"),
+                       ("--Tflows", "TFLOWS"), ("--Tsemiflows", "TSEMIFLOWS")):
+        if flag in first_line:
+            return mode
+    return "UNK"
+
+
+def _read_lines(logPath: str):
+    with open(logPath, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def _first_line(logPath: str) -> str:
+    with open(logPath, "r", encoding="utf-8", errors="replace") as f:
+        return f.readline()
+
+
+def logModelTool(logPath: str) -> Optional[Tuple[str, str]]:
+    """
+    The (Model, Tool) columns of the row of a log, derived from its file name
+    only (so also for logs that do not exist yet). None for non-log files.
+    """
+    name = os.path.basename(logPath)
+    if re.search(r'\.petri(32|64|128)$', name):
+        m = re.match(r'^(.*)\.([^.]*)\.petri(32|64|128)$', name)
+        if m:
+            model, flags, tool_base = m.group(1), m.group(2), f"PetriSpot{m.group(3)}"
+        else:
+            m = re.search(r'\.petri(32|64|128)', name)
+            model, flags, tool_base = re.sub(r'\.petri(32|64|128)', "", name), "", f"PetriSpot{m.group(1)}"
+        return (model, f"{tool_base}_{flags}" if flags else tool_base)
+    elif name.endswith(".its"):
+        return (name.replace(".its", ""), "ItsTools")
+    elif re.search(r'\.(struct|tina)$', name):
+        return (re.sub(r'\.(struct|tina)$', "", name), "tina4ti2" if name.endswith(".struct") else "tina")
+    elif name.endswith(".gspn"):
+        return (name.replace(".gspn", ""), "GreatSPN")
+    elif name.endswith(".petrisage"):
+        m = re.match(r'^(.*)\.([^.]*)\.petrisage$', name)
+        if m:
+            return (m.group(1), f"PetriSage_{m.group(2)}" if m.group(2) else "PetriSage")
+        return (re.sub(r'\.petrisage$', "", name), "PetriSage")
+    return None
+
+
+def parseStatsPetriSpot(logPath: str) -> Dict[str, Value]:
+    row = _new_row(*logModelTool(logPath))
+    row["Examination"] = _examination_from_dashed(_first_line(logPath))
+
+    ptime = ttime = -1
+    overflow = False
+    patterns = [
+        (re.compile(r'Computed (\d+) P\s+flows .* in (\d+) ms'), "P"),
+        (re.compile(r'Computed (\d+) T\s+flows .* in (\d+) ms'), "T"),
+        (re.compile(r'Computed (\d+) P\s+semiflows .* in (\d+) ms'), "P"),
+        (re.compile(r'Computed (\d+) T\s+semiflows .* in (\d+) ms'), "T"),
+    ]
+    for line in _read_lines(logPath):
+        if re.search(r'Reduce places removed (\d+) places', line):
+            continue
+        if re.search(r'overflow', line, re.IGNORECASE):
+            overflow = True
+            continue
+        matched = False
+        for pat, kind in patterns:
+            pm = pat.search(line)
+            if pm:
+                if kind == "P":
+                    row["NbPInv"], ptime = int(pm.group(1)), int(pm.group(2))
+                else:
+                    row["NbTInv"], ttime = int(pm.group(1)), int(pm.group(2))
+                matched = True
+                break
+        if matched:
+            continue
+        dm = re.search(r'Total of (\d+) decompressed invariants.', line)
+        if dm:
+            row["NbDecomp"] = int(dm.group(1))
+            continue
+        pm = PARSED_PT_PATTERN.search(line)
+        if pm:
+            row["CardP"], row["CardT"], row["CardA"] = int(pm.group(1)), int(pm.group(2)), int(pm.group(3))
+            continue
+        if re.search(r'Total runtime (\d+) ms', line):
+            row["Status"] = "OK"
+            continue
+        tm = TIMEOUT_PATTERN.search(line)
+        if tm:
+            row["Time"] = int(tm.group(1)) * 1000
+            row["Status"] = "TO"
+            continue
+        if "TIME LIMIT" in line:
+            row["Status"] = "TO"
+            continue
+        _parse_time_line(line, row)
+
+    if overflow:
+        row["Status"] = "OF"
+        row["NbPInv"] = row["NbTInv"] = -1
+
+    if ptime != -1 and ttime != -1 and ptime != ttime:
+        row["TimeInternal"] = f"{ptime}/{ttime}"
+    elif ptime != -1:
+        row["TimeInternal"] = ptime
+    else:
+        row["TimeInternal"] = ttime
+    return row
+
+
+def parseStatsIts(logPath: str, timeLimitMs: int = DEFAULT_TIME_LIMIT_MS) -> Dict[str, Value]:
+    row = _new_row(*logModelTool(logPath))
+    row["Examination"] = _examination_from_dashed(_first_line(logPath))
+
+    ptime = -1
+    tottime = -1
+    of = False
+    for line in _read_lines(logPath):
+        m = re.search(r'Computed (\d+) P\s+flows in (\d+) ms', line)
+        if m:
+            row["NbPInv"], ptime = int(m.group(1)), int(m.group(2))
+            continue
+        m = re.search(r'Computed (\d+) T\s+flows in (\d+) ms', line)
+        if m:
+            row["NbTInv"] = int(m.group(1))
+            continue
+        if "Invariants computation overflowed" in line:
+            of = True
+            continue
+        m = PARSED_PT_PATTERN.search(line) or re.search(
+            r'Unfolded HLPN to a Petri net with (\d+) places and (\d+) transitions (\d+) arcs in (\d+) ms', line)
+        if m:
+            row["CardP"], row["CardT"], row["CardA"] = int(m.group(1)), int(m.group(2)), int(m.group(3))
+            continue
+        m = re.search(r'Total runtime (\d+) ms', line)
+        if m:
+            tottime = int(m.group(1))
+            row["Status"] = "OK"
+            continue
+        tm = TIMEOUT_PATTERN.search(line)
+        if tm or "TIME LIMIT" in line:
+            tottime = int(tm.group(1)) * 1000 if tm else timeLimitMs
+            row["Status"] = "TO"
+            continue
+        _parse_time_line(line, row)
+
+    if of:
+        row["Status"] = "OF"
+        row["NbPInv"] = row["NbTInv"] = -1
+    row["TimeInternal"] = tottime
+    return row
+
+
+def parseStatsTina(logPath: str) -> Dict[str, Value]:
+    row = _new_row(*logModelTool(logPath))
+
+    first_line = _first_line(logPath)
+    has = {f: re.search(rf'\s+-{f}\s', first_line) is not None for f in "FSPT"}
+    is_t_mode = False
+    if has["F"] and has["T"]:
+        row["Examination"], is_t_mode = "TFLOWS", True
+    elif has["F"] and has["P"]:
+        row["Examination"] = "PFLOWS"
+    elif has["S"] and has["T"]:
+        row["Examination"], is_t_mode = "TSEMIFLOWS", True
+    elif has["S"] and has["P"]:
+        row["Examination"] = "PSEMIFLOWS"
+    elif has["F"]:
+        row["Examination"] = "FLOWS"
+    elif has["S"]:
+        row["Examination"] = "SEMIFLOWS"
+    count_col = "NbTInv" if is_t_mode else "NbPInv"
+
+    of = False
+    for line in _read_lines(logPath):
+        m = re.search(r'(\d+) places, (\d+) transitions, (\d+) arcs', line)
+        if m:
+            row["CardP"], row["CardT"], row["CardA"] = int(m.group(1)), int(m.group(2)), int(m.group(3))
+            continue
+        m = re.search(r'(\d+) flow\(s\)', line)
+        if m:
+            row[count_col] = int(m.group(1))
+            continue
+        if re.search(r'no flow\(s\)', line):
+            row[count_col] = 0
+            continue
+        m = re.search(r'(\d+) semiflow\(s\)', line)
+        if m:
+            row[count_col] = int(m.group(1))
+            continue
+        if re.search(r'no semiflow\(s\)', line):
+            row[count_col] = 0
+            continue
+        if "ANALYSIS COMPLETED" in line:
+            row["Status"] = "OK"
+            continue
+        m = TIMEOUT_PATTERN.search(line)
+        if m:
+            row["Time"] = int(m.group(1)) * 1000
+            row["Status"] = "TO"
+            continue
+        if "Command terminated by signal 9" in line:
+            row["Status"] = "MOVF"
+            continue
+        if "overflow" in line:
+            of = True
+            continue
+        if "Command exited with non-zero status" in line:
+            row["Status"] = "MOVF"
+            continue
+        _parse_time_line(line, row)
+
+    if of:
+        row["Status"] = "OF"
+        row["NbPInv"] = row["NbTInv"] = -1
+    return row
+
+
+def parseStatsGreatSPN(logPath: str, timeLimitMs: int = DEFAULT_TIME_LIMIT_MS) -> Dict[str, Value]:
+    row = _new_row(*logModelTool(logPath))
+    lines = _read_lines(logPath)
+    first_line = next(lines, None)
+    if first_line is not None:
+        pb, tb = "-pbasis" in first_line, "-tbasis" in first_line
+        pi, ti = "-pinv" in first_line, "-tinv" in first_line
+        if pb and tb:
+            row["Examination"] = "FLOWS"
+        elif pi and ti:
+            row["Examination"] = "SEMIFLOWS"
+        elif tb:
+            row["Examination"] = "TFLOWS"
+        elif pb:
+            row["Examination"] = "PFLOWS"
+        elif ti:
+            row["Examination"] = "TSEMIFLOWS"
+        elif pi:
+            row["Examination"] = "PSEMIFLOWS"
+
+    of = False
+    counts = [
+        (re.compile(r'FOUND (\d+) VECTORS IN THE PLACE FLOW BASIS'), "NbPInv"),
+        (re.compile(r'FOUND (\d+) VECTORS IN THE TRANSITION FLOW BASIS'), "NbTInv"),
+        (re.compile(r'FOUND (\d+) PLACE SEMIFLOWS'), "NbPInv"),
+        (re.compile(r'FOUND (\d+) TRANSITION SEMIFLOWS'), "NbTInv"),
+    ]
+    for line in lines:
+        m = re.search(r'PLACES:\s+(\d+)', line)
+        if m:
+            row["CardP"] = int(m.group(1))
+            continue
+        m = re.search(r'TRANSITIONS:\s+(\d+)', line)
+        if m:
+            row["CardT"] = int(m.group(1))
+            continue
+        matched = False
+        for pat, col in counts:
+            cm = pat.search(line)
+            if cm:
+                row[col] = int(cm.group(1))
+                matched = True
+                break
+        if matched:
+            continue
+        m = TIMEOUT_PATTERN.search(line)
+        if m:
+            row["Time"] = int(m.group(1)) * 1000
+            row["Status"] = "TO"
+            continue
+        if "TIME LIMIT" in line:
+            row["Time"] = timeLimitMs
+            row["Status"] = "TO"
+            continue
+        if "overflow" in line:
+            of = True
+            continue
+        m = re.search(r'TOTAL TIME:\s*\[User\s+(\d+\.\d+)s,\s*Sys\s+(\d+\.\d+)s\]', line)
+        if m:
+            row["TimeInternal"] = (float(m.group(1)) + float(m.group(2))) * 1000.0
+            continue
+        _parse_time_line(line, row)
+
+    if of:
+        row["Status"] = "OF"
+        row["NbPInv"] = row["NbTInv"] = -1
+
+    if row["Status"] not in ("TO", "OF"):
+        exam = row["Examination"]
+        if exam == "FLOWS":
+            ok = row["NbPInv"] != -1 and row["NbTInv"] != -1
+        elif exam in ("PFLOWS", "PSEMIFLOWS"):
+            ok = row["NbPInv"] != -1
+        elif exam in ("TFLOWS", "TSEMIFLOWS"):
+            ok = row["NbTInv"] != -1
+        else:
+            ok = False
+        row["Status"] = "OK" if ok else "ERR"
+    return row
+
+
+def parseStatsPetriSage(logPath: str) -> Dict[str, Value]:
+    row = _new_row(*logModelTool(logPath))
+
+    first_line = _first_line(logPath)
+    if "TFLOWS" in first_line:
+        row["Examination"] = "TFLOWS"
+    elif "PFLOWS" in first_line:
+        row["Examination"] = "PFLOWS"
+
+    for line in _read_lines(logPath):
+        m = re.search(r'Loaded matrix: (\d+)x(\d+), (\d+) non-zero entries', line)
+        if m:
+            row["CardP"], row["CardT"], row["CardA"] = int(m.group(1)), int(m.group(2)), int(m.group(3))
+            continue
+        m = re.search(r'Extracted (\d+) flows', line)
+        if m:
+            if row["Examination"] == "PFLOWS":
+                row["NbPInv"] = int(m.group(1))
+            elif row["Examination"] == "TFLOWS":
+                row["NbTInv"] = int(m.group(1))
+            continue
+        m = re.search(r'Computed (\d+) pflows', line)
+        if m:
+            row["NbPInv"], row["Status"] = int(m.group(1)), "OK"
+            continue
+        m = re.search(r'Computed (\d+) tflows', line)
+        if m:
+            row["NbTInv"], row["Status"] = int(m.group(1)), "OK"
+            continue
+        m = TIMEOUT_PATTERN.search(line)
+        if m:
+            row["Time"] = int(m.group(1)) * 1000
+            row["Status"] = "TO"
+            continue
+        if "Command exited with non-zero status" in line:
+            row["Status"] = "ERR"
+            continue
+        _parse_time_line(line, row)
+    return row
+
+
+def parseLogStats(logPath: str, timeLimitMs: int = DEFAULT_TIME_LIMIT_MS) -> Optional[Dict[str, Value]]:
+    """
+    Dispatcher on the log extension, as in logs2csvpar.pl.
+    Returns the CSV row (without solution metrics), or None for non-log files.
+    timeLimitMs is the run's timeout, the time of a timed out ITS or GreatSPN
+    run whose log does not give it.
+    """
+    name = os.path.basename(logPath)
+    if re.search(r'\.petri(32|64|128)$', name):
+        return parseStatsPetriSpot(logPath)
+    elif name.endswith(".its"):
+        return parseStatsIts(logPath, timeLimitMs)
+    elif re.search(r'\.(struct|tina)$', name):
+        return parseStatsTina(logPath)
+    elif name.endswith(".gspn"):
+        return parseStatsGreatSPN(logPath, timeLimitMs)
+    elif name.endswith(".petrisage"):
+        return parseStatsPetriSage(logPath)
+    return None
+
+
+RESOURCE_LINE_PATTERN = re.compile(
+    r'([\d.]+)user ([\d.]+)system ([\d:.]+)elapsed .*avgdata (\d+)maxresident\)k')
+
+
+def parseTimeUsage(logPath: str) -> Optional[Dict[str, int]]:
+    """
+    Resource usage from the last `time` summary line of a log: Wall, User and
+    Sys times (ms) and Mem (max RSS, kB). None if the log has no such line.
+    Unlike the Time column, the elapsed time may also be in h:mm:ss form.
+    """
+    usage: Optional[Dict[str, int]] = None
+    for line in _read_lines(logPath):
+        m = RESOURCE_LINE_PATTERN.search(line)
+        if not m:
+            continue
+        wall = 0.0
+        for part in m.group(3).split(":"):
+            wall = wall * 60 + float(part)
+        usage = {
+            "Wall": int(round(wall * 1000)),
+            "User": int(round(float(m.group(1)) * 1000)),
+            "Sys": int(round(float(m.group(2)) * 1000)),
+            "Mem": int(m.group(4)),
+        }
+    return usage
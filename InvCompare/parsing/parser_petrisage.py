@@ -0,0 +1,38 @@
+# parsing/parser_petrisage.py
+from typing import Iterator
+from invariants.invariant import Invariant
+
+def iterTbaPetriSage(tba_file: str, is_place_flow: bool) -> Iterator[Invariant]:
+    """
+    Stream the flows of a PetriSage .tba output file.
+
+    The first line is the number of flows, then one flow per line:
+    "<number of terms> <coeff> <index> <coeff> <index> ..." with 1-based indices,
+    named p<index-1> or t<index-1>. The constant of place flows is unknown ('?'),
+    it is 0 for transition flows.
+
+    Raises:
+        ValueError: If a line is malformed.
+    """
+    prefix = "p" if is_place_flow else "t"
+    with open(tba_file, "r", encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        lines = (line for line in lines if line)
+        num_flows = int(next(lines, "0"))  # First line is number of flows
+        for _, line in zip(range(num_flows), lines):  # Stop before the final "0"
+            parts = line.split()
+            num_terms = int(parts[0])
+            terms = parts[1:]  # coeff idx coeff idx ...
+            if len(terms) != 2 * num_terms:
+                raise ValueError(f"Malformed line in {tba_file}: {line}")
+
+            var_coeffs = {}
+            for i in range(0, len(terms), 2):
+                coeff = int(terms[i])
+                idx = int(terms[i + 1]) - 1  # Convert 1-based to 0-based
+                var_coeffs[f"{prefix}{idx}"] = coeff
+
+            inv = Invariant(var_coeffs, 0)
+            if is_place_flow:
+                inv.const = "?"
+            yield inv
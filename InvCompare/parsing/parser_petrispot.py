@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import Iterator, List
 from .invariant_parser import parse_invariant_line
 from invariants.invariant import Invariant
 
@@ -8,8 +8,12 @@ def parseLogPetriSpot(logPath: str, isPlaceFlow: bool = True) -> List[Invariant]
     Parse the content of a PetriSpot log file and return a list of Invariant objects
     for either place flows or transition flows.
     """
-    invariants: List[Invariant] = []
+    return list(iterLogPetriSpot(logPath, isPlaceFlow))
 
+def iterLogPetriSpot(logPath: str, isPlaceFlow: bool = True) -> Iterator[Invariant]:
+    """
+    Stream the invariants of a PetriSpot (or ITS-Tools) log, one line at a time.
+    """
     if isPlaceFlow:
         start_block_pattern = re.compile(r'^Computed\s+\d+\s+P\s+(?:flows|semiflows)\s+in\b')
     else:
@@ -38,6 +42,4 @@ def parseLogPetriSpot(logPath: str, isPlaceFlow: bool = True) -> List[Invariant]
                     inv_expr = m.group(1)
                     inv_obj = parse_invariant_line(inv_expr)
                     if inv_obj:
-                        invariants.append(inv_obj)
-
-    return invariants
\ No newline at end of file
+                        yield inv_obj
\ No newline at end of file
@@ -0,0 +1,106 @@
+# parsing/parser_phases.py
+"""
+Phase timings of a tool log, as a long table: one (Model, Tool, Examination,
+Phase, Ms) row per phase reported by the tool. Phases are normalized across
+tools:
+
+    parse   reading the model (PetriSpot/ITS-Tools "Parsed PT model ... in N ms",
+            ITS-Tools HLPN unfolding, Tina's first step time)
+    reduce  structural reductions (ITS-Tools "Applied a total of N rules in M ms")
+    flows   the flow / semiflow computation (PetriSpot/ITS-Tools "Computed N P flows
+            ... in M ms", summed over P and T; Tina's step time after a FLOWS or
+            SEMI-FLOWS section; GreatSPN TOTAL TIME user + sys)
+    other   other Tina step times
+    total   the tool's own total ("Total runtime N ms")
+    wall    elapsed time measured by `time`
+
+A phase a tool does not report has no row.
+"""
+
+import re
+from typing import Dict, List
+
+from .parser_logstats import PARSED_PT_PATTERN, Value, _read_lines, logModelTool, parseLogStats, parseTimeUsage
+
+PHASE_COLUMNS = ["Model", "Tool", "Examination", "Phase", "Ms"]
+# phases that partition the work of a tool, in report order
+COMPONENT_PHASES = ["parse", "reduce", "flows", "other"]
+
+UNFOLD_PATTERN = re.compile(
+    r'Unfolded HLPN to a Petri net with \d+ places and \d+ transitions \d+ arcs in (\d+) ms')
+COMPUTED_PATTERN = re.compile(r'Computed \d+ [PT]\s+(?:semi)?flows .*?in (\d+) ms')
+RULES_PATTERN = re.compile(r'Applied a total of \d+ rules in (\d+) ms')
+TOTAL_PATTERN = re.compile(r'Total runtime (\d+) ms')
+GSPN_TOTAL_PATTERN = re.compile(r'TOTAL TIME:\s*\[User\s+(\d+\.\d+)s,\s*Sys\s+(\d+\.\d+)s\]')
+TINA_STEP_PATTERN = re.compile(r'^(\d+\.\d+)s$')
+
+
+def _phasesDashed(logPath: str) -> Dict[str, float]:
+    """PetriSpot and ITS-Tools: explicit '... in N ms' messages."""
+    phases: Dict[str, float] = {}
+    for line in _read_lines(logPath):
+        for pattern, phase in ((PARSED_PT_PATTERN, "parse"), (UNFOLD_PATTERN, "parse"),
+                               (RULES_PATTERN, "reduce"), (COMPUTED_PATTERN, "flows"),
+                               (TOTAL_PATTERN, "total")):
+            m = pattern.search(line)
+            if m:
+                ms = int(m.groups()[-1])
+                phases[phase] = ms if phase == "total" else phases.get(phase, 0) + ms
+                break
+    return phases
+
+
+def _phasesTina(logPath: str) -> Dict[str, float]:
+    """Tina prints the time of each step alone on a line (e.g. 0.073s) when it ends."""
+    phases: Dict[str, float] = {}
+    steps = 0
+    in_flows = False
+    for line in _read_lines(logPath):
+        stripped = line.strip()
+        if "FLOWS" in stripped:
+            in_flows = True
+            continue
+        m = TINA_STEP_PATTERN.match(stripped)
+        if not m:
+            continue
+        phase = "flows" if in_flows else ("parse" if steps == 0 else "other")
+        phases[phase] = phases.get(phase, 0) + round(float(m.group(1)) * 1000)
+        steps += 1
+        in_flows = False
+    return phases
+
+
+def _phasesGreatSPN(logPath: str) -> Dict[str, float]:
+    phases: Dict[str, float] = {}
+    for line in _read_lines(logPath):
+        m = GSPN_TOTAL_PATTERN.search(line)
+        if m:
+            phases["flows"] = (float(m.group(1)) + float(m.group(2))) * 1000.0
+    return phases
+
+
+def parsePhases(logPath: str) -> List[Dict[str, Value]]:
+    """Phase rows of a log (see the module documentation), [] for non-log files."""
+    key = logModelTool(logPath)
+    if key is None:
+        return []
+    model, tool = key
+    if tool.startswith(("PetriSpot", "ItsTools")):
+        phases = _phasesDashed(logPath)
+    elif tool.startswith("tina"):
+        phases = _phasesTina(logPath)
+    elif tool == "GreatSPN":
+        phases = _phasesGreatSPN(logPath)
+    else:
+        phases = {}
+    usage = parseTimeUsage(logPath)
+    if usage is not None:
+        phases["wall"] = usage["Wall"]
+    if not phases:
+        return []
+    stats = parseLogStats(logPath)
+    examination = stats["Examination"] if stats else "UNK"
+    return [
+        {"Model": model, "Tool": tool, "Examination": examination, "Phase": phase, "Ms": ms}
+        for phase, ms in phases.items()
+    ]
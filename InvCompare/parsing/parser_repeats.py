@@ -0,0 +1,88 @@
+# parsing/parser_repeats.py
+"""
+Statistics of repeated runs (see benchmark.py): the logs of repetition k of a
+log folder are in <folder>/bench/r<k>/, with the usual log names. Each job
+gives one row with the min, median and median absolute deviation of its wall,
+user and sys times (ms) and max RSS (kB) over the repetitions that succeeded.
+"""
+
+import os
+import re
+from statistics import median
+from typing import Dict, List, Optional, Sequence
+
+from .parser_logstats import Value, logModelTool, parseLogStats, parseTimeUsage
+
+BENCH_DIR = "bench"
+REPEAT_PATTERN = re.compile(r'^r(\d+)$')
+
+REPEAT_METRICS = ["Wall", "User", "Sys", "Mem"]
+REPEAT_COLUMNS = ["Model", "Tool", "Examination", "Runs", "RunsOK", "Status"] + [
+    f"{metric}{stat}" for metric in REPEAT_METRICS for stat in ("Min", "Median", "MAD")
+]
+
+
+def repeatFolders(folder: str) -> List[str]:
+    """The r<k> repetition folders of a log folder, in repetition order."""
+    bench = os.path.join(folder, BENCH_DIR)
+    try:
+        names = os.listdir(bench)
+    except FileNotFoundError:
+        return []
+    reps = [(int(m.group(1)), n) for n in names for m in [REPEAT_PATTERN.match(n)] if m]
+    return [os.path.join(bench, n) for _, n in sorted(reps)]
+
+
+def mad(values: Sequence[float]) -> float:
+    """Median absolute deviation from the median."""
+    center = median(values)
+    return median(abs(v - center) for v in values)
+
+
+def repeatRow(logPaths: List[str]) -> Optional[Dict[str, Value]]:
+    """Aggregated row of the repetitions of one job (logs with the same name)."""
+    key = logModelTool(logPaths[0])
+    if key is None:
+        return None
+    row: Dict[str, Value] = {col: -1 for col in REPEAT_COLUMNS}
+    row["Model"], row["Tool"] = key
+    statuses = []
+    samples: Dict[str, List[int]] = {metric: [] for metric in REPEAT_METRICS}
+    for path in logPaths:
+        stats = parseLogStats(path)
+        if stats is None:
+            continue
+        row["Examination"] = stats["Examination"]
+        statuses.append(str(stats["Status"]))
+        usage = parseTimeUsage(path)
+        if stats["Status"] != "OK" or usage is None:
+            continue
+        for metric in REPEAT_METRICS:
+            samples[metric].append(usage[metric])
+    row["Runs"] = len(statuses)
+    row["RunsOK"] = len(samples["Wall"])
+    # a single status when all repetitions agree, else all of them (e.g. OK/TO)
+    row["Status"] = "/".join(sorted(set(statuses))) or "UNK"
+    if samples["Wall"]:
+        for metric in REPEAT_METRICS:
+            values = samples[metric]
+            row[f"{metric}Min"] = min(values)
+            row[f"{metric}Median"] = median(values)
+            row[f"{metric}MAD"] = mad(values)
+    return row
+
+
+def parseRepeats(folder: str) -> List[Dict[str, Value]]:
+    """One aggregated row per job of the repetition folders of a log folder."""
+    byName: Dict[str, List[str]] = {}
+    for rep in repeatFolders(folder):
+        for name in sorted(os.listdir(rep)):
+            path = os.path.join(rep, name)
+            if os.path.isfile(path) and logModelTool(name) is not None:
+                byName.setdefault(name, []).append(path)
+    rows = []
+    for name in sorted(byName):
+        row = repeatRow(byName[name])
+        if row is not None:
+            rows.append(row)
+    return rows
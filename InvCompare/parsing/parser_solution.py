@@ -1,21 +1,79 @@
-from typing import List
+import gzip
+from typing import IO, Iterator, List, Optional
 from .invariant_parser import parse_invariant_line
 from invariants.invariant import Invariant
+from invariants.metrics import SolutionMetrics, readSidecar
+from .solbin import isSolBin, iterSolBin, readSolBin
 
-def parseSolFile(solPath: str) -> List[Invariant]:
+def openSolFile(solPath: str) -> IO[str]:
+    """Open a .sol file for reading as text, decompressing on the fly if gzipped."""
+    if solPath.endswith(".gz"):
+        return gzip.open(solPath, "rt", encoding="utf-8")
+    return open(solPath, "r", encoding="utf-8")
+
+def parseSolFile(solPath: str, allowUnknown: bool = False) -> List[Invariant]:
     """
     Parse a .sol file containing invariants in PetriSpot equation format.
     Each line is an equation like "p1 + 2*p2 - p3 = 1".
+    Gzipped files (.sol.gz) are decompressed in memory, binary files (.solb)
+    are loaded with the binary reader.
+    With allowUnknown, lines with an unknown constant ("= ?") are kept with const '?',
+    otherwise they are dropped.
+    """
+    if solPath.endswith(".solb") or isSolBin(solPath):
+        invs = readSolBin(solPath)
+        return invs if allowUnknown else [inv for inv in invs if inv.const != "?"]
+    return list(iterSolFile(solPath, allowUnknown))
+
+def iterSolFile(solPath: str, allowUnknown: bool = False) -> Iterator[Invariant]:
+    """
+    Stream the invariants of a solution file one at a time, as parseSolFile
+    would return them, without holding the text ones in memory (binary ones
+    hold their compact arrays, see iterSolBin).
     """
-    invariants: List[Invariant] = []
+    if solPath.endswith(".solb") or isSolBin(solPath):
+        for inv in iterSolBin(solPath):
+            if allowUnknown or inv.const != "?":
+                yield inv
+        return
 
-    with open(solPath, "r", encoding="utf-8") as f:
+    with openSolFile(solPath) as f:
         for line in f:
             line_stripped = line.strip()
             if not line_stripped:  # Skip empty lines
                 continue
-            inv_obj = parse_invariant_line(line_stripped)
+            if allowUnknown and line_stripped.endswith("= ?"):
+                inv_obj = parse_invariant_line(line_stripped[:-1] + "0")
+                if inv_obj:
+                    inv_obj.const = "?"
+            else:
+                inv_obj = parse_invariant_line(line_stripped)
             if inv_obj:
-                invariants.append(inv_obj)
+                yield inv_obj
 
-    return invariants
\ No newline at end of file
+def solutionMetrics(solPath: str) -> SolutionMetrics:
+    """
+    Compute the metrics of an existing .sol / .sol.gz file in one streaming pass.
+    Unknown constants ('= ?', GreatSPN and PetriSage place flows) are accepted.
+    Used to rebuild the .sol.json sidecar of solutions written before sidecars existed.
+    """
+    metrics = SolutionMetrics()
+    with openSolFile(solPath) as f:
+        for line in f:
+            line_stripped = line.strip()
+            if not line_stripped:
+                continue
+            inv_obj = parse_invariant_line(line_stripped.replace("= ?", "= 0"))
+            if inv_obj:
+                metrics.add(inv_obj, line.rstrip("\n"))
+    return metrics
+
+def solutionFingerprint(solPath: str) -> Optional[str]:
+    """
+    Row-space fingerprint of a solution, read from its metrics sidecar; None if
+    there is no sidecar or it has no fingerprint (the solution was too large to
+    fingerprint at collection time). It is never computed here: on a large set
+    the row reduction costs more than the comparison it would save.
+    """
+    metrics = readSidecar(solPath)
+    return metrics.get("Fingerprint") if metrics is not None else None
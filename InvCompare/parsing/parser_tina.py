@@ -1,7 +1,7 @@
 # parser_tina.py
 
 import re
-from typing import List
+from typing import Iterator, List, Tuple
 from invariants.invariant import Invariant
 
 # Regex for an entire line describing a flow:
@@ -22,10 +22,41 @@ def parseLogTina(logPath: str, isPlaceFlow: bool = True) -> List[Invariant]:
       - Skips blank lines within the relevant section.
       - Only parses lines that match e.g. "... (integer)" at the end.
     """
+    return list(iterLogTina(logPath, isPlaceFlow))
 
-    invariants: List[Invariant] = []
-    relevant_lines: List[str] = []
-
+def iterLogTina(logPath: str, isPlaceFlow: bool = True) -> Iterator[Invariant]:
+    """
+    Stream the flows of the relevant sections of a Tina log, one line at a time.
+    A section cut short by a repeated header is discarded, as parseLogTina
+    always did: a first pass locates the complete sections, a second one
+    parses their lines.
+    """
+    sections = _relevantSections(logPath, isPlaceFlow)
+    if not sections:
+        return
+    current = 0
+    with open(logPath, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f):
+            while current < len(sections) and number >= sections[current][1]:
+                current += 1
+            if current == len(sections):
+                return
+            if number < sections[current][0]:
+                continue
+            line_stripped = line.strip()
+            if line_stripped:
+                try:
+                    yield _parseLineTina(line_stripped, isPlaceFlow)
+                except ValueError:
+                    # Not a valid flow line (could be '0.073s' or other noise)
+                    continue
+
+def _relevantSections(logPath: str, isPlaceFlow: bool) -> List[Tuple[int, int]]:
+    """
+    (first, end) line numbers of the relevant sections of a Tina log: from the
+    line after a header to the end condition (or end of file), skipping the
+    sections restarted by a repeated header before their end.
+    """
     # Define possible section headers
     if isPlaceFlow:
         possible_headers = [
@@ -38,19 +69,20 @@ def parseLogTina(logPath: str, isPlaceFlow: bool = True) -> List[Invariant]:
             "T-SEMI-FLOWS GENERATING SET"
         ]
 
-    inside_relevant_section = False
+    sections: List[Tuple[int, int]] = []
+    first = None  # first line of the current section, None outside
+    number = -1
 
     with open(logPath, "r", encoding="utf-8") as f:
-        for line in f:
+        for number, line in enumerate(f):
             line_stripped = line.strip()
 
             # If the line contains the relevant header, we start a new section
             if any(hdr in line_stripped for hdr in possible_headers):
-                inside_relevant_section = True
-                relevant_lines = []
+                first = number + 1
                 continue
 
-            if inside_relevant_section:
+            if first is not None:
                 # End conditions
                 if (
                     line_stripped.startswith("0.000s")
@@ -61,17 +93,13 @@ def parseLogTina(logPath: str, isPlaceFlow: bool = True) -> List[Invariant]:
                     or "ANALYSIS COMPLETED" in line_stripped
                 ):
                     # End of relevant block
-                    invariants.extend(_parseFlowLines(relevant_lines, isPlaceFlow))
-                    inside_relevant_section = False
-                else:
-                    # Accumulate lines (including blank lines)
-                    relevant_lines.append(line_stripped)
+                    sections.append((first, number))
+                    first = None
 
     # If we ended the file while still in the relevant section
-    if inside_relevant_section and relevant_lines:
-        invariants.extend(_parseFlowLines(relevant_lines, isPlaceFlow))
-
-    return invariants
+    if first is not None:
+        sections.append((first, number + 1))
+    return sections
 
 def normalize_name(text: str) -> str:
     # Remove wrapping braces if present.
@@ -127,26 +155,3 @@ def _parseLineTina(line: str, isPlaceFlow: bool) -> Invariant:
     
     return Invariant(var_coeffs, const_val)
 
-
-def _parseFlowLines(lines: List[str], isPlaceFlow: bool) -> List[Invariant]:
-    """
-    Parse each line in 'lines' as a single flow if it matches the pattern:
-       varName varName... (const)
-    ignoring lines that are empty or do not match.
-    For transition flows (isPlaceFlow == False), the constant is discarded (set to 0).
-    """
-    result: List[Invariant] = []
-    for ln in lines:
-        ln_stripped = ln.strip()
-        if not ln_stripped:
-            # Skip blank lines
-            continue
-        
-        try:
-            inv = _parseLineTina(ln_stripped, isPlaceFlow)
-            result.append(inv)
-        except ValueError:
-            # Not a valid flow line (could be '0.073s' or other noise)
-            continue
-    
-    return result
\ No newline at end of file
@@ -0,0 +1,255 @@
+# parsing/solbin.py
+"""
+Compact binary solution format (.solb).
+
+Layout (all integers are unsigned LEB128 varints unless stated otherwise):
+
+    header : b"SOLB" | version (1 byte) | flags (1 byte) | content hash (16 bytes)
+    payload (zlib-compressed if flags & FLAG_ZLIB):
+        nnames, then per name: byte length + UTF-8 bytes   (sorted name table)
+        nrows, then per row its number of terms            (CSR row offsets, delta coded)
+        id section   : per term, the variable id as a fixed width little-endian
+                       unsigned integer (1, 2 or 4 bytes, the smallest fitting nnames)
+        coefficients : per term, one byte: zigzag(value) if below 255, else 255 (escape)
+        escapes      : per escaped coefficient, in order, a tagged integer
+        constants    : per row, a tagged integer
+
+Variable ids and small coefficients are fixed width rather than varints so that
+the loader decodes them with array conversions and a table lookup instead of a
+Python loop per term; zlib recovers most of the space.
+
+A tagged integer t encodes: t == 0 unknown ('?' constant), t == 1 big-int escape
+(followed by a byte length and the two's complement big-endian bytes),
+otherwise zigzag(value) + 2, used whenever zigzag(value) < 2**64.
+
+The content hash is the BLAKE2b-128 digest of the uncompressed payload; equal
+hashes mean identical solutions (same names, rows and values, in the same order).
+"""
+
+import hashlib
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from invariants.invariant import Invariant
+
+MAGIC = b"SOLB"
+VERSION = 1
+FLAG_ZLIB = 1
+HASH_SIZE = 16
+HEADER_SIZE = len(MAGIC) + 2 + HASH_SIZE
+
+TAG_UNKNOWN = 0
+TAG_BIGINT = 1
+ZIGZAG_LIMIT = 2**64
+COEFF_ESCAPE = 0xFF
+
+# Row-compressed solution: (names, row_lengths, col_ids, coeffs, consts)
+SolArrays = Tuple[List[str], List[int], List[int], List[int], List[Optional[int]]]
+
+
+# one byte coefficient -> integer (the escape entry is never used)
+_UNZIGZAG_BYTE = [((zz >> 1) if not (zz & 1) else -((zz + 1) >> 1)) for zz in range(256)]
+
+
+def _id_typecode(nnames: int) -> str:
+    """array typecode of the smallest unsigned type able to index nnames names."""
+    if nnames <= 0xFF:
+        return "B"
+    if nnames <= 0xFFFF:
+        return "H"
+    return "I" if array("I").itemsize == 4 else "L"
+
+
+def _put_varint(out: bytearray, v: int) -> None:
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def _put_tagged(out: bytearray, v: Optional[int]) -> None:
+    if v is None:
+        out.append(TAG_UNKNOWN)
+        return
+    zz = (v << 1) if v >= 0 else ((-v << 1) - 1)
+    if zz < ZIGZAG_LIMIT:
+        _put_varint(out, zz + 2)
+    else:
+        raw = v.to_bytes((v.bit_length() + 8) // 8, "big", signed=True)
+        out.append(TAG_BIGINT)
+        _put_varint(out, len(raw))
+        out += raw
+
+
+def isSolBin(path: str) -> bool:
+    """True if the file starts with the .solb magic number."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def encodeSolution(rows: Sequence[Tuple[Dict[str, int], Optional[int]]], compress: bool = True) -> bytes:
+    """
+    Encode rows of (varCoeffs, const) into .solb bytes; const None means unknown.
+    """
+    names = sorted(set().union(*(r[0].keys() for r in rows))) if rows else []
+    index = {nm: i for i, nm in enumerate(names)}
+
+    payload = bytearray()
+    _put_varint(payload, len(names))
+    for nm in names:
+        raw = nm.encode("utf-8")
+        _put_varint(payload, len(raw))
+        payload += raw
+
+    sorted_rows = [sorted((index[v], c) for v, c in coeffs.items() if c != 0) for coeffs, _ in rows]
+    _put_varint(payload, len(rows))
+    for terms in sorted_rows:
+        _put_varint(payload, len(terms))
+    ids = array(_id_typecode(len(names)), (var_id for terms in sorted_rows for var_id, _ in terms))
+    if sys.byteorder != "little":
+        ids.byteswap()
+    coeff_bytes = bytearray()
+    escapes = bytearray()
+    for terms in sorted_rows:
+        for _, coeff in terms:
+            zz = (coeff << 1) if coeff >= 0 else ((-coeff << 1) - 1)
+            if zz < COEFF_ESCAPE:
+                coeff_bytes.append(zz)
+            else:
+                coeff_bytes.append(COEFF_ESCAPE)
+                _put_tagged(escapes, coeff)
+    payload += ids.tobytes()
+    payload += coeff_bytes
+    payload += escapes
+    for _, const in rows:
+        _put_tagged(payload, const)
+
+    digest = hashlib.blake2b(bytes(payload), digest_size=HASH_SIZE).digest()
+    flags = FLAG_ZLIB if compress else 0
+    body = zlib.compress(bytes(payload), 6) if compress else bytes(payload)
+    return MAGIC + bytes([VERSION, flags]) + digest + body
+
+
+def writeSolBin(path: str, invariants: Sequence[Invariant], compress: bool = True) -> str:
+    """Write invariants to a .solb file; a non-integer constant ('?') is stored as unknown."""
+    rows = [(inv.varCoeffs, inv.const if isinstance(inv.const, int) else None) for inv in invariants]
+    data = encodeSolution(rows, compress)
+    with open(path, "wb") as f:
+        f.write(data)
+    return data[len(MAGIC) + 2:HEADER_SIZE].hex()
+
+
+def readSolBinHash(path: str) -> str:
+    """Return the content hash of a .solb file (hex), reading only its header."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a .solb file: {path}")
+    return header[len(MAGIC) + 2:].hex()
+
+
+def decodeSolution(data: bytes) -> SolArrays:
+    """Decode .solb bytes into row-compressed arrays."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Bad magic number, not a .solb file")
+    version, flags = data[len(MAGIC)], data[len(MAGIC) + 1]
+    if version != VERSION:
+        raise ValueError(f"Unsupported .solb version {version}")
+    body = data[HEADER_SIZE:]
+    payload = zlib.decompress(body) if flags & FLAG_ZLIB else body
+
+    pos = 0
+    n = len(payload)
+
+    def varint() -> int:
+        nonlocal pos
+        b = payload[pos]
+        pos += 1
+        if b < 0x80:
+            return b
+        result = b & 0x7F
+        shift = 7
+        while True:
+            b = payload[pos]
+            pos += 1
+            result |= (b & 0x7F) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    def tagged() -> Optional[int]:
+        nonlocal pos
+        t = varint()
+        if t == TAG_UNKNOWN:
+            return None
+        if t == TAG_BIGINT:
+            length = varint()
+            v = int.from_bytes(payload[pos:pos + length], "big", signed=True)
+            pos += length
+            return v
+        zz = t - 2
+        return (zz >> 1) if not (zz & 1) else -((zz + 1) >> 1)
+
+    nnames = varint()
+    names: List[str] = []
+    for _ in range(nnames):
+        length = varint()
+        names.append(payload[pos:pos + length].decode("utf-8"))
+        pos += length
+
+    nrows = varint()
+    row_lengths = [varint() for _ in range(nrows)]
+    nterms = sum(row_lengths)
+    ids = array(_id_typecode(nnames))
+    ids_len = nterms * ids.itemsize
+    ids.frombytes(payload[pos:pos + ids_len])
+    if sys.byteorder != "little":
+        ids.byteswap()
+    col_ids: List[int] = ids.tolist()
+    pos += ids_len
+
+    coeff_section = payload[pos:pos + nterms]
+    coeffs: List[int] = list(map(_UNZIGZAG_BYTE.__getitem__, coeff_section))
+    pos += nterms
+    k = coeff_section.find(COEFF_ESCAPE)
+    while k != -1:
+        coeffs[k] = tagged()
+        k = coeff_section.find(COEFF_ESCAPE, k + 1)
+
+    consts = [tagged() for _ in range(nrows)]
+    if pos != n:
+        raise ValueError("Trailing bytes in .solb payload")
+    return (names, row_lengths, col_ids, coeffs, consts)
+
+
+def readSolBinArrays(path: str) -> SolArrays:
+    """Load a .solb file as row-compressed arrays (names, row_lengths, col_ids, coeffs, consts)."""
+    with open(path, "rb") as f:
+        return decodeSolution(f.read())
+
+
+def iterSolBin(path: str) -> Iterator[Invariant]:
+    """
+    Stream the invariants of a .solb file; unknown constants become '?'.
+    The format is columnar, so the compact arrays are decoded first, but the
+    Invariant objects are built one at a time.
+    """
+    names, row_lengths, col_ids, coeffs, consts = readSolBinArrays(path)
+    k = 0
+    for length, const in zip(row_lengths, consts):
+        end = k + length
+        # zero coefficients are never stored, skip Invariant.__init__ filtering
+        inv = Invariant.__new__(Invariant)
+        inv.varCoeffs = {names[c]: v for c, v in zip(col_ids[k:end], coeffs[k:end])}
+        inv.const = const if const is not None else "?"
+        yield inv
+        k = end
+
+
+def readSolBin(path: str) -> List[Invariant]:
+    """Load a .solb file as Invariant objects; unknown constants become '?'."""
+    return list(iterSolBin(path))
@@ -0,0 +1,106 @@
+# profiling.py
+"""
+Per-phase profiling records of main.py (--stats-json), one JSON object per
+line and per comparison or minimality test:
+
+    {"kind": "compare", "files": ["A.sol.gz", "B.sol.gz"], "result": "consistent",
+     "phases_ms": {"parse": 812.4, "index": 35.1, "dedup": 120.9, "z3_build": 410.0, "z3_solve": 2210.7},
+     "sizes": {"invariantsA": 1520, "invariantsB": 1520, "uniqueA": 12, "uniqueB": 9, "vars": 640, "terms": 3811},
+     "z3": {"conflicts": 1021, "decisions": 5230, "memory": 41.2, ...},
+     "peak_rss_kb": 512344, "pid": 4242}
+
+With tracemalloc running (--tracemalloc), each phase also gets the peak of the
+Python heap during that phase in phases_peak_kb.
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, TextIO
+
+
+def peakRssKb() -> int:
+    """Peak resident set size of this process (kB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def solverStatistics(solver) -> Dict[str, float]:
+    """The statistics of a Z3 solver (conflicts, decisions, memory, ...) as a dict."""
+    stats = solver.statistics()
+    return {key: stats.get_key_value(key) for key in stats.keys()}
+
+
+class PhaseProfile:
+    """Wall time per phase, problem sizes and solver statistics of one test."""
+
+    def __init__(self, kind: str, files: List[str]) -> None:
+        self.record: Dict[str, object] = {"kind": kind, "files": files}
+        self.phases: Dict[str, float] = {}
+        self.peaks: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+        self.z3: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block; repeated phases add up."""
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+            if tracing:
+                peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+                self.peaks[name] = max(self.peaks.get(name, 0.0), peak_kb)
+
+    def size(self, **sizes: int) -> None:
+        self.sizes.update(sizes)
+
+    def solver(self, solver) -> None:
+        """Add the statistics of a solver (summed over the solvers of the test)."""
+        for key, value in solverStatistics(solver).items():
+            if "memory" in key:
+                self.z3[key] = max(self.z3.get(key, 0), value)
+            else:
+                self.z3[key] = self.z3.get(key, 0) + value
+
+    def toDict(self) -> Dict[str, object]:
+        record = dict(self.record)
+        record["phases_ms"] = {k: round(v, 3) for k, v in self.phases.items()}
+        if self.peaks:
+            record["phases_peak_kb"] = {k: round(v, 1) for k, v in self.peaks.items()}
+        record["sizes"] = self.sizes
+        record["z3"] = self.z3
+        record["peak_rss_kb"] = peakRssKb()
+        record["pid"] = os.getpid()
+        return record
+
+
+def phase(profile: Optional[PhaseProfile], name: str):
+    """profile.phase(name), or a no-op context without profile."""
+    return profile.phase(name) if profile is not None else nullcontext()
+
+
+class StatsWriter:
+    """Appends profile records as JSON lines to a file ('-' for stderr)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.stream: TextIO = sys.stderr if path == "-" else open(path, "a", encoding="utf-8")
+
+    def write(self, profile: PhaseProfile, **fields: object) -> None:
+        record = profile.toDict()
+        record.update(fields)
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self.stream is not sys.stderr:
+            self.stream.close()
@@ -0,0 +1,55 @@
+# results.py
+"""
+Machine-readable results of main.py (--results-json), one JSON object per
+line, next to the text reports (.comp, .sol.min). collectResults.py loads the
+records of a whole campaign into tables.
+
+A compared pair:
+    {"kind": "compare", "model": "Angiogenesis-PT-01", "names": ["M.petri64", "M.struct"],
+     "verdict": "discrepancy", "method": "solver", "ms": 812.4,
+     "sizes": {"invariantsA": 12, "invariantsB": 12, "uniqueA": 2, "uniqueB": 1, "vars": 40},
+     "violatedA": [], "violatedB": [0], "witness": {"p3": 1, "p7": 2}}
+method is same-blob (links to one solution store blob), fingerprint (equal
+row-space fingerprints), confirmed (fingerprints confirmed by an exact rank
+computation) or solver; violated* are indices in the unique invariants of each
+side; witness is the non-zero part of the assignment found by the solver. When
+the common core of the model's files is used, unique* and violated* refer to
+the residuals of each side outside the core, and sizes also has core and
+eliminated. With --witnesses=K, the record also has the number of witnesses
+found and, per side, how many of them violate each unique
+invariant: "witnesses": 5, "violationCountsA": {}, "violationCountsB": {"0": 5, "3": 2}.
+
+The consistency groups of the files given to one main.py call:
+    {"kind": "summary", "model": "...", "names": [...], "pairs": 3, "discrepancies": 2,
+     "groups": [["M.petri64", "M.its"], ["M.struct"]]}
+
+A minimality test:
+    {"kind": "minimality", "model": "...", "name": "M.petri64", "verdict": "redundant",
+     "ms": 120.5, "sizes": {"invariants": 12, "vars": 40}, "redundant": [3, 7], "check_sat_calls": 12}
+"""
+
+import json
+import os
+from typing import Dict, List
+
+from parsing.log_info import model_name
+
+
+class ResultWriter:
+    """Appends result records as JSON lines to a file, each in a single write."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, kind: str, names: List[str], **fields: object) -> None:
+        record: Dict[str, object] = {"kind": kind, "model": model_name(names[0]) if names else ""}
+        if kind == "minimality":
+            record["name"] = names[0]
+        else:
+            record["names"] = names
+        record.update(fields)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(record) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Cost-aware local campaign scheduler, an alternative to the sequential model
+loop of run.sh / run_atool.sh.
+- Expands the (mode x tool x flag set x model) jobs; a tool's flag sets are the
+  cartesian product of its --matrix groups, written as in run_oar2.sh.
+- Predicts the time and memory of each job from past invar.csv files.
+- Runs the jobs on --jobs local cores, longest first, keeping the sum of the
+  memory reserved by running jobs below a budget; each job goes through
+  runners/run_job.sh and runners/run_<tool>.sh, so logs are named and limited
+  exactly as with run_atool.sh. Jobs whose log already exists are skipped.
+Must be run from the folder containing config.sh, like run_atool.sh.
+
+Example:
+  python3 InvCompare/runCampaign.py PFLOWS TFLOWS --tools=tina,petri \\
+      --matrix "tina=@MLton fixed-heap 15G -- -mp | @MLton max-heap 8G -- -4ti2 -I" \\
+      --matrix "petri=--noSingleSignRow | ''" --jobs 16 --mem=16G -t 120 --dry-run
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict
+
+from campaign.costmodel import CostModel, parse_mem, physical_mem_kb
+from campaign.jobs import RUNNER_TOOLS, expand_jobs, parse_matrices, read_model_list
+from campaign.scheduler import longest_first, run_jobs, runner_command, simulate
+
+MODES = ["PFLOWS", "TFLOWS", "PSEMIFLOWS", "TSEMIFLOWS"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a campaign on local cores, longest predicted jobs first.")
+    parser.add_argument("modes", nargs="+", choices=MODES, help="Examination modes.")
+    parser.add_argument("--tools", default="tina,petri,itstools,gspn",
+                        help="Comma separated runners (tina, petri, itstools, gspn, petrisage).")
+    parser.add_argument("--matrix", action="append", default=[], metavar="TOOL=GROUP",
+                        help="Flag group of a tool, alternatives separated by '|' ('' for none). Repeatable.")
+    parser.add_argument("--mem", "-mem", default="16G", help="Per-job memory limit (MemoryMax), or ANY.")
+    parser.add_argument("--mem-budget", default=None,
+                        help="Total memory of concurrently running jobs (default: 90%% of physical memory).")
+    parser.add_argument("-t", "--timeout", type=int, default=120, help="Per-job timeout in seconds.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of concurrent jobs.")
+    parser.add_argument("-solution", "--solution", action="store_true", help="Collect solution files.")
+    parser.add_argument("--model-filter", default=None, help="First letter range of the models, e.g. A-D.")
+    parser.add_argument("--model-list", default=None,
+                        help="File of the model names to run, one per line (e.g. from selectModels.py).")
+    parser.add_argument("--models", default=os.environ.get("MODELDIR"), help="Models folder (default $MODELDIR).")
+    parser.add_argument("--history", action="append", default=None,
+                        help="Past results CSV used to predict costs (default: invar.csv). Repeatable.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan and its predicted makespan only.")
+    args = parser.parse_args()
+
+    tools = [t for t in args.tools.split(",") if t]
+    unknown = [t for t in tools if t not in RUNNER_TOOLS]
+    if unknown:
+        parser.error(f"unknown tool(s): {', '.join(unknown)}")
+    if not args.models or not os.path.isdir(args.models):
+        parser.error("models folder not found, use --models or set MODELDIR")
+    if args.model_filter and not (len(args.model_filter) == 3 and args.model_filter[1] == "-"
+                                  and args.model_filter[0].isalpha() and args.model_filter[2].isalpha()):
+        parser.error("--model-filter must be X-Y (e.g. A-D)")
+    if args.jobs < 1:
+        parser.error("--jobs must be positive")
+    if args.model_list and not os.path.isfile(args.model_list):
+        parser.error(f"model list {args.model_list} not found")
+    try:
+        matrices = parse_matrices(tools, args.matrix)
+        mem_limit_kb = parse_mem(args.mem)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.mem_budget:
+        budget_kb = parse_mem(args.mem_budget)
+    else:
+        physical = physical_mem_kb()
+        budget_kb = 0.9 * physical if physical else None
+    if budget_kb is None:
+        budget_kb = float("inf")
+
+    costs = CostModel(args.timeout, mem_limit_kb)
+    for path in args.history or (["invar.csv"] if os.path.exists("invar.csv") else []):
+        print(f"History: {costs.load_csv(path)} rows from {path}")
+
+    model_list = read_model_list(args.model_list) if args.model_list else None
+    jobs = [j for j in expand_jobs(args.models, args.modes, matrices, args.model_filter, model_list)
+            if not os.path.exists(j.log_path())]
+    planned = longest_first([(job, costs.predict(job)) for job in jobs])
+
+    sources: Dict[str, int] = {}
+    for _, pred in planned:
+        sources[pred.source] = sources.get(pred.source, 0) + 1
+    print(f"{len(planned)} jobs to run on {args.jobs} cores, predictions: "
+          + ", ".join(f"{n} {s}" for s, n in sorted(sources.items())))
+    work = sum(pred.seconds for _, pred in planned)
+    makespan = simulate(planned, args.jobs, budget_kb, mem_limit_kb)
+    in_order = simulate(sorted(planned, key=lambda jp: jp[0]), args.jobs, budget_kb, mem_limit_kb)
+    print(f"Predicted work {work / 3600:.2f} h, makespan {makespan / 3600:.2f} h "
+          f"(model order: {in_order / 3600:.2f} h, lower bound: {work / args.jobs / 3600:.2f} h)")
+
+    if args.dry_run:
+        for job, pred in planned:
+            print(f"{pred.seconds:8.1f}s {pred.mem_kb / 1024:8.0f}MB {pred.source:8s} {job.describe()}")
+        return
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    counts = run_jobs(planned, args.jobs, budget_kb, mem_limit_kb,
+                      runner_command(root, args.mem, args.timeout, args.solution))
+    print(f"Campaign complete: {counts['done']} jobs done, {counts['failed']} failed.")
+    sys.exit(1 if counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
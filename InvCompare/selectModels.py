@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Select K representative models from a past campaign (see campaign/subset.py),
+for a short campaign that tells whether a flag change is worth a full run.
+
+  selectModels.py [invar.csv] -k 50 [--time-bins 4] [--per-tool-failures]
+                  [-o subset.txt] [--csv subset.csv] [--check other.csv ...] [--jobs 4]
+
+Writes the selected models, one per line, to -o; run.sh, run_atool.sh and
+runCampaign.py take that file as --model-list. --csv also writes the stratum
+weight, cost and number of invariants of each selected model.
+
+Prints how well the subset's weighted aggregates (solved models, hours, PAR2)
+estimate those of the full campaign, per tool, on the CSV used for the
+selection and on each --check CSV (other past campaigns of the same models,
+e.g. with other flags or tool versions), and for each --check CSV how well the
+subset estimates the change from the first CSV.
+"""
+
+import argparse
+import csv
+import os
+import sys
+from typing import Dict
+
+from campaign.subset import (Aggregate, ModelFeatures, aggregates, full_weights, load_runs,
+                             relative_error, select, strata)
+
+
+def pct(value: float) -> str:
+    return f"{100 * value:+6.1f}%" if value != float("inf") else "    inf"
+
+
+def print_quality(title: str, models: Dict[str, ModelFeatures], weights: Dict[str, float]) -> Dict[str, Aggregate]:
+    full = aggregates(models, full_weights(models))
+    est = aggregates(models, weights)
+    print(f"\n{title}")
+    print(f"{'Tool':24s} {'Solved':>7s} {'Est.':>8s} {'Err':>7s} {'Hours':>8s} {'Est.':>8s} {'Err':>7s} "
+          f"{'PAR2(s)':>8s} {'Est.':>8s} {'Err':>7s}")
+    for tool in sorted(full):
+        f, e = full[tool], est.get(tool, Aggregate(0, 0, 0, 0))
+        print(f"{tool[:24]:24s} {f.solved:7.0f} {e.solved:8.1f} {pct(relative_error(e.solved, f.solved))} "
+              f"{f.hours:8.2f} {e.hours:8.2f} {pct(relative_error(e.hours, f.hours))} "
+              f"{f.par2_sec:8.2f} {e.par2_sec:8.2f} {pct(relative_error(e.par2_sec, f.par2_sec))}")
+    return full
+
+
+def print_change(before: Dict[str, ModelFeatures], after: Dict[str, ModelFeatures], weights: Dict[str, float]) -> None:
+    """Full and estimated change of solved models and PAR2 from before to after, per tool."""
+    common = {m: w for m, w in weights.items() if m in before and m in after}
+    full_b, full_a = aggregates(before, full_weights(before)), aggregates(after, full_weights(after))
+    est_b, est_a = aggregates(before, common), aggregates(after, common)
+    tools = sorted(set(full_b) & set(full_a) & set(est_b) & set(est_a))
+    if not tools:
+        print("  No tool in common.")
+        return
+    print(f"{'Tool':24s} {'dSolved':>8s} {'Est.':>8s} {'PAR2 ratio':>11s} {'Est.':>8s} {'Same sign':>10s}")
+    agree = 0
+    for tool in tools:
+        d_full = full_a[tool].solved - full_b[tool].solved
+        d_est = est_a[tool].solved - est_b[tool].solved
+        r_full = full_a[tool].par2_sec / full_b[tool].par2_sec if full_b[tool].par2_sec else float("nan")
+        r_est = est_a[tool].par2_sec / est_b[tool].par2_sec if est_b[tool].par2_sec else float("nan")
+        same = (r_full > 1) == (r_est > 1)
+        agree += same
+        print(f"{tool[:24]:24s} {d_full:+8.0f} {d_est:+8.1f} {r_full:11.3f} {r_est:8.3f} {'yes' if same else 'NO':>10s}")
+    print(f"  The subset gets the direction of the PAR2 change right for {agree}/{len(tools)} tools.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Select a representative subset of the models of a campaign.")
+    parser.add_argument("history", nargs="?", default="invar.csv", help="Past campaign CSV (default: invar.csv).")
+    parser.add_argument("-k", type=int, default=50, help="Number of models to select.")
+    parser.add_argument("--time-bins", type=int, default=4, help="Number of cost quantile bins.")
+    parser.add_argument("--per-tool-failures", action="store_true",
+                        help="Stratify on which tool failed how, instead of the failure classes only.")
+    parser.add_argument("--examination", default=None, help="Only use the rows of this Examination (mode).")
+    parser.add_argument("-o", "--output", default="subset.txt", help="Model list for --model-list.")
+    parser.add_argument("--csv", default="", help="Also write Model, Stratum, Weight, CostMs, Invariants to this CSV.")
+    parser.add_argument("--check", action="append", default=[],
+                        help="Other past campaign CSV to measure the estimates on. Repeatable.")
+    parser.add_argument("--jobs", type=int, default=1, help="Cores of the subset campaign, for its duration.")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.history):
+        parser.error(f"{args.history} not found")
+    if args.k <= 0:
+        parser.error("-k must be positive")
+    models = load_runs(args.history, args.examination)
+    if not models:
+        parser.error(f"no rows in {args.history}")
+    selection = select(models, args.k, args.time_bins, args.per_tool_failures)
+
+    groups = strata(models, args.time_bins, args.per_tool_failures)
+    taken: Dict[str, int] = {}
+    for stratum in selection.stratum.values():
+        taken[stratum] = taken.get(stratum, 0) + 1
+    print(f"{len(models)} models in {len(groups)} strata, {len(selection.weights)} selected:")
+    for name in sorted(groups):
+        print(f"  {name:32s} {len(groups[name]):6d} models, {taken.get(name, 0):4d} taken")
+    missed = len(groups) - len(taken)
+    if missed:
+        print(f"  {missed} strata without a model: raise -k or lower --time-bins.")
+
+    cost_ms = sum(models[m].cost_ms() for m in selection.weights)
+    full_ms = sum(f.cost_ms() for f in models.values())
+    print(f"Subset cost {cost_ms / 3.6e6:.2f} CPU-h ({cost_ms / 6e4 / args.jobs:.0f} min on {args.jobs} cores), "
+          f"{100 * cost_ms / full_ms if full_ms else 0:.1f}% of the full campaign ({full_ms / 3.6e6:.1f} CPU-h).")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(f"# {len(selection.weights)} models selected from {args.history} by selectModels.py\n")
+        for model in sorted(selection.weights):
+            f.write(model + "\n")
+    print(f"Wrote {args.output}")
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["Model", "Stratum", "Weight", "CostMs", "Invariants"])
+            for model in sorted(selection.weights):
+                writer.writerow([model, selection.stratum[model], f"{selection.weights[model]:.3f}",
+                                 models[model].cost_ms(), models[model].invariants()])
+        print(f"Wrote {args.csv}")
+
+    print_quality(f"Estimates on {args.history} (selection data):", models, selection.weights)
+    for path in args.check:
+        other = load_runs(path, args.examination)
+        print_quality(f"Estimates on {path}:", other, selection.weights)
+        print(f"\nChange from {args.history} to {path}:")
+        print_change(models, other, selection.weights)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Share identical solutions between runs through a content-addressed store
+(see solution/store.py): each distinct invariant set is kept once, and every
+logs_*/<run>.sol.gz becomes a link to its blob, read through unchanged.
+
+  solStore.py add logs_pflows logs_tflows/M.petri64.sol.gz [--store solstore] [--verify] [--jobs N]
+  solStore.py stats [--store solstore]
+  solStore.py gc [--store solstore] [--grace 3600] [--dry-run]
+
+add folders default to all logs_* in the current directory. Every link is
+recorded in the store when added, and gc removes the blobs none of their
+recorded links points to any more, wherever the linking campaigns live.
+"""
+
+import argparse
+import glob
+import os
+import sys
+from functools import partial
+from multiprocessing import Pool
+from typing import List, Tuple
+
+from solution.store import DEFAULT_GRACE_SECONDS, add_solution, collect_garbage, iter_solution_paths, store_stats
+
+
+def log_folders(sources: List[str]) -> List[str]:
+    return sources or sorted(d for d in glob.glob("logs_*") if os.path.isdir(d))
+
+
+def add_one(store: str, verify: bool, sol_path: str) -> Tuple[str, str]:
+    """Worker: sol_path -> (sol_path, status message)."""
+    try:
+        key, created = add_solution(store, sol_path, verify)
+    except Exception as e:
+        return (sol_path, f"ERROR: {e}")
+    return (sol_path, f"{'new' if created else 'shared'} {key}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Content-addressed store of solution files.")
+    store = argparse.ArgumentParser(add_help=False)
+    store.add_argument("--store", default="solstore", help="Store folder (default: solstore).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("add", parents=[store], help="Move solutions into the store and link them back.")
+    p.add_argument("sources", nargs="*", help="Solution files or log folders (default: logs_*).")
+    p.add_argument("--verify", action="store_true", help="Re-read each new blob before linking.")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    sub.add_parser("stats", parents=[store], help="Recorded links, blobs and space saved.")
+    p = sub.add_parser("gc", parents=[store], help="Remove the blobs no recorded link points to.")
+    p.add_argument("--grace", type=float, default=DEFAULT_GRACE_SECONDS,
+                   help=f"Keep unlinked blobs and link records younger than this many seconds (default: {DEFAULT_GRACE_SECONDS}).")
+    p.add_argument("--dry-run", action="store_true", help="Only list the blobs that would be removed.")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "add":
+            paths = [path for src in log_folders(args.sources)
+                     for path in (iter_solution_paths([src]) if os.path.isdir(src) else [src])]
+            errors = shared = 0
+            with Pool(processes=max(1, args.jobs)) as pool:
+                for sol_path, msg in pool.imap_unordered(partial(add_one, args.store, args.verify),
+                                                         paths, chunksize=4):
+                    errors += msg.startswith("ERROR")
+                    shared += msg.startswith("shared")
+                    print(f"{sol_path}: {msg}")
+            print(f"Added {len(paths) - errors} solutions to {args.store}, {shared} sharing an existing blob")
+            sys.exit(1 if errors else 0)
+        elif args.command == "stats":
+            s = store_stats(args.store)
+            print(f"{s.refs} links ({s.unreachable} unreachable) on {s.referenced} of {s.blobs} blobs")
+            print(f"{s.stored_bytes / 2**20:.1f} MB stored for {s.logical_bytes / 2**20:.1f} MB of linked solutions")
+        else:
+            removed, freed, unreachable = collect_garbage(args.store, args.grace, args.dry_run)
+            for path in removed:
+                print(path)
+            for link in unreachable:
+                print(f"Warning: kept for {link}, whose folder is missing", file=sys.stderr)
+            print(f"{'Would remove' if args.dry_run else 'Removed'} {len(removed)} blobs, {freed / 2**20:.1f} MB")
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
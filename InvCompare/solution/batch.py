@@ -0,0 +1,153 @@
+# solution/batch.py
+"""
+Batch collection of solutions: process many tool logs in a single Python
+process with a worker pool, instead of one interpreter per tool run.
+"""
+
+import os
+import sys
+from functools import partial
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Tuple
+from parsing.log_info import infer_tool, infer_mode, model_name
+from parsing.parser_solution import solutionMetrics
+from invariants.metrics import readSidecar, writeSidecar
+from solution.generic import create_solution
+from campaign.events import span
+
+COLLECTABLE_MODES = ("PFLOWS", "PSEMIFLOWS", "TFLOWS", "TSEMIFLOWS")
+
+# A collection task: (log_path, tool, mode, model_path); None fields are inferred.
+Task = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+def is_collected(log_path: str) -> bool:
+    """A log is collected once its .sol.gz exists next to it."""
+    return os.path.exists(f"{log_path}.sol.gz")
+
+
+def no_solution_path(log_path: str) -> str:
+    """Marker recording that a log was collected but holds no solution (timeout, error)."""
+    return f"{log_path}.nosol"
+
+
+def is_recorded_without_solution(log_path: str) -> bool:
+    """True if a no-solution marker exists and is not older than the log (a re-run clears it)."""
+    marker = no_solution_path(log_path)
+    if not os.path.exists(marker):
+        return False
+    return not os.path.exists(log_path) or os.path.getmtime(log_path) <= os.path.getmtime(marker)
+
+
+def record_no_solution(log_path: str, reason: str) -> Tuple[str, str, str]:
+    """Write the no-solution marker (holding the reason) so later batches skip the log."""
+    with open(no_solution_path(log_path), "w", encoding="utf-8") as f:
+        f.write(reason + "\n")
+    return (log_path, "OK", f"no solution ({reason}), recorded")
+
+
+def iter_log_paths(sources: Iterable[str]) -> Iterator[str]:
+    """
+    Expand sources into log paths: directories are listed (non-recursively),
+    '-' reads one path per line from stdin, '@file' reads one path per line from file.
+    Lines may carry tab-separated tool, mode and model folder after the path.
+    """
+    for src in sources:
+        if src == "-":
+            for line in sys.stdin:
+                if line.strip():
+                    yield line.rstrip("\n")
+        elif src.startswith("@"):
+            with open(src[1:], "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield line.rstrip("\n")
+        elif os.path.isdir(src):
+            for name in sorted(os.listdir(src)):
+                yield os.path.join(src, name)
+        else:
+            yield src
+
+
+def make_task(entry: str, mode: Optional[str], models_dir: Optional[str]) -> Optional[Task]:
+    """Turn a queue entry into a task, or None if it is not a collectable log."""
+    fields = entry.split("\t")
+    log_path = fields[0]
+    tool = fields[1] if len(fields) > 1 and fields[1] else infer_tool(log_path)
+    if tool is None:
+        return None
+    task_mode = fields[2] if len(fields) > 2 and fields[2] else mode
+    model_path = fields[3] if len(fields) > 3 and fields[3] else None
+    if model_path is None and models_dir:
+        model_path = os.path.join(models_dir, model_name(log_path))
+    return (log_path, tool, task_mode, model_path)
+
+
+def collect_one(task: Task, binary: bool = False) -> Tuple[str, str, str]:
+    """
+    Collect the solution of a single log. Never raises: returns
+    (log_path, status, message) with status in OK, SKIP, ERR.
+    """
+    log_path, tool, mode, model_path = task
+    try:
+        if is_collected(log_path):
+            sol_path = f"{log_path}.sol.gz"
+            if readSidecar(sol_path) is None:  # missing or outdated
+                writeSidecar(sol_path, solutionMetrics(sol_path))
+                return (log_path, "OK", "metrics sidecar added")
+            return (log_path, "SKIP", "already collected")
+        if is_recorded_without_solution(log_path):
+            return (log_path, "SKIP", "no solution (recorded)")
+        if not os.path.isfile(log_path):
+            return (log_path, "ERR", "log not found")
+        mode = mode or infer_mode(log_path, tool)
+        if mode not in COLLECTABLE_MODES:
+            return (log_path, "SKIP", f"unsupported or unknown mode {mode}")
+        if tool == "petrisage" and not os.path.exists(f"{log_path}.tba"):
+            return record_no_solution(log_path, "no .tba output")
+        if tool == "greatspn" and not model_path:
+            return (log_path, "ERR", "model folder required (use --models)")
+        with span("collect", model_name(log_path), tool, mode):
+            create_solution(tool, log_path, model_path or "", mode, binary)
+        if not is_collected(log_path):  # e.g. GreatSPN wrote no invariant file
+            return record_no_solution(log_path, "no invariant output")
+        return (log_path, "OK", f"{tool} {mode}")
+    except Exception as e:  # one bad log must not stop the batch
+        return (log_path, "ERR", f"{type(e).__name__}: {e}")
+
+
+def collect_batch(
+    sources: List[str],
+    mode: Optional[str] = None,
+    models_dir: Optional[str] = None,
+    jobs: int = 1,
+    binary: bool = False
+) -> Tuple[int, int, int]:
+    """
+    Collect solutions for all logs found in sources with a pool of jobs workers.
+    Already collected logs are skipped (only their missing metrics sidecar is
+    created), as are logs recorded without a solution, so the batch can be
+    re-run safely. Logs that fail with ERR are retried on the next run.
+    Returns the counts (ok, skipped, errors).
+    """
+    tasks = (make_task(e, mode, models_dir) for e in iter_log_paths(sources))
+    tasks = (t for t in tasks if t is not None)
+
+    counts = {"OK": 0, "SKIP": 0, "ERR": 0}
+
+    def report(result: Tuple[str, str, str]) -> None:
+        log_path, status, message = result
+        counts[status] += 1
+        if status != "SKIP":
+            print(f"{status} {log_path}: {message}", flush=True)
+
+    worker = partial(collect_one, binary=binary)
+    if jobs <= 1:
+        for task in tasks:
+            report(worker(task))
+    else:
+        with Pool(processes=jobs) as pool:
+            for result in pool.imap_unordered(worker, tasks, chunksize=4):
+                report(result)
+
+    return (counts["OK"], counts["SKIP"], counts["ERR"])
@@ -4,10 +4,13 @@ from solution.tina import create_solution_for_tina
 from solution.petrispot import create_solution_for_petrispot
 from solution.greatspn import create_solution_for_greatspn
 from solution.petrisage import create_solution_for_petrisage  # New import
+from parsing.parser_solution import parseSolFile
+from parsing.solbin import writeSolBin
 
-def create_solution(tool: str, log_path: str, model_path: str, mode: str) -> None:
+def create_solution(tool: str, log_path: str, model_path: str, mode: str, binary: bool = False) -> None:
     """
     Dispatch to the appropriate tool-specific solution creator and compress the result.
+    With binary, also write the solution in the compact binary format (.solb).
     """
     if tool == "tina":
         create_solution_for_tina(log_path, model_path, mode)
@@ -22,5 +25,7 @@ def create_solution(tool: str, log_path: str, model_path: str, mode: str) -> Non
 
     # Compress the .sol file to .sol.gz and remove the original
     sol_file = f"{log_path}.sol"
+    if binary and os.path.exists(sol_file):
+        writeSolBin(f"{log_path}.solb", parseSolFile(sol_file, allowUnknown=True))
     if os.path.exists(sol_file):
         os.system(f"gzip -f {sol_file}")  # -f to overwrite if .sol.gz exists
\ No newline at end of file
@@ -3,6 +3,7 @@ import os
 from typing import List
 from invariants.invariant import Invariant
 from invariants.report import formatInvariantAsEquation
+from solution.writer import SolWriter
 from parsing.parser_greatspn import parse_greatspn_net, parse_greatspn_invariants
 
 def create_solution_for_greatspn(log_path: str, model_path: str, mode: str) -> None:
@@ -50,10 +51,10 @@ def create_solution_for_greatspn(log_path: str, model_path: str, mode: str) -> N
     invariants: List[Invariant] = parse_greatspn_invariants(inv_file, names, is_place_flow)
     
     # Write to .sol file
-    with open(sol_file, "w", encoding="utf-8") as f:
+    with SolWriter(sol_file) as w:
         for inv in invariants:
             # Hack: Handle '?' constant for place flows
             line = formatInvariantAsEquation(inv)
             if is_place_flow and inv.const == "?":
                 line = line.replace(" = ?", " = ?")
-            f.write(line + "\n")
\ No newline at end of file
+            w.write(inv, line)
\ No newline at end of file
@@ -2,7 +2,7 @@ from typing import List
 import os
 import re
 from invariants.invariant import Invariant
-from invariants.report import formatInvariantAsEquation
+from solution.writer import SolWriter
 from parsing.invariant_parser import parse_invariant_line
 
 def create_solution_for_petrispot(log_path: str, model_path: str, mode: str) -> None:
@@ -14,7 +14,7 @@ def create_solution_for_petrispot(log_path: str, model_path: str, mode: str) ->
     inv_line_pattern = re.compile(r'^\s*inv\s*:\s*(.*)$')
     
     with open(log_path, "r", encoding="utf-8") as log_f, \
-         open(sol_file, "w", encoding="utf-8") as sol_f, \
+         SolWriter(sol_file) as sol_w, \
          open(tmp_file, "w", encoding="utf-8") as tmp_f:
         
         for line in log_f:
@@ -24,7 +24,7 @@ def create_solution_for_petrispot(log_path: str, model_path: str, mode: str) ->
                 inv_expr = match.group(1)
                 inv = parse_invariant_line(inv_expr)
                 if inv:
-                    sol_f.write(formatInvariantAsEquation(inv) + "\n")
+                    sol_w.write(inv)
             else:
                 tmp_f.write(line)
     
@@ -0,0 +1,252 @@
+# solution/store.py
+"""
+Content-addressed store of collected solutions.
+
+PetriSpot 32/64/128, ITS-Tools and the --extra-petri-flags variants often
+produce the same invariants, each kept in its own logs_*/<run>.sol.gz. The
+store keeps one blob per distinct invariant set, named by the hash of its
+canonical text: every invariant in equation format with sorted terms
+(formatInvariantAsEquation), the lines sorted, duplicates and unknown
+constants kept. Blobs are read-only gzip files written without a timestamp:
+
+    <store>/<key[:2]>/<key>.sol.gz
+
+Each run's <run>.sol.gz becomes a relative symlink to its blob, so every
+reader of the existing names (main.py, the shell scripts, zcat) reads
+through the link unchanged, and two runs sharing a blob are recognized by
+their resolved path. The .sol.json sidecar and the logs stay per run.
+
+Every link is also recorded inside the store, at add time, as a file named
+by the hash of the link's absolute path in <key>.refs/ next to the blob.
+Garbage collection only trusts these records, so it is safe on a store shared
+by several campaign trees: a blob is removed once none of its recorded links
+still points to it. A record whose link is gone but whose folder still exists
+is dropped; one whose folder is missing (a tree moved or not mounted) is kept
+and reported. Records and blobs younger than a grace period are kept, so that
+an add running at the same time is never collected before its link exists.
+"""
+
+import gzip
+import hashlib
+import os
+import shutil
+import stat
+import time
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from invariants.report import formatInvariantAsEquation
+from parsing.parser_solution import parseSolFile
+
+BLOB_SUFFIX = ".sol.gz"
+REFS_SUFFIX = ".refs"
+DEFAULT_GRACE_SECONDS = 3600
+
+
+class StoreStats(NamedTuple):
+    refs: int           # links recorded in the store that still point to their blob
+    unreachable: int    # recorded links whose folder is missing (kept by gc)
+    blobs: int          # blobs in the store
+    referenced: int     # blobs with at least one live or unreachable link
+    stored_bytes: int   # size of all blobs
+    logical_bytes: int  # size the linked runs would take as separate files
+
+
+class RefStatus(NamedTuple):
+    live: List[str]         # recorded links still pointing to the blob
+    unreachable: List[str]  # recorded links whose folder is missing
+    stale: List[str]        # record files of links that are gone or point elsewhere
+
+
+def canonical_lines(sol_path: str) -> List[str]:
+    """Canonical text of a solution: sorted equation lines, '?' constants kept."""
+    return sorted(formatInvariantAsEquation(inv) for inv in parseSolFile(sol_path, allowUnknown=True))
+
+
+def solution_key(lines: List[str]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for line in lines:
+        h.update(line.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def blob_path(store: str, key: str) -> str:
+    return os.path.join(store, key[:2], key + BLOB_SUFFIX)
+
+
+def refs_dir(blob: str) -> str:
+    """Folder holding the link records of a blob."""
+    return blob[:-len(BLOB_SUFFIX)] + REFS_SUFFIX
+
+
+def is_entry(path: str, store: str) -> bool:
+    """True if path is a link to a blob of the store."""
+    if not os.path.islink(path):
+        return False
+    target = os.path.realpath(path)
+    return os.path.dirname(os.path.dirname(target)) == os.path.realpath(store) and target.endswith(BLOB_SUFFIX)
+
+
+def _write_blob(path: str, lines: List[str]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as f:
+        for line in lines:
+            f.write(line.encode("utf-8") + b"\n")
+    os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(tmp, path)
+
+
+def _record(blob: str, sol_path: str) -> None:
+    """Record in the store that sol_path links to blob (one file per link, written atomically)."""
+    link = os.path.abspath(sol_path)
+    folder = refs_dir(blob)
+    os.makedirs(folder, exist_ok=True)
+    record = os.path.join(folder, hashlib.blake2b(link.encode("utf-8"), digest_size=16).hexdigest())
+    tmp = f"{record}.tmp{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(link + "\n")
+    os.replace(tmp, record)
+
+
+def _link(sol_path: str, blob: str) -> None:
+    """Replace sol_path by a relative link to blob, atomically."""
+    tmp = f"{sol_path}.tmp{os.getpid()}"
+    os.symlink(os.path.relpath(blob, os.path.dirname(os.path.abspath(sol_path))), tmp)
+    os.replace(tmp, sol_path)
+
+
+def add_solution(store: str, sol_path: str, verify: bool = False) -> Tuple[str, bool]:
+    """
+    Move a .sol.gz solution into the store, record the link and link it back.
+    Returns (key, True if a new blob was written). An existing entry is only recorded again.
+    With verify, the blob is re-read and compared with the solution before linking.
+    """
+    if not sol_path.endswith(BLOB_SUFFIX):
+        raise ValueError(f"{sol_path} is not a .sol.gz solution")
+    if is_entry(sol_path, store):
+        blob = os.path.realpath(sol_path)
+        _record(blob, sol_path)
+        return os.path.basename(blob)[:-len(BLOB_SUFFIX)], False
+    lines = canonical_lines(sol_path)
+    key = solution_key(lines)
+    blob = blob_path(store, key)
+    created = not os.path.exists(blob)
+    if created:
+        _write_blob(blob, lines)
+    if verify and canonical_lines(blob) != lines:
+        raise ValueError(f"{blob} does not match {sol_path}")
+    # Recorded before linking: a collection running now sees a fresh record and keeps the blob
+    _record(blob, sol_path)
+    _link(sol_path, blob)
+    if not os.path.exists(blob):
+        # Collected between the existence check and the record: write it back
+        _write_blob(blob, lines)
+        _record(blob, sol_path)
+    return key, created
+
+
+def iter_solution_paths(folders: Iterable[str]) -> Iterator[str]:
+    """The *.sol.gz names of the given folders (links or files), in one directory scan each."""
+    for folder in folders:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(BLOB_SUFFIX):
+                    yield entry.path
+
+
+def iter_blobs(store: str) -> Iterator[str]:
+    """Blobs and leftover temporary files of the store (not the link records)."""
+    if not os.path.isdir(store):
+        return
+    with os.scandir(store) as shards:
+        for shard in shards:
+            if shard.is_dir(follow_symlinks=False):
+                with os.scandir(shard.path) as blobs:
+                    for blob in blobs:
+                        if not blob.is_dir(follow_symlinks=False):
+                            yield blob.path
+
+
+def blob_refs(blob: str, grace_seconds: float = 0) -> RefStatus:
+    """Check the recorded links of a blob. Records younger than grace_seconds count as live."""
+    live: List[str] = []
+    unreachable: List[str] = []
+    stale: List[str] = []
+    folder = refs_dir(blob)
+    if not os.path.isdir(folder):
+        return RefStatus(live, unreachable, stale)
+    target = os.path.realpath(blob)
+    deadline = time.time() - grace_seconds
+    with os.scandir(folder) as records:
+        for record in records:
+            try:
+                with open(record.path, encoding="utf-8") as f:
+                    link = f.readline().rstrip("\n")
+                fresh = record.stat(follow_symlinks=False).st_mtime > deadline
+            except OSError:
+                continue
+            if not link:
+                stale.append(record.path)
+            elif os.path.realpath(link) == target or fresh:
+                live.append(link)
+            elif not os.path.isdir(os.path.dirname(link)):
+                unreachable.append(link)
+            else:
+                stale.append(record.path)
+    return RefStatus(live, unreachable, stale)
+
+
+def collect_garbage(store: str, grace_seconds: float = DEFAULT_GRACE_SECONDS,
+                    dry_run: bool = False) -> Tuple[List[str], int, List[str]]:
+    """
+    Remove the blobs (and leftover temporary files) older than grace_seconds
+    that no recorded link points to any more, with the records of links that
+    are gone. Only the records kept in the store are trusted, whatever log
+    folders exist. Returns the removed paths, the bytes freed, and the
+    unreachable links that kept a blob alive.
+    """
+    deadline = time.time() - grace_seconds
+    removed: List[str] = []
+    unreachable: List[str] = []
+    freed = 0
+    for path in iter_blobs(store):
+        st = os.stat(path, follow_symlinks=False)
+        if path.endswith(BLOB_SUFFIX):
+            refs = blob_refs(path, grace_seconds)
+            unreachable.extend(refs.unreachable)
+            if not dry_run:
+                for record in refs.stale:
+                    os.remove(record)
+            if refs.live or refs.unreachable or st.st_mtime > deadline:
+                continue
+        elif st.st_mtime > deadline:
+            continue
+        if not dry_run:
+            os.remove(path)
+            shutil.rmtree(refs_dir(path), ignore_errors=True)
+        removed.append(path)
+        freed += st.st_size
+    if not dry_run:
+        for shard in {os.path.dirname(path) for path in removed}:
+            try:
+                os.rmdir(shard)
+            except OSError:
+                pass
+    return removed, freed, unreachable
+
+
+def store_stats(store: str) -> StoreStats:
+    refs = unreachable = blobs = referenced = stored = logical = 0
+    for path in iter_blobs(store):
+        if not path.endswith(BLOB_SUFFIX):
+            continue
+        status = blob_refs(path)
+        size = os.path.getsize(path)
+        blobs += 1
+        stored += size
+        refs += len(status.live)
+        unreachable += len(status.unreachable)
+        referenced += bool(status.live or status.unreachable)
+        logical += size * len(status.live)
+    return StoreStats(refs, unreachable, blobs, referenced, stored, logical)
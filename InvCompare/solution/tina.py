@@ -2,7 +2,7 @@ import os
 import re
 from typing import Optional
 from invariants.invariant import Invariant
-from invariants.report import formatInvariantAsEquation
+from solution.writer import SolWriter
 from parsing.parser_tina import _parseLineTina
 
 def create_solution_for_tina(log_path: str, model_path: str, mode: str) -> None:
@@ -29,7 +29,7 @@ def create_solution_for_tina(log_path: str, model_path: str, mode: str) -> None:
     
     # First pass: process the log and collect invariants
     with open(log_path, "r", encoding="utf-8") as log_f, \
-         open(sol_file, "w", encoding="utf-8") as sol_f, \
+         SolWriter(sol_file) as sol_w, \
          open(tmp_file, "w", encoding="utf-8") as tmp_f:
         
         line_num = 0
@@ -54,7 +54,7 @@ def create_solution_for_tina(log_path: str, model_path: str, mode: str) -> None:
                 insert_line = line_num  # Mark the start of the section
                 try:
                     inv = _parseLineTina(line_stripped, is_place_flow)
-                    sol_f.write(formatInvariantAsEquation(inv) + "\n")
+                    sol_w.write(inv)
                     sol_count += 1
                 except ValueError:
                     tmp_f.write(line)
@@ -67,7 +67,7 @@ def create_solution_for_tina(log_path: str, model_path: str, mode: str) -> None:
                 elif inv_pattern.match(line_stripped):
                     try:
                         inv = _parseLineTina(line_stripped, is_place_flow)
-                        sol_f.write(formatInvariantAsEquation(inv) + "\n")
+                        sol_w.write(inv)
                         sol_count += 1
                     except ValueError:
                         tmp_f.write(line)
@@ -95,9 +95,5 @@ def create_solution_for_tina(log_path: str, model_path: str, mode: str) -> None:
     # Replace original log with final version
     os.replace(final_tmp, log_path)
     os.remove(tmp_file)
-    
-    # Ensure .sol exists (empty if no invariants)
-    if sol_count == 0:
-        open(sol_file, "w").close()
         
         
@@ -0,0 +1,38 @@
+# solution/writer.py
+from typing import Optional
+from invariants.invariant import Invariant
+from invariants.metrics import SolutionMetrics, writeSidecar
+from invariants.report import formatInvariantAsEquation
+
+class SolWriter:
+    """
+    Writes invariants to a .sol file, one equation per line, and accumulates
+    their metrics so that the .sol.json sidecar is produced on close without
+    re-reading the solution.
+    """
+
+    def __init__(self, sol_file: str) -> None:
+        self.sol_file = sol_file
+        self.metrics = SolutionMetrics()
+        self._f = open(sol_file, "w", encoding="utf-8")
+
+    def write(self, inv: Invariant, line: Optional[str] = None) -> None:
+        """Write inv, as line if given (e.g. with a '?' constant), else in equation format."""
+        if line is None:
+            line = formatInvariantAsEquation(inv)
+        self._f.write(line + "\n")
+        self.metrics.add(inv, line)
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+            writeSidecar(self.sol_file, self.metrics)
+
+    def __enter__(self) -> "SolWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._f.close()
@@ -0,0 +1,63 @@
+"""
+Minimality test fanned out over worker processes.
+
+The invariant set is packed once in shared memory (see invariants/shared.py);
+each worker attaches it by handle when it starts and keeps the view open. Its
+solver is built over all the invariants, decoded one row at a time from the
+shared block, and tests one shard of them for redundancy: the workers hold no
+Python copy of the set. Only the handle and the shard indices cross the process
+boundary, whatever the size of the set.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from invariants.invariant import Invariant
+from invariants.shared import SharedHandle, SharedInvariants, SharedView
+from invariants.varindex import VarIndex
+from profiling import PhaseProfile, phase
+from solver.satcheck import checkMinimality
+
+# Worker state: the attached set, open until the worker exits, and its variable index
+_view: Optional[SharedView] = None
+_vIndex: Optional[VarIndex] = None
+
+
+def _attach(handle: SharedHandle) -> None:
+    global _view, _vIndex
+    _view = SharedView(handle)
+    _vIndex = VarIndex(_view.names)
+
+
+def _testShard(indices: List[int]) -> Tuple[List[int], int]:
+    redundant, _, calls = checkMinimality(_view, _vIndex, None, indices)
+    return redundant, calls
+
+
+def checkMinimalityParallel(
+    invariants: List[Invariant],
+    jobs: int,
+    profile: Optional[PhaseProfile] = None
+) -> Tuple[List[int], float, int]:
+    """
+    Same result as checkMinimality, with the invariants split in jobs shards.
+    Raises RuntimeError if a worker dies (the shared block is still released).
+    """
+    if len(invariants) <= 1:
+        return ([], 0.0, 0)
+    start_time = time.time()
+    jobs = max(1, min(jobs, len(invariants)))
+    with phase(profile, "share"):
+        shared = SharedInvariants(invariants)
+    with shared:
+        shards = [list(range(k, len(invariants), jobs)) for k in range(jobs)]
+        try:
+            with phase(profile, "z3_solve"), \
+                    ProcessPoolExecutor(max_workers=jobs, initializer=_attach, initargs=(shared.handle,)) as pool:
+                results = list(pool.map(_testShard, shards))
+        except BrokenProcessPool as e:
+            raise RuntimeError(f"A minimality worker died: {e}") from e
+    redundant = sorted(i for shard, _ in results for i in shard)
+    return (redundant, time.time() - start_time, sum(calls for _, calls in results))
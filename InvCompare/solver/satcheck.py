@@ -1,7 +1,9 @@
-from typing import List, Dict, Tuple, Optional
-from z3 import Solver, Int, Xor, And, Bool, Function, Not, sat, unsat, BoolSort
+from typing import Iterable, List, Dict, Sequence, Tuple, Optional
+from z3 import Solver, Int, Xor, And, Or, Bool, BoolRef, BoolVal, Function, Implies, Not, is_true, sat, unsat, BoolSort
 from invariants.varindex import VarIndex
 from invariants.invariant import Invariant
+from invariants.core import CommonCore
+from profiling import PhaseProfile, phase
 import time
 
 def buildZ3EqConjunction(
@@ -28,23 +30,35 @@ def buildZ3EqConjunction(
 def checkXor(
     invSetA: List[Invariant],
     invSetB: List[Invariant],
-    vIndex: VarIndex
+    vIndex: VarIndex,
+    profile: Optional[PhaseProfile] = None,
+    assumed: Optional[Iterable[Invariant]] = None
 ) -> Tuple[bool, Optional[Dict[str, int]]]:
     """
     Build a formula for Xor(cA, cB) with domain constraints (all variables >=0),
     solve it, and return:
       (False, None)  if UNSAT => no discrepancy
       (True, assignment)  if SAT => we found a discrepancy assignment
+    The assumed invariants (shared by both sets) are asserted as well, one at
+    a time as the iterable yields them, so they may be streamed from disk.
+    With a profile, records the z3_build and z3_solve phases and the solver statistics.
     """
     solver = Solver()
-    z3Vars = [Int(f"v{i}") for i in range(vIndex.size())]
-    domain_constraints = [v >= 0 for v in z3Vars]
-    cA = buildZ3EqConjunction(invSetA, z3Vars, vIndex)
-    cB = buildZ3EqConjunction(invSetB, z3Vars, vIndex)
-    solver.add(domain_constraints)
-    solver.add(Xor(cA, cB))
-
-    if solver.check() == sat:
+    with phase(profile, "z3_build"):
+        z3Vars = [Int(f"v{i}") for i in range(vIndex.size())]
+        domain_constraints = [v >= 0 for v in z3Vars]
+        cA = buildZ3EqConjunction(invSetA, z3Vars, vIndex)
+        cB = buildZ3EqConjunction(invSetB, z3Vars, vIndex)
+        solver.add(domain_constraints)
+        if assumed is not None:
+            _assertEach(solver, assumed, z3Vars, vIndex)
+        solver.add(Xor(cA, cB))
+
+    with phase(profile, "z3_solve"):
+        result = solver.check()
+    if profile is not None:
+        profile.solver(solver)
+    if result == sat:
         model = solver.model()
         assignment: Dict[str, int] = {}
         for i in range(vIndex.size()):
@@ -54,18 +68,188 @@ def checkXor(
         return (True, assignment)
     return (False, None)
 
+def buildZ3Eq(inv: Invariant, z3Vars, vIndex: VarIndex) -> BoolRef:
+    """Z3 Boolean for sum(coeff[var] * var) == const of one invariant."""
+    if not inv.varCoeffs:
+        return BoolVal(inv.const == 0)
+    lhs = 0
+    for varName, coeff in inv.varCoeffs.items():
+        lhs += coeff * z3Vars[vIndex.getIndex(varName)]
+    return lhs == inv.const
+
+def _assertEach(solver: Solver, invariants: Iterable[Invariant], z3Vars, vIndex: VarIndex) -> None:
+    """Assert each invariant on its own, without building a list or a conjunction."""
+    for inv in invariants:
+        solver.add(buildZ3Eq(inv, z3Vars, vIndex))
+
+def _assignment(model, z3Vars, vIndex: VarIndex) -> Dict[str, int]:
+    assignment: Dict[str, int] = {}
+    for i in range(vIndex.size()):
+        val = model[z3Vars[i]]
+        assignment[vIndex.getName(i)] = val.as_long() if val is not None else 0
+    return assignment
+
+def _enumerate(solver: Solver, assumptions: List[BoolRef], pattern: List[BoolRef],
+               z3Vars, vIndex: VarIndex, k: int) -> List[Dict[str, int]]:
+    """
+    Up to k assignments with pairwise different truth values of the pattern
+    literals: each one found is blocked by a clause on its pattern.
+    """
+    witnesses: List[Dict[str, int]] = []
+    while len(witnesses) < k and solver.check(assumptions) == sat:
+        model = solver.model()
+        witnesses.append(_assignment(model, z3Vars, vIndex))
+        values = [is_true(model.eval(e, model_completion=True)) for e in pattern]
+        solver.add(Or([Not(e) if v else e for e, v in zip(pattern, values)]))
+    return witnesses
+
+def enumerateXor(
+    invSetA: List[Invariant],
+    invSetB: List[Invariant],
+    vIndex: VarIndex,
+    k: int,
+    profile: Optional[PhaseProfile] = None,
+    assumed: Optional[Iterable[Invariant]] = None
+) -> List[Dict[str, int]]:
+    """
+    Up to k discrepancy assignments of Xor(cA, cB), each with a different set
+    of satisfied invariants; empty if UNSAT (no discrepancy). The assumed
+    invariants are asserted as in checkXor.
+    """
+    solver = Solver()
+    with phase(profile, "z3_build"):
+        z3Vars = [Int(f"v{i}") for i in range(vIndex.size())]
+        solver.add([v >= 0 for v in z3Vars])
+        if assumed is not None:
+            _assertEach(solver, assumed, z3Vars, vIndex)
+        conjunctions = []
+        pattern = []
+        for prefix, invs in (("a", invSetA), ("b", invSetB)):
+            lits = [Bool(f"{prefix}{i}") for i in range(len(invs))]
+            solver.add([e == buildZ3Eq(inv, z3Vars, vIndex) for e, inv in zip(lits, invs)])
+            conjunctions.append(And(lits) if lits else BoolVal(True))
+            pattern.extend(lits)
+        solver.add(Xor(conjunctions[0], conjunctions[1]))
+    with phase(profile, "z3_solve"):
+        witnesses = _enumerate(solver, [], pattern, z3Vars, vIndex, k)
+    if profile is not None:
+        profile.solver(solver)
+    return witnesses
+
+class CoreSolver:
+    """
+    One incremental solver for all the pairwise comparisons of a model. The
+    variables, domain constraints and common core of its sets (see
+    invariants/core.py) are asserted once; the residual of each set, reduced by
+    the core's eliminated variables, is asserted behind a guard g_i, as
+    checkMinimality guards invariants with a_i(). A pair is then a single
+    check-sat-assuming of a literal d_i_j => Xor(g_i, g_j), and the lemmas learned
+    on the shared structure are kept from one pair to the next.
+    """
+
+    def __init__(self, core: CommonCore, profile: Optional[PhaseProfile] = None) -> None:
+        self.core = core
+        self.vIndex = core.varIndex
+        self.solver = Solver()
+        self.guards: Dict[int, BoolRef] = {}
+        self.pairs: Dict[Tuple[int, int], BoolRef] = {}
+        with phase(profile, "core_build"):
+            self.z3Vars = [Int(f"v{i}") for i in range(self.vIndex.size())]
+            self.solver.add([v >= 0 for v in self.z3Vars])
+            if core.core:
+                self.solver.add(buildZ3EqConjunction(core.core, self.z3Vars, self.vIndex))
+
+    def _conjunction(self, invariants: List[Invariant]):
+        # a reduced invariant without variables is implied by the core (0 = 0) or contradicts it
+        if any(not inv.varCoeffs and inv.const != 0 for inv in invariants):
+            return BoolVal(False)
+        rows = [inv for inv in invariants if inv.varCoeffs]
+        return buildZ3EqConjunction(rows, self.z3Vars, self.vIndex) if rows else BoolVal(True)
+
+    def guard(self, i: int) -> BoolRef:
+        """Guard of the residual of set i, asserted on first use."""
+        if i not in self.guards:
+            g = Bool(f"g{i}")
+            self.solver.add(g == self._conjunction(self.core.reduce(self.core.residuals[i])))
+            self.guards[i] = g
+        return self.guards[i]
+
+    def checkPair(
+        self,
+        i: int,
+        j: int,
+        profile: Optional[PhaseProfile] = None
+    ) -> Tuple[bool, Optional[Dict[str, int]]]:
+        """
+        Same as checkXor for sets i and j of the model, given its core.
+        The assignment covers every variable of the model.
+        """
+        with phase(profile, "z3_build"):
+            d = self.pairLiteral(i, j)
+        with phase(profile, "z3_solve"):
+            result = self.solver.check([d])
+        if profile is not None:
+            profile.solver(self.solver)
+        if result != sat:
+            return (False, None)
+        return (True, _assignment(self.solver.model(), self.z3Vars, self.vIndex))
+
+    def pairLiteral(self, i: int, j: int) -> BoolRef:
+        """Literal d_i_j => Xor(g_i, g_j), asserted on first use."""
+        if (i, j) not in self.pairs:
+            d = Bool(f"d{i}_{j}")
+            self.solver.add(Implies(d, Xor(self.guard(i), self.guard(j))))
+            self.pairs[(i, j)] = d
+        return self.pairs[(i, j)]
+
+    def enumeratePair(
+        self,
+        i: int,
+        j: int,
+        invSetA: List[Invariant],
+        invSetB: List[Invariant],
+        k: int,
+        profile: Optional[PhaseProfile] = None
+    ) -> List[Dict[str, int]]:
+        """
+        Same as enumerateXor for sets i and j of the model, whose invariants to
+        tell apart (their residuals outside the core) are invSetA and invSetB.
+        The blocking clauses are dropped afterwards.
+        """
+        with phase(profile, "z3_build"):
+            d = self.pairLiteral(i, j)
+            self.solver.push()
+        try:
+            with phase(profile, "z3_build"):
+                pattern = []
+                for inv in self.core.reduce(invSetA + invSetB):
+                    e = Bool(f"e{len(pattern)}")
+                    self.solver.add(e == buildZ3Eq(inv, self.z3Vars, self.vIndex))
+                    pattern.append(e)
+            with phase(profile, "z3_solve"):
+                witnesses = _enumerate(self.solver, [d], pattern, self.z3Vars, self.vIndex, k)
+            if profile is not None:
+                profile.solver(self.solver)
+            return witnesses
+        finally:
+            self.solver.pop()
+
 def checkMinimality(
-    invariants: List[Invariant],
-    vIndex: VarIndex
+    invariants: Sequence[Invariant],
+    vIndex: VarIndex,
+    profile: Optional[PhaseProfile] = None,
+    indices: Optional[List[int]] = None
 ) -> Tuple[List[int], float, int]:
     """
-    Check if the set of invariants is minimal by testing each one for redundancy.
+    Check if the set of invariants is minimal by testing each one for redundancy
+    (only those at indices if given, against all the others).
     Returns:
       - List of indices of invariants that are redundant (implied by the others).
       - Total time taken for the test in seconds.
       - Number of check-sat calls made.
     Defines each invariant as a Bool function and uses check-sat-assuming to test
     if all but one can be satisfied while violating that one; if UNSAT, it's redundant.
+    With a profile, records the z3_build and z3_solve phases and the solver statistics.
     """
     if len(invariants) <= 1:
         return ([], 0.0, 0)
@@ -73,32 +257,36 @@ def checkMinimality(
     solver = Solver()
     start_time = time.time()
 
-    # Define Z3 variables using public VarIndex methods
-    z3Vars = {vIndex.getName(i): Int(vIndex.getName(i)) for i in range(vIndex.size())}
+    with phase(profile, "z3_build"):
+        # Define Z3 variables using public VarIndex methods
+        z3Vars = {vIndex.getName(i): Int(vIndex.getName(i)) for i in range(vIndex.size())}
 
-    # Domain constraints: all variables >= 0
-    solver.add([v >= 0 for v in z3Vars.values()])
+        # Domain constraints: all variables >= 0
+        solver.add([v >= 0 for v in z3Vars.values()])
 
-    # Define each invariant as a function a_i() : Bool
-    assumption_funcs = []
-    for i, inv in enumerate(invariants):
-        lhs = 0
-        for varName, coeff in inv.varCoeffs.items():
-            lhs += coeff * z3Vars[varName]
-        func = Function(f"a{i}", BoolSort())
-        solver.add(func() == (lhs == inv.const))
-        assumption_funcs.append(func)
+        # Define each invariant as a function a_i() : Bool
+        assumption_funcs = []
+        for i, inv in enumerate(invariants):
+            lhs = 0
+            for varName, coeff in inv.varCoeffs.items():
+                lhs += coeff * z3Vars[varName]
+            func = Function(f"a{i}", BoolSort())
+            solver.add(func() == (lhs == inv.const))
+            assumption_funcs.append(func)
 
     # Test each invariant for redundancy
     redundant_indices = []
     check_sat_calls = 0
-    for i in range(len(invariants)):
-        test_assumptions = [f() if j != i else Not(f())
-                           for j, f in enumerate(assumption_funcs)]
-        result = solver.check(test_assumptions)
-        check_sat_calls += 1
-        if result == unsat:
-            redundant_indices.append(i)
+    with phase(profile, "z3_solve"):
+        for i in (range(len(invariants)) if indices is None else indices):
+            test_assumptions = [f() if j != i else Not(f())
+                               for j, f in enumerate(assumption_funcs)]
+            result = solver.check(test_assumptions)
+            check_sat_calls += 1
+            if result == unsat:
+                redundant_indices.append(i)
 
     total_time = time.time() - start_time
+    if profile is not None:
+        profile.solver(solver)
     return (redundant_indices, total_time, check_sat_calls)
\ No newline at end of file
@@ -0,0 +1,5 @@
+# The modules import each other from the InvCompare folder (e.g. "from campaign.subset import ...")
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,54 @@
+import os
+
+from parsing.parser_solution import parseSolFile
+from solution.batch import collect_batch, collect_one
+
+
+def petrisage_run(folder, name="M.petrisage"):
+    log = folder / name
+    log.write_text("petrisage run\n", encoding="utf-8")
+    (folder / f"{name}.tba").write_text("2\n1 1 1\n2 1 2 -1 3\n0\n", encoding="utf-8")
+    return str(log)
+
+
+def test_petrisage_collected_from_kept_tba(tmp_path):
+    log = petrisage_run(tmp_path)
+    assert collect_one((log, "petrisage", "TFLOWS", None)) == (log, "OK", "petrisage TFLOWS")
+    assert not os.path.exists(f"{log}.tba")
+    assert [inv.varCoeffs for inv in parseSolFile(f"{log}.sol.gz")] == [{"t0": 1}, {"t1": 1, "t2": -1}]
+    assert collect_one((log, "petrisage", "TFLOWS", None))[1] == "SKIP"
+
+
+def test_petrisage_batch_over_a_log_folder(tmp_path):
+    logs = tmp_path / "logs_tflows"
+    logs.mkdir()
+    petrisage_run(logs)
+    petrisage_run(logs, "N.pK.petrisage")
+    # the .tba files themselves are not taken for logs
+    assert collect_batch([str(logs)], mode="TFLOWS") == (2, 0, 0)
+    assert sorted(os.listdir(logs)) == ["M.petrisage", "M.petrisage.sol.gz", "M.petrisage.sol.json",
+                                        "N.pK.petrisage", "N.pK.petrisage.sol.gz", "N.pK.petrisage.sol.json"]
+
+
+def test_timed_out_log_is_recorded_once(tmp_path, capsys):
+    logs = tmp_path / "logs_tflows"
+    logs.mkdir()
+    log = logs / "M.petrisage"
+    log.write_text("petrisage run\nTIMEOUT\n", encoding="utf-8")  # killed: no .tba
+    assert collect_batch([str(logs)], mode="TFLOWS") == (1, 0, 0)
+    assert "no solution (no .tba output), recorded" in capsys.readouterr().out
+    assert sorted(os.listdir(logs)) == ["M.petrisage", "M.petrisage.nosol"]
+    # the second batch neither parses the log again nor takes the marker for a log
+    assert collect_batch([str(logs)], mode="TFLOWS") == (0, 1, 0)
+    assert capsys.readouterr().out == ""
+    assert collect_one((str(log), "petrisage", "TFLOWS", None))[2] == "no solution (recorded)"
+
+
+def test_rerun_log_clears_the_no_solution_marker(tmp_path):
+    log = tmp_path / "M.petrisage"
+    log.write_text("petrisage run\n", encoding="utf-8")
+    assert collect_one((str(log), "petrisage", "TFLOWS", None))[1] == "OK"
+    petrisage_run(tmp_path)
+    marker = tmp_path / "M.petrisage.nosol"
+    os.utime(marker, (0, 0))  # the tool ran again after the marker was written
+    assert collect_one((str(log), "petrisage", "TFLOWS", None)) == (str(log), "OK", "petrisage TFLOWS")
@@ -0,0 +1,79 @@
+import itertools
+import random
+
+from invariants.core import MAX_PIVOT_TERMS, CommonCore, _substitute
+from invariants.invariant import Invariant
+
+
+def holds(inv, assignment):
+    return sum(c * assignment[v] for v, c in inv.varCoeffs.items()) == inv.const
+
+
+def test_core_and_residuals():
+    shared = Invariant({"p0": 1, "p1": 1}, 1)
+    a = [shared, Invariant({"p2": 1}, 0), shared]
+    b = [Invariant({"p2": 1}, 0), Invariant({"p1": 1, "p0": 1}, 1), Invariant({"p3": 2}, 0)]
+    c = [Invariant({"p0": 1, "p1": 1}, 1), Invariant({"p3": 1}, 0)]
+    core = CommonCore([a, b, c])
+    assert core.core == [shared]
+    assert core.residuals == [[Invariant({"p2": 1}, 0)],
+                              [Invariant({"p2": 1}, 0), Invariant({"p3": 2}, 0)],
+                              [Invariant({"p3": 1}, 0)]]
+    assert [core.varIndex.getName(i) for i in range(core.varIndex.size())] == ["p0", "p1", "p2", "p3"]
+
+
+def test_no_sets():
+    core = CommonCore([])
+    assert core.core == [] and core.residuals == [] and core.pivots == []
+
+
+def test_substitute_removes_pivot_variables():
+    # p0 = 3 - p1 - p2, then p1 = 1 + p3
+    pivots = [("p0", {"p1": 1, "p2": 1}, 3), ("p1", {"p3": -1}, 1)]
+    row, const = _substitute({"p0": 2, "p1": 1, "p4": 1}, 5, pivots)
+    # 2*(3 - p1 - p2) + p1 + p4 = 5  =>  -p1 - 2*p2 + p4 = -1  =>  -(1 + p3) - 2*p2 + p4 = -1
+    assert (row, const) == ({"p2": -2, "p3": -1, "p4": 1}, 0)
+    original = {"p0": 2, "p1": 1}
+    _substitute(original, 0, pivots)
+    assert original == {"p0": 2, "p1": 1}
+
+
+def test_pivots_and_elimination():
+    core = CommonCore([[Invariant({"p0": 1, "p1": 1}, 2), Invariant({"p1": -1, "p2": 1}, 0),
+                        Invariant({"p3": 2, "p4": 2}, 4)]] * 2)
+    # p0 pivots first; p1 - p2 = 0 reduced by it still has unit p1; 2*p3 + 2*p4 has no unit coefficient
+    assert core.eliminated() == ["p0", "p1"]
+    for var, row, _ in core.pivots:
+        assert var not in row
+    reduced = core.reduce([Invariant({"p0": 1, "p5": 1}, 3)])
+    assert reduced == [Invariant({"p2": -1, "p5": 1}, 1)]
+
+
+def test_wide_rows_are_not_pivots():
+    wide = Invariant({f"p{i}": 1 for i in range(MAX_PIVOT_TERMS + 1)}, 1)
+    core = CommonCore([[wide], [wide]])
+    assert core.eliminated() == []
+    assert core.reduce([wide]) == [wide]
+
+
+def test_reduction_is_equivalent_given_the_core():
+    rng = random.Random(0)
+    names = ["p0", "p1", "p2", "p3"]
+
+    def random_invariant():
+        return Invariant({v: rng.choice((-2, -1, 1, 1, 2)) for v in rng.sample(names, rng.randint(1, 3))},
+                         rng.randint(-2, 3))
+
+    for _ in range(50):
+        shared = [random_invariant() for _ in range(rng.randint(1, 3))]
+        residual = [random_invariant() for _ in range(3)]
+        core = CommonCore([shared + residual, list(shared)])
+        reduced = core.reduce(core.residuals[0])
+        eliminated = set(core.eliminated())
+        for inv in reduced:
+            assert not eliminated & inv.getUsedVarNames()
+        for values in itertools.product(range(-2, 3), repeat=len(names)):
+            assignment = dict(zip(names, values))
+            if all(holds(inv, assignment) for inv in core.core):
+                assert [holds(inv, assignment) for inv in core.residuals[0]] == \
+                       [holds(inv, assignment) for inv in reduced]
@@ -0,0 +1,101 @@
+import itertools
+import random
+
+import pytest
+
+pytest.importorskip("z3")
+
+from invariants.core import CommonCore
+from invariants.invariant import Invariant
+from invariants.report import formatInvariantAsEquation
+from invariants.varindex import VarIndex
+from solver.satcheck import CoreSolver, checkXor, enumerateXor
+
+VARS = ["p0", "p1", "p2", "p3", "p4"]
+
+
+def holds(invs, assignment):
+    return all(sum(c * assignment.get(v, 0) for v, c in inv.varCoeffs.items()) == inv.const for inv in invs)
+
+
+def random_invariant(rng):
+    coeffs = {v: rng.choice((-1, 1, 1, 2)) for v in rng.sample(VARS, rng.randint(1, 3))}
+    return Invariant(coeffs, rng.randint(0, 3))
+
+
+def random_model(rng, nb_sets=3):
+    """Sets sharing a common part, each with its own invariants and duplicates."""
+    shared = [random_invariant(rng) for _ in range(rng.randint(0, 3))]
+    sets = []
+    for _ in range(nb_sets):
+        own = [random_invariant(rng) for _ in range(rng.randint(0, 2))]
+        invs = shared + own
+        invs += rng.sample(invs, min(len(invs), rng.randint(0, 2)))   # duplicates
+        rng.shuffle(invs)
+        sets.append(invs)
+    if rng.random() < 0.3:
+        sets[1] = list(sets[0])     # an identical pair
+    return sets
+
+
+def reference(setA, setB):
+    vIndex = VarIndex(sorted(set().union(*(inv.getUsedVarNames() for inv in setA + setB))))
+    return checkXor(setA, setB, vIndex)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_core_verdicts_match_checkXor(seed):
+    rng = random.Random(seed)
+    sets = random_model(rng)
+    core = CommonCore(sets)
+    solver = CoreSolver(core)
+    for i, j in itertools.combinations(range(len(sets)), 2):
+        expected, _ = reference(sets[i], sets[j])
+        found, assignment = solver.checkPair(i, j)
+        assert found == expected, (i, j)
+        if found:
+            assert holds(sets[i], assignment) != holds(sets[j], assignment)
+
+
+def test_discrepancy_and_duplicates():
+    a = [Invariant({"p0": 1, "p1": 1}, 1), Invariant({"p0": 1, "p1": 1}, 1), Invariant({"p2": 1}, 0)]
+    b = [Invariant({"p0": 1, "p1": 1}, 1), Invariant({"p2": 1, "p3": 1}, 0)]
+    c = [Invariant({"p2": 1}, 0), Invariant({"p3": 1}, 0), Invariant({"p1": 1, "p0": 1}, 1)]
+    core = CommonCore([a, b, c])
+    solver = CoreSolver(core)
+    assert solver.checkPair(0, 1)[0]            # p3 = 0 is implied by b only
+    assert not solver.checkPair(1, 2)[0]        # b and c are equivalent
+    assert solver.checkPair(0, 2)[0]
+    # asked again, a pair gives the same verdict
+    assert solver.checkPair(0, 1)[0]
+
+
+def test_enumerate_pair_matches_enumerateXor():
+    a = [Invariant({"p0": 1, "p1": 1}, 2)]
+    b = [Invariant({"p0": 1, "p1": 1}, 2), Invariant({"p0": 1}, 1)]
+    core = CommonCore([a, b])
+    solver = CoreSolver(core)
+    found = solver.enumeratePair(0, 1, core.residuals[0], core.residuals[1], 5)
+    vIndex = VarIndex(sorted({"p0", "p1"}))
+    assert len(found) == len(enumerateXor(a, b, vIndex, 5))
+    for assignment in found:
+        assert holds(a, assignment) != holds(b, assignment)
+    # the blocking clauses are dropped: the pair is still discrepant
+    assert solver.checkPair(0, 1)[0]
+
+
+def write_sol(path, invs):
+    path.write_text("".join(formatInvariantAsEquation(inv) + "\n" for inv in invs), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_main_core_and_pairwise_verdicts(tmp_path, seed):
+    main = pytest.importorskip("main")
+    rng = random.Random(seed)
+    files = [write_sol(tmp_path / f"M.t{k}.sol", invs) for k, invs in enumerate(random_model(rng))]
+    core = main.ModelCore(files)
+    for solA, solB in itertools.combinations(files, 2):
+        with_core = main.compare_invariants(solA, solB, keep_duplicates=True, use_fingerprint=False, core=core)
+        pairwise = main.compare_invariants(solA, solB, keep_duplicates=True, use_fingerprint=False)
+        assert with_core == pairwise, (solA, solB)
@@ -0,0 +1,32 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from campaign.figcache import FigureCache
+
+
+def test_figures_are_redrawn_only_when_their_data_changes(tmp_path):
+    data = pd.DataFrame({"Tool": ["tina", "itstools"], "Time": [10, 20]})
+    drawn = []
+
+    def draw():
+        drawn.append(True)
+        matplotlib.pyplot.plot(data["Time"])
+
+    cache = FigureCache(str(tmp_path / "cache"))
+    cache.figure("times", [data], draw)
+    cache = FigureCache(str(tmp_path / "cache"))
+    assert cache.figure("times", [data], draw) is not None
+    assert (cache.hits, cache.misses, len(drawn)) == (1, 0, 1)
+    data.loc[0, "Time"] = 11
+    cache.figure("times", [data], draw)
+    assert (cache.hits, cache.misses, len(drawn)) == (1, 1, 2)
+    # the next report only draws the new data: the old figure is pruned
+    cache = FigureCache(str(tmp_path / "cache"))
+    cache.figure("times", [data], draw)
+    assert cache.hits == 1 and cache.prune() == 1
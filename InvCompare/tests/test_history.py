@@ -0,0 +1,58 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+
+from campaign import history
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CSV = """Model,Tool,Examination,Status,Time
+M1,tina,PFLOWS,OK,10
+M1,itstools,PFLOWS,TO,-1
+M2,tina,PFLOWS,MOVF,5
+M2,itstools,PFLOWS,OK,7
+"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    csv = tmp_path / "invar.csv"
+    csv.write_text(CSV, encoding="utf-8")
+    path = str(tmp_path / "history")
+    assert history.add_campaign(path, str(csv), "2025-06") == 4
+    assert history.add_campaign(path, str(csv), "2025-07") == 4
+    return path
+
+
+def test_select_and_summary(store):
+    assert history.campaigns(store) == ["2025-06", "2025-07"]
+    rows = history.select(store, ["2025-06"], models=["M1"])
+    assert sorted(rows["Tool"]) == ["itstools", "tina"]
+    counts = history.status_summary(store, ["2025-07"]).set_index("Tool")
+    assert counts.loc["tina", "succ"] == 1 and counts.loc["tina", "mem"] == 1
+    assert counts.loc["itstools", "time"] == 1 and counts["tot"].sum() == 4
+
+
+def test_unknown_campaign_is_an_error(store):
+    with pytest.raises(ValueError, match="No campaign 2025-08"):
+        history.status_summary(store, ["2025-08"])
+    with pytest.raises(ValueError, match="No campaign 2025-08"):
+        history.select(store, iter(["2025-06", "2025-08"]))
+    with pytest.raises(ValueError):
+        history.remove_campaign(store, "2025-08")
+
+
+def test_summary_script(store, capsys):
+    spec = importlib.util.spec_from_file_location("summary", os.path.join(ROOT, "summary.py"))
+    summary = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(summary)
+    summary.history_summary(store)
+    out = capsys.readouterr().out
+    assert "campaign 2025-07" in out and "| tina | 1 | 0 | 0 | 1 | 0 | 1 | 2 |" in out
+    with pytest.raises(SystemExit):
+        summary.history_summary(store, "2025-08")
+    assert "No campaign 2025-08" in capsys.readouterr().err
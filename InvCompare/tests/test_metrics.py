@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from invariants.fingerprint import fingerprintInvariants
+from invariants.invariant import Invariant
+from invariants.metrics import SolutionMetrics, readSidecar, writeSidecar
+from invariants.report import formatInvariantAsEquation
+from parsing.parser_solution import solutionFingerprint
+
+INVARIANTS = [Invariant({"p0": 1, "p1": 1}, 1), Invariant({"p1": 2, "p2": -1}, 0), Invariant({"p3": 1}, 4)]
+
+
+def write_solution(tmp_path, metrics, invariants=INVARIANTS):
+    path = tmp_path / "M.petri64.sol"
+    lines = [formatInvariantAsEquation(inv) for inv in invariants]
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    for inv, line in zip(invariants, lines):
+        metrics.add(inv, line)
+    writeSidecar(str(path), metrics)
+    return str(path)
+
+
+def test_fingerprint_at_collection_time(tmp_path):
+    path = write_solution(tmp_path, SolutionMetrics())
+    data = readSidecar(path)
+    assert data["Fingerprint"] == fingerprintInvariants(INVARIANTS) and data["Rank"] == 3
+    assert solutionFingerprint(path) == data["Fingerprint"]
+
+
+def test_large_solutions_have_no_fingerprint(tmp_path):
+    metrics = SolutionMetrics(fingerprintMaxTerms=3)
+    path = write_solution(tmp_path, metrics)
+    assert metrics.fingerprint is None
+    data = readSidecar(path)
+    assert data["Fingerprint"] is None and data["Rank"] is None and data["SolNbCoeff"] == 5
+    assert solutionFingerprint(path) is None
+
+
+def test_fingerprint_is_never_computed_without_sidecar(tmp_path):
+    path = write_solution(tmp_path, SolutionMetrics())
+    os.remove(path + ".json")
+    assert solutionFingerprint(path) is None
+
+
+@pytest.mark.parametrize("sidecars, out_of_core, method", [
+    (True, False, "fingerprint"),
+    (False, False, "solver"),
+    (True, True, "solver"),
+])
+def test_main_uses_sidecar_fingerprints_only(tmp_path, sidecars, out_of_core, method):
+    pytest.importorskip("z3")
+    main = pytest.importorskip("main")
+    main.cached_fingerprint.cache_clear()
+    paths = []
+    for name, invs in (("a", INVARIANTS), ("b", list(reversed(INVARIANTS)))):
+        folder = tmp_path / name
+        folder.mkdir()
+        paths.append(write_solution(folder, SolutionMetrics(), invs))
+        if not sidecars:
+            os.remove(paths[-1] + ".json")
+    record = {}
+    assert main.compare_invariants(*paths, record=record, out_of_core=out_of_core)
+    assert record["method"] == method
+
+
+def test_unbounded_metrics():
+    metrics = SolutionMetrics(fingerprintMaxTerms=None)
+    for inv in INVARIANTS * 10:
+        metrics.add(inv)
+    assert metrics.toDict()["Rank"] == 3
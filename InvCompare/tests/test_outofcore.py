@@ -0,0 +1,92 @@
+import itertools
+import random
+
+import pytest
+
+from invariants.deduplicate import deduplicateInvariants
+from invariants.invariant import Invariant
+from invariants.outofcore import deduplicateSolFiles, iterResidual
+from invariants.report import formatInvariantAsEquation
+from invariants.varindex import VarIndex
+from parsing.parser_solution import iterSolFile, parseSolFile
+from parsing.solbin import writeSolBin
+
+VARS = ["p0", "p1", "p2", "p3"]
+
+
+def random_sets(rng):
+    pool = [Invariant({v: rng.choice((-1, 1, 2)) for v in rng.sample(VARS, rng.randint(1, 3))}, rng.randint(0, 2))
+            for _ in range(8)]
+    return [rng.choices(pool, k=rng.randint(0, 8)) for _ in range(2)]
+
+
+def write_sol(path, invs):
+    path.write_text("".join(formatInvariantAsEquation(inv) + "\n" for inv in invs), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("bucket_bytes", [1, 64 * 1024 * 1024])
+def test_matches_in_memory_dedup(tmp_path, seed, bucket_bytes):
+    setA, setB = random_sets(random.Random(seed))
+    solA, solB = write_sol(tmp_path / "A.sol", setA), write_sol(tmp_path / "B.sol", setB)
+    work = tmp_path / "work"
+    work.mkdir()
+    streamed = deduplicateSolFiles(solA, solB, str(work), bucket_bytes)
+    fused = VarIndex(sorted(set().union(*(inv.getUsedVarNames() for inv in setA + setB))))
+    uniqueA, uniqueB = deduplicateInvariants(setA, setB, fused)
+    assert list(iterResidual(streamed.uniqueA)) == uniqueA
+    assert list(iterResidual(streamed.uniqueB)) == uniqueB
+    shared = list(iterResidual(streamed.shared))
+    assert set(shared) == set(setA) & set(setB)
+    assert len(shared) == len(set(shared)) == streamed.countShared
+    assert (streamed.invariantsA, streamed.invariantsB) == (len(setA), len(setB))
+
+
+def test_iter_sol_file_streams_binary(tmp_path):
+    invs = [Invariant({"p0": 1, "p1": -3}, 2), Invariant({"p2": 300}, 0)]
+    path = str(tmp_path / "A.solb")
+    writeSolBin(path, invs + [Invariant({"p3": 1}, "?")])
+    stream = iterSolFile(path)
+    assert next(stream) == invs[0]
+    assert list(stream) == invs[1:]
+    assert len(list(iterSolFile(path, allowUnknown=True))) == 3
+    assert parseSolFile(path) == invs
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_streamed_keepdup_verdicts(tmp_path, seed):
+    pytest.importorskip("z3")
+    main = pytest.importorskip("main")
+    rng = random.Random(seed)
+    files = [write_sol(tmp_path / f"M.t{k}.sol", invs) for k, invs in enumerate(random_sets(rng) + random_sets(rng))]
+    for solA, solB in itertools.combinations(files, 2):
+        whole = main.compare_invariants(solA, solB, keep_duplicates=True, use_fingerprint=False)
+        streamed = main.compare_invariants(solA, solB, keep_duplicates=True, use_fingerprint=False, out_of_core=True)
+        assert streamed == whole, (solA, solB)
+
+
+def test_streamed_keepdup_does_not_load_the_shared_invariants(tmp_path, monkeypatch):
+    pytest.importorskip("z3")
+    main = pytest.importorskip("main")
+    shared = [Invariant({"p0": 1, "p1": 1}, 1), Invariant({"p2": 1, "p3": -1}, 0)]
+    solA = write_sol(tmp_path / "M.a.sol", shared + [Invariant({"p1": 1}, 0)])
+    solB = write_sol(tmp_path / "M.b.sol", shared + [Invariant({"p0": 1}, 1)])
+    solC = write_sol(tmp_path / "M.c.sol", shared + [Invariant({"p4": 1}, 0)])
+    passed = []
+
+    def recording(check):
+        def wrapper(*args):
+            passed.append(args[-1])  # main passes the assumed invariants last
+            return check(*args)
+        return wrapper
+
+    monkeypatch.setattr(main, "checkXor", recording(main.checkXor))
+    monkeypatch.setattr(main, "enumerateXor", recording(main.enumerateXor))
+    for (a, b), witnesses in itertools.product(itertools.combinations([solA, solB, solC], 2), (1, 3)):
+        whole = main.compare_invariants(a, b, keep_duplicates=True, use_fingerprint=False)
+        passed.clear()
+        streamed = main.compare_invariants(a, b, keep_duplicates=True, use_fingerprint=False,
+                                           out_of_core=True, witnesses=witnesses)
+        assert streamed == whole, (a, b)
+        assert len(passed) == 1 and passed[0] is not None and not isinstance(passed[0], list)
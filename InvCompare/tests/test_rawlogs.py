@@ -0,0 +1,40 @@
+from invariants.invariant import Invariant
+from parsing.parser_generic import iterInvariants, parseInvariants
+from parsing.parser_tina import parseLogTina
+
+TINA_LOG = """# net M, PFLOWS
+P-FLOWS BASIS
+p0 p1 (1)
+P-SEMI-FLOWS GENERATING SET
+p2 p3*2 (3)
+
+p4 (0)
+0.000s
+T-FLOWS BASIS
+t0 t1 (0)
+ANALYSIS COMPLETED
+"""
+
+
+def test_tina_sections(tmp_path):
+    log = tmp_path / "M.tina"
+    log.write_text(TINA_LOG, encoding="utf-8")
+    # the P-FLOWS section restarted by the semi-flows header is discarded
+    assert parseLogTina(str(log)) == [Invariant({"p2": 1, "p3": 2}, 3), Invariant({"p4": 1}, 0)]
+    assert parseLogTina(str(log), isPlaceFlow=False) == [Invariant({"t0": 1, "t1": 1}, 0)]
+
+
+def test_tina_section_until_end_of_file(tmp_path):
+    log = tmp_path / "M.tina"
+    log.write_text("T-FLOWS BASIS\nt0 (0)\nnoise\nt1*-1 t2 (0)\n", encoding="utf-8")
+    assert parseInvariants(str(log), "TFLOWS") == [Invariant({"t0": 1}, 0), Invariant({"t1": -1, "t2": 1}, 0)]
+
+
+def test_unknown_constants_are_reported(tmp_path, capsys):
+    tba = tmp_path / "M.petrisage.tba"
+    tba.write_text("2\n1 1 1\n2 1 2 -1 3\n0\n", encoding="utf-8")
+    assert list(iterInvariants(str(tba), "PFLOWS")) == []
+    assert "all its invariants have an unknown constant" in capsys.readouterr().out
+    assert list(iterInvariants(str(tba), "PFLOWS")) == []
+    assert capsys.readouterr().out == ""   # once per file
+    assert len(parseInvariants(str(tba), "PFLOWS", allowUnknown=True)) == 2
@@ -0,0 +1,41 @@
+import csv
+
+from campaign.regression import compare_tool, load_campaign
+
+# Status written by logs2csvpar.pl / logs2csv.pl -> class reported in the transitions
+STATUSES = {"OK": "OK", "TO": "TO", "MOVF": "MEM", "OF": "OF", "OK_OF": "OF", "TO_OF": "TO",
+            "MOVF_OF": "MEM", "ERR": "ERR", "UNK": "ERR"}
+
+
+def write_campaign(path, statuses):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Model", "Tool", "Examination", "Time", "Mem", "Status"])
+        for i, status in enumerate(statuses):
+            writer.writerow([f"M{i}", "Tina", "PFLOWS", 1000, 100, status])
+    return str(path)
+
+
+def test_status_transitions(tmp_path):
+    statuses = list(STATUSES)
+    base, names = load_campaign(write_campaign(tmp_path / "base.csv", ["OK"] * len(statuses)))
+    new, _ = load_campaign(write_campaign(tmp_path / "new.csv", statuses))
+    assert names == {"tina": "Tina"}
+    assert [new[(f"M{i}", "tina", "PFLOWS")].status for i in range(len(statuses))] == list(STATUSES.values())
+
+    comparison = compare_tool("tina", base, new)
+    expected = {}
+    for cls in STATUSES.values():
+        if cls != "OK":
+            expected[("OK", cls)] = expected.get(("OK", cls), 0) + 1
+    assert comparison.transitions == expected
+    assert comparison.new_failures() == len(statuses) - 1
+    assert comparison.timed == 1
+
+
+def test_memory_regression_is_not_an_error(tmp_path):
+    base, _ = load_campaign(write_campaign(tmp_path / "base.csv", ["OK", "TO"]))
+    new, _ = load_campaign(write_campaign(tmp_path / "new.csv", ["MOVF", "OK"]))
+    comparison = compare_tool("tina", base, new)
+    assert comparison.transitions == {("OK", "MEM"): 1, ("TO", "OK"): 1}
+    assert comparison.fixed() == 1
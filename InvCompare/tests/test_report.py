@@ -0,0 +1,38 @@
+import pytest
+
+from invariants import report
+from invariants.invariant import Invariant
+from invariants.report import evaluateWitnesses
+
+WIDE = 2**70
+
+
+def python_diffs(invs, witnesses):
+    return [[sum(c * w.get(v, 0) for v, c in inv.varCoeffs.items()) - inv.const for w in witnesses]
+            for inv in invs]
+
+
+@pytest.mark.parametrize("invs, witnesses", [
+    # every witness value is 0: the product bound alone let the coefficients through
+    ([Invariant({"p": WIDE, "q": WIDE}, 1)], [{"p": 0, "q": 0}]),
+    ([Invariant({"p": 1, "q": 1}, WIDE)], [{"p": 0, "q": 0}, {"p": 1, "q": 0}]),
+    ([Invariant({"p": 1}, 0)], [{"p": WIDE}]),
+    ([Invariant({"p": 3, "q": -2}, 1), Invariant({"q": 1}, 0)], [{"p": 1, "q": 1}, {"p": -2, "q": 5}]),
+])
+def test_wide_values_fall_back_to_python(invs, witnesses):
+    assert evaluateWitnesses(invs, witnesses) == python_diffs(invs, witnesses)
+
+
+def test_pure_python_path(monkeypatch):
+    monkeypatch.setattr(report, "np", None)
+    invs = [Invariant({"p": WIDE}, 1)]
+    assert evaluateWitnesses(invs, [{"p": 0}, {"p": 1}]) == [[-1, WIDE - 1]]
+
+
+def test_main_with_wide_coefficients(tmp_path):
+    pytest.importorskip("z3")
+    main = pytest.importorskip("main")
+    solA, solB = tmp_path / "A.sol", tmp_path / "B.sol"
+    solA.write_text(f"{WIDE}*p + {WIDE}*q = 1\n", encoding="utf-8")
+    solB.write_text("q + p = 0\n", encoding="utf-8")
+    assert main.compare_invariants(str(solA), str(solB), use_fingerprint=False) is False
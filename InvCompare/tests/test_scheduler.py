@@ -0,0 +1,39 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from campaign.costmodel import Prediction
+from campaign.scheduler import run_jobs, simulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_simulate():
+    planned = [("a", Prediction(10, 1, "default")), ("b", Prediction(5, 1, "default"))]
+    assert simulate(planned, 1, 10, None) == 15
+    assert simulate(planned, 2, 10, None) == 10
+    with pytest.raises(ValueError):
+        simulate(planned, 0, 10, None)
+    with pytest.raises(ValueError):
+        run_jobs(planned, -1, 10, None, lambda job: ["true"])
+
+
+@pytest.mark.parametrize("script", ["runCampaign.py", "timeoutLadder.py"])
+@pytest.mark.parametrize("jobs", ["0", "-2"])
+def test_jobs_must_be_positive(tmp_path, monkeypatch, capsys, script, jobs):
+    main = __import__(script[:-3]).main
+    monkeypatch.setattr(sys, "argv", [script, "PFLOWS", "--tools=tina", f"--models={tmp_path}", f"--jobs={jobs}"])
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 2
+    assert "--jobs must be positive" in capsys.readouterr().err
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="needs bash")
+def test_build_limits():
+    script = f'TIMEOUT=timeout; source "{ROOT}/runners/run_common.sh"; build_limits ANY 120; build_limits 16G 60'
+    out = subprocess.run(["bash", "-c", script], capture_output=True, text=True, check=True).stdout
+    assert out.splitlines() == ["timeout 120 time", "timeout 60 time systemd-run --scope -p MemoryMax=16G --user"]
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from invariants.invariant import Invariant
+from invariants.shared import SharedInvariants, SharedView
+
+
+def random_set(rng, n=30):
+    names = [f"p{i}" for i in range(8)]
+    return [Invariant({v: rng.choice((-3, -1, 1, 2, 2**40)) for v in rng.sample(names, rng.randint(1, 4))},
+                      rng.choice((0, 1, 5, "?"))) for _ in range(n)]
+
+
+def test_round_trip_and_lazy_view():
+    invs = random_set(random.Random(0))
+    with SharedInvariants(invs) as shared:
+        view = SharedView(shared.handle)
+        try:
+            assert len(view) == len(invs)
+            assert view[3] == invs[3] and view[3].const == invs[3].const
+            assert list(view) == invs
+            assert view.invariants() == invs
+            with pytest.raises(IndexError):
+                view[len(invs)]
+        finally:
+            view.close()
+
+
+def test_overflow():
+    with pytest.raises(OverflowError):
+        SharedInvariants([Invariant({"p0": 1}, 2**70)])
+
+
+def test_parallel_minimality_matches_sequential():
+    pytest.importorskip("z3")
+    from invariants.varindex import VarIndex
+    from solver.parallel import checkMinimalityParallel
+    from solver.satcheck import checkMinimality
+
+    rng = random.Random(1)
+    invs = [inv for inv in random_set(rng, 12) if inv.const != "?"]
+    invs += [invs[0], Invariant({v: 2 * c for v, c in invs[1].varCoeffs.items()}, 2 * invs[1].const)]
+    vIndex = VarIndex(sorted(set().union(*(inv.getUsedVarNames() for inv in invs))))
+    expected, _, calls = checkMinimality(invs, vIndex)
+    redundant, _, parallel_calls = checkMinimalityParallel(invs, 3)
+    assert redundant == expected
+    assert parallel_calls == calls == len(invs)
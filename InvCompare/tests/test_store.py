@@ -0,0 +1,70 @@
+import gzip
+import os
+
+from solution.store import add_solution, blob_refs, collect_garbage, is_entry, store_stats
+
+
+def write_sol(path, text):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(text)
+    return str(path)
+
+
+def campaign(root, folder, runs):
+    logs = root / folder
+    logs.mkdir(parents=True)
+    return [write_sol(logs / f"M.{name}.sol.gz", text) for name, text in runs.items()]
+
+
+def test_gc_keeps_blobs_linked_from_other_folders(tmp_path, monkeypatch):
+    store = str(tmp_path / "solstore")
+    pflows = campaign(tmp_path / "a", "logs_pflows", {"petri64": "p0 + p1 = 1\n", "its": "p1 + p0 = 1\n"})
+    other = campaign(tmp_path / "b", "logs_other", {"petri64": "p2 = 0\n"})
+    keys = {add_solution(store, path)[0] for path in pflows + other}
+    assert len(keys) == 2 and all(is_entry(path, store) for path in pflows + other)
+    # gc run from the other tree, only knowing about its own folders
+    monkeypatch.chdir(tmp_path / "b")
+    removed, _, unreachable = collect_garbage(store, grace_seconds=0)
+    assert removed == [] and unreachable == []
+    assert all(os.path.exists(os.path.realpath(path)) for path in pflows + other)
+
+
+def test_gc_removes_blobs_once_unlinked(tmp_path):
+    store = str(tmp_path / "solstore")
+    first, second = campaign(tmp_path, "logs_pflows", {"petri64": "p0 = 1\n", "its": "p0 = 1\n"})
+    key, _ = add_solution(store, first)
+    assert add_solution(store, second) == (key, False)
+    blob = os.path.realpath(first)
+    assert len(blob_refs(blob).live) == 2
+    os.remove(first)
+    assert collect_garbage(store, grace_seconds=0)[0] == []
+    assert len(blob_refs(blob).live) == 1 and blob_refs(blob).stale == []
+    # a run collected again replaces its link by a plain file
+    os.remove(second)
+    write_sol(second, "p0 = 2\n")
+    removed, freed, _ = collect_garbage(store, grace_seconds=0)
+    assert removed == [blob] and freed > 0
+    assert not os.path.exists(blob) and store_stats(store).blobs == 0
+
+
+def test_gc_keeps_blobs_of_missing_folders(tmp_path):
+    store = str(tmp_path / "solstore")
+    (path,) = campaign(tmp_path / "mnt", "logs_pflows", {"petri64": "p0 = 1\n"})
+    add_solution(store, path)
+    blob = os.path.realpath(path)
+    os.rename(tmp_path / "mnt", tmp_path / "unmounted")
+    removed, _, unreachable = collect_garbage(store, grace_seconds=0)
+    assert removed == [] and unreachable == [path]
+    assert os.path.exists(blob)
+    stats = store_stats(store)
+    assert (stats.refs, stats.unreachable, stats.referenced) == (0, 1, 1)
+
+
+def test_dry_run_and_grace(tmp_path):
+    store = str(tmp_path / "solstore")
+    (path,) = campaign(tmp_path, "logs_pflows", {"petri64": "p0 = 1\n"})
+    add_solution(store, path)
+    os.remove(path)
+    assert collect_garbage(store)[0] == []                      # younger than the grace period
+    blob = collect_garbage(store, grace_seconds=0, dry_run=True)[0]
+    assert len(blob) == 1 and os.path.exists(blob[0])
@@ -0,0 +1,76 @@
+import csv
+
+import pytest
+
+from campaign.subset import load_runs, select, status_class, strata
+
+
+@pytest.mark.parametrize("status, expected", [
+    ("OK", "OK"),
+    ("TO", "TO"),
+    ("MOVF", "MEM"),
+    ("OF", "OF"),
+    ("OK_OF", "OF"),
+    ("TO_OF", "TO"),
+    ("MOVF_OF", "MEM"),
+    ("ERR", "ERR"),
+    ("UNK", "ERR"),
+    ("", "ERR"),
+])
+def test_status_class(status, expected):
+    assert status_class(status) == expected
+
+
+def write_csv(path, columns, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    return str(path)
+
+
+COLLECT_COLUMNS = ["Model", "Tool", "Examination", "CardP", "CardT", "CardA", "NbPInv", "NbTInv",
+                   "Time", "Mem", "Status"]
+
+
+def test_load_runs_keeps_each_examination(tmp_path):
+    path = write_csv(tmp_path / "invar.csv", COLLECT_COLUMNS, [
+        ["M", "tina", "PFLOWS", 3, 2, 6, 4, -1, 100000, 10, "TO"],
+        ["M", "tina", "TFLOWS", 3, 2, 6, -1, 2, 5, 10, "OK"],
+    ])
+    features = load_runs(path)["M"]
+    assert set(features.runs) == {"tina/PFLOWS", "tina/TFLOWS"}
+    assert features.cost_ms() == 100005
+    assert features.size == 11
+    assert features.runs["tina/PFLOWS"].invariants == 4
+    assert features.invariants() == 4
+    assert features.failures() == "TO"
+
+    only = load_runs(path, "TFLOWS")["M"]
+    assert set(only.runs) == {"tina"}
+    assert only.cost_ms() == 5
+
+
+def test_load_runs_legacy_columns(tmp_path):
+    path = write_csv(tmp_path / "old.csv", ["Model", "Tool", "NBP", "NBT", "Time", "TotalTime", "Mem", "Status"], [
+        ["M", "petri64", 3, 1, -1, 120000, 10, "TO"],
+        ["M", "tina", 3, 1, 20, -1, 10, "MOVF"],
+    ])
+    features = load_runs(path)["M"]
+    assert set(features.runs) == {"petri64", "tina"}
+    assert features.runs["petri64"].ms == 120000
+    assert features.invariants() == 4
+    assert features.failures() == "TO+MEM"
+    assert features.failures(per_tool=True) == "petri64:TO+tina:MEM"
+
+
+def test_select_covers_every_stratum(tmp_path):
+    rows = []
+    for i in range(40):
+        status = ("OK", "TO", "MOVF", "OF")[i % 4]
+        rows.append([f"M{i:02d}", "tina", "PFLOWS", i, i, i, 1, 1, 10 * (i + 1), 10, status])
+    models = load_runs(write_csv(tmp_path / "invar.csv", COLLECT_COLUMNS, rows))
+    groups = strata(models, time_bins=2)
+    selection = select(models, len(groups), time_bins=2)
+    assert set(selection.stratum.values()) == set(groups)
+    assert sum(selection.weights.values()) == pytest.approx(len(models))
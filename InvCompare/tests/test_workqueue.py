@@ -0,0 +1,87 @@
+import os
+import time
+
+from campaign.workqueue import WorkQueue
+
+
+def make_queue(tmp_path, lease_sec=600.0):
+    queue = WorkQueue(str(tmp_path / "queue"), lease_sec)
+    queue.init()
+    return queue
+
+
+def age(queue, state, tid, seconds):
+    path = queue._path(state, tid)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_claim_starts_a_fresh_lease(tmp_path):
+    queue = make_queue(tmp_path, lease_sec=60)
+    tid = queue.add("run", ["true"], str(tmp_path))
+    age(queue, "pending", tid, 3600)        # queued long ago
+    task = queue.claim()
+    assert task["id"] == tid and task["lease"]
+    assert list(queue.expired()) == []
+    assert queue.requeue_expired() == []
+    assert queue.ids("claimed") == [tid]
+
+
+def test_finish_after_takeover_leaves_the_task_to_its_owner(tmp_path):
+    queue = make_queue(tmp_path, lease_sec=60)
+    tid = queue.add("run", ["false"], str(tmp_path))
+    first = queue.claim()
+    age(queue, "claimed", tid, 3600)        # the first worker stalled
+    assert queue.requeue_expired() == [tid]
+    second = queue.claim()
+    assert second["lease"] != first["lease"]
+    assert not queue.heartbeat(first)
+    assert queue.finish(first, 1) == "lost"
+    assert queue.ids("claimed") == [tid] and queue.ids("pending") == []
+    assert queue.heartbeat(second)
+    assert queue.finish(second, 0) == "done"
+    assert queue.counts() == {"pending": 0, "claimed": 0, "done": 1, "failed": 0}
+
+
+def test_success_after_lost_lease_is_kept(tmp_path):
+    queue = make_queue(tmp_path, lease_sec=60)
+    tid = queue.add("run", ["true"], str(tmp_path))
+    task = queue.claim()
+    age(queue, "claimed", tid, 3600)
+    assert queue.requeue_expired() == [tid]
+    assert queue.finish(task, 0) == "done"
+    assert queue.ids("pending") == [] and queue.ids("done") == [tid]
+
+
+def test_retry_then_fail(tmp_path):
+    queue = make_queue(tmp_path)
+    tid = queue.add("run", ["false"], str(tmp_path), max_attempts=2)
+    assert queue.finish(queue.claim(), 1) == "pending"
+    assert queue.finish(queue.claim(), 1) == "failed"
+    assert queue.ids("failed") == [tid] and queue.claim() is None
+
+
+def test_unreadable_tasks_are_set_aside(tmp_path, capsys):
+    queue = make_queue(tmp_path, lease_sec=60)
+    broken = queue.add("run", ["true"], str(tmp_path), priority=1)
+    good = queue.add("run", ["false"], str(tmp_path), priority=2)
+    with open(queue._path("pending", broken), "w") as f:
+        f.write("{not json")
+    task = queue.claim(candidates=1)
+    assert task["id"] == good
+    assert queue.ids("failed") == [broken] and queue.ids("claimed") == [good]
+    assert f"unreadable task {broken}" in capsys.readouterr().err
+    with open(queue._path("failed", broken)) as f:
+        assert f.read() == "{not json"           # kept as is for inspection
+
+
+def test_unreadable_expired_task_is_not_lost(tmp_path, capsys):
+    queue = make_queue(tmp_path, lease_sec=60)
+    tid = queue.add("run", ["true"], str(tmp_path))
+    queue.claim()
+    with open(queue._path("claimed", tid), "w") as f:
+        f.write("[]")
+    age(queue, "claimed", tid, 3600)
+    assert queue.requeue_expired() == []
+    assert queue.ids("failed") == [tid] and queue.ids("claimed") == []
+    assert f"unreadable task {tid}" in capsys.readouterr().err
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Adaptive timeout / memory ladder (see campaign/ladder.py).
+
+Reads the status of the logs of a finished campaign and re-runs only the jobs
+that timed out (TO) or ran out of memory (MOVF), with geometrically larger
+limits, round after round, until they succeed or reach --max-timeout /
+--max-mem; an attempt whose run fails without a log is not retried. Attempts are logged under logs_<mode>/ladder/t<sec>_m<mem>/ and the
+smallest successful limits per model and tool are written to a CSV
+(default ladder.csv):
+
+  Model,Tool,Examination,BaseStatus,Attempts,SolvedTimeout,SolvedMem,FinalStatus,FinalTime
+
+SolvedTimeout / SolvedMem are -1 if the job never succeeded, FinalTime is the
+Time (ms) of the last attempt. Jobs are described with the same arguments as
+runCampaign.py; must be run from the folder containing config.sh.
+
+Example:
+  python3 InvCompare/timeoutLadder.py PFLOWS --tools=tina,petri -t 120 --mem=16G \\
+      --time-factor 5 --max-timeout 3000 --max-mem 64G --jobs 8
+"""
+
+import argparse
+import csv
+import os
+import sys
+from typing import Dict, List, Set, Tuple
+
+from campaign.costmodel import Prediction, parse_mem, physical_mem_kb
+from campaign.jobs import RUNNER_TOOLS, Job, expand_jobs, parse_matrices
+from campaign.ladder import LADDER_DIR, Ladder, Limits, is_solved
+from campaign.scheduler import longest_first, run_jobs
+from parsing.parser_logstats import logModelTool, parseLogStats
+
+MODES = ["PFLOWS", "TFLOWS", "PSEMIFLOWS", "TSEMIFLOWS"]
+
+
+def write_summary(path: str, ladder: Ladder, jobs: List[Job]) -> Tuple[int, int]:
+    """Write the per-job ladder summary. Returns (escalated jobs, solved by escalation)."""
+    escalated = solved = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["Model", "Tool", "Examination", "BaseStatus", "Attempts", "SolvedTimeout",
+                         "SolvedMem", "FinalStatus", "FinalTime"])
+        for job in jobs:
+            attempts = [a for a in ladder.attempts(job) if a.status is not None]
+            if len(attempts) < 2:
+                continue
+            escalated += 1
+            model, tool = logModelTool(job.log_name())
+            success = next((a for a in attempts if is_solved(a.status)), None)
+            if success:
+                solved += 1
+            last = attempts[-1]
+            row = parseLogStats(last.log_path, last.limits.time_limit_ms()) or {}
+            writer.writerow([
+                model, tool, job.mode, attempts[0].status, len(attempts),
+                success.limits.timeout_sec if success else -1,
+                success.limits.mem_arg() if success else -1,
+                last.status, row.get("Time", -1),
+            ])
+    return (escalated, solved)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-run only timed out / memory overflowing jobs with larger limits.")
+    parser.add_argument("modes", nargs="+", choices=MODES, help="Examination modes.")
+    parser.add_argument("--tools", default="tina,petri,itstools,gspn", help="Comma separated runners.")
+    parser.add_argument("--matrix", action="append", default=[], metavar="TOOL=GROUP",
+                        help="Flag group of a tool, as in runCampaign.py. Repeatable.")
+    parser.add_argument("--model-filter", default=None, help="First letter range of the models, e.g. A-D.")
+    parser.add_argument("--models", default=os.environ.get("MODELDIR"), help="Models folder (default $MODELDIR).")
+    parser.add_argument("-t", "--timeout", type=int, default=120, help="Timeout of the base campaign (s).")
+    parser.add_argument("--mem", "-mem", default="16G", help="Memory limit of the base campaign, or ANY.")
+    parser.add_argument("--time-factor", type=float, default=5.0, help="Timeout multiplier per rung.")
+    parser.add_argument("--max-timeout", type=int, default=3000, help="Largest timeout (s).")
+    parser.add_argument("--mem-factor", type=float, default=2.0, help="Memory limit multiplier per rung.")
+    parser.add_argument("--max-mem", default=None, help="Largest memory limit (default: no memory escalation).")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of concurrent jobs.")
+    parser.add_argument("-solution", "--solution", action="store_true", help="Collect solution files.")
+    parser.add_argument("--summary", default="ladder.csv", help="Output CSV of the smallest successful limits.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the next round of attempts only.")
+    args = parser.parse_args()
+
+    tools = [t for t in args.tools.split(",") if t]
+    if any(t not in RUNNER_TOOLS for t in tools):
+        parser.error(f"unknown tool in {args.tools}")
+    if not args.models or not os.path.isdir(args.models):
+        parser.error("models folder not found, use --models or set MODELDIR")
+    if args.jobs < 1:
+        parser.error("--jobs must be positive")
+    try:
+        matrices = parse_matrices(tools, args.matrix)
+        base_mem = parse_mem(args.mem)
+        max_mem = parse_mem(args.max_mem) if args.max_mem else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    ladder = Ladder(Limits(args.timeout, base_mem), args.time_factor, args.max_timeout,
+                    args.mem_factor, max_mem)
+    jobs = expand_jobs(args.models, args.modes, matrices, args.model_filter)
+    budget_kb = 0.9 * (physical_mem_kb() or float("inf"))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = os.path.join(root, "runners", "run_job.sh")
+
+    # Each attempt is run once: one that left no log (runner failure) is not retried
+    tried: Set[Tuple[Job, Limits]] = set()
+    rung = 0
+    while True:
+        todo: Dict[Job, Limits] = {}
+        for job in jobs:
+            attempt = ladder.next_attempt(job)
+            if attempt is not None and (job, attempt.limits) not in tried:
+                todo[job] = attempt.limits
+        if not todo:
+            break
+        rung += 1
+        print(f"Round {rung}: {len(todo)} jobs to re-run with larger limits")
+        if args.dry_run:
+            for job, limits in sorted(todo.items()):
+                print(f"  {limits.tag():16s} {job.describe()}")
+            break
+
+        def command(job: Job) -> List[str]:
+            limits = todo[job]
+            return [script, job.mode, job.tool, job.model_dir.rstrip("/") + "/", job.flags,
+                    limits.mem_arg(), str(limits.timeout_sec), "true" if args.solution else "false",
+                    os.path.join(LADDER_DIR, limits.tag())]
+
+        # a re-run is expected to use its whole new limits
+        planned = longest_first([
+            (job, Prediction(float(limits.timeout_sec), limits.mem_kb or 0.0, "ladder"))
+            for job, limits in todo.items()
+        ])
+        tried.update(todo.items())
+        counts = run_jobs(planned, args.jobs, budget_kb, max_mem, command)
+        if counts["failed"]:
+            print(f"Warning: {counts['failed']} runs of round {rung} failed, those that left no log are not retried")
+
+    escalated, solved = write_summary(args.summary, ladder, jobs)
+    print(f"{escalated} jobs escalated, {solved} solved with larger limits; summary in {args.summary}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
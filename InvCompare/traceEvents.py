@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Timelines of campaigns from the event log (see campaign/events.py).
+
+Export to the Chrome/Perfetto trace-event format (open in ui.perfetto.dev or
+chrome://tracing; one process per node, one thread per worker slot):
+
+  traceEvents.py export EVENT_LOG -o campaign.trace.json
+
+Per-node utilization (busy slots over time), stragglers and the tail of the
+campaign, with an optional CSV of the busy slots per node and time bin:
+
+  traceEvents.py summary EVENT_LOG [--bin 60] [--csv utilization.csv] [--phase run]
+
+Events are recorded by exporting EVENT_LOG=/shared/folder before run_atool.sh,
+run.sh, runCampaign.py or the work queue workers.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+from campaign.events import read_events
+from campaign.timeline import Interval, chrome_trace, intervals, utilization
+
+
+def hms(seconds: float) -> str:
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def peak_concurrency(items: List[Interval]) -> int:
+    points = sorted([(i.start, 1) for i in items] + [(i.end, -1) for i in items], key=lambda p: (p[0], p[1]))
+    current = peak = 0
+    for _, delta in points:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def summary(items: List[Interval], bin_sec: float, phases: List[str], csv_path: str, top: int) -> None:
+    selected = [i for i in items if not phases or i.phase in phases]
+    if not selected:
+        print("No events.")
+        return
+    by_host: Dict[str, List[Interval]] = defaultdict(list)
+    for item in selected:
+        by_host[item.host].append(item)
+    series = utilization(selected, bin_sec)
+
+    print(f"{'Host':20s} {'Tasks':>6s} {'Span':>9s} {'Busy':>10s} {'Peak':>5s} {'AvgBusy':>8s} {'Util':>6s} {'Tail':>9s}")
+    longest_span = 0.0
+    for host in sorted(by_host):
+        host_items = by_host[host]
+        start = min(i.start for i in host_items)
+        end = max(i.end for i in host_items)
+        span = end - start
+        longest_span = max(longest_span, span)
+        busy = sum(i.end - i.start for i in host_items)
+        peak = peak_concurrency(host_items)
+        avg = busy / span if span > 0 else 0.0
+        # tail: time from the last bin with at least half the peak busy to the end
+        bins = series.get(host, [])
+        half = [n for n, v in enumerate(bins) if v >= peak / 2]
+        t0 = min(i.start for i in selected)
+        tail = end - (t0 + (half[-1] + 1) * bin_sec) if half else span
+        print(f"{host[:20]:20s} {len(host_items):6d} {hms(span):>9s} {busy / 3600:9.1f}h {peak:5d} "
+              f"{avg:8.1f} {100 * avg / peak if peak else 0:5.0f}% {hms(max(0.0, tail)):>9s}")
+
+    unfinished = [i for i in selected if i.rc is None]
+    if unfinished:
+        print(f"{len(unfinished)} tasks without end event (killed or still running).")
+    print(f"Longest node span {hms(longest_span)}: a walltime of {hms(longest_span * 1.2)} "
+          f"leaves a 20% margin for this partition.")
+    print("Longest tasks:")
+    for item in sorted(selected, key=lambda i: i.start - i.end)[:top]:
+        print(f"  {hms(item.end - item.start)} {item.host} {item.phase} {item.mode} {item.tool} {item.model}"
+              f"{'' if item.rc is not None else ' (unfinished)'}")
+
+    if csv_path:
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["Host", "Time", "Busy"])
+            for host, values in sorted(series.items()):
+                for n, value in enumerate(values):
+                    writer.writerow([host, f"{n * bin_sec:g}", f"{value:.2f}"])
+        print(f"Wrote {csv_path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Campaign timelines from the event log.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("export", help="Write a Chrome/Perfetto trace-event JSON file.")
+    p.add_argument("events", help="Event log folder (EVENT_LOG).")
+    p.add_argument("-o", "--output", default="campaign.trace.json", help="Output trace file.")
+    p = sub.add_parser("summary", help="Print per-node utilization, tail and stragglers.")
+    p.add_argument("events", help="Event log folder (EVENT_LOG).")
+    p.add_argument("--bin", type=float, default=60.0, help="Time bin of the utilization series (s).")
+    p.add_argument("--phase", action="append", default=[],
+                   help="Only count these phases (run, collect, compare, minimality). Repeatable.")
+    p.add_argument("--csv", default="", help="Write the busy slots per node and time bin to this CSV.")
+    p.add_argument("--top", type=int, default=10, help="Number of longest tasks to list.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.events):
+        parser.error(f"{args.events} is not a folder")
+    items = intervals(read_events(args.events))
+
+    if args.command == "export":
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(items), f)
+        print(f"Wrote {len(items)} tasks to {args.output}")
+    else:
+        summary(items, args.bin, args.phase, args.csv, args.top)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Shared-filesystem work queue for multi-node campaigns (see campaign/workqueue.py).
+
+Producers add tasks, workers started on any number of nodes (e.g. one OAR job
+each) pull them until the queue is empty:
+
+  workQueue.py init QUEUE
+  workQueue.py add-runs QUEUE PFLOWS TFLOWS --tools=tina,petri --matrix "petri=-32 | -64" [-solution]
+  workQueue.py add-collect QUEUE logs_pflows logs_tflows
+  workQueue.py add-compare QUEUE logs_pflows logs_tflows
+  workQueue.py add-minimality QUEUE logs_pflows
+  workQueue.py work QUEUE --slots 4
+  workQueue.py status QUEUE
+
+Run tasks are ordered longest predicted first (see runCampaign.py); tasks that
+fail are retried up to --max-attempts times, and tasks of dead workers are put
+back once their lease expires. Commands are run from the folder that added
+them, which must contain config.sh for run tasks, like run_atool.sh.
+"""
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from campaign.costmodel import CostModel, parse_mem
+from campaign.jobs import RUNNER_TOOLS, expand_jobs, parse_matrices
+from campaign.workqueue import MAX_PRIORITY, WorkQueue
+from parsing.log_info import infer_tool, model_name
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ["PFLOWS", "TFLOWS", "PSEMIFLOWS", "TSEMIFLOWS"]
+
+
+def add_runs(queue: WorkQueue, args: argparse.Namespace) -> int:
+    tools = [t for t in args.tools.split(",") if t]
+    for tool in tools:
+        if tool not in RUNNER_TOOLS:
+            raise ValueError(f"unknown tool: {tool}")
+    costs = CostModel(args.timeout, parse_mem(args.mem))
+    for path in args.history or (["invar.csv"] if os.path.exists("invar.csv") else []):
+        costs.load_csv(path)
+    script = os.path.join(ROOT, "runners", "run_job.sh")
+    added = 0
+    for job in expand_jobs(args.models, args.modes, parse_matrices(tools, args.matrix), args.model_filter):
+        if os.path.exists(job.log_path()):
+            continue
+        pred = costs.predict(job)
+        argv = [script, job.mode, job.tool, job.model_dir.rstrip("/") + "/", job.flags,
+                args.mem, str(args.timeout), "true" if args.solution else "false"]
+        # longest predicted first
+        if queue.add("run", argv, os.getcwd(), MAX_PRIORITY - int(pred.seconds * 1000),
+                     max_attempts=args.max_attempts):
+            added += 1
+    return added
+
+
+def add_collect(queue: WorkQueue, args: argparse.Namespace) -> int:
+    script = os.path.join(ROOT, "InvCompare", "collectSolution.py")
+    added = 0
+    for folder in args.folders:
+        for name in sorted(os.listdir(folder)):
+            log = os.path.abspath(os.path.join(folder, name))
+            if infer_tool(log) is None or os.path.exists(f"{log}.sol.gz"):
+                continue
+            argv = ["python3", script, "--batch", log, "--jobs", "1"]
+            if args.models:
+                argv += ["--models", args.models]
+            if queue.add("collect", argv, os.getcwd(), max_attempts=args.max_attempts):
+                added += 1
+    return added
+
+
+def add_compare(queue: WorkQueue, args: argparse.Namespace) -> int:
+    """One compare_sol.sh task per model with at least two solutions, as parCompareSol.sh."""
+    script = os.path.join(ROOT, "compare_sol.sh")
+    added = 0
+    for folder in args.folders:
+        by_model: Dict[str, List[str]] = {}
+        for sol in sorted(glob.glob(os.path.join(os.path.abspath(folder), "*.sol.gz"))):
+            by_model.setdefault(model_name(sol), []).append(sol)
+        for model, sols in sorted(by_model.items()):
+            if len(sols) < 2 or os.path.exists(os.path.join(os.path.dirname(sols[0]), f"{model}.comp")):
+                continue
+            if queue.add("compare", [script] + sols, ROOT, max_attempts=args.max_attempts):
+                added += 1
+    return added
+
+
+def add_minimality(queue: WorkQueue, args: argparse.Namespace) -> int:
+    """One test_minimality.sh task per solution, as parTestMin.sh."""
+    script = os.path.join(ROOT, "test_minimality.sh")
+    added = 0
+    for folder in args.folders:
+        for sol in sorted(glob.glob(os.path.join(os.path.abspath(folder), "*.sol.gz"))):
+            if os.path.exists(sol[:-len(".sol.gz")] + ".sol.min"):
+                continue
+            if queue.add("minimality", [script, sol], ROOT, max_attempts=args.max_attempts):
+                added += 1
+    return added
+
+
+def work(queue: WorkQueue, slots: int, wait: bool, poll_sec: float = 2.0) -> Dict[str, int]:
+    """
+    Run tasks on slots local processes until the queue is empty (or forever
+    with wait), renewing the leases of running tasks.
+    """
+    running: Dict[subprocess.Popen, Tuple[dict, object]] = {}
+    counts = {"done": 0, "pending": 0, "failed": 0, "lost": 0}
+    last_beat = time.time()
+    while True:
+        while len(running) < slots:
+            task = queue.claim()
+            if task is None:
+                break
+            out = open(task["output"], "a")
+            try:
+                proc = subprocess.Popen(task["argv"], cwd=task["cwd"], stdout=out, stderr=subprocess.STDOUT)
+            except OSError as e:
+                out.write(f"Error: cannot start task: {e}\n")
+                out.close()
+                counts[queue.finish(task, 127)] += 1
+                continue
+            running[proc] = (task, out)
+            print(f"[{queue.host}] start {task['kind']} {task['id']} (attempt {task['attempts']})")
+            sys.stdout.flush()
+
+        if not running:
+            if queue.requeue_expired():
+                continue
+            if not wait and not queue.ids("claimed"):
+                return counts
+            time.sleep(poll_sec)
+            continue
+
+        time.sleep(poll_sec)
+        if time.time() - last_beat > queue.lease_sec / 3:
+            for task, _ in running.values():
+                queue.heartbeat(task)
+            last_beat = time.time()
+        for proc in [p for p in running if p.poll() is not None]:
+            task, out = running.pop(proc)
+            out.close()
+            state = queue.finish(task, proc.returncode)
+            counts[state] += 1
+            print(f"[{queue.host}] {task['kind']} {task['id']} -> {state} (exit {proc.returncode})")
+        queue.requeue_expired()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared-filesystem work queue for multi-node campaigns.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def queue_command(name: str, help_text: str) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("queue", help="Queue folder, on a filesystem shared by all nodes.")
+        p.add_argument("--lease", type=float, default=600.0,
+                       help="Seconds without heartbeat after which a claimed task is put back.")
+        return p
+
+    queue_command("init", "Create the queue folders.")
+    queue_command("status", "Print the number of tasks per state and the expired leases.")
+
+    p = queue_command("add-runs", "Add tool runs (as runCampaign.py).")
+    p.add_argument("modes", nargs="+", choices=MODES)
+    p.add_argument("--tools", default="tina,petri,itstools,gspn")
+    p.add_argument("--matrix", action="append", default=[], metavar="TOOL=GROUP")
+    p.add_argument("--mem", "-mem", default="16G")
+    p.add_argument("-t", "--timeout", type=int, default=120)
+    p.add_argument("-solution", "--solution", action="store_true")
+    p.add_argument("--model-filter", default=None)
+    p.add_argument("--models", default=os.environ.get("MODELDIR"))
+    p.add_argument("--history", action="append", default=None)
+    p.add_argument("--max-attempts", type=int, default=2)
+
+    for name, help_text in (("add-collect", "Add solution collection of uncollected logs."),
+                            ("add-compare", "Add one solution comparison per model."),
+                            ("add-minimality", "Add one minimality test per solution.")):
+        p = queue_command(name, help_text)
+        p.add_argument("folders", nargs="+", help="Log folders.")
+        p.add_argument("--max-attempts", type=int, default=2)
+        if name == "add-collect":
+            p.add_argument("--models", default=os.environ.get("MODELDIR"))
+
+    p = queue_command("work", "Pull and run tasks until the queue is empty.")
+    p.add_argument("--slots", type=int, default=os.cpu_count() or 1, help="Concurrent tasks on this node.")
+    p.add_argument("--wait", action="store_true", help="Keep waiting for new tasks when the queue is empty.")
+
+    args = parser.parse_args()
+    queue = WorkQueue(args.queue, args.lease)
+
+    if args.command == "init":
+        queue.init()
+        print(f"Initialized queue {args.queue}")
+        return
+    if not os.path.isdir(os.path.join(args.queue, "pending")):
+        parser.error(f"{args.queue} is not a queue, run: {sys.argv[0]} init {args.queue}")
+
+    if args.command == "status":
+        counts = queue.counts()
+        print(", ".join(f"{n} {state}" for state, n in counts.items()))
+        for tid, age in queue.expired():
+            print(f"  expired lease: {tid} ({age:.0f}s)")
+    elif args.command == "work":
+        counts = work(queue, args.slots, args.wait)
+        print(f"[{queue.host}] worker exiting: {counts['done']} done, "
+              f"{counts['pending']} retried, {counts['failed']} failed, {counts['lost']} lost.")
+    else:
+        adders = {"add-runs": add_runs, "add-collect": add_collect,
+                  "add-compare": add_compare, "add-minimality": add_minimality}
+        try:
+            added = adders[args.command](queue, args)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Added {added} tasks to {args.queue}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,9 @@ source ./config.sh
 
 PYTHON_SCRIPT="$ROOT/InvCompare/main.py"
 TIMEOUT_SEC=300
+# Models whose solutions total more than this (compressed) are streamed out of core;
+# with --keepDup, their shared invariants are still asserted, so the verdicts are the same
+OUT_OF_CORE_MB=${OUT_OF_CORE_MB:-256}
 
 # Ensure Python script exists
 if [ ! -f "$PYTHON_SCRIPT" ]; then
@@ -88,7 +91,18 @@ for model in "${MODELS[@]}"; do
     TEMP_FILES=()
     for gz_file in "${MODEL_FILES[@]}"; do
         TEMP_FILE="$TEMP_DIR/$(basename "${gz_file%.sol.gz}.sol")"
-        if ! gunzip -c "$gz_file" > "$TEMP_FILE"; then
+        if [ -L "$gz_file" ]; then
+            # Solution store entry (InvCompare/solStore.py): link its blob, so that
+            # runs sharing a blob are recognized by main.py without reading it
+            if zgrep -q '?' "$gz_file"; then
+                echo "Skipping $gz_file: Contains '?' indicating missing constants" >&2
+                echo "Skipping $gz_file: Contains '?' indicating missing constants" >> "$REPORT_FILE"
+            else
+                ln -s "$(readlink -f "$gz_file")" "$TEMP_FILE.gz" && TEMP_FILES+=("$TEMP_FILE.gz")
+                # main.py only uses fingerprints from the .sol.json sidecars
+                [ -f "${gz_file%.gz}.json" ] && cp "${gz_file%.gz}.json" "$TEMP_FILE.json"
+            fi
+        elif ! gunzip -c "$gz_file" > "$TEMP_FILE"; then
             echo "Warning: Failed to unzip $gz_file" >&2
             echo "Warning: Failed to unzip $gz_file" >> "$REPORT_FILE"
         elif grep -q '?' "$TEMP_FILE"; then
@@ -97,6 +111,7 @@ for model in "${MODELS[@]}"; do
             rm -f "$TEMP_FILE"
         else
             TEMP_FILES+=("$TEMP_FILE")
+            [ -f "${gz_file%.gz}.json" ] && cp "${gz_file%.gz}.json" "$TEMP_FILE.json"
         fi
     done
 
@@ -104,8 +119,15 @@ for model in "${MODELS[@]}"; do
         echo "Warning: Fewer than 2 valid files unzipped successfully for $model" >&2
         echo "Warning: Fewer than 2 valid files unzipped successfully" >> "$REPORT_FILE"
     else
-        # Run comparison with timeout
-        "$TIMEOUT" "$TIMEOUT_SEC" python3 "$PYTHON_SCRIPT" --keepDup --compareSolutions "${TEMP_FILES[@]}" >> "$REPORT_FILE" 2>&1
+        # Run comparison with timeout; verdicts also go to ${model}.comp.json (InvCompare/collectResults.py)
+        rm -f "$REPORT_FILE.json"
+        STREAM_FLAG=""
+        TOTAL_KB=$(du -ckL "${MODEL_FILES[@]}" | tail -n 1 | cut -f 1)
+        if [ "$TOTAL_KB" -gt $((OUT_OF_CORE_MB * 1024)) ]; then
+            STREAM_FLAG="--outOfCore"
+        fi
+        "$TIMEOUT" "$TIMEOUT_SEC" python3 "$PYTHON_SCRIPT" --keepDup $STREAM_FLAG --compareSolutions \
+            --results-json="$REPORT_FILE.json" "${TEMP_FILES[@]}" >> "$REPORT_FILE" 2>&1
     fi
 
     echo "Completed: $(date)" >> "$REPORT_FILE"
@@ -1,3 +1,6 @@
+import argparse
+import os
+import sys
 import pandas as pd
 import numpy as np
 from scipy.stats import gmean
@@ -5,43 +8,51 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.backends.backend_pdf import PdfPages
 
-# Load the CSV file
-file_path = 'invar.csv'  # Replace with the path to your CSV file
-data = pd.read_csv(file_path)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'InvCompare'))
+from campaign.figcache import FigureCache
+
+parser = argparse.ArgumentParser(description='Build analysis_report.pdf from a campaign CSV or the history store.')
+parser.add_argument('csv', nargs='?', default='invar.csv', help='Campaign CSV (default: invar.csv).')
+parser.add_argument('--history', default=None,
+                    help='History store (InvCompare/campaignHistory.py) to read instead of the CSV.')
+parser.add_argument('--campaign', default=None, help='Campaign of the history store (default: the last one).')
+parser.add_argument('--phases', default='phases.csv', help='Per-phase timings (InvCompare/collectPhases.py).')
+parser.add_argument('--output', default='analysis_report.pdf', help='Output PDF.')
+parser.add_argument('--cache-dir', default='.report_cache', help='Cache of the rendered figures.')
+parser.add_argument('--no-cache', action='store_true', help='Redraw every figure.')
+args = parser.parse_args()
+
+# Load the campaign, from the history store or the CSV file
+trends = None
+if args.history:
+    from campaign import history
+    names = history.campaigns(args.history)
+    if not names:
+        sys.exit(f'No campaign in {args.history}')
+    campaign = args.campaign or names[-1]
+    if campaign not in names:
+        sys.exit(f'No campaign {campaign} in {args.history}')
+    data = history.select(args.history, [campaign]).sort_values(['Model', 'Tool'], kind='stable')
+    if len(names) > 1:
+        trends = history.status_summary(args.history, by_campaign=True)
+else:
+    data = pd.read_csv(args.csv)
 
 # Replace -1 in 'Time' with 120000 (timeout in ms)
 data['Time'] = data['Time'].replace(-1, 120000)
 
-# Add a column for success or failure
-data['Status'] = data.apply(lambda row: 'Failure' if row['Status'] != 'OK' else 'Success', axis=1)
-
-# Function to calculate summary statistics (mean and median)
-def calculate_summary_statistics(df):
-    summary = {
-        'mean': df.mean(),
-        'median': df.median()
-    }
-    return pd.Series(summary)
-
-# Calculate summary statistics for each tool and each metric
-tools = data['Tool'].unique()
-metrics = ['Time', 'TotalTime', 'Mem']
-summary_data = []
+# Per-phase timings (long table built by InvCompare/collectPhases.py), if present
+phases = pd.read_csv(args.phases) if os.path.exists(args.phases) else None
+component_phases = ['parse', 'reduce', 'flows', 'other']
 
-for tool in tools:
-    tool_data = data[data['Tool'] == tool]
-    for metric in metrics:
-        stats = calculate_summary_statistics(tool_data[metric])
-        stats['Tool'] = tool
-        stats['Metric'] = metric
-        summary_data.append(stats)
-
-# Create a dataframe for the summary statistics
-summary_stats_df = pd.DataFrame(summary_data)
+# Add a column for success or failure
+data['Status'] = np.where(data['Status'] == 'OK', 'Success', 'Failure')
 
-# Pivot the dataframe to have a more readable format
-summary_stats_pivot = summary_stats_df.pivot(index='Tool', columns='Metric').reset_index()
-summary_stats_pivot.columns = ['Tool', 'Time_mean', 'Time_median', 'TotalTime_mean', 'TotalTime_median', 'Mem_mean', 'Mem_median']
+# Summary statistics (mean and median) of each metric per tool
+metrics = ['Time', 'TotalTime', 'Mem']
+summary_stats_pivot = data.groupby('Tool')[metrics].agg(['mean', 'median'])
+summary_stats_pivot.columns = [f'{metric}_{stat}' for metric, stat in summary_stats_pivot.columns]
+summary_stats_pivot = summary_stats_pivot.reset_index()
 
 # Limit precision to whole milliseconds
 summary_stats_pivot = summary_stats_pivot.round(0)
@@ -50,86 +61,120 @@ summary_stats_pivot = summary_stats_pivot.round(0)
 qualitative_results = data.groupby(['Tool', 'Status']).size().unstack(fill_value=0)
 qualitative_results['Total'] = qualitative_results.sum(axis=1)
 
+# Figures are only redrawn when the data they plot changed
+cache = None if args.no_cache else FigureCache(args.cache_dir)
+
+
+def page(pdf, name, frames, draw, **savefig_args):
+    """Add the figure drawn by draw() from frames to the report."""
+    if cache is not None:
+        fig = cache.figure(name, frames, draw)
+    else:
+        fig = plt.figure(figsize=(12, 8))
+        draw()
+    pdf.savefig(fig, **savefig_args)
+    plt.close(fig)
+
+
+def boxplot(metric, title, ylabel):
+    def draw():
+        sns.boxplot(x='Tool', y=metric, data=data)
+        plt.title(title)
+        plt.ylabel(ylabel)
+    return draw
+
+
+def cactus(df, column, title, xlabel, ylabel, log=False):
+    def draw():
+        for tool, values in df.groupby('Tool', sort=False)[column]:
+            sorted_values = np.sort(values.values)
+            y_vals = np.arange(1, len(sorted_values) + 1)
+            plt.step(y_vals, sorted_values, label=tool)
+        plt.title(title)
+        plt.xlabel(xlabel)
+        plt.ylabel(ylabel)
+        if log:
+            plt.yscale('log')
+        plt.legend()
+    return draw
+
+
+def table(df, title, row_labels=None):
+    def draw():
+        plt.axis('off')
+        plt.title(title)
+        t = plt.table(cellText=df.values, colLabels=df.columns, rowLabels=row_labels,
+                      cellLoc='center', loc='center')
+        t.auto_set_font_size(False)
+        t.set_fontsize(12)
+        t.scale(1.2, 1.2)
+    return draw
+
+
 # Create a PDF report
-pdf_path = 'analysis_report.pdf'
+pdf_path = args.output
 with PdfPages(pdf_path) as pdf:
-    # Box plot for Time
-    plt.figure(figsize=(12, 8))
-    sns.boxplot(x='Tool', y='Time', data=data)
-    plt.title('Distribution of Time by Tool')
-    plt.ylabel('Time (ms)')
-    pdf.savefig()
-    plt.close()
-
-    # Box plot for TotalTime
-    plt.figure(figsize=(12, 8))
-    sns.boxplot(x='Tool', y='TotalTime', data=data)
-    plt.title('Distribution of TotalTime by Tool')
-    plt.ylabel('TotalTime (ms)')
-    pdf.savefig()
-    plt.close()
-
-    # Box plot for Memory
-    plt.figure(figsize=(12, 8))
-    sns.boxplot(x='Tool', y='Mem', data=data)
-    plt.title('Distribution of Memory by Tool')
-    plt.ylabel('Memory (kB)')
-    pdf.savefig()
-    plt.close()
-
-    # Cactus plot for Time
-    plt.figure(figsize=(12, 8))
-    for tool in data['Tool'].unique():
-        tool_data = data[data['Tool'] == tool]
-        sorted_time = np.sort(tool_data['Time'].values)
-        y_vals = np.arange(1, len(sorted_time) + 1)
-        plt.step(y_vals, sorted_time, label=tool)
-    plt.title('Cactus Plot for Time')
-    plt.xlabel('Instances Solved')
-    plt.ylabel('Time (ms)')
-    plt.legend()
-    pdf.savefig()
-    plt.close()
-
-    # Cactus plot for Memory
-    plt.figure(figsize=(12, 8))
-    for tool in data['Tool'].unique():
-        tool_data = data[data['Tool'] == tool]
-        sorted_mem = np.sort(tool_data['Mem'].values)
-        y_vals = np.arange(1, len(sorted_mem) + 1)
-        plt.step(y_vals, sorted_mem, label=tool)
-    plt.title('Cactus Plot for Memory')
-    plt.xlabel('Instances Solved')
-    plt.ylabel('Memory (kB)')
-    plt.legend()
-    pdf.savefig()
-    plt.close()
-
-    # Qualitative results table
-    plt.figure(figsize=(12, 8))
-    plt.axis('off')
-    plt.title('Qualitative Results')
-    qualitative_results_table = plt.table(cellText=qualitative_results.values,
-                                          colLabels=qualitative_results.columns,
-                                          rowLabels=qualitative_results.index,
-                                          cellLoc='center', loc='center')
-    qualitative_results_table.auto_set_font_size(False)
-    qualitative_results_table.set_fontsize(12)
-    qualitative_results_table.scale(1.2, 1.2)
-    pdf.savefig(bbox_inches='tight')
-    plt.close()
-
-    # Summary statistics table
-    plt.figure(figsize=(12, 8))
-    plt.axis('off')
-    plt.title('Summary Statistics')
-    summary_stats_table = plt.table(cellText=summary_stats_pivot.values,
-                                    colLabels=summary_stats_pivot.columns,
-                                    cellLoc='center', loc='center')
-    summary_stats_table.auto_set_font_size(False)
-    summary_stats_table.set_fontsize(12)
-    summary_stats_table.scale(1.2, 1.2)
-    pdf.savefig(bbox_inches='tight')
-    plt.close()
-
+    # Box plots for Time, TotalTime and Memory
+    page(pdf, 'box_time', [data[['Tool', 'Time']]],
+         boxplot('Time', 'Distribution of Time by Tool', 'Time (ms)'))
+    page(pdf, 'box_totaltime', [data[['Tool', 'TotalTime']]],
+         boxplot('TotalTime', 'Distribution of TotalTime by Tool', 'TotalTime (ms)'))
+    page(pdf, 'box_mem', [data[['Tool', 'Mem']]],
+         boxplot('Mem', 'Distribution of Memory by Tool', 'Memory (kB)'))
+
+    # Cactus plots for Time and Memory
+    page(pdf, 'cactus_time', [data[['Tool', 'Time']]],
+         cactus(data, 'Time', 'Cactus Plot for Time', 'Instances Solved', 'Time (ms)'))
+    page(pdf, 'cactus_mem', [data[['Tool', 'Mem']]],
+         cactus(data, 'Mem', 'Cactus Plot for Memory', 'Instances Solved', 'Memory (kB)'))
+
+    # Qualitative results and summary statistics tables
+    page(pdf, 'table_qualitative', [qualitative_results.reset_index()],
+         table(qualitative_results, 'Qualitative Results', qualitative_results.index),
+         bbox_inches='tight')
+    page(pdf, 'table_summary', [summary_stats_pivot],
+         table(summary_stats_pivot, 'Summary Statistics'), bbox_inches='tight')
+
+    if trends is not None:
+        # Solved models per tool over the campaigns of the history store
+        solved = trends.pivot(index='campaign', columns='Tool', values='succ')
+
+        def draw_trends():
+            solved.plot(marker='o', ax=plt.gca())
+            plt.title('Solved Models per Campaign')
+            plt.ylabel('Models solved')
+            plt.xticks(rotation=45, ha='right')
+        page(pdf, 'trend_solved', [solved.reset_index()], draw_trends, bbox_inches='tight')
+
+    if phases is not None:
+        # Cactus plot per phase
+        by_phase = dict(tuple(phases.groupby('Phase')))
+        for phase in component_phases + ['total', 'wall']:
+            phase_data = by_phase.get(phase)
+            if phase_data is None:
+                continue
+            page(pdf, f'cactus_phase_{phase}', [phase_data[['Tool', 'Ms']]],
+                 cactus(phase_data, 'Ms', f'Cactus Plot for Phase {phase}', 'Instances', 'Time (ms)', log=True))
+
+        # Phase share of the wall time per tool, over the runs with a wall time;
+        # the remainder (startup, output, unreported steps) is shown as 'unaccounted'
+        wide = phases.pivot_table(index=['Model', 'Tool', 'Examination'], columns='Phase',
+                                  values='Ms', aggfunc='sum')
+        if 'wall' in wide.columns:
+            wide = wide[wide['wall'] > 0]
+            present = [p for p in component_phases if p in wide.columns]
+            totals = wide[present + ['wall']].fillna(0).groupby(level='Tool').sum()
+            shares = totals[present].div(totals['wall'], axis=0).clip(upper=1.0)
+            shares['unaccounted'] = (1.0 - shares.sum(axis=1)).clip(lower=0.0)
+
+            def draw_shares():
+                shares.plot(kind='bar', stacked=True, ax=plt.gca())
+                plt.title('Phase Share of Wall Time by Tool')
+                plt.ylabel('Share of total wall time')
+                plt.xticks(rotation=45, ha='right')
+            page(pdf, 'phase_shares', [shares.reset_index()], draw_shares, bbox_inches='tight')
+
+if cache is not None:
+    cache.prune()
+    print(f'Figures: {cache.misses} drawn, {cache.hits} from {args.cache_dir}')
 print(f'Report saved to {pdf_path}')
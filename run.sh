@@ -2,7 +2,7 @@
 # run.sh: Run performance tests on models for a given mode and a selected set of tools.
 #
 # Usage:
-#   ./run.sh [MODE] [--tools=tina,tina4ti2,itstools,petri32,petri64,petri128,gspn,petrisage] [--mem=VALUE] [-t TIMEOUT] [--extra-petri-flags=FLAGS] [--extra-petrisage-flags=FLAGS] [--model-filter=RANGE]
+#   ./run.sh [MODE] [--tools=tina,tina4ti2,itstools,petri32,petri64,petri128,gspn,petrisage] [--mem=VALUE] [-t TIMEOUT] [--extra-petri-flags=FLAGS] [--extra-petrisage-flags=FLAGS] [--model-filter=RANGE] [--model-list=FILE]
 #
 # MODE must be one of:
 #   FLOWS, SEMIFLOWS, TFLOWS, PFLOWS, TSEMIFLOWS, PSEMIFLOWS
@@ -37,15 +37,20 @@
 #   Format: X-Y (e.g., A-D, E-L, M-R, S-Z). Case-insensitive.
 #   Default: process all models.
 #
+# --model-list=FILE:
+#   Process only the models listed in FILE, one name per line ('#' starts a comment),
+#   e.g. a representative subset written by InvCompare/selectModels.py.
+#
 # Examples:
 #   ./run.sh TFLOWS
 #   ./run.sh PFLOWS --tools=tina4ti2,petri64,petrisage -t 300
 #   ./run.sh TFLOWS --mem=ANY --extra-petri-flags="--noSingleSignRow --loopLimit=500" --extra-petrisage-flags="--backend=snf"
 #   ./run.sh PFLOWS --model-filter=A-D
+#   ./run.sh PFLOWS --tools=petri64 --model-list=subset.txt
 
 print_usage() {
     cat <<EOF
-Usage: $0 [MODE] [--tools=tina,tina4ti2,itstools,petri32,petri64,petri128,gspn,petrisage] [--mem=VALUE] [-t=TIMEOUT] [-solution] [--extra-petri-flags=FLAGS] [--extra-petrisage-flags=FLAGS] [--model-filter=RANGE]
+Usage: $0 [MODE] [--tools=tina,tina4ti2,itstools,petri32,petri64,petri128,gspn,petrisage] [--mem=VALUE] [-t=TIMEOUT] [-solution] [--extra-petri-flags=FLAGS] [--extra-petrisage-flags=FLAGS] [--model-filter=RANGE] [--model-list=FILE]
 
 MODE must be one of:
   FLOWS, SEMIFLOWS, TFLOWS, PFLOWS, TSEMIFLOWS, PSEMIFLOWS
@@ -82,11 +87,16 @@ Tool names and their meanings: (default : all tools)
   Format: X-Y (e.g., A-D, E-L, M-R, S-Z). Case-insensitive.
   Default: process all models.
 
+--model-list=FILE:
+  Process only the models listed in FILE, one name per line ('#' starts a comment),
+  e.g. a representative subset written by InvCompare/selectModels.py.
+
 Examples:
   $0 TFLOWS
   $0 PFLOWS --tools=tina4ti2,petri64,petrisage -t=300 -solution
   $0 TFLOWS --mem=ANY --extra-petri-flags="--noSingleSignRow --loopLimit=500" --extra-petrisage-flags="--backend=SNF"
   $0 PFLOWS --model-filter=A-D
+  $0 PFLOWS --tools=petri64 --model-list=subset.txt
 EOF
 }
 
@@ -119,6 +129,7 @@ EXTRA_PETRI_FLAGS=""
 EXTRA_PETRISAGE_FLAGS=""
 MODEL_FILTER_START=""
 MODEL_FILTER_END=""
+MODEL_LIST=""
 
 for arg in "$@"; do
   case "$arg" in
@@ -153,6 +164,9 @@ for arg in "$@"; do
         exit 1
       fi
       ;;
+    --model-list=*)
+      MODEL_LIST="${arg#*=}"
+      ;;
     -h|--help)
       print_usage
       exit 0
@@ -175,6 +189,19 @@ if ! [[ "$TIMEOUT_SEC" =~ ^[0-9]+$ ]] || [ "$TIMEOUT_SEC" -le 0 ]; then
     exit 1
 fi
 
+# Load the model list (--model-list)
+declare -A MODEL_SET=()
+if [ -n "$MODEL_LIST" ]; then
+    if [ ! -f "$MODEL_LIST" ]; then
+        echo "Error: model list not found: $MODEL_LIST"
+        exit 1
+    fi
+    while read -r listed _; do
+        [ -z "$listed" ] || [[ "$listed" == \#* ]] || MODEL_SET["$listed"]=1
+    done < "$MODEL_LIST"
+    echo "Model list $MODEL_LIST: ${#MODEL_SET[@]} models"
+fi
+
 # Validate provided tool names.
 allowed_tools="tina tina4ti2 itstools petri32 petri64 petri128 gspn petrisage"
 IFS=',' read -ra selected_tools <<< "$TOOLS_TO_RUN"
@@ -391,10 +418,13 @@ run_petrisage() {
         # Parse .tba and create .sol.gz in /tmp, then move to $LOGS
         python3 "$ROOT/InvCompare/collectSolution.py" --tool=petrisage --log="$temp_logfile" --model="$model_dir" --mode="$MODE"
         [ -f "$temp_logfile.sol.gz" ] && mv "$temp_logfile.sol.gz" "$final_sol_file" || echo "Warning: Failed to move $temp_logfile.sol.gz to $final_sol_file"
+        [ -f "$temp_logfile.sol.json" ] && mv "$temp_logfile.sol.json" "${final_sol_file%.gz}.json"
         rm -f "$temp_tba_file"  # Clean up temporary .tba
+      elif [ -f "$temp_tba_file" ]; then
+        # Keep the .tba next to the log, for collectSolution.py --batch
+        mv "$temp_tba_file" "$final_logfile.tba" || echo "Warning: Failed to move $temp_tba_file to $final_logfile.tba"
       else
-        [ -f "$temp_tba_file" ] || echo "Warning: No .tba file produced for $model${extra_suffix}${log_suffix}, skipping solution collection"
-        [ -f "$temp_tba_file" ] && rm -f "$temp_tba_file"  # Clean up even if no solution
+        echo "Warning: No .tba file produced for $model${extra_suffix}${log_suffix}, skipping solution collection"
       fi
     fi
   fi
@@ -409,6 +439,9 @@ for model_dir in "$MODELDIR"/*/; do
             continue
         fi
     fi
+    if [ -n "$MODEL_LIST" ] && [ -z "${MODEL_SET[$model]}" ]; then
+        continue
+    fi
     cd "$model_dir" || exit
     echo "Processing model: $model"
     
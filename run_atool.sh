@@ -8,7 +8,7 @@ set -e
 
 print_usage() {
     cat <<EOF
-Usage: $0 MODE --tool=NAME [--flags="FLAGS"] [--mem=VALUE] [-t=TIMEOUT] [-solution] [--model-filter=RANGE]
+Usage: $0 MODE --tool=NAME [--flags="FLAGS"] [--mem=VALUE] [-t=TIMEOUT] [-solution] [--model-filter=RANGE] [--model-list=FILE]
 
 MODE must be one of: PFLOWS, TFLOWS, PSEMIFLOWS, TSEMIFLOWS
 
@@ -16,6 +16,7 @@ Examples:
   $0 TFLOWS --tool=petri --flags="--noSingleSignRow"
   $0 PFLOWS --tool=tina --flags="@MLton max-heap 8G -- -4ti2" -solution
   $0 TFLOWS --tool=petrisage --flags="--backend=pari_kernel"
+  $0 PFLOWS --tool=petri --flags="--noSingleSignRow" --model-list=subset.txt
 EOF
 }
 
@@ -35,6 +36,7 @@ TIMEOUT_SEC=120
 SOLUTION=false
 MODEL_FILTER_START=""
 MODEL_FILTER_END=""
+MODEL_LIST=""
 
 while [[ $# -gt 0 ]]; do
   case "$1" in
@@ -67,6 +69,9 @@ while [[ $# -gt 0 ]]; do
         exit 1
       fi
       ;;
+    --model-list=*)
+      MODEL_LIST="${1#*=}"
+      ;;
     *)
       echo "Unknown argument: $1"
       print_usage
@@ -99,6 +104,19 @@ if [ ! -f ./config.sh ]; then
 fi
 source ./config.sh
 
+# Load the model list (--model-list)
+declare -A MODEL_SET=()
+if [ -n "$MODEL_LIST" ]; then
+    if [ ! -f "$MODEL_LIST" ]; then
+        echo "Error: model list not found: $MODEL_LIST"
+        exit 1
+    fi
+    while read -r listed _; do
+        [ -z "$listed" ] || [[ "$listed" == \#* ]] || MODEL_SET["$listed"]=1
+    done < "$MODEL_LIST"
+    echo "Model list $MODEL_LIST: ${#MODEL_SET[@]} models"
+fi
+
 RUNNERS_DIR="$ROOT/runners"
 RUNNER="$RUNNERS_DIR/run_${TOOL}.sh"
 if [ ! -x "$RUNNER" ]; then
@@ -117,12 +135,10 @@ esac
 mkdir -p "$LOGDIR"
 export LOGS="$PWD/$LOGDIR"
 
-# Build LIMITS wrapper exactly as before
-if [ "$MEM_LIMIT" = "ANY" ]; then
-    export LIMITS="$TIMEOUT $TIMEOUT_SEC time"
-else
-    export LIMITS="$TIMEOUT $TIMEOUT_SEC time systemd-run --scope -p MemoryMax=$MEM_LIMIT --user"
-fi
+# Build LIMITS wrapper (shared with runners/run_job.sh)
+source "$RUNNERS_DIR/run_common.sh"
+LIMITS=$(build_limits "$MEM_LIMIT" "$TIMEOUT_SEC")
+export LIMITS
 
 # Process each model
 for model_dir in "$MODELDIR"/*/; do
@@ -133,6 +149,9 @@ for model_dir in "$MODELDIR"/*/; do
             continue
         fi
     fi
+    if [ -n "$MODEL_LIST" ] && [ -z "${MODEL_SET[$model]}" ]; then
+        continue
+    fi
 
     echo "Processing model: $model with tool: $TOOL"
     "$RUNNER" "$MODE" "$model_dir" "$FLAGS" "$LIMITS" "$SOLUTION"
@@ -0,0 +1,41 @@
+#!/bin/bash
+# run_oar_queue.sh
+# Submit OAR jobs that each start one work queue worker (InvCompare/workQueue.py work).
+# Tasks are added to the queue beforehand, e.g.:
+#   python3 InvCompare/workQueue.py init $QUEUE
+#   python3 InvCompare/workQueue.py add-runs $QUEUE PFLOWS TFLOWS --tools=tina,petri --mem=ANY -t 120 -solution
+#   python3 InvCompare/workQueue.py add-compare $QUEUE logs_pflows logs_tflows
+# Workers pull tasks until the queue is empty, so any number of nodes can join;
+# tasks of a node that dies are put back once their lease expires.
+#
+# Usage: ./run_oar_queue.sh [NB_WORKERS]
+
+set -e
+
+WORKDIR="/home/ythierry/git/InvariantPerformance"
+
+# ====================== USER CONFIGURATION ======================
+
+QUEUE="$WORKDIR/queue"
+NB_WORKERS="${1:-9}"
+SLOTS=4           # concurrent tasks per worker, must match core= below
+LEASE=900         # seconds, larger than the longest task between two heartbeats
+
+OAR_CONSTRAINTS='{(host like "tall%")}/nodes=1/core=4,walltime=12:00:00'
+
+# ================================================================
+
+if [ ! -d "$QUEUE/pending" ]; then
+    echo "Error: $QUEUE is not a queue, run: python3 InvCompare/workQueue.py init $QUEUE"
+    exit 1
+fi
+
+python3 "$WORKDIR/InvCompare/workQueue.py" status "$QUEUE"
+
+for ((i = 1; i <= NB_WORKERS; i++)); do
+    CMD="cd $WORKDIR && python3 InvCompare/workQueue.py work $QUEUE --slots $SLOTS --lease $LEASE; exit"
+    echo "  oarsub -l \"$OAR_CONSTRAINTS\" \"$CMD\""
+    oarsub -l "$OAR_CONSTRAINTS" "$CMD"
+done
+
+echo "All OAR workers submitted ($NB_WORKERS total)"
@@ -3,6 +3,12 @@
 # Pure plumbing layer used by every normal runner.
 # Provides flag compression, idempotent execution with temp files,
 # LIMITS wrapping and standard solution collection.
+# If COLLECT_QUEUE is set, solution collection is deferred: the log is appended
+# to that file and later processed by collectSolution.py --batch @$COLLECT_QUEUE.
+# If MONITOR_INTERVAL is set (seconds), each run is sampled by InvCompare/monitor.py
+# and its memory/CPU time series is written next to the log (<log>.mon).
+# If EVENT_LOG is set (a folder), begin/end events of each run are appended to
+# $EVENT_LOG/<host>.jsonl (see InvCompare/campaign/events.py).
 
 compress_flags() {
   local flags="$1"
@@ -23,6 +29,31 @@ compress_flags() {
   echo "$compressed"
 }
 
+# Signature: build_limits MEM_LIMIT TIMEOUT_SEC
+# Prints the LIMITS wrapper of the tool runs: timeout, time and, unless
+# MEM_LIMIT is ANY, a systemd scope capping the memory. Shared by run_atool.sh
+# and run_job.sh.
+build_limits() {
+  if [ "$1" = "ANY" ]; then
+    echo "$TIMEOUT $2 time"
+  else
+    echo "$TIMEOUT $2 time systemd-run --scope -p MemoryMax=$1 --user"
+  fi
+}
+
+# Signature: emit_event B|E phase model tool mode [rc]
+emit_event() {
+  [ -n "$EVENT_LOG" ] || return 0
+  mkdir -p "$EVENT_LOG" 2>/dev/null
+  local host
+  host=$(hostname)
+  local rc_field=""
+  [ -n "$6" ] && rc_field=",\"rc\":$6"
+  printf '{"ts":%s,"ev":"%s","host":"%s","pid":%d,"slot":"%s","phase":"%s","model":"%s","tool":"%s","mode":"%s"%s}\n' \
+    "$(date +%s.%3N)" "$1" "$host" "$$" "${EVENT_SLOT:-}" "$2" "$3" "$4" "$5" "$rc_field" \
+    >> "$EVENT_LOG/$host.jsonl" 2>/dev/null || true
+}
+
 # Signature: invoke_and_log "raw_cmd" "final_logfile" "solution_tool" "model_dir" "mode" "LIMITS" "SOLUTION"
 invoke_and_log() {
   local raw_cmd="$1"
@@ -35,6 +66,7 @@ invoke_and_log() {
 
   local temp_log="/tmp/$(basename "$final_logfile").$$"
   local temp_time="${temp_log}.time"
+  local temp_series="${temp_log}.mon"
 
   if [ -f "$final_logfile" ]; then
     echo "  Skipping (already exists): $final_logfile"
@@ -43,17 +75,32 @@ invoke_and_log() {
 
   local full_cmd="$LIMITS $raw_cmd"
   echo "  Running: $full_cmd"
+  if [ -n "$MONITOR_INTERVAL" ]; then
+    full_cmd="python3 \"$ROOT/InvCompare/monitor.py\" --interval $MONITOR_INTERVAL --output \"$temp_series\" -- $full_cmd"
+  fi
 
-  rm -f "$temp_time" "$temp_log"
+  local model event_tool rc
+  model=$(basename "$model_dir")
+  event_tool=$(basename "$final_logfile")
+  event_tool="${event_tool#"$model".}"
+  rm -f "$temp_time" "$temp_log" "$temp_series"
+  emit_event B run "$model" "$event_tool" "$mode"
   (
     cd "$model_dir" || exit 1
-    eval "$full_cmd" > "$temp_log" 2> "$temp_time" || true
+    eval "$full_cmd" > "$temp_log" 2> "$temp_time"
   )
+  rc=$?
+  emit_event E run "$model" "$event_tool" "$mode" "$rc"
   cat "$temp_time" >> "$temp_log"
+  if [ -f "$temp_series" ]; then
+    mv "$temp_series" "${final_logfile}.mon" || echo "Warning: mv failed"
+  fi
   mv "$temp_log" "$final_logfile" || echo "Warning: mv failed"
   rm -f "$temp_time"
 
-  if [ "$SOLUTION" = true ] && [ -n "$solution_tool" ]; then
+  if [ "$SOLUTION" = true ] && [ -n "$solution_tool" ] && [ -n "$COLLECT_QUEUE" ]; then
+    printf '%s\t%s\t%s\t%s\n' "$final_logfile" "$solution_tool" "$mode" "$model_dir" >> "$COLLECT_QUEUE"
+  elif [ "$SOLUTION" = true ] && [ -n "$solution_tool" ]; then
     python3 "$ROOT/InvCompare/collectSolution.py" \
       --tool="$solution_tool" --log="$final_logfile" \
       --model="$model_dir" --mode="$mode" || true
@@ -0,0 +1,52 @@
+#!/bin/bash
+# run_job.sh
+# Run a single campaign job: one tool on one model in one mode, with the same
+# log folder and LIMITS wrapper as run_atool.sh. Used by InvCompare/runCampaign.py.
+# Must be called from the folder containing config.sh.
+# With LOG_SUBDIR, logs go to a subfolder of the mode's log folder (e.g. the
+# limit-tagged folders of InvCompare/timeoutLadder.py).
+#
+# Usage: run_job.sh MODE TOOL MODEL_DIR FLAGS MEM TIMEOUT_SEC SOLUTION [LOG_SUBDIR]
+
+if [ $# -ne 7 ] && [ $# -ne 8 ]; then
+    echo "Usage: $0 MODE TOOL MODEL_DIR FLAGS MEM TIMEOUT_SEC SOLUTION [LOG_SUBDIR]" >&2
+    exit 1
+fi
+
+MODE="$1"
+TOOL="$2"
+MODEL_DIR="$3"
+FLAGS="$4"
+MEM_LIMIT="$5"
+TIMEOUT_SEC="$6"
+SOLUTION="$7"
+LOG_SUBDIR="$8"
+
+if [ ! -f ./config.sh ]; then
+    echo "Error: config.sh not found" >&2
+    exit 1
+fi
+source ./config.sh
+
+RUNNER="$ROOT/runners/run_${TOOL}.sh"
+if [ ! -x "$RUNNER" ]; then
+    echo "Error: runner not found or not executable: $RUNNER" >&2
+    exit 1
+fi
+
+case "$MODE" in
+  TFLOWS)     LOGDIR="logs_tflows" ;;
+  PFLOWS)     LOGDIR="logs_pflows" ;;
+  TSEMIFLOWS) LOGDIR="logs_tsemiflows" ;;
+  PSEMIFLOWS) LOGDIR="logs_psemiflows" ;;
+  *) echo "Error: unsupported mode $MODE" >&2; exit 1 ;;
+esac
+
+[ -n "$LOG_SUBDIR" ] && LOGDIR="$LOGDIR/$LOG_SUBDIR"
+mkdir -p "$LOGDIR"
+export LOGS="$PWD/$LOGDIR"
+
+source "$ROOT/runners/run_common.sh"
+LIMITS=$(build_limits "$MEM_LIMIT" "$TIMEOUT_SEC")
+
+exec "$RUNNER" "$MODE" "$MODEL_DIR" "$FLAGS" "$LIMITS" "$SOLUTION"
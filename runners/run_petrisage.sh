@@ -1,7 +1,7 @@
 #!/bin/bash
 # run_petrisage.sh
 # Tool-specific runner for PetriSage. Contains ALL special handling (micromamba,
-# .mtx input, temporary .tba file, custom .sol.gz, simple backend suffix).
+# .mtx input, .tba output kept next to the log, custom .sol.gz, simple backend suffix).
 # Does NOT pollute run_common.sh.
 
 MODE="$1"
@@ -33,9 +33,16 @@ raw_cmd="\"$MICROMAMBA\" run -r \"$ROOT/micromamba\" -n sage \"$PETRISAGE\" \"$M
 source "$ROOT/runners/run_common.sh"
 invoke_and_log "$raw_cmd" "$final_logfile" "" "$MODEL_DIR" "$MODE" "$LIMITS" false
 
-# PetriSage-specific solution collection (kept here)
-if [ "$SOLUTION" = true ] && [ -f "$temp_tba_file" ]; then
-    python3 "$ROOT/InvCompare/collectSolution.py" --tool=petrisage --log="$final_logfile" --model="$MODEL_DIR" --mode="$MODE"
-    [ -f "${final_logfile}.sol.gz" ] && mv "${final_logfile}.sol.gz" "$LOGS/$model${extra_segment}.petrisage.sol.gz" || true
-    rm -f "$temp_tba_file"
+# PetriSage-specific solution collection (kept here). The .tba output is kept
+# next to the log as <log>.tba, where collectSolution.py (single or --batch)
+# reads it and removes it once collected.
+if [ -f "$temp_tba_file" ]; then
+    mv "$temp_tba_file" "${final_logfile}.tba" || echo "Warning: mv failed"
+fi
+if [ "$SOLUTION" = true ] && [ -f "${final_logfile}.tba" ]; then
+    if [ -n "$COLLECT_QUEUE" ]; then
+        printf '%s\t%s\t%s\t%s\n' "$final_logfile" petrisage "$MODE" "$MODEL_DIR" >> "$COLLECT_QUEUE"
+    else
+        python3 "$ROOT/InvCompare/collectSolution.py" --tool=petrisage --log="$final_logfile" --model="$MODEL_DIR" --mode="$MODE" || true
+    fi
 fi
@@ -1,19 +1,20 @@
 #!/usr/bin/env python3
+import os
 import sys
 import pandas as pd
 
-def summary(csv_file):
-    # Read CSV into DataFrame
-    df = pd.read_csv(csv_file)
-    
+def status_counts(df):
     # Define flags for each status
-    df['succ'] = (df['Status'] == 'OK').astype(int)
-    df['time'] = (df['Status'] == 'TO').astype(int)
-    df['ovf']  = (df['Status'] == 'OF').astype(int)
-    # mem: statuses containing "MO" but not "OF"
-    df['mem']  = df['Status'].apply(lambda x: 1 if ("MO" in str(x) and "OF" not in str(x)) else 0)
-    df['unk']  = (df['Status'] == 'UNK').astype(int)
-    
+    status = df['Status'].astype(str)
+    df = df.assign(
+        succ=(status == 'OK').astype(int),
+        time=(status == 'TO').astype(int),
+        ovf=(status == 'OF').astype(int),
+        # mem: statuses containing "MO" but not "OF"
+        mem=(status.str.contains('MO', regex=False) & ~status.str.contains('OF', regex=False)).astype(int),
+        unk=(status == 'UNK').astype(int),
+    )
+
     # Group by Tool and compute counts
     g = df.groupby('Tool').agg(
         tot=('Status', 'count'),
@@ -24,19 +25,46 @@ def summary(csv_file):
         unk=('unk', 'sum')
     ).reset_index()
     g['fail'] = g['tot'] - g['succ']
-    
+    return g
+
+def print_summary(g):
     # Print markdown table
     print("summary\n")
     print("| Tool | Failure | time | ovf | mem | unk | Success | Total |")
     print("|---|---|---|---|---|---|---|---|")
-    for _, row in g.sort_values('Tool').iterrows():
-        print(f"| {row['Tool']} | {row['fail']} | {row['time']} | {row['ovf']} | {row['mem']} | {row['unk']} | {row['succ']} | {row['tot']} |")
+    for row in g.sort_values('Tool').itertuples(index=False):
+        print(f"| {row.Tool} | {row.fail} | {row.time} | {row.ovf} | {row.mem} | {row.unk} | {row.succ} | {row.tot} |")
+
+def summary(csv_file):
+    # Read CSV into DataFrame
+    print_summary(status_counts(pd.read_csv(csv_file)))
+
+def history_summary(store, campaign=None):
+    # Same counts, computed by DuckDB over a campaign of the history store
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'InvCompare'))
+    from campaign import history
+    names = history.campaigns(store)
+    if not names:
+        print(f"No campaign in {store}")
+        sys.exit(1)
+    campaign = campaign or names[-1]
+    try:
+        counts = history.status_summary(store, [campaign])
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"campaign {campaign}\n")
+    print_summary(counts)
 
 def main():
     if len(sys.argv) < 2:
         print(f"Usage: {sys.argv[0]} <csv_file>")
+        print(f"       {sys.argv[0]} --history <store> [campaign]")
         sys.exit(1)
-    summary(sys.argv[1])
+    if sys.argv[1] == '--history' and len(sys.argv) >= 3:
+        history_summary(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    else:
+        summary(sys.argv[1])
 
 if __name__ == '__main__':
     main()
@@ -17,6 +17,8 @@ fi
 BASE_DIR="/home/ythierry/git/InvariantPerformance"
 PYTHON_SCRIPT="$BASE_DIR/InvCompare/main.py"
 TEMP_DIR="/tmp"
+# Worker processes per minimality test (main.py --jobs)
+MIN_JOBS=${MIN_JOBS:-1}
 
 # Ensure Python script exists
 if [ ! -f "$PYTHON_SCRIPT" ]; then
@@ -59,11 +61,12 @@ process_file() {
         return
     fi
 
-    # Run minimality test and write to report file
+    # Run minimality test and write to report file, the verdict also to .sol.min.json
+    rm -f "$REPORT_FILE.json"
     {
         echo "Minimality Test Report for $SOL_FILE"
         echo "Started: $(date)"
-        python3 "$PYTHON_SCRIPT" --testMinimality "$TEMP_FILE"
+        python3 "$PYTHON_SCRIPT" --testMinimality --jobs="$MIN_JOBS" --results-json="$REPORT_FILE.json" "$TEMP_FILE"
         echo "Completed: $(date)"
     } > "$REPORT_FILE" 2>&1
 